@@ -0,0 +1,10 @@
+"""
+Benchmark suite for the robotic vehicle hot paths
+
+Every benchmark runs against the in-process simulator backend, so the
+suite needs no hardware and gives repeatable numbers on a workstation,
+in CI and on the Pi itself. Run it with:
+
+    python -m benchmarks.run                    # run, save, compare
+    python -m benchmarks.run --save-baseline    # accept as new baseline
+"""
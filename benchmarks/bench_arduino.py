@@ -0,0 +1,35 @@
+import json
+
+from .harness import benchmark
+
+SENSOR_FRAME = (json.dumps({
+    'temperature': 23.5,
+    'acceleration': {'x': 0.01, 'y': -0.02, 'z': 0.98},
+    'distance': 412
+}) + '\n').encode()
+
+@benchmark('arduino.parse', unit='frames/s', number=2000)
+def arduino_parse(sim):
+    """
+    Receive path: a sensor frame crosses the serial link and is parsed
+    """
+    from src.communication.arduino_interface import ArduinoInterface
+    arduino = ArduinoInterface(port='/dev/bench-arduino')
+    device = sim.serial_device('/dev/bench-arduino')
+
+    def _receive():
+        device.write(SENSOR_FRAME)
+        arduino._parse_frame(arduino.serial_conn.readline())
+
+    return _receive, arduino.close
+
+@benchmark('arduino.command', unit='commands/s', number=1000)
+def arduino_command(sim):
+    """
+    send_command() round trip against a simulated JSON responder
+    """
+    from src.communication.arduino_interface import ArduinoInterface
+    sim.serial_link('/dev/bench-arduino').set_responder(lambda line: b'{"status": "ok"}\n')
+    arduino = ArduinoInterface(port='/dev/bench-arduino')
+    command = {'type': 'diagnostic', 'check_components': ['power_system']}
+    return (lambda: arduino.send_command(command)), arduino.close
@@ -0,0 +1,33 @@
+from .harness import benchmark
+
+# Representative status frame; the JSON encoding keeps the first 8 bytes
+VEHICLE_STATUS = {'speed': 50, 'battery_level': 85, 'mode': 'autonomous'}
+
+@benchmark('can.encode', unit='frames/s', number=2000)
+def can_encode(sim):
+    """
+    CANInterface.send_message(): dict encoding and bus transmit
+    """
+    from src.communication.can_interface import CANInterface
+    interface = CANInterface(channel='bench0')
+    return (lambda: interface.send_message(0x123, VEHICLE_STATUS)), interface.close
+
+@benchmark('can.decode', unit='frames/s', number=5000)
+def can_decode(sim):
+    """
+    CANInterface._process_message() on JSON and raw binary frames
+    """
+    from src import hal
+    from src.communication.can_interface import CANInterface
+    interface = CANInterface(channel='bench0')
+    frames = (
+        hal.can_message(0x200, b'{"v":12}'),
+        hal.can_message(0x201, bytes([0x01, 0x02, 0xfe, 0xff])),
+    )
+    state = {'index': 0}
+
+    def _decode():
+        state['index'] ^= 1
+        interface._process_message(frames[state['index']])
+
+    return _decode, interface.close
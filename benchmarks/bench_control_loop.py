@@ -0,0 +1,67 @@
+from .harness import benchmark, LATENCY
+
+LOOP_PERIOD = 0.01
+LEFT_SENSOR_PIN = 5
+RIGHT_SENSOR_PIN = 6
+
+BENCH_CONFIG = {
+    'gpio': {
+        'dc_motor_pins': {
+            'left': {'pwm': 18, 'dir1': 23, 'dir2': 24},
+            'right': {'pwm': 25, 'dir1': 8, 'dir2': 7}
+        }
+    },
+    'speed_control': {
+        'left_sensor_pin': LEFT_SENSOR_PIN,
+        'right_sensor_pin': RIGHT_SENSOR_PIN,
+        'max_speed': 1.0
+    },
+    'communication': {'bluetooth': {'port': '/dev/bench-bluetooth'}}
+}
+
+def build_controller(config=BENCH_CONFIG):
+    """
+    VehicleController on the simulator, driving forward at half speed
+
+    Returns:
+        VehicleController: Controller with wheel targets set
+    """
+    from src.vehicle_control import VehicleController
+    controller = VehicleController(config, calibrate=False)
+    controller.wheel_speed_targets[0] = 0.5
+    controller.wheel_speed_targets[1] = 0.5
+    return controller
+
+@benchmark('control.tick', kind=LATENCY, unit='us', number=2000, rounds=3)
+def control_tick(sim):
+    """
+    Closed-loop VehicleController.control_tick() at a 100 Hz loop rate
+    """
+    controller = build_controller()
+    # Encoder pulses for the whole run so the speed loop sees real feedback
+    duration = 3 * 2000 * LOOP_PERIOD + 10
+    sim.gpio.pulse_train(LEFT_SENSOR_PIN, 8, duration)
+    sim.gpio.pulse_train(RIGHT_SENSOR_PIN, 8, duration)
+
+    def _tick():
+        sim.clock.advance(LOOP_PERIOD)
+        controller.control_tick()
+
+    return _tick, controller.stop
+
+@benchmark('control.tick_open_loop', kind=LATENCY, unit='us', number=2000, rounds=3)
+def control_tick_open_loop(sim):
+    """
+    Open-loop control_tick(): deadtime bookkeeping only
+    """
+    config = dict(BENCH_CONFIG)
+    del config['speed_control']
+    from src.vehicle_control import VehicleController
+    controller = VehicleController(config, calibrate=False)
+    controller.drive_train.set_wheels(40, -40)
+
+    def _tick():
+        sim.clock.advance(LOOP_PERIOD)
+        controller.control_tick()
+
+    return _tick, controller.stop
@@ -0,0 +1,20 @@
+from .harness import benchmark
+
+@benchmark('imu.read', unit='samples/s', number=2000)
+def imu_read(sim):
+    """
+    Full MPU6050Sensor.read(): six registers, offsets and timestamp
+    """
+    from src.sensors.mpu6050 import MPU6050Sensor
+    sim.i2c_device(0x68).set_motion(accel=(0.02, -0.01, 1.0), gyro=(1.5, -0.5, 0.25))
+    sensor = MPU6050Sensor()
+    return sensor.read
+
+@benchmark('imu.read_raw', unit='reads/s', number=5000)
+def imu_read_raw(sim):
+    """
+    Single 16-bit register read over the simulated I2C bus
+    """
+    from src.sensors.mpu6050 import MPU6050
+    imu = MPU6050()
+    return lambda: imu.read_raw_data(MPU6050.ACCEL_XOUT_H)
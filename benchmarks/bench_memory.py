@@ -0,0 +1,45 @@
+from .harness import benchmark, MEMORY
+from .bench_can import VEHICLE_STATUS
+from .bench_control_loop import build_controller, LOOP_PERIOD
+
+@benchmark('memory.control_loop', kind=MEMORY, unit='bytes/1k iterations', number=20000, warmup=500)
+def control_loop_memory(sim):
+    """
+    Retained memory over a long run of the main loop's per-tick work
+    """
+    from src.sensors.mpu6050 import MPU6050Sensor
+    from src.communication.can_interface import CANInterface
+
+    controller = build_controller()
+    imu = MPU6050Sensor()
+    can = CANInterface(channel='bench0')
+
+    def _iteration():
+        sim.clock.advance(LOOP_PERIOD)
+        imu.read()
+        controller.control_tick()
+        can.send_message(0x123, VEHICLE_STATUS)
+
+    def _cleanup():
+        controller.stop()
+        can.close()
+
+    return _iteration, _cleanup
+
+@benchmark('memory.can_receive', kind=MEMORY, unit='bytes/1k frames', number=20000, warmup=500)
+def can_receive_memory(sim):
+    """
+    Retained memory while frames arrive and nobody drains the queue
+    """
+    from src import hal
+    from src.communication.can_interface import CANInterface
+
+    listener = CANInterface(channel='bench1')
+    sender = hal.open_can_bus('bench1', 500000)
+    frame = hal.can_message(0x300, b'{"v":1}')
+
+    def _receive():
+        sender.send(frame)
+        listener._dispatch(listener.bus.recv(timeout=0))
+
+    return _receive, listener.close
@@ -0,0 +1,32 @@
+import math
+from .harness import benchmark, LATENCY
+
+@benchmark('offload.collect', kind=LATENCY, unit='us', number=5000, rounds=3)
+def collect(sim):
+    """
+    ComputeOffload.collect() while a job runs (the per-tick cost in the loop)
+    """
+    import time
+    from src.compute_offload import ComputeOffload
+    offload = ComputeOffload(max_workers=1)
+    offload.submit('idle', time.sleep, 1.0)
+    return offload.collect, offload.shutdown
+
+@benchmark('offload.occupancy_scan', kind=LATENCY, unit='us', number=20, rounds=3)
+def occupancy_scan(sim):
+    """
+    occupancy_update() of a 360-beam, 2 m scan into a 200x200 grid (worker time per scan)
+    """
+    from src.compute_offload import SharedArray, occupancy_update
+    grid = SharedArray('f', 200 * 200)
+    scan = SharedArray('f', 360)
+    scan.write([2.0] * 360)
+
+    def operation():
+        occupancy_update(grid.handle, 200, 200, 0.05, (5.0, 5.0, 0.0), scan.handle,
+                         0.0, 2 * math.pi / 360, 4.0)
+
+    def cleanup():
+        grid.close()
+        scan.close()
+    return operation, cleanup
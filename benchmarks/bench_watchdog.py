@@ -0,0 +1,29 @@
+from .harness import benchmark, LATENCY
+
+MOTOR_PINS = (18, 23, 24, 25, 8, 7)
+
+@benchmark('watchdog.stop_path', kind=LATENCY, unit='us', number=2000, rounds=3)
+def stop_path(sim):
+    """
+    EmergencyStopPath.trip(): zero two PWM duties, drive six pins low
+    """
+    from src.safety_watchdog import EmergencyStopPath
+    sim.gpio.setmode(sim.gpio.BCM)
+    for pin in MOTOR_PINS:
+        sim.gpio.setup(pin, sim.gpio.OUT)
+    pwms = [sim.gpio.PWM(pin, 1000) for pin in (18, 25)]
+    for pwm in pwms:
+        pwm.start(50)
+    path = EmergencyStopPath(MOTOR_PINS, pwms)
+    return path.trip
+
+@benchmark('watchdog.check', kind=LATENCY, unit='us', number=5000, rounds=3)
+def check(sim):
+    """
+    SafetyWatchdog.check() on a healthy heartbeat (the per-poll cost)
+    """
+    from src.safety_watchdog import HeartbeatBoard, SafetyWatchdog
+    board = HeartbeatBoard(['control', 'teleop'])
+    watchdog = SafetyWatchdog(board, {'control': 3600.0, 'teleop': 3600.0})
+    watchdog.arm()
+    return watchdog.check
@@ -0,0 +1,322 @@
+import gc
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+
+from src import hal
+from src.hal.simulator import SimulatorBackend
+from src.instrumentation import LatencyHistogram
+
+THROUGHPUT = 'throughput'
+LATENCY = 'latency'
+MEMORY = 'memory'
+
+# Growth below this is noise from interpreter caches, not a leak
+MEMORY_SLACK_BYTES = 4096
+
+REGISTRY = {}
+
+class Benchmark:
+    def __init__(self, name, setup, kind, unit, number, rounds, warmup, description=''):
+        """
+        One registered benchmark
+
+        The setup function receives a fresh SimulatorBackend (already
+        installed as the HAL backend) and returns the operation to
+        measure, or an (operation, cleanup) pair.
+
+        Args:
+            name (str): Dotted result name, e.g. 'imu.read'
+            setup (callable): setup(sim) -> operation
+            kind (str): THROUGHPUT, LATENCY or MEMORY
+            unit (str): Unit of the reported value
+            number (int): Calls per round (iterations for MEMORY)
+            rounds (int): Timed rounds
+            warmup (int): Untimed calls before measuring
+            description (str): One-line summary for reports
+        """
+        self.name = name
+        self.setup = setup
+        self.kind = kind
+        self.unit = unit
+        self.number = number
+        self.rounds = rounds
+        self.warmup = warmup
+        self.description = description
+
+    @property
+    def higher_is_better(self):
+        return self.kind == THROUGHPUT
+
+    def run(self, scale=1.0):
+        """
+        Measure the benchmark on a fresh simulator
+
+        Args:
+            scale (float): Multiplier for the call counts (0.1 for a quick run)
+
+        Returns:
+            dict: Result record with 'value' and kind-specific 'stats'
+        """
+        number = max(int(self.number * scale), 1)
+        sim = SimulatorBackend()
+        previous = hal.set_backend(sim)
+        try:
+            prepared = self.setup(sim)
+            operation, cleanup = prepared if isinstance(prepared, tuple) else (prepared, None)
+            try:
+                for _ in range(self.warmup):
+                    operation()
+                if self.kind == THROUGHPUT:
+                    value, stats = _measure_throughput(operation, number, self.rounds)
+                elif self.kind == LATENCY:
+                    value, stats = _measure_latency(operation, number, self.rounds)
+                else:
+                    value, stats = _measure_memory(operation, number)
+            finally:
+                if cleanup:
+                    cleanup()
+        finally:
+            hal.set_backend(previous)
+
+        return {
+            'name': self.name,
+            'kind': self.kind,
+            'unit': self.unit,
+            'value': value,
+            'higher_is_better': self.higher_is_better,
+            'stats': stats
+        }
+
+def benchmark(name, kind=THROUGHPUT, unit='ops/s', number=1000, rounds=5, warmup=50, description=''):
+    """
+    Register a setup function as a benchmark
+
+    Args:
+        name (str): Dotted result name
+        kind (str): THROUGHPUT (ops/s, higher is better), LATENCY
+                    (median microseconds per call) or MEMORY (bytes
+                    retained per 1000 calls)
+        unit (str): Unit of the reported value
+        number (int): Calls per round (total iterations for MEMORY)
+        rounds (int): Timed rounds
+        warmup (int): Untimed calls before measuring
+        description (str): One-line summary, defaults to the docstring
+
+    Returns:
+        callable: Decorator returning the setup function unchanged
+    """
+    def _decorator(setup):
+        summary = description or (setup.__doc__ or '').strip().split('\n')[0]
+        REGISTRY[name] = Benchmark(name, setup, kind, unit, number, rounds, warmup, summary)
+        return setup
+    return _decorator
+
+def _measure_throughput(operation, number, rounds):
+    rates = []
+    calls = range(number)
+    # Like timeit: collector pauses are noise, leaks show up in MEMORY runs
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for _ in calls:
+                operation()
+            rates.append(number / (time.perf_counter() - start))
+    finally:
+        gc.enable()
+    value = statistics.median(rates)
+    return value, {
+        'rounds': rounds,
+        'number': number,
+        'min': min(rates),
+        'max': max(rates),
+        'stdev': statistics.stdev(rates) if rounds > 1 else 0.0
+    }
+
+def _measure_latency(operation, number, rounds):
+    histogram = LatencyHistogram()
+    clock = time.perf_counter_ns
+    gc.disable()
+    try:
+        for _ in range(rounds * number):
+            start = clock()
+            operation()
+            histogram.record_ns(clock() - start)
+    finally:
+        gc.enable()
+    snapshot = histogram.snapshot()
+    return snapshot['p50_us'], snapshot
+
+def _measure_memory(operation, iterations):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        for _ in range(iterations):
+            operation()
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    differences = after.compare_to(before, 'lineno')
+    growth = sum(stat.size_diff for stat in differences)
+    top = [
+        {'location': str(stat.traceback[0]), 'size_diff': stat.size_diff, 'count_diff': stat.count_diff}
+        for stat in differences[:5] if stat.size_diff > 0
+    ]
+    return growth * 1000.0 / iterations, {
+        'iterations': iterations,
+        'growth_bytes': growth,
+        'peak_bytes': peak,
+        'top_growth': top
+    }
+
+def load_benchmarks():
+    """
+    Import every bench_*.py module so its benchmarks register
+
+    Returns:
+        dict: Benchmark name -> Benchmark
+    """
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    for filename in sorted(os.listdir(package_dir)):
+        if filename.startswith('bench_') and filename.endswith('.py'):
+            importlib.import_module(f"{__package__}.{filename[:-3]}")
+    return REGISTRY
+
+def git_commit(cwd=None):
+    """
+    Current commit hash, or None outside a git checkout
+    """
+    try:
+        output = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=cwd,
+            capture_output=True, text=True, timeout=10, check=True
+        )
+        dirty = subprocess.run(
+            ['git', 'status', '--porcelain', '--untracked-files=no'], cwd=cwd,
+            capture_output=True, text=True, timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    commit = output.stdout.strip()
+    return commit + '-dirty' if dirty.stdout.strip() else commit
+
+def run_benchmarks(benchmarks, scale=1.0, progress=None):
+    """
+    Run benchmarks and collect a results document
+
+    Args:
+        benchmarks (iterable): Benchmark instances
+        scale (float): Call count multiplier
+        progress (callable, optional): progress(result) after each run
+
+    Returns:
+        dict: Results document with environment metadata
+    """
+    results = {}
+    for bench in benchmarks:
+        result = bench.run(scale)
+        results[bench.name] = result
+        if progress:
+            progress(result)
+
+    return {
+        'commit': git_commit(os.path.dirname(os.path.abspath(__file__))),
+        'timestamp': time.time(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+        'scale': scale,
+        'results': results
+    }
+
+def save_results(document, path):
+    """
+    Write a results document as JSON (atomically)
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as results_file:
+        json.dump(document, results_file, indent=2, sort_keys=True)
+        results_file.write('\n')
+    os.replace(temp_path, path)
+
+def load_results(path):
+    """
+    Read a results document
+
+    Returns:
+        dict: The document, or None if the file does not exist
+    """
+    try:
+        with open(path, 'r') as results_file:
+            return json.load(results_file)
+    except FileNotFoundError:
+        return None
+
+def compare(document, baseline, tolerance=0.15):
+    """
+    Compare results against a baseline document
+
+    A throughput below baseline * (1 - tolerance), or a latency or memory
+    figure above baseline * (1 + tolerance), is a regression. Memory
+    growth also gets MEMORY_SLACK_BYTES of absolute headroom because a
+    leak-free baseline is close to zero.
+
+    Args:
+        document (dict): Current results
+        baseline (dict): Baseline results
+        tolerance (float): Allowed relative change
+
+    Returns:
+        list: One row per benchmark with 'name', 'value', 'baseline',
+              'change' (relative) and 'status' ('ok', 'regression',
+              'improvement' or 'new')
+    """
+    rows = []
+    previous_results = baseline.get('results', {}) if baseline else {}
+    for name, result in sorted(document['results'].items()):
+        value = result['value']
+        previous = previous_results.get(name)
+        if previous is None:
+            rows.append({'name': name, 'value': value, 'baseline': None, 'change': None, 'status': 'new'})
+            continue
+
+        reference = previous['value']
+        change = (value - reference) / reference if reference else None
+        if result['higher_is_better']:
+            worse = value < reference * (1 - tolerance)
+            better = value > reference * (1 + tolerance)
+        else:
+            slack = MEMORY_SLACK_BYTES if result['kind'] == MEMORY else 0.0
+            worse = value > reference * (1 + tolerance) + slack
+            better = value < reference * (1 - tolerance) - slack
+        status = 'regression' if worse else 'improvement' if better else 'ok'
+        rows.append({'name': name, 'value': value, 'baseline': reference, 'change': change, 'status': status})
+    return rows
+
+def format_comparison(rows, document):
+    """
+    Render comparison rows as a text table
+    """
+    lines = [f"{'benchmark':<28} {'value':>14} {'baseline':>14} {'change':>8}  status"]
+    for row in rows:
+        unit = document['results'][row['name']]['unit']
+        baseline = '-' if row['baseline'] is None else f"{row['baseline']:,.1f}"
+        change = '-' if row['change'] is None else f"{row['change'] * 100:+.1f}%"
+        lines.append(
+            f"{row['name']:<28} {row['value']:>14,.1f} {baseline:>14} {change:>8}  {row['status']} ({unit})"
+        )
+    return '\n'.join(lines)
@@ -0,0 +1,88 @@
+import argparse
+import fnmatch
+import logging
+import os
+import sys
+
+from .harness import (
+    load_benchmarks, run_benchmarks, save_results, load_results, compare, format_comparison
+)
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, 'baseline.json')
+DEFAULT_RESULTS_DIR = os.path.join(BENCHMARK_DIR, 'results')
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmarks.run',
+        description="Run the simulated hot-path benchmarks and compare against a baseline"
+    )
+    parser.add_argument('patterns', nargs='*', help="Benchmark name globs (default: all)")
+    parser.add_argument('--list', action='store_true', help="List benchmarks and exit")
+    parser.add_argument('--quick', action='store_true', help="Run a tenth of the iterations")
+    parser.add_argument('--output', help="Results file (default: results/<commit>.json)")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline results file")
+    parser.add_argument('--save-baseline', action='store_true', help="Write these results as the baseline")
+    parser.add_argument('--tolerance', type=float, default=0.15,
+                        help="Allowed relative change before flagging a regression")
+    return parser.parse_args(argv)
+
+def select(benchmarks, patterns):
+    if not patterns:
+        return list(benchmarks.values())
+    return [
+        bench for name, bench in benchmarks.items()
+        if any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+    ]
+
+def main(argv=None):
+    """
+    Run benchmarks, store the JSON results and report regressions
+
+    Returns:
+        int: Exit status, 1 if any benchmark regressed against the baseline
+    """
+    args = parse_args(argv)
+    # Driver info logging would dominate the hot paths being measured
+    logging.disable(logging.INFO)
+
+    benchmarks = select(load_benchmarks(), args.patterns)
+    if args.list:
+        for bench in benchmarks:
+            print(f"{bench.name:<28} {bench.kind:<10} {bench.description}")
+        return 0
+    if not benchmarks:
+        print("No benchmarks match", ' '.join(args.patterns))
+        return 2
+
+    def _progress(result):
+        print(f"  {result['name']:<28} {result['value']:>14,.1f} {result['unit']}")
+
+    print(f"Running {len(benchmarks)} benchmarks")
+    document = run_benchmarks(benchmarks, scale=0.1 if args.quick else 1.0, progress=_progress)
+
+    output = args.output or os.path.join(DEFAULT_RESULTS_DIR, f"{document['commit'] or 'local'}.json")
+    save_results(document, output)
+    print(f"Results written to {output}")
+
+    if args.save_baseline:
+        save_results(document, args.baseline)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    baseline = load_results(args.baseline)
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    rows = compare(document, baseline, args.tolerance)
+    print(f"\nAgainst baseline {baseline.get('commit')} (tolerance {args.tolerance:.0%}):")
+    print(format_comparison(rows, document))
+    regressions = [row['name'] for row in rows if row['status'] == 'regression']
+    if regressions:
+        print(f"\nRegressions: {', '.join(regressions)}")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,19 +3,55 @@ Actuators Package Initialization
 
 This module provides a centralized import and initialization 
 for all actuator interfaces in the robotic vehicle project.
+
+Actuator classes are loaded from their modules on first access, so
+importing the package touches no GPIO.
 """
 
-from .servo_motor import ServoMotor
-from .water_pump import WaterPump
-from .motor_controller import DCMotor
+import importlib
+
+# Public name -> defining submodule, resolved on first access (PEP 562)
+_LAZY_IMPORTS = {
+    'ServoMotor': '.servo_motor',
+    'WaterPump': '.water_pump',
+    'DCMotor': '.motor_controller',
+    'DifferentialDrive': '.differential_drive',
+    'SpeedProfile': '.motion_profile',
+    'RampEngine': '.motion_profile',
+    'FlowModel': '.pump_scheduler',
+    'PumpScheduler': '.pump_scheduler',
+    'HydraulicCorner': '.hydraulic_corner',
+    'SuspensionActuators': '.hydraulic_corner'
+}
 
 # Define which actuators will be exposed when using 'from actuators import *'
 __all__ = [
     'ServoMotor', 
     'WaterPump', 
-    'DCMotor'
+    'DCMotor',
+    'DifferentialDrive',
+    'SpeedProfile',
+    'RampEngine',
+    'FlowModel',
+    'PumpScheduler',
+    'HydraulicCorner',
+    'SuspensionActuators',
+    'initialize_all_actuators',
+    'emergency_stop_all_actuators'
 ]
 
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
 def initialize_all_actuators():
     """
     Initialize all actuator modules with default configurations.
@@ -23,6 +59,10 @@ def initialize_all_actuators():
     Returns:
         dict: A dictionary of initialized actuator instances
     """
+    from .servo_motor import ServoMotor
+    from .water_pump import WaterPump
+    from .motor_controller import DCMotor
+    
     actuators = {
         'steering_servo': ServoMotor(pin=18),  # Example pin assignment
         'water_pump': WaterPump(pin=23),       # Example pin assignment
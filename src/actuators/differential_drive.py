@@ -0,0 +1,236 @@
+import time
+from .. import hal
+from .motor_controller import DCMotor
+
+LEFT = 0
+RIGHT = 1
+
+class DifferentialDrive:
+    def __init__(self, left_motor, right_motor, track_width=0.15,
+                 max_wheel_speed=1.0, deadtime=0.05, duty_resolution=0.1,
+                 clock=hal.monotonic):
+        """
+        Group the left and right DC motors behind one batched update
+
+        Commands only store a target; update() works out which pins
+        actually changed and writes them in one pass, so both wheels move
+        within the same control loop tick and unchanged pins are skipped.
+
+        :param left_motor: DCMotor driving the left wheel
+        :param right_motor: DCMotor driving the right wheel
+        :param track_width: Distance between the wheels (m)
+        :param max_wheel_speed: Wheel ground speed at 100% duty (m/s)
+        :param deadtime: Coast time before a wheel may reverse (seconds)
+        :param duty_resolution: Duty changes smaller than this are not written (%)
+        :param clock: Monotonic time source in seconds
+        """
+        self.motors = (left_motor, right_motor)
+        self.track_width = track_width
+        self.max_wheel_speed = max_wheel_speed
+        self.deadtime = deadtime
+        self.duty_resolution = duty_resolution
+        self.clock = clock
+
+        # Requested and last written state per wheel
+        self._target_duty = [0.0, 0.0]
+        self._target_dir = [0, 0]
+        self._applied_duty = [None, None]
+        self._applied_dir = [None, None]
+        self._coast_until = [0.0, 0.0]
+
+        self.stats = {'pin_writes': 0, 'skipped_writes': 0}
+
+    @classmethod
+    def from_pins(cls, left_pins, right_pins, **kwargs):
+        """
+        Build the drive from (pwm, dir1, dir2) pin tuples
+
+        :param left_pins: Left motor pins (pwm, dir1, dir2)
+        :param right_pins: Right motor pins (pwm, dir1, dir2)
+        :return: DifferentialDrive instance
+        """
+        left = DCMotor(*left_pins)
+        right = DCMotor(*right_pins)
+        return cls(left, right, **kwargs)
+
+    @classmethod
+    def from_config(cls, motor_pins, **kwargs):
+        """
+        Build the drive from the 'dc_motor_pins' configuration section
+
+        :param motor_pins: {'left': {'pwm', 'dir1', 'dir2'}, 'right': {...}}
+        :return: DifferentialDrive instance
+        """
+        def _pins(side):
+            pins = motor_pins[side]
+            return (pins['pwm'], pins['dir1'], pins['dir2'])
+
+        return cls.from_pins(_pins('left'), _pins('right'), **kwargs)
+
+    def set_wheels(self, left, right, now=None):
+        """
+        Command both wheels at once
+
+        :param left: Left wheel speed (-100 to 100%, negative is reverse)
+        :param right: Right wheel speed (-100 to 100%, negative is reverse)
+        :param now: Optional timestamp from the control loop
+        """
+        for side, speed in ((LEFT, left), (RIGHT, right)):
+            if speed < -100 or speed > 100:
+                raise ValueError("Wheel speed must be between -100 and 100")
+
+            duty = round(abs(speed) / self.duty_resolution) * self.duty_resolution
+            self._target_duty[side] = duty
+            self._target_dir[side] = 0 if duty == 0 else (1 if speed > 0 else -1)
+
+        self.update(now)
+
+    def targets(self):
+        """
+        Commanded wheel speeds, as passed to set_wheels()
+
+        :return: (left, right) in percent, negative is reverse
+        """
+        return (
+            self._target_dir[LEFT] * self._target_duty[LEFT],
+            self._target_dir[RIGHT] * self._target_duty[RIGHT]
+        )
+
+    def set_velocity(self, linear, angular, now=None):
+        """
+        Command the body velocity (v, omega)
+
+        Wheel speeds that would exceed 100% are scaled down together so
+        the turn radius is kept.
+
+        :param linear: Forward speed (m/s)
+        :param angular: Yaw rate (rad/s, positive turns left)
+        :param now: Optional timestamp from the control loop
+        """
+        half_track = self.track_width / 2
+        left = (linear - angular * half_track) / self.max_wheel_speed * 100
+        right = (linear + angular * half_track) / self.max_wheel_speed * 100
+
+        peak = max(abs(left), abs(right))
+        if peak > 100:
+            left = left * 100 / peak
+            right = right * 100 / peak
+
+        self.set_wheels(left, right, now)
+
+    def update(self, now=None):
+        """
+        Apply pending wheel targets in one batched write
+
+        Call this once per control loop tick; it finishes direction
+        changes whose deadtime has elapsed and is a no-op otherwise.
+
+        :param now: Optional timestamp from the control loop
+        :return: True if any wheel is still waiting out its deadtime
+        """
+        if now is None:
+            now = self.clock()
+
+        writes = []
+        for side in (LEFT, RIGHT):
+            applied_dir = self._applied_dir[side]
+            target_dir = self._target_dir[side]
+
+            if applied_dir not in (None, 0) and applied_dir != target_dir:
+                # Leaving a driven direction: coast through the deadtime first
+                direction, duty = 0, 0.0
+                self._coast_until[side] = now + self.deadtime
+            elif now < self._coast_until[side]:
+                direction, duty = 0, 0.0
+            else:
+                direction, duty = target_dir, self._target_duty[side]
+
+            writes.append((side, direction, duty))
+
+        # Drop the duty before touching direction pins, raise it after
+        for side, direction, duty in writes:
+            if duty == 0:
+                self._write_duty(side, duty)
+        for side, direction, duty in writes:
+            self._write_direction(side, direction)
+        for side, direction, duty in writes:
+            if duty != 0:
+                self._write_duty(side, duty)
+
+        return self.pending
+
+    @property
+    def pending(self):
+        """
+        True while a wheel has not reached its commanded state
+        """
+        return any(
+            self._applied_dir[side] != self._target_dir[side]
+            or self._applied_duty[side] != self._target_duty[side]
+            for side in (LEFT, RIGHT)
+        )
+
+    def _write_direction(self, side, direction):
+        if self._applied_dir[side] == direction:
+            self.stats['skipped_writes'] += 1
+            return
+        self.motors[side].apply_direction(direction)
+        self._applied_dir[side] = direction
+        self.stats['pin_writes'] += 1
+
+    def _write_duty(self, side, duty):
+        if self._applied_duty[side] == duty:
+            self.stats['skipped_writes'] += 1
+            return
+        self.motors[side].apply_duty(duty)
+        self._applied_duty[side] = duty
+        self.stats['pin_writes'] += 1
+
+    def stop(self, now=None):
+        """
+        Stop both wheels (coast)
+        """
+        self.set_wheels(0, 0, now)
+
+    def cleanup(self):
+        """
+        Cleanup GPIO resources for both motors
+        """
+        for motor in self.motors:
+            motor.cleanup()
+
+def main():
+    """
+    Example usage of Differential Drive
+    """
+    drive = None
+    try:
+        # Pins from config/hardware_map.txt
+        drive = DifferentialDrive.from_pins(
+            left_pins=(18, 23, 24),
+            right_pins=(25, 8, 7)
+        )
+
+        drive.set_velocity(0.5, 0.0)   # Straight ahead
+        time.sleep(2)
+
+        drive.set_velocity(0.2, 1.5)   # Arc to the left
+        time.sleep(2)
+
+        # Spin in place: the left wheel reverses through its deadtime
+        drive.set_wheels(-40, 40)
+        while drive.update():
+            time.sleep(0.01)
+        time.sleep(1)
+
+        drive.stop()
+        print("GPIO writes:", drive.stats)
+
+    except Exception as e:
+        print(f"Error: {e}")
+    finally:
+        if drive:
+            drive.cleanup()
+
+if __name__ == "__main__":
+    main()
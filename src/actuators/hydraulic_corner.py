@@ -0,0 +1,162 @@
+import time
+from .. import hal
+from ..hal import GPIO
+
+class HydraulicCorner:
+    def __init__(self, pump_pin, valve_pin, pwm_frequency=100, deadband=0.05, min_duty=20.0):
+        """
+        Pump (raise) and release valve (lower) of one suspension strut
+
+        Both run on GPIO.PWM, which RPi.GPIO generates in software from
+        its own thread, so apply() only changes duty cycles and returns
+        at once; a duty is written only when its whole-percent value
+        changes. Neither output has a direction pin: only a duty of 0
+        from this process keeps a strut still.
+
+        :param pump_pin: GPIO pin of the pump driver
+        :param valve_pin: GPIO pin of the release valve driver
+        :param pwm_frequency: PWM frequency (Hz)
+        :param deadband: Commands smaller than this hold the strut
+        :param min_duty: Lowest duty that moves fluid (%)
+        """
+        self.pump_pin = pump_pin
+        self.valve_pin = valve_pin
+        self.deadband = deadband
+        self.min_duty = min_duty
+
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setup(pump_pin, GPIO.OUT)
+        GPIO.setup(valve_pin, GPIO.OUT)
+        self.pump_pwm = GPIO.PWM(pump_pin, pwm_frequency)
+        self.valve_pwm = GPIO.PWM(valve_pin, pwm_frequency)
+        self.pump_pwm.start(0)
+        self.valve_pwm.start(0)
+
+        self.pump_duty = 0
+        self.valve_duty = 0
+        self.writes = 0
+
+    def duties_for(self, command):
+        """
+        Pump and valve duty for a command
+
+        :param command: -1 (release) to 1 (pump)
+        :return: (pump duty, valve duty) in whole percent
+        """
+        magnitude = abs(command)
+        if magnitude < self.deadband:
+            return 0, 0
+        duty = int(round(self.min_duty + (100 - self.min_duty) * min(magnitude, 1.0)))
+        return (duty, 0) if command > 0 else (0, duty)
+
+    def set_duties(self, pump_duty, valve_duty):
+        """
+        Write the duties that changed
+
+        :param pump_duty: Pump duty (0-100%)
+        :param valve_duty: Valve duty (0-100%)
+        """
+        if pump_duty != self.pump_duty:
+            self.pump_pwm.ChangeDutyCycle(pump_duty)
+            self.pump_duty = pump_duty
+            self.writes += 1
+        if valve_duty != self.valve_duty:
+            self.valve_pwm.ChangeDutyCycle(valve_duty)
+            self.valve_duty = valve_duty
+            self.writes += 1
+
+    def apply(self, command):
+        """
+        Drive the strut
+
+        :param command: -1 (release) to 1 (pump)
+        """
+        self.set_duties(*self.duties_for(command))
+
+    def hold(self):
+        """
+        Stop the pump and close the valve
+        """
+        self.set_duties(0, 0)
+
+    def cleanup(self):
+        """
+        Cleanup GPIO resources
+        """
+        self.hold()
+        self.pump_pwm.stop()
+        self.valve_pwm.stop()
+        GPIO.cleanup([self.pump_pin, self.valve_pin])
+
+class SuspensionActuators:
+    def __init__(self, corners, max_active_pumps=2):
+        """
+        The four struts, with a cap on pumps running at once
+
+        Pumps draw the most current, so only the corners with the
+        largest raise demand get their pump each tick; valves need no
+        power and always follow their command.
+
+        :param corners: HydraulicCorner per corner (front left, front
+                        right, rear left, rear right)
+        :param max_active_pumps: Pumps allowed to run together
+        """
+        self.corners = corners
+        self.max_active_pumps = max_active_pumps
+        self._order = list(range(len(corners)))
+
+    def apply(self, commands):
+        """
+        Drive every strut from the controller's corner commands
+
+        :param commands: Command per corner (-1 to 1)
+        :return: Number of pumps running
+        """
+        order = self._order
+        order.sort(key=lambda index: -commands[index])
+        running = 0
+        for index in order:
+            corner = self.corners[index]
+            pump_duty, valve_duty = corner.duties_for(commands[index])
+            if pump_duty:
+                if running >= self.max_active_pumps:
+                    pump_duty = 0
+                else:
+                    running += 1
+            corner.set_duties(pump_duty, valve_duty)
+        return running
+
+    def hold(self):
+        """
+        Stop all pumps and close all valves
+        """
+        for corner in self.corners:
+            corner.hold()
+
+    def cleanup(self):
+        """
+        Cleanup GPIO resources of every strut
+        """
+        for corner in self.corners:
+            corner.cleanup()
+
+def main():
+    """
+    Example usage of the suspension actuators on the simulator
+    """
+    sim = hal.use_simulator()
+    corners = [HydraulicCorner(pump, valve) for pump, valve in ((5, 6), (12, 13), (19, 26), (20, 21))]
+    actuators = SuspensionActuators(corners, max_active_pumps=2)
+    try:
+        for commands in ([0.8, 0.6, 0.4, -0.5], [0.8, 0.6, 0.4, -0.5], [0.0, 0.2, 0.9, 0.0]):
+            start = time.perf_counter()
+            running = actuators.apply(commands)
+            elapsed_us = (time.perf_counter() - start) * 1e6
+            duties = [(corner.pump_duty, corner.valve_duty) for corner in corners]
+            print(f"{commands} -> {duties}, {running} pumps, {elapsed_us:.1f} us")
+        print(f"PWM duty on pump pin 5: {sim.gpio.pwm_duty(5)}")
+    finally:
+        actuators.cleanup()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+import logging
+import math
+import threading
+import time
+from .. import hal
+
+logger = logging.getLogger('RampEngine')
+
+class SpeedProfile:
+    def __init__(self, start_speed, target_speed, max_accel, max_jerk=None):
+        """
+        Precomputed speed trajectory between two speeds
+
+        Without a jerk limit the profile is trapezoidal (speed changes at
+        a constant max_accel). With max_jerk set it is an S-curve: the
+        acceleration itself ramps up and down, which removes the torque
+        step at the start and end of the ramp.
+
+        :param start_speed: Initial speed (-100 to 100%)
+        :param target_speed: Final speed (-100 to 100%)
+        :param max_accel: Acceleration limit (%/s)
+        :param max_jerk: Optional jerk limit (%/s^2), enables the S-curve
+        """
+        if max_accel <= 0:
+            raise ValueError("max_accel must be positive")
+        if max_jerk is not None and max_jerk <= 0:
+            raise ValueError("max_jerk must be positive")
+
+        self.start_speed = start_speed
+        self.target_speed = target_speed
+        self.max_accel = max_accel
+        self.max_jerk = max_jerk
+
+        delta = target_speed - start_speed
+        self._sign = 1 if delta >= 0 else -1
+        delta = abs(delta)
+
+        if max_jerk is None:
+            # Trapezoidal: constant acceleration for the whole change
+            self._jerk_time = 0.0
+            self._const_time = delta / max_accel
+            self._peak_accel = max_accel
+        else:
+            jerk_time = max_accel / max_jerk
+            if delta >= max_accel * jerk_time:
+                self._jerk_time = jerk_time
+                self._const_time = delta / max_accel - jerk_time
+                self._peak_accel = max_accel
+            else:
+                # Too short to reach max_accel: triangular acceleration
+                self._jerk_time = math.sqrt(delta / max_jerk)
+                self._const_time = 0.0
+                self._peak_accel = max_jerk * self._jerk_time
+
+        self.duration = 2 * self._jerk_time + self._const_time
+
+    @property
+    def profile_type(self):
+        return 'trapezoidal' if self.max_jerk is None else 's_curve'
+
+    def speed_at(self, elapsed):
+        """
+        Speed at a given time into the profile
+
+        :param elapsed: Seconds since the profile started
+        :return: Speed (%)
+        """
+        if elapsed <= 0:
+            return self.start_speed
+        if elapsed >= self.duration:
+            return self.target_speed
+
+        jerk_time = self._jerk_time
+        if jerk_time == 0:
+            return self.start_speed + self._sign * self._peak_accel * elapsed
+
+        jerk = self.max_jerk
+        if elapsed < jerk_time:
+            change = jerk * elapsed * elapsed / 2
+        elif elapsed < jerk_time + self._const_time:
+            change = self._peak_accel * (jerk_time / 2 + (elapsed - jerk_time))
+        else:
+            remaining = self.duration - elapsed
+            return self.target_speed - self._sign * jerk * remaining * remaining / 2
+
+        return self.start_speed + self._sign * change
+
+class RampEngine:
+    def __init__(self, output, max_accel=100.0, max_jerk=None, speed=0.0,
+                 clock=hal.monotonic):
+        """
+        Non-blocking speed ramp driver
+
+        Ramps are advanced by tick(), either from the control loop or from
+        the optional background timer, so the caller never sleeps.
+
+        :param output: Callable taking the signed speed (-100 to 100%)
+        :param max_accel: Acceleration limit (%/s)
+        :param max_jerk: Optional jerk limit (%/s^2) for S-curve ramps
+        :param speed: Speed the output is currently at
+        :param clock: Monotonic time source in seconds
+        """
+        self.output = output
+        self.max_accel = max_accel
+        self.max_jerk = max_jerk
+        self.clock = clock
+
+        self.speed = speed
+        self.profile = None
+        self._started_at = 0.0
+        self._lock = threading.Lock()
+
+        self._timer_thread = None
+        self._stop_event = threading.Event()
+
+    @classmethod
+    def for_motor(cls, motor, **kwargs):
+        """
+        Build an engine that drives a DCMotor through set_speed
+
+        :param motor: DCMotor instance
+        :return: RampEngine instance
+        """
+        def _output(speed):
+            motor.set_speed(abs(speed), 1 if speed >= 0 else -1)
+
+        return cls(_output, **kwargs)
+
+    def ramp_to(self, target_speed, now=None, max_accel=None, max_jerk=None):
+        """
+        Start a ramp, or retarget the running one from the current speed
+
+        :param target_speed: Final speed (-100 to 100%)
+        :param now: Optional timestamp from the control loop
+        :param max_accel: Override the engine acceleration limit
+        :param max_jerk: Override the engine jerk limit
+        :return: The new SpeedProfile
+        """
+        if target_speed < -100 or target_speed > 100:
+            raise ValueError("Speed must be between -100 and 100")
+        if now is None:
+            now = self.clock()
+
+        with self._lock:
+            self._advance(now)
+            self.profile = SpeedProfile(
+                self.speed, target_speed,
+                max_accel or self.max_accel,
+                max_jerk if max_jerk is not None else self.max_jerk
+            )
+            self._started_at = now
+            return self.profile
+
+    def tick(self, now=None):
+        """
+        Advance the active ramp and write the new speed if it changed
+
+        :param now: Optional timestamp from the control loop
+        :return: Current speed (%)
+        """
+        if now is None:
+            now = self.clock()
+
+        with self._lock:
+            self._advance(now)
+            return self.speed
+
+    def _advance(self, now):
+        profile = self.profile
+        if profile is None:
+            return
+
+        elapsed = now - self._started_at
+        speed = profile.speed_at(elapsed)
+        if elapsed >= profile.duration:
+            self.profile = None
+
+        if speed != self.speed:
+            self.speed = speed
+            self.output(speed)
+
+    def cancel(self, stop=False):
+        """
+        Cancel the active ramp
+
+        :param stop: Also set the output to 0 instead of holding the current speed
+        """
+        with self._lock:
+            self.profile = None
+            if stop and self.speed != 0:
+                self.speed = 0.0
+                self.output(0.0)
+
+    @property
+    def active(self):
+        return self.profile is not None
+
+    def progress(self, now=None):
+        """
+        Report ramp progress
+
+        :param now: Optional timestamp from the control loop
+        :return: dict with active flag, fraction done, remaining time and speeds
+        """
+        if now is None:
+            now = self.clock()
+
+        with self._lock:
+            profile = self.profile
+            if profile is None:
+                return {
+                    'active': False,
+                    'fraction': 1.0,
+                    'remaining_s': 0.0,
+                    'speed': self.speed,
+                    'target_speed': self.speed
+                }
+
+            elapsed = now - self._started_at
+            fraction = 1.0 if profile.duration == 0 else min(elapsed / profile.duration, 1.0)
+            return {
+                'active': True,
+                'fraction': fraction,
+                'remaining_s': max(profile.duration - elapsed, 0.0),
+                'speed': self.speed,
+                'target_speed': profile.target_speed
+            }
+
+    def start_timer(self, period=0.01):
+        """
+        Advance ramps from a background thread instead of the control loop
+
+        :param period: Tick period (seconds)
+        """
+        if self._timer_thread and self._timer_thread.is_alive():
+            return
+
+        def _timer():
+            while not self._stop_event.wait(period):
+                try:
+                    self.tick()
+                except Exception as e:
+                    logger.error(f"Ramp timer error: {e}")
+
+        self._stop_event.clear()
+        self._timer_thread = threading.Thread(target=_timer, daemon=True)
+        self._timer_thread.start()
+
+    def stop_timer(self):
+        """
+        Stop the background timer
+        """
+        self._stop_event.set()
+        if self._timer_thread:
+            self._timer_thread.join()
+            self._timer_thread = None
+
+def main():
+    """
+    Example usage of the ramp engine with a DC motor
+    """
+    from .motor_controller import DCMotor
+
+    motor = None
+    try:
+        motor = DCMotor(pwm_pin=18, dir_pin1=23, dir_pin2=24)
+        engine = RampEngine.for_motor(motor, max_accel=80.0, max_jerk=400.0)
+        engine.start_timer()
+
+        engine.ramp_to(80)
+        while engine.active:
+            print("Ramp progress:", engine.progress())
+            time.sleep(0.2)
+
+        # Retarget in the middle of a ramp
+        engine.ramp_to(-50)
+        time.sleep(0.5)
+        engine.ramp_to(0)
+        time.sleep(2)
+
+        engine.stop_timer()
+    except Exception as e:
+        print(f"Error: {e}")
+    finally:
+        if motor:
+            motor.cleanup()
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
-# import RPi.GPIO as GPIO
-import gpiozero as GPIO
 import time
+import threading
+from .. import hal
+from ..hal import GPIO
 
 class DCMotor:
     def __init__(self, pwm_pin, dir_pin1, dir_pin2):
@@ -36,33 +37,61 @@ class DCMotor:
             raise ValueError("Speed must be between 0 and 100")
         
         # Set motor direction
+        self.apply_direction(1 if direction == 1 else -1)
+        
+        # Set motor speed
+        self.apply_duty(speed)
+
+    def apply_direction(self, direction):
+        """
+        Write the direction pins without touching the duty cycle
+        
+        :param direction: 1 forward, -1 reverse, 0 coast (both pins low)
+        """
         if direction == 1:
             GPIO.output(self.dir_pin1, GPIO.HIGH)
             GPIO.output(self.dir_pin2, GPIO.LOW)
-        else:
+        elif direction == -1:
             GPIO.output(self.dir_pin1, GPIO.LOW)
             GPIO.output(self.dir_pin2, GPIO.HIGH)
+        else:
+            GPIO.output(self.dir_pin1, GPIO.LOW)
+            GPIO.output(self.dir_pin2, GPIO.LOW)
+
+    def apply_duty(self, duty):
+        """
+        Write the PWM duty cycle without touching the direction pins
         
-        # Set motor speed
-        self.pwm.ChangeDutyCycle(speed)
+        :param duty: Duty cycle (0-100%)
+        """
+        self.pwm.ChangeDutyCycle(duty)
 
     def stop(self):
         """
         Stop the motor
         """
-        self.pwm.ChangeDutyCycle(0)
-        GPIO.output(self.dir_pin1, GPIO.LOW)
-        GPIO.output(self.dir_pin2, GPIO.LOW)
+        self.apply_duty(0)
+        self.apply_direction(0)
 
-    def brake(self, braking_time=0.5):
+    def brake(self, braking_time=0.5, blocking=True):
         """
         Apply brake to motor
         
         :param braking_time: Duration of braking
+        :param blocking: If False, release the brake from a timer thread
+                         instead of sleeping on the caller
+        :return: The release timer when non-blocking, else None
         """
         GPIO.output(self.dir_pin1, GPIO.HIGH)
         GPIO.output(self.dir_pin2, GPIO.HIGH)
-        time.sleep(braking_time)
+        
+        if not blocking:
+            release = threading.Timer(braking_time, self.stop)
+            release.daemon = True
+            release.start()
+            return release
+        
+        hal.sleep(braking_time)
         self.stop()
 
     def ramp_up(self, max_speed=100, step=10, delay=0.1):
@@ -75,7 +104,7 @@ class DCMotor:
         """
         for speed in range(0, max_speed + 1, step):
             self.set_speed(speed)
-            time.sleep(delay)
+            hal.sleep(delay)
 
     def ramp_down(self, max_speed=100, step=10, delay=0.1):
         """
@@ -87,7 +116,7 @@ class DCMotor:
         """
         for speed in range(max_speed, -1, -step):
             self.set_speed(speed)
-            time.sleep(delay)
+            hal.sleep(delay)
         
         self.stop()
 
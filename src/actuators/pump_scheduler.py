@@ -0,0 +1,383 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from .. import hal
+
+logger = logging.getLogger('PumpScheduler')
+
+class FlowModel:
+    def __init__(self, max_flow=20.0, min_intensity=15.0):
+        """
+        Linear pump flow model
+
+        :param max_flow: Flow at 100% intensity (ml/s)
+        :param min_intensity: Intensity below which the pump does not deliver (%)
+        """
+        self.max_flow = max_flow
+        self.min_intensity = min_intensity
+
+    def flow_rate(self, intensity):
+        """
+        Flow at a given intensity
+
+        :param intensity: Pump intensity (0-100%)
+        :return: Flow (ml/s)
+        """
+        if intensity <= self.min_intensity:
+            return 0.0
+        return self.max_flow * (intensity - self.min_intensity) / (100 - self.min_intensity)
+
+    def time_for_volume(self, volume, intensity):
+        """
+        Pump-on time needed to deliver a volume
+
+        :param volume: Volume to deliver (ml)
+        :param intensity: Pump intensity (0-100%)
+        :return: On time (seconds)
+        """
+        flow = self.flow_rate(intensity)
+        if flow <= 0:
+            raise ValueError(f"Pump delivers nothing at {intensity}% intensity")
+        return volume / flow
+
+class DoseJob:
+    """
+    One queued dose: an intensity and a list of remaining on/off phases.
+    """
+    __slots__ = (
+        'job_id', 'priority', 'intensity', 'phases',
+        'state', 'delivered', 'target_volume'
+    )
+
+    def __init__(self, job_id, priority, intensity, phases, target_volume=None):
+        self.job_id = job_id
+        self.priority = priority
+        self.intensity = intensity
+        self.phases = deque(phases)
+        self.state = 'queued'
+        self.delivered = 0.0
+        self.target_volume = target_volume
+
+class PumpScheduler:
+    def __init__(self, pump, flow_model=None, clock=hal.monotonic, history=64):
+        """
+        Non-blocking dose scheduler for a WaterPump
+
+        Jobs run from tick(), called by the control loop or the optional
+        background timer; the pump PWM is only written on phase changes.
+
+        :param pump: WaterPump instance
+        :param flow_model: FlowModel used for volume doses and accounting
+        :param clock: Monotonic time source in seconds
+        :param history: Number of finished jobs kept for status queries
+        """
+        self.pump = pump
+        self.flow_model = flow_model or FlowModel()
+        self.clock = clock
+
+        self._queue = []
+        self._sequence = itertools.count()
+        self._job_ids = itertools.count(1)
+        self._jobs = {}
+        self._finished = deque(maxlen=history)
+        self._lock = threading.RLock()
+
+        self.current = None
+        self._phase_started = None
+        self._accounted_until = None
+        self._pump_on = False
+        self.halted = False
+        self.total_delivered = 0.0
+
+        self._timer_thread = None
+        self._stop_event = threading.Event()
+
+    def submit(self, intensity=100, on_time=None, off_time=0.0, cycles=1,
+               volume=None, priority=0):
+        """
+        Queue a dose job
+
+        Either give an on/off pattern (on_time, off_time, cycles), a total
+        volume, or both: with both, the volume is split into on_time
+        pulses and the last pulse is shortened.
+
+        :param intensity: Pump intensity (0-100%)
+        :param on_time: Pump-on time per cycle (seconds)
+        :param off_time: Pause between cycles (seconds)
+        :param cycles: Number of on/off cycles (pattern doses)
+        :param volume: Total volume to deliver (ml)
+        :param priority: Higher runs first and preempts lower priorities
+        :return: Job ID
+        """
+        if intensity < 0 or intensity > 100:
+            raise ValueError("Intensity must be between 0 and 100")
+        if on_time is None and volume is None:
+            raise ValueError("A dose needs an on_time or a volume")
+
+        if volume is not None:
+            total_on = self.flow_model.time_for_volume(volume, intensity)
+            pulse = on_time or total_on
+            on_times = []
+            while total_on > 1e-9:
+                on_times.append(min(pulse, total_on))
+                total_on -= pulse
+        else:
+            on_times = [on_time] * cycles
+
+        phases = []
+        for on in on_times:
+            phases.append((True, on))
+            if off_time:
+                phases.append((False, off_time))
+        if phases and not phases[-1][0]:
+            phases.pop()
+
+        with self._lock:
+            if self.halted:
+                raise RuntimeError("Pump scheduler is halted by emergency stop")
+            job = DoseJob(next(self._job_ids), priority, intensity, phases, volume)
+            self._jobs[job.job_id] = job
+            heapq.heappush(self._queue, (-priority, next(self._sequence), job))
+            return job.job_id
+
+    def tick(self, now=None):
+        """
+        Advance the running dose, start queued ones and account volume
+
+        :param now: Optional timestamp from the control loop
+        :return: ID of the running job, or None when idle
+        """
+        if now is None:
+            now = self.clock()
+
+        with self._lock:
+            if self.halted:
+                return None
+
+            self._preempt_if_needed(now)
+
+            while True:
+                job = self.current
+                if job is None:
+                    job = self._start_next(now)
+                    if job is None:
+                        break
+
+                is_on, duration = job.phases[0]
+                phase_end = self._phase_started + duration
+                segment_end = min(now, phase_end)
+                if is_on:
+                    self._account(job, segment_end - self._accounted_until)
+                self._accounted_until = segment_end
+
+                if now < phase_end:
+                    break
+
+                # Phase finished: move on at the exact phase boundary
+                job.phases.popleft()
+                self._phase_started = phase_end
+                if not job.phases:
+                    self._finish(job, 'done')
+                    continue
+                self._set_pump(job.phases[0][0], job.intensity)
+
+            return self.current.job_id if self.current else None
+
+    def _start_next(self, now):
+        while self._queue:
+            _, _, job = heapq.heappop(self._queue)
+            if job.state == 'cancelled':
+                continue
+            if not job.phases:
+                self._finish(job, 'done')
+                continue
+            job.state = 'running'
+            self.current = job
+            self._phase_started = now
+            self._accounted_until = now
+            self._set_pump(job.phases[0][0], job.intensity)
+            return job
+        self._set_pump(False, 0)
+        return None
+
+    def _preempt_if_needed(self, now):
+        job = self.current
+        if job is None or not self._queue:
+            return
+        if -self._queue[0][0] <= job.priority:
+            return
+
+        # Close out the running phase and requeue what is left of it
+        is_on, duration = job.phases[0]
+        elapsed = min(now - self._phase_started, duration)
+        if is_on:
+            self._account(job, self._phase_started + elapsed - self._accounted_until)
+        job.phases[0] = (is_on, duration - elapsed)
+        job.state = 'preempted'
+        heapq.heappush(self._queue, (-job.priority, next(self._sequence), job))
+        self.current = None
+
+    def _account(self, job, on_seconds):
+        if on_seconds <= 0:
+            return
+        volume = self.flow_model.flow_rate(job.intensity) * on_seconds
+        job.delivered += volume
+        self.total_delivered += volume
+
+    def _finish(self, job, state):
+        job.state = state
+        self._jobs.pop(job.job_id, None)
+        self._finished.append(job)
+        if self.current is job:
+            self.current = None
+
+    def _set_pump(self, on, intensity):
+        if on:
+            self.pump.turn_on(intensity=intensity)
+            self._pump_on = True
+        elif self._pump_on:
+            self.pump.turn_off()
+            self._pump_on = False
+
+    def cancel(self, job_id, now=None):
+        """
+        Cancel a queued or running job
+
+        :param job_id: Job ID from submit()
+        :return: True if the job was found
+        """
+        with self._lock:
+            # Settle the running job's volume before dropping anything
+            self.tick(now)
+            job = self._jobs.get(job_id)
+            if job is None:
+                return False
+            if job is self.current:
+                self._set_pump(False, 0)
+            self._finish(job, 'cancelled')
+            return True
+
+    def emergency_stop(self):
+        """
+        Turn the pump off immediately and drop every job
+
+        The scheduler stays halted (rejecting new jobs) until resume().
+        """
+        with self._lock:
+            self.halted = True
+            self.pump.turn_off()
+            self._pump_on = False
+            if self.current:
+                self._finish(self.current, 'cancelled')
+            while self._queue:
+                _, _, job = heapq.heappop(self._queue)
+                if job.state != 'cancelled':
+                    self._finish(job, 'cancelled')
+
+    def resume(self):
+        """
+        Accept jobs again after an emergency stop
+        """
+        with self._lock:
+            self.halted = False
+
+    def delivered_volume(self, job_id=None):
+        """
+        Volume delivered so far
+
+        :param job_id: Optional job ID; None for the scheduler total
+        :return: Volume (ml), or None for an unknown job
+        """
+        with self._lock:
+            if job_id is None:
+                return self.total_delivered
+            job = self._find(job_id)
+            return job.delivered if job else None
+
+    def status(self, job_id):
+        """
+        Job state and progress
+
+        :param job_id: Job ID from submit()
+        :return: dict with state, delivered and target volume, or None
+        """
+        with self._lock:
+            job = self._find(job_id)
+            if job is None:
+                return None
+            return {
+                'state': job.state,
+                'priority': job.priority,
+                'delivered_ml': job.delivered,
+                'target_ml': job.target_volume,
+                'remaining_s': sum(duration for _, duration in job.phases)
+            }
+
+    def _find(self, job_id):
+        job = self._jobs.get(job_id)
+        if job is None:
+            for finished in self._finished:
+                if finished.job_id == job_id:
+                    return finished
+        return job
+
+    def start_timer(self, period=0.02):
+        """
+        Run tick() from a background thread
+
+        :param period: Tick period (seconds)
+        """
+        if self._timer_thread and self._timer_thread.is_alive():
+            return
+
+        def _timer():
+            while not self._stop_event.wait(period):
+                try:
+                    self.tick()
+                except Exception as e:
+                    logger.error(f"Pump timer error: {e}")
+
+        self._stop_event.clear()
+        self._timer_thread = threading.Thread(target=_timer, daemon=True)
+        self._timer_thread.start()
+
+    def stop_timer(self):
+        """
+        Stop the background timer
+        """
+        self._stop_event.set()
+        if self._timer_thread:
+            self._timer_thread.join()
+            self._timer_thread = None
+
+def main():
+    """
+    Example usage of the pump scheduler
+    """
+    from .water_pump import WaterPump
+
+    pump = None
+    try:
+        pump = WaterPump(pin=21)
+        scheduler = PumpScheduler(pump, FlowModel(max_flow=20.0))
+        scheduler.start_timer()
+
+        pulses = scheduler.submit(intensity=80, on_time=0.5, off_time=0.5, cycles=3)
+        dose = scheduler.submit(intensity=60, volume=15.0, priority=5)
+
+        while scheduler.status(pulses)['state'] != 'done':
+            print("Delivered:", scheduler.delivered_volume(dose), scheduler.delivered_volume(pulses))
+            time.sleep(0.5)
+
+        scheduler.stop_timer()
+    except Exception as e:
+        print(f"Error: {e}")
+    finally:
+        if pump:
+            pump.cleanup()
+
+if __name__ == "__main__":
+    main()
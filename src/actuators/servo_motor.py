@@ -1,6 +1,6 @@
-# import RPi.GPIO as GPIO
-import gpiozero as GPIO
 import time
+from .. import hal
+from ..hal import GPIO
 
 class ServoMotor:
     def __init__(self, pin, min_pulse=0.5, max_pulse=2.5, frequency=50):
@@ -36,7 +36,7 @@ class ServoMotor:
         # Convert angle to duty cycle
         duty = self.min_pulse + (angle / 180) * (self.max_pulse - self.min_pulse)
         self.pwm.ChangeDutyCycle(duty)
-        time.sleep(0.3)  # Allow time for servo to reach position
+        hal.sleep(0.3)  # Allow time for servo to reach position
 
     def sweep(self, start=0, end=180, step=10, delay=0.1):
         """
@@ -49,11 +49,11 @@ class ServoMotor:
         """
         for angle in range(start, end + 1, step):
             self.set_angle(angle)
-            time.sleep(delay)
+            hal.sleep(delay)
         
         for angle in range(end, start - 1, -step):
             self.set_angle(angle)
-            time.sleep(delay)
+            hal.sleep(delay)
 
     def cleanup(self):
         """
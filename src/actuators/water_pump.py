@@ -1,6 +1,6 @@
-# import RPi.GPIO as GPIO
-import gpiozero as GPIO
 import time
+from .. import hal
+from ..hal import GPIO
 
 class WaterPump:
     def __init__(self, pin, pwm_frequency=100):
@@ -33,7 +33,7 @@ class WaterPump:
         self.pwm.ChangeDutyCycle(intensity)
         
         if duration:
-            time.sleep(duration)
+            hal.sleep(duration)
             self.turn_off()
 
     def turn_off(self):
@@ -52,7 +52,7 @@ class WaterPump:
         """
         for _ in range(cycles):
             self.turn_on(duration=on_time)
-            time.sleep(off_time)
+            hal.sleep(off_time)
 
     def cleanup(self):
         """
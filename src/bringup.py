@@ -0,0 +1,256 @@
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+class BringUpError(Exception):
+    """
+    A required device failed to initialize.
+    """
+
+class DeviceSpec:
+    """
+    One node of the bring-up dependency graph.
+    """
+
+    def __init__(self, name, factory, depends_on=(), timeout=5.0, retries=0,
+                 backoff=0.2, required=True):
+        self.name = name
+        self.factory = factory
+        self.depends_on = tuple(depends_on)
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.required = required
+
+        # Timeline
+        self.status = 'pending'
+        self.attempts = 0
+        self.started = None
+        self.finished = None
+        self.error = None
+
+class BringUpOrchestrator:
+    def __init__(self, max_workers=4, clock=time.monotonic, jitter=0.2):
+        """
+        Initialize devices concurrently in dependency order
+
+        Each device factory runs on a thread pool as soon as all of its
+        dependencies are up. Attempts that raise or exceed their timeout
+        are retried with exponential backoff; a timed-out attempt is
+        abandoned (its thread cannot be killed) and its late result ignored.
+
+        Args:
+            max_workers (int): Thread pool size
+            clock (callable): Monotonic time source in seconds
+            jitter (float): Random fraction added to each backoff delay
+        """
+        self.max_workers = max_workers
+        self.clock = clock
+        self.jitter = jitter
+        self.devices = {}
+        self.specs = {}
+        self.logger = logging.getLogger('BringUp')
+        self._t0 = None
+
+    def add(self, name, factory, depends_on=(), timeout=5.0, retries=0,
+            backoff=0.2, required=True):
+        """
+        Register a device
+
+        Args:
+            name (str): Device name
+            factory (callable): Called with the dict of already initialized
+                                devices; returns the device object
+            depends_on (iterable): Names that must be up first
+            timeout (float): Per-attempt timeout (seconds)
+            retries (int): Extra attempts after the first failure
+            backoff (float): Delay before the first retry, doubled each time
+            required (bool): If False, failure does not abort bring-up
+        """
+        if name in self.specs:
+            raise ValueError(f"Device '{name}' registered twice")
+        self.specs[name] = DeviceSpec(name, factory, depends_on, timeout, retries, backoff, required)
+
+    def _check_graph(self):
+        for spec in self.specs.values():
+            for dependency in spec.depends_on:
+                if dependency not in self.specs:
+                    raise ValueError(f"'{spec.name}' depends on unknown device '{dependency}'")
+
+        # Kahn's algorithm: anything left over is on a cycle
+        remaining = {name: set(spec.depends_on) for name, spec in self.specs.items()}
+        while True:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                break
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        if remaining:
+            raise ValueError(f"Dependency cycle between: {', '.join(sorted(remaining))}")
+
+    def run(self):
+        """
+        Bring up every registered device
+
+        Returns:
+            dict: Initialized devices by name
+
+        Raises:
+            BringUpError: If a required device failed, timed out or was
+                          skipped because a dependency failed
+        """
+        self._check_graph()
+        self._t0 = self.clock()
+
+        running = {}      # future -> (spec, deadline)
+        retry_at = {}     # name -> time of next attempt
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='bringup')
+        try:
+            while True:
+                now = self.clock()
+                self._skip_blocked(now)
+
+                for spec in self.specs.values():
+                    if spec.status == 'pending' and self._dependencies_up(spec):
+                        self._launch(executor, spec, running, now)
+                    elif spec.status == 'retrying' and retry_at.get(spec.name, 0) <= now:
+                        del retry_at[spec.name]
+                        self._launch(executor, spec, running, now)
+
+                if not running and not retry_at:
+                    break
+
+                wake_times = [deadline for _, deadline in running.values()] + list(retry_at.values())
+                timeout = max(min(wake_times) - self.clock(), 0)
+                if running:
+                    done, _ = wait(list(running), timeout=timeout, return_when=FIRST_COMPLETED)
+                else:
+                    # Only retries pending: nothing to wait on but the backoff
+                    time.sleep(timeout)
+                    done = ()
+
+                now = self.clock()
+                for future in done:
+                    spec, _ = running.pop(future)
+                    error = future.exception()
+                    if error is None:
+                        self.devices[spec.name] = future.result()
+                        spec.status = 'ok'
+                        spec.finished = now
+                    else:
+                        self._attempt_failed(spec, error, now, retry_at)
+
+                for future, (spec, deadline) in list(running.items()):
+                    if now >= deadline:
+                        # Abandon the attempt; the thread finishes on its own
+                        del running[future]
+                        future.cancel()
+                        self._attempt_failed(spec, TimeoutError(f"timed out after {spec.timeout}s"), now, retry_at)
+        finally:
+            executor.shutdown(wait=False)
+
+        self.logger.info("Bring-up timeline:\n%s", self.format_timeline())
+
+        failed = [
+            spec for spec in self.specs.values()
+            if spec.required and spec.status != 'ok'
+        ]
+        if failed:
+            raise BringUpError(
+                "Required devices not available: " +
+                ", ".join(f"{spec.name} ({spec.status}: {spec.error})" for spec in failed)
+            )
+        return self.devices
+
+    def _dependencies_up(self, spec):
+        return all(self.specs[name].status == 'ok' for name in spec.depends_on)
+
+    def _skip_blocked(self, now):
+        changed = True
+        while changed:
+            changed = False
+            for spec in self.specs.values():
+                if spec.status != 'pending':
+                    continue
+                blocked = [
+                    name for name in spec.depends_on
+                    if self.specs[name].status in ('failed', 'timeout', 'skipped')
+                ]
+                if blocked:
+                    spec.status = 'skipped'
+                    spec.error = f"dependency {', '.join(blocked)} unavailable"
+                    spec.started = spec.finished = now
+                    changed = True
+
+    def _launch(self, executor, spec, running, now):
+        spec.attempts += 1
+        if spec.started is None:
+            spec.started = now
+        spec.status = 'running'
+        dependencies = {name: self.devices[name] for name in spec.depends_on}
+        future = executor.submit(spec.factory, dependencies)
+        running[future] = (spec, now + spec.timeout)
+
+    def _attempt_failed(self, spec, error, now, retry_at):
+        spec.error = error
+        if spec.attempts <= spec.retries:
+            delay = spec.backoff * (2 ** (spec.attempts - 1))
+            delay *= 1 + random.uniform(0, self.jitter)
+            spec.status = 'retrying'
+            retry_at[spec.name] = now + delay
+            self.logger.warning(f"{spec.name}: attempt {spec.attempts} failed ({error}), retrying in {delay:.2f}s")
+        else:
+            spec.status = 'timeout' if isinstance(error, TimeoutError) else 'failed'
+            spec.finished = now
+            log = self.logger.error if spec.required else self.logger.warning
+            log(f"{spec.name}: {spec.status} after {spec.attempts} attempt(s): {error}")
+
+    def timeline(self):
+        """
+        Startup timeline
+
+        Returns:
+            list: One dict per device with start/end offsets (seconds from
+                  the start of bring-up), status, attempts and error
+        """
+        entries = []
+        for spec in self.specs.values():
+            entries.append({
+                'name': spec.name,
+                'status': spec.status,
+                'attempts': spec.attempts,
+                'start': None if spec.started is None else spec.started - self._t0,
+                'end': None if spec.finished is None else spec.finished - self._t0,
+                'error': None if spec.error is None else str(spec.error)
+            })
+        entries.sort(key=lambda entry: (entry['start'] is None, entry['start'] or 0))
+        return entries
+
+    def format_timeline(self, width=40):
+        """
+        Render the timeline as a text Gantt chart
+
+        Args:
+            width (int): Bar width in characters
+
+        Returns:
+            str: One line per device
+        """
+        entries = self.timeline()
+        total = max([entry['end'] or 0 for entry in entries] + [1e-6])
+        lines = []
+        for entry in entries:
+            start = entry['start'] or 0
+            end = entry['end'] if entry['end'] is not None else start
+            begin = int(start / total * width)
+            length = max(int(end / total * width) - begin, 1)
+            bar = ' ' * begin + '#' * length
+            lines.append(
+                f"{entry['name']:<16} |{bar:<{width}}| {start * 1000:7.1f} -> {end * 1000:7.1f} ms "
+                f"{entry['status']} x{entry['attempts']}"
+            )
+        return '\n'.join(lines)
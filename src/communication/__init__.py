@@ -3,85 +3,69 @@ Communication Package Initialization
 
 This module provides a centralized import and initialization 
 for all communication interfaces in the robotic vehicle project.
+
+Importing the package has no side effects: interface classes are loaded
+from their modules on first access, and no port or bus is opened until
+an interface (or the shared manager from get_communication_manager())
+is created.
 """
 
-from .bluetooth_controller import BluetoothController
-from .arduino_interface import ArduinoInterface
-from .can_interface import CANInterface
+import importlib
+import threading
+
+# Public name -> defining submodule, resolved on first access (PEP 562)
+_LAZY_IMPORTS = {
+    'BluetoothController': '.bluetooth_controller',
+    'ArduinoInterface': '.arduino_interface',
+    'CANInterface': '.can_interface',
+    'CommunicationManager': '.manager',
+    'TeleopChannel': '.teleop_channel',
+    'ATCommandEngine': '.at_command',
+    'TelemetryDownlink': '.telemetry_downlink'
+}
 
 # Define which communication modules will be exposed
 __all__ = [
     'BluetoothController', 
     'ArduinoInterface', 
-    'CANInterface'
+    'CANInterface',
+    'CommunicationManager',
+    'TeleopChannel',
+    'ATCommandEngine',
+    'TelemetryDownlink',
+    'get_communication_manager'
 ]
 
-class CommunicationManager:
-    """
-    Centralized manager for handling multiple communication interfaces.
+_manager = None
+_manager_lock = threading.Lock()
+
+def get_communication_manager():
     """
-    def __init__(self):
-        """
-        Initialize communication interfaces.
-        """
-        self.bluetooth = BluetoothController()
-        self.arduino = ArduinoInterface()
-        self.can_bus = CANInterface()
-        
-        # Store all interfaces in a dictionary for easy access
-        self.interfaces = {
-            'bluetooth': self.bluetooth,
-            'arduino': self.arduino,
-            'can': self.can_bus
-        }
+    Return the shared CommunicationManager, creating it on first call.
     
-    def initialize_all(self):
-        """
-        Initialize all communication interfaces.
-        
-        Returns:
-            dict: Status of initialization for each interface
-        """
-        initialization_status = {}
-        
-        for name, interface in self.interfaces.items():
-            try:
-                interface.connect()
-                initialization_status[name] = True
-            except Exception as e:
-                print(f"Error initializing {name} interface: {e}")
-                initialization_status[name] = False
-        
-        return initialization_status
+    Returns:
+        CommunicationManager: The process-wide manager instance
+    """
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                from .manager import CommunicationManager
+                _manager = CommunicationManager()
+    return _manager
+
+def __getattr__(name):
+    if name == 'communication_manager':
+        # Backwards-compatible alias for the old import-time singleton
+        return get_communication_manager()
     
-    def broadcast_message(self, message, interfaces=None):
-        """
-        Broadcast a message across specified or all interfaces.
-        
-        Args:
-            message (str): Message to broadcast
-            interfaces (list, optional): List of interfaces to use. 
-                                        If None, uses all interfaces.
-        """
-        if interfaces is None:
-            interfaces = list(self.interfaces.keys())
-        
-        for name in interfaces:
-            if name in self.interfaces:
-                try:
-                    self.interfaces[name].send(message)
-                except Exception as e:
-                    print(f"Error broadcasting on {name} interface: {e}")
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
     
-    def close_all_connections(self):
-        """
-        Close all communication interface connections.
-        """
-        for interface in self.interfaces.values():
-            try:
-                interface.disconnect()
-            except Exception as e:
-                print(f"Error closing interface: {e}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
 
-# Create a singleton communication manager
-communication_manager = CommunicationManager()
\ No newline at end of file
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
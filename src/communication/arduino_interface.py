@@ -1,7 +1,7 @@
-import serial
 import time
 import json
 import threading
+from .. import hal
 
 class ArduinoInterface:
     def __init__(self, port='/dev/ttyACM0', baudrate=115200, timeout=1):
@@ -12,8 +12,15 @@ class ArduinoInterface:
         :param baudrate: Communication speed
         :param timeout: Serial communication timeout
         """
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        
+        # Link activity and failures, watched by the LinkSupervisor
+        self.rx_count = 0
+        self.error_count = 0
         try:
-            self.serial_conn = serial.Serial(
+            self.serial_conn = hal.open_serial(
                 port=port,
                 baudrate=baudrate,
                 timeout=timeout
@@ -21,10 +28,29 @@ class ArduinoInterface:
             self.is_connected = False
             self._stop_event = threading.Event()
             self.receive_thread = None
-        except serial.SerialException as e:
+        except hal.SerialException as e:
             print(f"Arduino connection error: {e}")
             raise
 
+    def reopen(self):
+        """
+        Close and reopen the serial port, e.g. after USB re-enumeration
+        
+        A running continuous read picks up the new port.
+        
+        :raises hal.SerialException: If the port cannot be opened
+        """
+        try:
+            self.serial_conn.close()
+        except Exception as e:
+            print(f"Arduino close error: {e}")
+        self.serial_conn = hal.open_serial(
+            port=self.port,
+            baudrate=self.baudrate,
+            timeout=self.timeout
+        )
+        self.is_connected = True
+
     def send_command(self, command):
         """
         Send command to Arduino
@@ -39,11 +65,60 @@ class ArduinoInterface:
             
             # Read response
             response = self.serial_conn.readline().decode().strip()
+            if response:
+                self.rx_count += 1
             return json.loads(response) if response else None
         except Exception as e:
+            self.error_count += 1
             print(f"Command sending error: {e}")
             return None
 
+    # Wire format the CommunicationManager encodes messages to for this link
+    WIRE_FORMAT = 'json-line'
+
+    def connect(self):
+        """
+        Mark the link ready (the port is opened in __init__)
+        
+        :return: True if the port is open
+        """
+        self.is_connected = bool(self.serial_conn.is_open)
+        return self.is_connected
+
+    def send(self, payload):
+        """
+        Write an already encoded message
+        
+        Unlike send_data() errors are raised, so the caller can count them.
+        
+        :param payload: Bytes in WIRE_FORMAT
+        """
+        self.serial_conn.write(payload)
+
+    def disconnect(self):
+        """
+        Close the link
+        """
+        self.is_connected = False
+        self.close()
+
+    def _parse_frame(self, line):
+        """
+        Decode one JSON line received from the Arduino
+        
+        :param line: Raw line as read from the serial port
+        :return: Parsed data, or None for a blank or invalid line
+        """
+        # Line noise is not valid UTF-8; let it fail as invalid JSON
+        data = line.decode(errors='replace').strip()
+        if not data:
+            return None
+        try:
+            return json.loads(data)
+        except json.JSONDecodeError:
+            print(f"Invalid JSON: {data}")
+            return None
+
     def start_continuous_read(self, callback):
         """
         Start continuous reading of sensor data
@@ -54,16 +129,14 @@ class ArduinoInterface:
             while not self._stop_event.is_set():
                 try:
                     if self.serial_conn.in_waiting:
-                        data = self.serial_conn.readline().decode().strip()
-                        if data:
-                            try:
-                                parsed_data = json.loads(data)
-                                callback(parsed_data)
-                            except json.JSONDecodeError:
-                                print(f"Invalid JSON: {data}")
+                        parsed_data = self._parse_frame(self.serial_conn.readline())
+                        self.rx_count += 1
+                        if parsed_data is not None:
+                            callback(parsed_data)
                 except Exception as e:
+                    self.error_count += 1
                     print(f"Read thread error: {e}")
-                time.sleep(0.1)
+                hal.sleep(0.1)
 
         # Start reading thread
         self.receive_thread = threading.Thread(target=_read_thread, daemon=True)
@@ -0,0 +1,244 @@
+import logging
+import re
+import threading
+import time
+
+# Final result lines of an AT command
+OK_PATTERN = re.compile(r'^OK')
+ERROR_PATTERN = re.compile(r'^(ERROR|FAIL|\+CME ERROR|\+CMS ERROR)')
+
+logger = logging.getLogger('ATCommandEngine')
+
+class ATCommandError(Exception):
+    """
+    An AT command failed, timed out or answered unexpectedly.
+    """
+
+    def __init__(self, message, response=None):
+        super().__init__(message)
+        self.response = response
+
+class ATResponse:
+    """
+    Result of one AT command.
+    """
+    __slots__ = ('command', 'lines', 'status', 'elapsed')
+
+    def __init__(self, command, lines, status, elapsed):
+        """
+        :param command: Command as sent (without line ending)
+        :param lines: Intermediate response lines
+        :param status: Final line ('OK...', 'ERROR...') or 'TIMEOUT'
+        :param elapsed: Seconds from sending to the final line
+        """
+        self.command = command
+        self.lines = lines
+        self.status = status
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return bool(OK_PATTERN.match(self.status))
+
+    @property
+    def text(self):
+        return '\n'.join(self.lines + [self.status])
+
+    def __repr__(self):
+        return f"ATResponse({self.command!r}, lines={self.lines}, status={self.status!r})"
+
+class ATScan:
+    """
+    Handle of a running device scan; results stream in as they arrive.
+    """
+
+    def __init__(self):
+        self.results = []
+        self.response = None
+        self._done = threading.Event()
+        self._cancel = threading.Event()
+
+    @property
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        """
+        :param timeout: Longest wait (seconds)
+        :return: The devices found, once the scan has finished
+        """
+        self._done.wait(timeout)
+        return list(self.results)
+
+    def cancel(self):
+        self._cancel.set()
+
+class ATCommandEngine:
+    def __init__(self, serial_conn, timeout=1.0, line_ending='\r\n', clock=time.monotonic):
+        """
+        Send AT commands and wait for their final result instead of sleeping
+
+        Each command completes on its terminal OK/ERROR line (HC-06
+        style replies such as 'OKsetname' count as OK), so a batch runs as
+        fast as the module answers and a silent module costs at most the
+        timeout.
+
+        :param serial_conn: Open serial port to the module
+        :param timeout: Default per-command timeout (seconds)
+        :param line_ending: Appended to every command
+        :param clock: Monotonic time source for the timeouts
+        """
+        self.serial_conn = serial_conn
+        self.timeout = timeout
+        self.line_ending = line_ending
+        self.clock = clock
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+
+    def _discard_input(self):
+        # A late reply to a timed-out command must not complete the next one
+        self._buffer.clear()
+        reset = getattr(self.serial_conn, 'reset_input_buffer', None)
+        if reset:
+            reset()
+
+    def _read_line(self, deadline):
+        # Serial reads can return partial lines; keep the rest buffered
+        while True:
+            index = self._buffer.find(b'\n')
+            if index >= 0:
+                line = bytes(self._buffer[:index])
+                del self._buffer[:index + 1]
+                return line.decode(errors='replace').strip()
+            if self.clock() >= deadline:
+                return None
+            self._buffer += self.serial_conn.readline()
+
+    def execute(self, command, timeout=None, expect=None):
+        """
+        Send one command and collect its response
+
+        :param command: AT command, e.g. 'AT+NAME=RoboVehicle'
+        :param timeout: Seconds to wait for the final line
+        :param expect: Optional regex that some response line must match
+        :return: ATResponse
+        :raises ATCommandError: On ERROR, timeout or a failed expectation
+        """
+        timeout = self.timeout if timeout is None else timeout
+        with self._lock:
+            start = self.clock()
+            deadline = start + timeout
+            self._discard_input()
+            self.serial_conn.write((command.strip() + self.line_ending).encode())
+
+            lines = []
+            status = 'TIMEOUT'
+            while True:
+                line = self._read_line(deadline)
+                if line is None:
+                    break
+                if not line or line == command.strip():
+                    continue  # Blank line or command echo
+                if OK_PATTERN.match(line) or ERROR_PATTERN.match(line):
+                    status = line
+                    break
+                lines.append(line)
+
+        response = ATResponse(command.strip(), lines, status, self.clock() - start)
+        if not response.ok:
+            raise ATCommandError(f"{command.strip()}: {status}", response)
+        if expect and not any(re.search(expect, line) for line in lines + [status]):
+            raise ATCommandError(f"{command.strip()}: expected {expect!r}, got {response.text!r}", response)
+        return response
+
+    def run_script(self, script, stop_on_error=True):
+        """
+        Run a batch of commands back to back
+
+        :param script: Commands, each a string or a (command, expect) or
+                       (command, expect, timeout) tuple
+        :param stop_on_error: Raise on the first failure; otherwise record
+                              it and carry on
+        :return: List of ATResponse (failures carry their error status)
+        :raises ATCommandError: On the first failure if stop_on_error
+        """
+        responses = []
+        for step in script:
+            if isinstance(step, str):
+                step = (step,)
+            command, expect, timeout = (tuple(step) + (None, None))[:3]
+            try:
+                responses.append(self.execute(command, timeout=timeout, expect=expect))
+            except ATCommandError as e:
+                if stop_on_error:
+                    raise
+                logger.warning(f"AT script step failed: {e}")
+                responses.append(e.response)
+        return responses
+
+    def scan(self, command='AT+INQ', result_pattern=r'^\+(INQ|INQUIRY|DEV)', duration=10.0,
+             callback=None):
+        """
+        Start a device scan in the background
+
+        Result lines are delivered to the callback (and ATScan.results)
+        the moment the module reports them; the scan ends on the final
+        OK/ERROR, after duration seconds, or on ATScan.cancel().
+
+        :param command: Scan command for the module
+        :param result_pattern: Regex for device result lines
+        :param duration: Longest scan time (seconds)
+        :param callback: Optional callable receiving each result line
+        :return: ATScan handle
+        """
+        handle = ATScan()
+        pattern = re.compile(result_pattern)
+
+        def _scan():
+            with self._lock:
+                start = self.clock()
+                deadline = start + duration
+                status = 'TIMEOUT'
+                try:
+                    self._discard_input()
+                    self.serial_conn.write((command.strip() + self.line_ending).encode())
+                    while not handle._cancel.is_set():
+                        line = self._read_line(min(deadline, self.clock() + 0.1))
+                        if line is None:
+                            if self.clock() >= deadline:
+                                break
+                            continue
+                        if OK_PATTERN.match(line) or ERROR_PATTERN.match(line):
+                            status = line
+                            break
+                        if line != command.strip() and pattern.search(line):
+                            handle.results.append(line)
+                            if callback:
+                                callback(line)
+                except Exception as e:
+                    logger.error(f"Device scan error: {e}")
+                    status = 'ERROR'
+                if handle._cancel.is_set():
+                    status = 'CANCELLED'
+                handle.response = ATResponse(command, list(handle.results), status, self.clock() - start)
+            handle._done.set()
+
+        threading.Thread(target=_scan, name='at-scan', daemon=True).start()
+        return handle
+
+def main():
+    """
+    Example: configure a simulated HC-05 module
+    """
+    from .. import hal
+    sim = hal.use_simulator()
+    replies = {b'AT': b'OK\r\n', b'AT+VERSION?': b'+VERSION:3.0-20170601\r\nOK\r\n'}
+    sim.serial_link('/dev/ttyS0').set_responder(lambda line: replies.get(line.strip(), b'OK\r\n'))
+
+    port = hal.open_serial('/dev/ttyS0', 38400, 0.05)
+    engine = ATCommandEngine(port)
+    for response in engine.run_script(['AT', ('AT+VERSION?', r'VERSION:'), 'AT+NAME=RoboVehicle']):
+        print(f"{response.command}: {response.status} {response.lines} in {response.elapsed * 1000:.2f} ms")
+
+if __name__ == "__main__":
+    main()
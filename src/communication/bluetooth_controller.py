@@ -1,6 +1,7 @@
-import serial
 import time
 import json
+from .. import hal
+from .at_command import ATCommandEngine, ATCommandError
 
 class BluetoothController:
     def __init__(self, port='/dev/ttyS0', baudrate=9600, timeout=1):
@@ -11,51 +12,110 @@ class BluetoothController:
         :param baudrate: Communication speed
         :param timeout: Serial communication timeout
         """
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        
+        # Link activity and failures, watched by the LinkSupervisor
+        self.rx_count = 0
+        self.error_count = 0
         try:
-            self.serial_conn = serial.Serial(
+            self.serial_conn = hal.open_serial(
                 port=port,
                 baudrate=baudrate,
                 timeout=timeout
             )
             self.is_connected = False
-        except serial.SerialException as e:
+            self.at = ATCommandEngine(self.serial_conn, timeout=timeout)
+        except hal.SerialException as e:
             print(f"Bluetooth connection error: {e}")
             raise
 
+    def reopen(self):
+        """
+        Close and reopen the serial port (e.g. after the module reset)
+        
+        :raises hal.SerialException: If the port cannot be opened
+        """
+        try:
+            self.serial_conn.close()
+        except Exception as e:
+            print(f"Bluetooth close error: {e}")
+        self.serial_conn = hal.open_serial(
+            port=self.port,
+            baudrate=self.baudrate,
+            timeout=self.timeout
+        )
+        self.at = ATCommandEngine(self.serial_conn, timeout=self.timeout)
+        self.is_connected = True
+
     def send_command(self, command, wait_time=0.5):
         """
         Send AT command to Bluetooth module
         
+        Returns as soon as the module's final OK/ERROR line arrives.
+        
         :param command: AT command to send
-        :param wait_time: Time to wait for response
+        :param wait_time: Longest time to wait for the response
         :return: Module response
         """
         try:
-            # Ensure command ends with \r\n
-            full_command = command.strip() + '\r\n'
-            self.serial_conn.write(full_command.encode())
-            time.sleep(wait_time)
-            
-            response = self.serial_conn.readline().decode().strip()
-            return response
+            return self.at.execute(command, timeout=wait_time).text
+        except ATCommandError as e:
+            print(f"Command sending error: {e}")
+            return e.response.text if e.response else None
         except Exception as e:
             print(f"Command sending error: {e}")
             return None
 
+    # Module setup; the reset goes last so the module has settled before
+    # the other commands and restarts with the new settings
+    CONFIG_SCRIPT = (
+        ('AT', r'^OK'),                  # Test communication
+        ('AT+ROLE0', r'^OK'),            # Set as slave mode
+        ('AT+NAME=RoboVehicle', r'^OK'), # Set device name
+        ('AT+RESET', r'^OK')             # Reset module
+    )
+
     def configure_module(self):
         """
         Configure Bluetooth module with basic settings
+        
+        :return: List of ATResponse, one per command
+        """
+        responses = self.at.run_script(self.CONFIG_SCRIPT, stop_on_error=False)
+        for response in responses:
+            print(f"Config {response.command}: {response.status}")
+        return responses
+
+    # Wire format the CommunicationManager encodes messages to for this link
+    WIRE_FORMAT = 'json-line'
+
+    def connect(self):
+        """
+        Mark the link ready (the port is opened in __init__)
+        
+        :return: True if the port is open
+        """
+        self.is_connected = bool(self.serial_conn.is_open)
+        return self.is_connected
+
+    def send(self, payload):
         """
-        configurations = [
-            'AT',           # Test communication
-            'AT+ROLE0',     # Set as slave mode
-            'AT+RESET',     # Reset module
-            'AT+NAME=RoboVehicle'  # Set device name
-        ]
+        Write an already encoded message
         
-        for config in configurations:
-            response = self.send_command(config)
-            print(f"Config {config}: {response}")
+        Unlike send_data() errors are raised, so the caller can count them.
+        
+        :param payload: Bytes in WIRE_FORMAT
+        """
+        self.serial_conn.write(payload)
+
+    def disconnect(self):
+        """
+        Close the link
+        """
+        self.is_connected = False
+        self.close()
 
     def send_data(self, data):
         """
@@ -69,6 +129,7 @@ class BluetoothController:
             
             self.serial_conn.write(data.encode())
         except Exception as e:
+            self.error_count += 1
             print(f"Data sending error: {e}")
 
     def receive_data(self, buffer_size=1024):
@@ -81,34 +142,35 @@ class BluetoothController:
         try:
             if self.serial_conn.in_waiting:
                 data = self.serial_conn.read(buffer_size).decode().strip()
+                self.rx_count += 1
                 return data
             return None
         except Exception as e:
+            self.error_count += 1
             print(f"Data receiving error: {e}")
             return None
 
-    def scan_devices(self):
+    def scan_devices(self, duration=5):
         """
         Scan for nearby Bluetooth devices
         
+        Returns when the module reports the inquiry finished, or after
+        duration seconds at the latest.
+        
+        :param duration: Longest scan time in seconds
         :return: List of discovered devices
         """
-        try:
-            devices = []
-            # Send scan command
-            self.send_command('AT+SCAN')
-            
-            # Wait and collect device information
-            time.sleep(5)  # Scan duration
-            while self.serial_conn.in_waiting:
-                device = self.serial_conn.readline().decode().strip()
-                if device:
-                    devices.append(device)
-            
-            return devices
-        except Exception as e:
-            print(f"Device scanning error: {e}")
-            return []
+        return self.scan_devices_async(duration=duration).wait(duration + self.at.timeout)
+
+    def scan_devices_async(self, callback=None, duration=5):
+        """
+        Start a device scan that streams results as they arrive
+        
+        :param callback: Optional function called with each device line
+        :param duration: Longest scan time in seconds
+        :return: ATScan handle (results, wait(), cancel())
+        """
+        return self.at.scan(command='AT+SCAN', result_pattern=r'\S', duration=duration, callback=callback)
 
     def close(self):
         """
@@ -1,33 +1,71 @@
-import can
 import threading
 import time
 import json
 import logging
+from collections import deque
+from .. import hal
 
 class CANInterface:
-    def __init__(self, channel='can0', bitrate=500000):
+    def __init__(self, channel='can0', bitrate=500000, max_queue=1000):
         """
         Initialize CAN Bus Interface
         
         :param channel: CAN bus channel
         :param bitrate: Communication speed
+        :param max_queue: Received messages kept until get_messages();
+                          the oldest are dropped once it is full
         """
+        self.channel = channel
+        self.bitrate = bitrate
+        self._filters = None
+        
+        # Link activity and failures, watched by the LinkSupervisor
+        self.rx_count = 0
+        self.error_count = 0
         try:
-            # Configure logging
-            logging.basicConfig(level=logging.INFO)
             self.logger = logging.getLogger('CAN_Interface')
             
             # Create CAN bus interface
-            self.bus = can.interface.Bus(channel=channel, bustype='socketcan', bitrate=bitrate)
+            self.bus = hal.open_can_bus(channel, bitrate)
             
             # Message queues and threads
-            self.receive_queue = []
+            self.receive_queue = deque(maxlen=max_queue)
+            self.dropped_messages = 0
             self._stop_event = threading.Event()
             self.receive_thread = None
         except Exception as e:
             self.logger.error(f"CAN bus initialization error: {e}")
             raise
 
+    def reopen(self):
+        """
+        Shut down and reopen the bus (e.g. to recover from bus-off)
+        
+        A running listener picks up the new bus; filters are restored.
+        
+        :raises hal.CANError: If the bus cannot be opened
+        """
+        try:
+            self.bus.shutdown()
+        except Exception as e:
+            self.logger.error(f"CAN bus shutdown error: {e}")
+        self.bus = hal.open_can_bus(self.channel, self.bitrate)
+        if self._filters:
+            self.bus.set_filters(self._filters)
+
+    def bus_state(self):
+        """
+        Controller state reported by the driver
+        
+        :return: 'ACTIVE', 'PASSIVE' or 'ERROR' (bus-off); 'ACTIVE' if
+                 the driver does not report it
+        """
+        try:
+            state = self.bus.state
+        except (AttributeError, NotImplementedError):
+            return 'ACTIVE'
+        return getattr(state, 'name', str(state)).upper()
+
     def send_message(self, arbitration_id, data):
         """
         Send message on CAN bus
@@ -41,12 +79,41 @@ class CANInterface:
                 data = self._dict_to_bytes(data)
             
             # Create and send CAN message
-            message = can.Message(arbitration_id=arbitration_id, data=data)
+            message = hal.can_message(arbitration_id, data)
             self.bus.send(message)
             self.logger.info(f"Sent CAN message: {message}")
         except Exception as e:
+            self.error_count += 1
             self.logger.error(f"CAN message sending error: {e}")
 
+    # Wire format the CommunicationManager encodes messages to for this bus
+    WIRE_FORMAT = 'can'
+
+    def connect(self):
+        """
+        Mark the bus ready (it is opened in __init__)
+        
+        :return: True
+        """
+        return True
+
+    def send(self, frame):
+        """
+        Send an already encoded frame
+        
+        Unlike send_message() errors are raised, so the caller can count them.
+        
+        :param frame: (arbitration_id, data bytes) tuple
+        """
+        arbitration_id, data = frame
+        self.bus.send(hal.can_message(arbitration_id, data))
+
+    def disconnect(self):
+        """
+        Close the bus
+        """
+        self.close()
+
     def _dict_to_bytes(self, data):
         """
         Convert dictionary to byte representation
@@ -67,29 +134,41 @@ class CANInterface:
         def _listener_thread():
             # Set up optional filters
             if filter_ids:
-                bus_filters = [{"can_id": id, "can_mask": 0x7FF, "extended": False} for id in filter_ids]
-                self.bus.set_filters(bus_filters)
+                self._filters = [{"can_id": id, "can_mask": 0x7FF, "extended": False} for id in filter_ids]
+                self.bus.set_filters(self._filters)
 
             while not self._stop_event.is_set():
                 try:
                     message = self.bus.recv(timeout=1.0)
                     if message:
-                        # Process message
-                        processed_msg = self._process_message(message)
-                        
-                        # Store in queue
-                        self.receive_queue.append(processed_msg)
-                        
-                        # Call callback if provided
-                        if callback:
-                            callback(processed_msg)
+                        self._dispatch(message, callback)
                 except Exception as e:
+                    self.error_count += 1
                     self.logger.error(f"CAN listening error: {e}")
 
         # Start listener thread
         self.receive_thread = threading.Thread(target=_listener_thread, daemon=True)
         self.receive_thread.start()
 
+    def _dispatch(self, message, callback=None):
+        """
+        Decode a received frame, queue it and hand it to the callback
+        
+        :param message: Received CAN message
+        :param callback: Optional callback function
+        """
+        processed_msg = self._process_message(message)
+        self.rx_count += 1
+        
+        # Store in queue, evicting the oldest message when full
+        if len(self.receive_queue) == self.receive_queue.maxlen:
+            self.dropped_messages += 1
+        self.receive_queue.append(processed_msg)
+        
+        # Call callback if provided
+        if callback:
+            callback(processed_msg)
+
     def _process_message(self, message):
         """
         Process received CAN message
@@ -118,9 +197,13 @@ class CANInterface:
         :param clear: Clear queue after retrieval
         :return: List of received messages
         """
-        messages = self.receive_queue.copy()
-        if clear:
-            self.receive_queue.clear()
+        if not clear:
+            return list(self.receive_queue)
+        
+        # Pop one at a time so messages arriving meanwhile are not lost
+        messages = []
+        while self.receive_queue:
+            messages.append(self.receive_queue.popleft())
         return messages
 
     def diagnostic_check(self):
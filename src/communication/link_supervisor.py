@@ -0,0 +1,298 @@
+import logging
+import random
+import threading
+from .. import hal
+
+# Link states
+LINK_UP = 'up'
+LINK_STALLED = 'stalled'
+LINK_ERRORS = 'errors'
+LINK_BUS_OFF = 'bus_off'
+LINK_DOWN = 'down'
+
+# Health sample for a check that saw some errors below the threshold
+ERROR_SAMPLE = 0.5
+
+def default_activity(interface):
+    """
+    Receive counter of an interface (0 if it does not keep one)
+    """
+    return getattr(interface, 'rx_count', 0)
+
+class SupervisedLink:
+    def __init__(self, name, interface=None, factory=None, stall_timeout=None,
+                 error_threshold=3, activity=default_activity):
+        """
+        Supervision state of one communication interface
+
+        :param name: Link name
+        :param interface: Connected interface, or None if it could not be created
+        :param factory: Callable creating a new interface; used when there
+                        is none yet or it has no reopen()
+        :param stall_timeout: Seconds without receive activity that count
+                              as a stall (None: the link may be quiet)
+        :param error_threshold: New errors within one check that trigger a reconnect
+        :param activity: Callable(interface) returning a receive counter
+        """
+        self.name = name
+        self.interface = interface
+        self.factory = factory
+        self.stall_timeout = stall_timeout
+        self.error_threshold = error_threshold
+        self.activity = activity
+        self.callbacks = []
+
+        self.state = LINK_UP if interface is not None else LINK_DOWN
+        self.health = 1.0 if interface is not None else 0.0
+        self.last_rx = None
+        self.last_activity = None
+        self.last_errors = None
+        self.failures = 0
+        self.next_attempt = 0.0
+        self.reconnects = 0
+        self.last_error = None
+
+    def status(self):
+        """
+        :return: Dict with state, health, reconnects and the last error
+        """
+        return {
+            'state': self.state,
+            'health': round(self.health, 3),
+            'reconnects': self.reconnects,
+            'failures': self.failures,
+            'last_error': self.last_error
+        }
+
+class LinkSupervisor:
+    def __init__(self, check_interval=0.1, backoff=0.5, max_backoff=30.0, jitter=0.2,
+                 health_alpha=0.1, clock=hal.monotonic):
+        """
+        Watch communication links and reconnect them in the background
+
+        Each check looks for a closed port, a bus-off CAN controller,
+        bursts of errors and, for links with a stall timeout, receive
+        silence. A failed link is reopened (or rebuilt by its factory)
+        from the supervisor thread with jittered exponential backoff,
+        so the control loop never waits on it. Every link keeps an
+        exponentially weighted health score between 0 and 1.
+
+        :param check_interval: Seconds between checks
+        :param backoff: First retry delay (seconds), doubled per failure
+        :param max_backoff: Longest retry delay (seconds)
+        :param jitter: Random fraction added to each retry delay
+        :param health_alpha: Weight of each check in the health score
+        :param clock: Monotonic time source in seconds
+        """
+        self.check_interval = check_interval
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.health_alpha = health_alpha
+        self.clock = clock
+        self.links = {}
+        self.logger = logging.getLogger('LinkSupervisor')
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def add_link(self, name, interface=None, factory=None, stall_timeout=None,
+                 error_threshold=3, activity=default_activity, on_reconnect=None):
+        """
+        Supervise a link
+
+        :param name: Link name
+        :param interface: Connected interface, or None if bring-up failed
+        :param factory: Callable creating a new interface
+        :param stall_timeout: Seconds without receive activity that count as a stall
+        :param error_threshold: New errors within one check that trigger a reconnect
+        :param activity: Callable(interface) returning a receive counter
+        :param on_reconnect: Optional callable(interface) run after each reconnect
+        :return: SupervisedLink
+        """
+        if interface is None and factory is None:
+            raise ValueError(f"Link {name}: needs an interface or a factory")
+        link = SupervisedLink(name, interface, factory, stall_timeout, error_threshold, activity)
+        if on_reconnect:
+            link.callbacks.append(on_reconnect)
+        self._reset_counters(link, self.clock())
+        with self._lock:
+            self.links[name] = link
+        return link
+
+    def _reset_counters(self, link, now):
+        link.last_activity = now
+        if link.interface is not None:
+            link.last_rx = link.activity(link.interface)
+            link.last_errors = getattr(link.interface, 'error_count', 0)
+
+    def _diagnose(self, link, now):
+        """
+        :return: (state, health sample) for one check of a connected link
+        """
+        interface = link.interface
+        serial_conn = getattr(interface, 'serial_conn', None)
+        if serial_conn is not None and not serial_conn.is_open:
+            return LINK_DOWN, 0.0
+        bus_state = getattr(interface, 'bus_state', None)
+        if bus_state is not None and bus_state() == 'ERROR':
+            return LINK_BUS_OFF, 0.0
+
+        rx = link.activity(interface)
+        if rx != link.last_rx:
+            link.last_rx = rx
+            link.last_activity = now
+            link.failures = 0
+        elif link.stall_timeout is not None and now - link.last_activity > link.stall_timeout:
+            return LINK_STALLED, 0.0
+
+        errors = getattr(interface, 'error_count', 0)
+        new_errors = errors - link.last_errors
+        link.last_errors = errors
+        if new_errors >= link.error_threshold:
+            return LINK_ERRORS, 0.0
+        return LINK_UP, ERROR_SAMPLE if new_errors else 1.0
+
+    def check(self, now=None):
+        """
+        Run one supervision pass over every link
+
+        :param now: Optional timestamp (monotonic seconds)
+        """
+        if now is None:
+            now = self.clock()
+        with self._lock:
+            links = list(self.links.values())
+
+        for link in links:
+            if link.interface is None:
+                state, sample = LINK_DOWN, 0.0
+            else:
+                state, sample = self._diagnose(link, now)
+            if state != link.state:
+                log = self.logger.info if state == LINK_UP else self.logger.warning
+                log(f"Link {link.name}: {link.state} -> {state}")
+                link.state = state
+
+            if state != LINK_UP and now >= link.next_attempt and self._reconnect(link, now):
+                # A fresh link starts out unproven rather than failed
+                sample = ERROR_SAMPLE
+            link.health += self.health_alpha * (sample - link.health)
+
+    def _reconnect(self, link, now):
+        """
+        One reconnect attempt; schedules the next with backoff
+
+        :return: True if the link was reopened
+        """
+        link.failures += 1
+        delay = min(self.max_backoff, self.backoff * (2 ** (link.failures - 1)))
+        delay *= 1 + random.uniform(0, self.jitter)
+        link.next_attempt = now + delay
+        try:
+            interface = link.interface
+            if interface is not None and hasattr(interface, 'reopen'):
+                interface.reopen()
+            elif link.factory is not None:
+                if interface is not None:
+                    try:
+                        interface.close()
+                    except Exception as e:
+                        self.logger.warning(f"Link {link.name}: close failed: {e}")
+                link.interface = link.factory()
+            else:
+                raise RuntimeError("no reopen() and no factory")
+        except Exception as e:
+            link.last_error = str(e)
+            self.logger.warning(
+                f"Link {link.name}: reconnect attempt {link.failures} failed ({e}), "
+                f"retrying in {delay:.2f}s"
+            )
+            return False
+
+        self._reset_counters(link, now)
+        state, _ = self._diagnose(link, now)
+        if state != LINK_UP:
+            # Reopened, but the fault is still there (e.g. bus-off persists)
+            link.last_error = f"still {state} after reopen"
+            self.logger.warning(f"Link {link.name}: {link.last_error}, retrying in {delay:.2f}s")
+            return False
+
+        link.reconnects += 1
+        link.state = LINK_UP
+        if link.stall_timeout is None:
+            link.failures = 0
+        self.logger.info(f"Link {link.name}: reconnected")
+        for callback in link.callbacks:
+            try:
+                callback(link.interface)
+            except Exception as e:
+                self.logger.error(f"Link {link.name}: reconnect callback failed: {e}")
+        return True
+
+    def health(self, name=None):
+        """
+        :param name: Optional link name
+        :return: Health of that link (0 to 1), or a dict of all links
+        """
+        if name is not None:
+            return self.links[name].health
+        return {link_name: link.health for link_name, link in self.links.items()}
+
+    def status(self):
+        """
+        :return: Dict of link name -> status dict
+        """
+        return {name: link.status() for name, link in self.links.items()}
+
+    def start(self):
+        """
+        Start the supervisor thread
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='link-supervisor', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop_event.wait(self.check_interval):
+            try:
+                self.check()
+            except Exception as e:
+                self.logger.error(f"Link supervision error: {e}")
+
+    def stop(self):
+        """
+        Stop the supervisor thread
+        """
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+def main():
+    """
+    Example: recover an Arduino link whose port went away
+    """
+    from .arduino_interface import ArduinoInterface
+
+    logging.basicConfig(level=logging.INFO)
+    sim = hal.use_simulator()
+    arduino = ArduinoInterface(timeout=0.05)
+    supervisor = LinkSupervisor(check_interval=0.05)
+    supervisor.add_link('arduino', arduino, stall_timeout=0.2)
+
+    device = sim.serial_device('/dev/ttyACM0')
+    for step in range(10):
+        if step != 4:
+            device.write(b'{"temperature": 21.5}\n')
+            arduino.send_command({'type': 'ping'})
+        if step == 6:
+            arduino.serial_conn.close()
+        sim.clock.advance(0.1)
+        supervisor.check()
+        print(step, supervisor.status()['arduino'])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,485 @@
+import json
+import logging
+import struct
+import threading
+import time
+from collections import deque
+from ..instrumentation import LatencyHistogram
+
+logger = logging.getLogger('CommunicationManager')
+
+class Topic:
+    """
+    A named message type with an optional payload schema.
+    """
+    __slots__ = ('name', 'fields', 'can_id', 'can_format', 'destinations')
+
+    def __init__(self, name, fields=None, can_id=None, can_format=None, destinations=None):
+        """
+        Args:
+            name (str): Topic name, e.g. 'vehicle.status'
+            fields (dict, optional): Payload field name -> type (or tuple
+                                     of types); None accepts any payload
+            can_id (int, optional): Arbitration ID; topics without one are
+                                    not sent on CAN
+            can_format (str, optional): struct format packing the fields,
+                                        in schema order, into the CAN frame
+            destinations (list, optional): Default interface names; None
+                                           means every interface
+        """
+        if can_format and not fields:
+            raise ValueError(f"Topic {name}: can_format needs a field schema")
+        self.name = name
+        self.fields = fields
+        self.can_id = can_id
+        self.can_format = struct.Struct('<' + can_format) if can_format else None
+        self.destinations = tuple(destinations) if destinations is not None else None
+
+    def validate(self, payload):
+        """
+        Check a payload against the schema
+
+        Args:
+            payload: Message payload
+
+        Raises:
+            TypeError: If a field is missing, unknown or of the wrong type
+        """
+        if self.fields is None:
+            return
+        if not isinstance(payload, dict):
+            raise TypeError(f"{self.name}: payload must be a dict, got {type(payload).__name__}")
+        for name, kind in self.fields.items():
+            if name not in payload:
+                raise TypeError(f"{self.name}: missing field '{name}'")
+            if not isinstance(payload[name], kind):
+                raise TypeError(f"{self.name}.{name}: expected {kind}, got {type(payload[name]).__name__}")
+        unknown = set(payload) - set(self.fields)
+        if unknown:
+            raise TypeError(f"{self.name}: unknown fields {sorted(unknown)}")
+
+class Message:
+    """
+    One published message; caches its encoding per wire format.
+    """
+    __slots__ = ('topic', 'payload', 'published', '_wire', '_lock')
+
+    def __init__(self, topic, payload, published):
+        self.topic = topic
+        self.payload = payload
+        self.published = published
+        self._wire = {}
+        self._lock = threading.Lock()
+
+    def encoded(self, wire_format, codec, counters=None):
+        """
+        Encoding of this message, computed by the first destination that
+        needs it and shared with every other destination of the same format
+
+        Args:
+            wire_format (str): Codec name
+            codec (callable): Function (topic, payload) -> wire data
+            counters (dict, optional): Encode counts by wire format
+
+        Returns:
+            Wire data
+        """
+        wire = self._wire.get(wire_format)
+        if wire is None:
+            with self._lock:
+                wire = self._wire.get(wire_format)
+                if wire is None:
+                    wire = codec(self.topic, self.payload)
+                    self._wire[wire_format] = wire
+                    if counters is not None:
+                        counters[wire_format] = counters.get(wire_format, 0) + 1
+        return wire
+
+def encode_json_line(topic, payload):
+    """
+    Newline-terminated compact JSON, for the serial links
+
+    Returns:
+        bytes: Encoded message
+    """
+    return (json.dumps({'topic': topic.name, 'data': payload}, separators=(',', ':')) + '\n').encode()
+
+def encode_can(topic, payload):
+    """
+    Single CAN frame: struct-packed fields when the topic defines a
+    format, otherwise the first 8 bytes of the JSON payload (as
+    CANInterface.send_message does for dicts)
+
+    Returns:
+        tuple: (arbitration_id, data bytes), or None if the topic has no
+               arbitration ID
+    """
+    if topic.can_id is None:
+        return None
+    if topic.can_format is not None:
+        data = topic.can_format.pack(*(payload[name] for name in topic.fields))
+    else:
+        data = json.dumps(payload, separators=(',', ':')).encode()[:8]
+    return topic.can_id, data
+
+def deliver_local(subscribers):
+    """
+    Codec-less sender that hands messages to in-process subscribers
+    """
+    def _send(message):
+        for callback in subscribers.get(message.topic.name, ()):
+            callback(message.topic.name, message.payload)
+    return _send
+
+# Wire format name -> codec
+CODECS = {
+    'json-line': encode_json_line,
+    'can': encode_can
+}
+
+class DestinationWorker:
+    def __init__(self, name, send, wire_format=None, codec=None, max_queue=100,
+                 encode_counters=None):
+        """
+        Outbound queue and sender thread for one destination
+
+        The queue is bounded; when it is full the oldest message is
+        dropped, so a stalled link never blocks publishers or grows
+        without limit.
+
+        Args:
+            name (str): Destination name
+            send (callable): Writes one encoded message (raises on failure)
+            wire_format (str, optional): Codec name; None passes the
+                                         Message itself to send
+            codec (callable, optional): Encoder for wire_format
+            max_queue (int): Messages held before the oldest is dropped
+            encode_counters (dict, optional): Shared encode counts
+        """
+        self.name = name
+        self.send = send
+        self.wire_format = wire_format
+        self.codec = codec
+        self.encode_counters = encode_counters
+        self.queue = deque(maxlen=max_queue)
+        self.latency = LatencyHistogram(f'comm.{name}.delivery')
+        self.counts = {'queued': 0, 'sent': 0, 'failed': 0, 'dropped': 0, 'skipped': 0}
+        self.max_depth = 0
+        self.last_error = None
+        self._condition = threading.Condition()
+        self._stop = False
+        self._thread = None
+
+    def enqueue(self, message):
+        with self._condition:
+            if len(self.queue) == self.queue.maxlen:
+                self.counts['dropped'] += 1
+            self.queue.append(message)
+            self.counts['queued'] += 1
+            self.max_depth = max(self.max_depth, len(self.queue))
+            self._condition.notify()
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name=f'comm-{self.name}', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self.queue and not self._stop:
+                    self._condition.wait()
+                if not self.queue:
+                    return
+                message = self.queue.popleft()
+            self.deliver(message)
+
+    def deliver(self, message):
+        """
+        Encode (or reuse the cached encoding) and send one message
+
+        Args:
+            message (Message): Message to send
+        """
+        try:
+            if self.wire_format is None:
+                self.send(message)
+            else:
+                wire = message.encoded(self.wire_format, self.codec, self.encode_counters)
+                if wire is None:
+                    self.counts['skipped'] += 1
+                    return
+                self.send(wire)
+            self.counts['sent'] += 1
+            self.latency.record(time.perf_counter() - message.published)
+        except Exception as e:
+            self.counts['failed'] += 1
+            self.last_error = str(e)
+            logger.error(f"Error sending on {self.name} interface: {e}")
+
+    def stop(self, timeout=1.0):
+        """
+        Stop after the queued messages have been sent
+
+        Args:
+            timeout (float): Longest wait for the queue to drain
+        """
+        with self._condition:
+            self._stop = True
+            self._condition.notify()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def metrics(self):
+        """
+        Returns:
+            dict: Delivery counts, queue depth and latency snapshot
+        """
+        metrics = dict(self.counts)
+        metrics['queue_depth'] = len(self.queue)
+        metrics['max_queue_depth'] = self.max_depth
+        metrics['last_error'] = self.last_error
+        metrics['latency'] = self.latency.snapshot()
+        return metrics
+
+class CommunicationManager:
+    """
+    In-process publish/subscribe bus over the communication interfaces.
+
+    Publishing validates the payload against its topic and queues it for
+    each destination; every interface has its own bounded queue and
+    sender thread, so a slow Bluetooth write never delays CAN. A message
+    is encoded at most once per wire format, however many interfaces
+    share that format.
+    """
+    # Topic for broadcast_message()
+    BROADCAST_TOPIC = 'broadcast'
+    BROADCAST_CAN_ID = 0x701
+
+    def __init__(self, interfaces=None, max_queue=100):
+        """
+        Initialize communication interfaces.
+
+        Args:
+            interfaces (dict, optional): Interface name -> connected
+                                         interface; by default the
+                                         Bluetooth, Arduino and CAN
+                                         interfaces are opened here
+            max_queue (int): Outbound queue length per interface
+        """
+        if interfaces is None:
+            from .bluetooth_controller import BluetoothController
+            from .arduino_interface import ArduinoInterface
+            from .can_interface import CANInterface
+
+            self.bluetooth = BluetoothController()
+            self.arduino = ArduinoInterface()
+            self.can_bus = CANInterface()
+            interfaces = {
+                'bluetooth': self.bluetooth,
+                'arduino': self.arduino,
+                'can': self.can_bus
+            }
+
+        # Store all interfaces in a dictionary for easy access
+        self.interfaces = dict(interfaces)
+        self.max_queue = max_queue
+        self.topics = {}
+        self.subscribers = {}
+        self.encode_counts = {}
+        self._lock = threading.Lock()
+
+        self.workers = {}
+        for name, interface in self.interfaces.items():
+            wire_format = getattr(interface, 'WIRE_FORMAT', 'json-line')
+            self.workers[name] = DestinationWorker(
+                name, interface.send, wire_format, CODECS[wire_format], max_queue, self.encode_counts
+            )
+        self.local = DestinationWorker('local', deliver_local(self.subscribers), max_queue=max_queue)
+
+        self.register_topic(self.BROADCAST_TOPIC, can_id=self.BROADCAST_CAN_ID)
+
+    def register_topic(self, name, fields=None, can_id=None, can_format=None, destinations=None):
+        """
+        Add a message type to the registry
+
+        Args:
+            name (str): Topic name
+            fields (dict, optional): Field name -> type
+            can_id (int, optional): Arbitration ID for CAN
+            can_format (str, optional): struct format for the CAN frame
+            destinations (list, optional): Default interface names
+
+        Returns:
+            Topic: The registered topic
+
+        Raises:
+            ValueError: If the topic exists with a different definition
+                        or names an unknown interface
+        """
+        topic = Topic(name, fields, can_id, can_format, destinations)
+        for destination in topic.destinations or ():
+            if destination not in self.interfaces:
+                raise ValueError(f"Topic {name}: unknown interface '{destination}'")
+        with self._lock:
+            existing = self.topics.get(name)
+            if existing is not None:
+                if (existing.fields, existing.can_id, existing.destinations) != (topic.fields, topic.can_id, topic.destinations):
+                    raise ValueError(f"Topic {name} already registered with a different definition")
+                return existing
+            self.topics[name] = topic
+        return topic
+
+    def subscribe(self, topic, callback):
+        """
+        Receive a topic in-process
+
+        Callbacks run on the bus's local delivery thread.
+
+        Args:
+            topic (str): Topic name
+            callback (callable): Called with (topic, payload)
+        """
+        if topic not in self.topics:
+            raise KeyError(f"Unknown topic: {topic}")
+        with self._lock:
+            self.subscribers[topic] = self.subscribers.get(topic, ()) + (callback,)
+        self.local.start()
+
+    def publish(self, topic, payload, destinations=None):
+        """
+        Queue a message for its destinations and local subscribers
+
+        Returns without waiting for any interface.
+
+        Args:
+            topic (str): Registered topic name
+            payload: Message payload (checked against the topic schema)
+            destinations (list, optional): Interface names; defaults to
+                                           the topic's, then to all
+
+        Returns:
+            int: Number of interfaces the message was queued for
+
+        Raises:
+            KeyError: If the topic is not registered
+            TypeError: If the payload does not match the topic schema
+        """
+        definition = self.topics.get(topic)
+        if definition is None:
+            raise KeyError(f"Unknown topic: {topic}")
+        definition.validate(payload)
+
+        message = Message(definition, payload, time.perf_counter())
+        if destinations is None:
+            destinations = definition.destinations
+        if destinations is None:
+            destinations = self.workers.keys()
+
+        queued = 0
+        for name in destinations:
+            worker = self.workers.get(name)
+            if worker is not None:
+                worker.enqueue(message)
+                queued += 1
+        if topic in self.subscribers:
+            self.local.enqueue(message)
+        return queued
+
+    def initialize_all(self):
+        """
+        Initialize all communication interfaces.
+
+        Connects each interface and starts its sender thread.
+
+        Returns:
+            dict: Status of initialization for each interface
+        """
+        initialization_status = {}
+
+        for name, interface in self.interfaces.items():
+            try:
+                initialization_status[name] = interface.connect() is not False
+                self.workers[name].start()
+            except Exception as e:
+                logger.error(f"Error initializing {name} interface: {e}")
+                initialization_status[name] = False
+
+        return initialization_status
+
+    def broadcast_message(self, message, interfaces=None):
+        """
+        Broadcast a message across specified or all interfaces.
+
+        Args:
+            message (str): Message to broadcast
+            interfaces (list, optional): List of interfaces to use.
+                                        If None, uses all interfaces.
+
+        Returns:
+            int: Number of interfaces the message was queued for
+        """
+        return self.publish(self.BROADCAST_TOPIC, message, interfaces)
+
+    def metrics(self):
+        """
+        Delivery metrics per interface
+
+        Returns:
+            dict: Interface name -> counts, queue depth and latency
+        """
+        metrics = {name: worker.metrics() for name, worker in self.workers.items()}
+        metrics['local'] = self.local.metrics()
+        metrics['encodes'] = dict(self.encode_counts)
+        return metrics
+
+    def close_all_connections(self, timeout=1.0):
+        """
+        Close all communication interface connections.
+
+        Queued messages get up to timeout seconds per interface to go out.
+
+        Args:
+            timeout (float): Longest drain time per interface
+        """
+        self.local.stop(timeout)
+        for worker in self.workers.values():
+            worker.stop(timeout)
+        for interface in self.interfaces.values():
+            try:
+                interface.disconnect()
+            except Exception as e:
+                logger.error(f"Error closing interface: {e}")
+
+def main():
+    """
+    Example: fan a status topic out over simulated links
+    """
+    from .. import hal
+    from .bluetooth_controller import BluetoothController
+    from .arduino_interface import ArduinoInterface
+    from .can_interface import CANInterface
+
+    hal.use_simulator()
+    manager = CommunicationManager({
+        'bluetooth': BluetoothController(timeout=0.05),
+        'arduino': ArduinoInterface(timeout=0.05),
+        'can': CANInterface()
+    })
+    manager.register_topic('vehicle.speed', {'left': float, 'right': float}, can_id=0x120, can_format='ff')
+    manager.subscribe('vehicle.speed', lambda topic, payload: print(f"local {topic}: {payload}"))
+    manager.initialize_all()
+
+    for step in range(100):
+        manager.publish('vehicle.speed', {'left': step * 0.01, 'right': step * 0.01})
+    manager.broadcast_message('hello')
+    manager.close_all_connections()
+
+    for name, metrics in manager.metrics().items():
+        print(name, metrics)
+
+if __name__ == "__main__":
+    main()
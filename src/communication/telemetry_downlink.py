@@ -0,0 +1,380 @@
+import logging
+import struct
+import threading
+import time
+from .. import hal
+from .teleop_channel import crc8
+
+# Frame: sync (2) | length u8 | kind u8 | seq u16 | (field id u8, value)* | crc8 (1)
+# The length counts the bytes from kind to the last field; the CRC
+# covers length through the last field.
+SYNC = b'\x5a\xa5'
+HEADER = struct.Struct('<BBH')
+FRAME_OVERHEAD = len(SYNC) + HEADER.size + 1
+MAX_BODY = 255 - (HEADER.size - 1)
+
+# Keyframes carry every field; deltas only the fields that changed
+KIND_KEYFRAME = 1
+KIND_DELTA = 2
+
+# Field priorities: safety fields go out in every frame they change,
+# lower priorities are trimmed first when the link is short of bandwidth
+PRIORITY_SAFETY = 0
+PRIORITY_STATUS = 1
+PRIORITY_DIAGNOSTIC = 2
+
+# Bits of the 'flags' field
+FLAG_ESTOP = 0x01
+FLAG_UNSTABLE = 0x02
+FLAG_LINK_LOST = 0x04
+FLAG_DEGRADED = 0x08
+
+logger = logging.getLogger('TelemetryDownlink')
+
+class DownlinkField:
+    """
+    One telemetry value and its wire encoding.
+    """
+    __slots__ = ('field_id', 'name', 'fmt', 'scale', 'priority', 'minimum', 'maximum')
+
+    # Integer range of each wire format
+    RANGES = {'B': (0, 0xFF), 'H': (0, 0xFFFF), 'h': (-0x8000, 0x7FFF)}
+
+    def __init__(self, field_id, name, fmt='h', scale=1, priority=PRIORITY_STATUS):
+        """
+        :param field_id: Wire identifier (0-255)
+        :param name: Key in the published status dict
+        :param fmt: struct format of the value ('B', 'H' or 'h')
+        :param scale: Multiplier before rounding (e.g. 1000 for milli-units)
+        :param priority: PRIORITY_SAFETY, PRIORITY_STATUS or PRIORITY_DIAGNOSTIC
+        """
+        self.field_id = field_id
+        self.name = name
+        self.fmt = struct.Struct('<B' + fmt)
+        self.scale = scale
+        self.priority = priority
+        self.minimum, self.maximum = self.RANGES[fmt]
+
+    @property
+    def size(self):
+        return self.fmt.size
+
+    def quantize(self, value):
+        """
+        :param value: Engineering value
+        :return: Wire integer, clamped to the format's range
+        """
+        return max(self.minimum, min(self.maximum, int(round(value * self.scale))))
+
+# Status published by the vehicle; see VehicleController.downlink_status()
+DOWNLINK_FIELDS = (
+    DownlinkField(1, 'flags', 'B', priority=PRIORITY_SAFETY),
+    DownlinkField(2, 'teleop_seq', 'H', priority=PRIORITY_SAFETY),
+    DownlinkField(3, 'left_command', 'h', 100),
+    DownlinkField(4, 'right_command', 'h', 100),
+    DownlinkField(5, 'left_speed', 'h', 1000),
+    DownlinkField(6, 'right_speed', 'h', 1000),
+    DownlinkField(7, 'ax', 'h', 1000, PRIORITY_DIAGNOSTIC),
+    DownlinkField(8, 'ay', 'h', 1000, PRIORITY_DIAGNOSTIC),
+    DownlinkField(9, 'az', 'h', 1000, PRIORITY_DIAGNOSTIC),
+    DownlinkField(10, 'gx', 'h', 10, PRIORITY_DIAGNOSTIC),
+    DownlinkField(11, 'gy', 'h', 10, PRIORITY_DIAGNOSTIC),
+    DownlinkField(12, 'gz', 'h', 10, PRIORITY_DIAGNOSTIC)
+)
+
+class DownlinkEncoder:
+    def __init__(self, fields=DOWNLINK_FIELDS):
+        """
+        Packs status values into keyframes and delta frames
+
+        Values are quantized to small integers; a delta frame carries
+        only the fields whose wire value differs from what the receiver
+        already has.
+
+        :param fields: DownlinkField definitions shared with the receiver
+        """
+        self.fields = tuple(sorted(fields, key=lambda field: (field.priority, field.field_id)))
+        self.by_name = {field.name: field for field in self.fields}
+        self.sent = {}
+        self.seq = 0
+
+    def encode(self, values, budget=MAX_BODY, keyframe=False):
+        """
+        Build the next frame
+
+        Fields are packed in priority order until the byte budget is
+        used up; safety fields are always included. Fields left out stay
+        pending and go in a later frame.
+
+        :param values: Latest engineering values by field name
+        :param budget: Largest frame size in bytes
+        :param keyframe: Send every field, not only the changed ones
+        :return: (frame bytes or None if nothing changed, fields left out)
+        """
+        room = min(budget - FRAME_OVERHEAD, MAX_BODY)
+        body = []
+        size = 0
+        trimmed = 0
+        for field in self.fields:
+            value = values.get(field.name)
+            if value is None:
+                continue
+            quantized = field.quantize(value)
+            if not keyframe and self.sent.get(field.name) == quantized:
+                continue
+            if size + field.size > room and (field.priority != PRIORITY_SAFETY or size + field.size > MAX_BODY):
+                trimmed += 1
+                continue
+            body.append(field.fmt.pack(field.field_id, quantized))
+            size += field.size
+            self.sent[field.name] = quantized
+
+        if not body and not keyframe:
+            return None, trimmed
+        frame = self._frame(KIND_KEYFRAME if keyframe else KIND_DELTA, b''.join(body))
+        return frame, trimmed
+
+    def _frame(self, kind, body):
+        header = HEADER.pack(len(body) + HEADER.size - 1, kind, self.seq)
+        self.seq = (self.seq + 1) & 0xFFFF
+        return SYNC + header + body + bytes((crc8(header + body),))
+
+class DownlinkDecoder:
+    def __init__(self, fields=DOWNLINK_FIELDS):
+        """
+        Receiving side of the downlink (ground station, tests)
+
+        Rebuilds the vehicle status from keyframes and deltas;
+        resynchronizes on the next sync marker after a corrupt frame.
+
+        :param fields: DownlinkField definitions shared with the sender
+        """
+        self.fields = {field.field_id: field for field in fields}
+        self.state = {}
+        self.frames = 0
+        self.crc_errors = 0
+        self.last_seq = None
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        """
+        Add received bytes
+
+        :param data: Bytes read from the link
+        :return: List of dicts, the fields updated by each decoded frame
+        """
+        buffer = self._buffer
+        buffer += data
+        updates = []
+        while True:
+            start = buffer.find(SYNC)
+            if start < 0:
+                keep = 1 if buffer[-1:] == SYNC[:1] else 0
+                del buffer[:len(buffer) - keep]
+                break
+            del buffer[:start]
+            if len(buffer) < FRAME_OVERHEAD:
+                break
+            size = len(SYNC) + 1 + buffer[2] + 1
+            if len(buffer) < size:
+                break
+
+            checked = bytes(buffer[2:size - 1])
+            if crc8(checked) != buffer[size - 1]:
+                self.crc_errors += 1
+                del buffer[:1]
+                continue
+            del buffer[:size]
+
+            update = self._decode(checked)
+            if update is None:
+                self.crc_errors += 1
+                continue
+            self.frames += 1
+            self.state.update(update)
+            updates.append(update)
+        return updates
+
+    def _decode(self, checked):
+        _, kind, self.last_seq = HEADER.unpack_from(checked)
+        offset = HEADER.size
+        update = {}
+        while offset < len(checked):
+            field = self.fields.get(checked[offset])
+            if field is None or offset + field.size > len(checked):
+                return None
+            _, value = field.fmt.unpack_from(checked, offset)
+            update[field.name] = value / field.scale if field.scale != 1 else value
+            offset += field.size
+        return update
+
+class TelemetryDownlink:
+    def __init__(self, serial_conn, fields=DOWNLINK_FIELDS, rate=10.0, min_rate=1.0,
+                 max_rate=20.0, keyframe_interval=20, utilization=0.8, clock=hal.monotonic):
+        """
+        Compact vehicle status stream over the Bluetooth link
+
+        The control loop calls publish(), which only stores the newest
+        values; a sender thread encodes them and writes to the UART, so
+        the loop never waits on the port. The outbox holds one slot per
+        field, so a slow link drops stale values instead of queueing
+        them. The publish rate backs off when frames have to be trimmed
+        or the port reports a transmit backlog, and creeps back up while
+        the link keeps pace.
+
+        :param serial_conn: Open serial port (e.g. BluetoothController.serial_conn)
+        :param fields: DownlinkField definitions
+        :param rate: Initial frame rate (Hz)
+        :param min_rate: Lowest frame rate (Hz)
+        :param max_rate: Highest frame rate (Hz)
+        :param keyframe_interval: Frames between full keyframes
+        :param utilization: Share of the link bandwidth to plan for
+        :param clock: Monotonic time source in seconds
+        """
+        self.serial_conn = serial_conn
+        self.encoder = DownlinkEncoder(fields)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.rate = max(min_rate, min(max_rate, rate))
+        self.keyframe_interval = keyframe_interval
+        self.utilization = utilization
+        self.clock = clock
+
+        # 8N1: ten bits on the wire per byte
+        baudrate = getattr(serial_conn, 'baudrate', 0) or 9600
+        self.line_rate = baudrate / 10.0
+        self.link_rate = self.line_rate
+
+        self.outbox = {}
+        self.stats = {'frames': 0, 'bytes': 0, 'trimmed': 0, 'write_errors': 0, 'backlog': 0}
+        self._safety = tuple(field.name for field in self.encoder.fields if field.priority == PRIORITY_SAFETY)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_controller(cls, bluetooth_controller, **kwargs):
+        """
+        Share the serial link of a connected BluetoothController
+
+        :param bluetooth_controller: Connected BluetoothController
+        :return: TelemetryDownlink instance
+        """
+        return cls(bluetooth_controller.serial_conn, **kwargs)
+
+    def publish(self, values):
+        """
+        Offer the newest status; never blocks on the link
+
+        A change in a safety field wakes the sender at once.
+
+        :param values: Engineering values by field name
+        """
+        outbox = self.outbox
+        with self._lock:
+            urgent = any(
+                name in values and values[name] != outbox.get(name) for name in self._safety
+            )
+            outbox.update(values)
+        if urgent:
+            self._wake.set()
+
+    def start(self):
+        """
+        Start the sender thread
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._send_loop, name='telemetry-downlink', daemon=True)
+        self._thread.start()
+
+    def _send_loop(self):
+        while not self._stop_event.is_set():
+            self._wake.wait(1.0 / self.rate)
+            self._wake.clear()
+            if self._stop_event.is_set():
+                break
+            self.send_once()
+
+    def frame_budget(self):
+        """
+        :return: Bytes one frame may use at the current rate
+        """
+        return max(FRAME_OVERHEAD + 8, int(self.link_rate * self.utilization / self.rate))
+
+    def send_once(self):
+        """
+        Encode and write one frame, then adapt the rate
+
+        :return: Bytes written
+        """
+        with self._lock:
+            values = dict(self.outbox)
+        keyframe = self.stats['frames'] % self.keyframe_interval == 0
+        frame, trimmed = self.encoder.encode(values, self.frame_budget(), keyframe)
+        self.stats['trimmed'] += trimmed
+
+        written = 0
+        if frame:
+            start = time.perf_counter()
+            try:
+                self.serial_conn.write(frame)
+                written = len(frame)
+            except Exception as e:
+                logger.error(f"Telemetry downlink write error: {e}")
+                self.stats['write_errors'] += 1
+                # Force a keyframe once the link recovers
+                self.encoder.sent.clear()
+            elapsed = time.perf_counter() - start
+            if written:
+                self.stats['frames'] += 1
+                self.stats['bytes'] += written
+                # A write that blocks shows the real drain rate of the UART
+                sample = written / elapsed if elapsed > 0 else self.line_rate
+                self.link_rate = 0.8 * self.link_rate + 0.2 * min(sample, self.line_rate)
+
+        backlog = getattr(self.serial_conn, 'out_waiting', 0) or 0
+        self.stats['backlog'] = backlog
+        self._adapt(trimmed, backlog, written)
+        return written
+
+    def _adapt(self, trimmed, backlog, written):
+        # Multiplicative decrease when the link falls behind, additive increase otherwise
+        if trimmed or backlog > self.link_rate / self.rate:
+            self.rate = max(self.min_rate, self.rate * 0.7)
+        elif written * 2 < self.frame_budget():
+            self.rate = min(self.max_rate, self.rate + 0.5)
+
+    def stop(self):
+        """
+        Stop the sender thread
+        """
+        self._stop_event.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+def main():
+    """
+    Example usage of the downlink against the simulator
+    """
+    sim = hal.use_simulator()
+    ground = sim.serial_device('/dev/ttyS0')
+    port = hal.open_serial('/dev/ttyS0', 9600, 0.05)
+    downlink = TelemetryDownlink(port)
+    decoder = DownlinkDecoder()
+
+    for step in range(5):
+        start = time.perf_counter()
+        downlink.publish({'flags': 0, 'left_command': 20.0 * step, 'right_command': 20.0 * step,
+                          'ax': 0.01, 'ay': 0.0, 'az': 1.0})
+        publish_us = (time.perf_counter() - start) * 1e6
+        written = downlink.send_once()
+        decoder.feed(ground.read(ground.in_waiting))
+        print(f"publish {publish_us:.1f} us, frame {written} bytes, rate {downlink.rate:.1f} Hz: {decoder.state}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+import logging
+import struct
+import threading
+import time
+from .. import hal
+
+# Frame: sync (2) | seq u16 | throttle i16 | steer i16 | mode u8 | crc8 (1)
+SYNC = b'\xaa\x55'
+PAYLOAD = struct.Struct('<HhhB')
+FRAME_SIZE = len(SYNC) + PAYLOAD.size + 1
+
+# Throttle and steer travel as signed thousandths
+AXIS_SCALE = 1000
+
+MODE_STOP = 0
+MODE_DRIVE = 1
+
+logger = logging.getLogger('TeleopChannel')
+
+def _crc8_table(polynomial=0x07):
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = ((crc << 1) ^ polynomial) & 0xFF if crc & 0x80 else (crc << 1) & 0xFF
+        table.append(crc)
+    return bytes(table)
+
+_CRC8 = _crc8_table()
+
+def crc8(data):
+    """
+    CRC-8 (polynomial 0x07, as used by SMBus)
+
+    :param data: Bytes to check
+    :return: CRC value (0-255)
+    """
+    crc = 0
+    for byte in data:
+        crc = _CRC8[crc ^ byte]
+    return crc
+
+class TeleopCommand:
+    """
+    One decoded joystick setpoint.
+    """
+    __slots__ = ('seq', 'throttle', 'steer', 'mode', 'received')
+
+    def __init__(self, seq, throttle, steer, mode, received=0.0):
+        """
+        :param seq: 16-bit sequence number from the sender
+        :param throttle: Forward command (-1 to 1)
+        :param steer: Turn command (-1 to 1, positive turns right)
+        :param mode: MODE_STOP or MODE_DRIVE
+        :param received: Monotonic time the frame was decoded
+        """
+        self.seq = seq
+        self.throttle = throttle
+        self.steer = steer
+        self.mode = mode
+        self.received = received
+
+    def __repr__(self):
+        return (f"TeleopCommand(seq={self.seq}, throttle={self.throttle:.3f}, "
+                f"steer={self.steer:.3f}, mode={self.mode})")
+
+def encode_command(seq, throttle, steer, mode=MODE_DRIVE):
+    """
+    Build a teleop frame (the joystick side of the protocol)
+
+    :param seq: Sequence number (wraps at 16 bits)
+    :param throttle: Forward command (-1 to 1)
+    :param steer: Turn command (-1 to 1)
+    :param mode: MODE_STOP or MODE_DRIVE
+    :return: Frame bytes
+    """
+    def _axis(value):
+        return int(round(max(-1.0, min(1.0, value)) * AXIS_SCALE))
+
+    payload = PAYLOAD.pack(seq & 0xFFFF, _axis(throttle), _axis(steer), mode)
+    return SYNC + payload + bytes((crc8(payload),))
+
+class TeleopFrameParser:
+    def __init__(self):
+        """
+        Incremental decoder for the framed teleop byte stream
+
+        Frames may be split across reads or arrive several per read;
+        after a corrupt frame the parser resynchronizes on the next
+        sync marker.
+        """
+        self._buffer = bytearray()
+        self.frames = 0
+        self.crc_errors = 0
+        self.discarded_bytes = 0
+
+    def feed(self, data, now=0.0):
+        """
+        Add received bytes
+
+        :param data: Bytes read from the link
+        :param now: Timestamp for the decoded commands
+        :return: List of TeleopCommand, oldest first
+        """
+        buffer = self._buffer
+        buffer += data
+        commands = []
+        while True:
+            start = buffer.find(SYNC)
+            if start < 0:
+                # Keep a trailing first sync byte, drop the rest
+                keep = 1 if buffer[-1:] == SYNC[:1] else 0
+                self.discarded_bytes += len(buffer) - keep
+                del buffer[:len(buffer) - keep]
+                break
+            if start:
+                self.discarded_bytes += start
+                del buffer[:start]
+            if len(buffer) < FRAME_SIZE:
+                break
+
+            payload = bytes(buffer[2:FRAME_SIZE - 1])
+            if crc8(payload) != buffer[FRAME_SIZE - 1]:
+                # Skip this sync marker and look for the next one
+                self.crc_errors += 1
+                self.discarded_bytes += 1
+                del buffer[:1]
+                continue
+
+            seq, throttle, steer, mode = PAYLOAD.unpack(payload)
+            commands.append(TeleopCommand(
+                seq, throttle / AXIS_SCALE, steer / AXIS_SCALE, mode, now
+            ))
+            self.frames += 1
+            del buffer[:FRAME_SIZE]
+        return commands
+
+class TeleopChannel:
+    def __init__(self, serial_conn, timeout=0.25, clock=hal.monotonic):
+        """
+        Bluetooth teleoperation input on a dedicated reader thread
+
+        The reader decodes frames as soon as bytes arrive and keeps only
+        the newest setpoint; the control loop picks it up with setpoint()
+        or wakes on it with wait(). Stale or out-of-order frames never
+        overwrite a newer one.
+
+        :param serial_conn: Open serial port (e.g. BluetoothController.serial_conn)
+        :param timeout: Age after which the setpoint is considered lost (seconds)
+        :param clock: Monotonic time source in seconds
+        """
+        self.serial_conn = serial_conn
+        self.timeout = timeout
+        self.clock = clock
+        self.parser = TeleopFrameParser()
+        self.stats = {'accepted': 0, 'out_of_order': 0, 'read_errors': 0}
+
+        self._latest = None
+        self._new_command = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_controller(cls, bluetooth_controller, **kwargs):
+        """
+        Share the serial link of a connected BluetoothController
+
+        :param bluetooth_controller: Connected BluetoothController
+        :return: TeleopChannel instance
+        """
+        return cls(bluetooth_controller.serial_conn, **kwargs)
+
+    def start(self):
+        """
+        Start the reader thread
+        """
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._read_loop, name='teleop-reader', daemon=True)
+        self._thread.start()
+
+    def _read_loop(self):
+        while not self._stop_event.is_set():
+            try:
+                # Blocks up to the port timeout for the first byte
+                data = self.serial_conn.read(max(self.serial_conn.in_waiting, 1))
+            except Exception as e:
+                logger.error(f"Teleop read error: {e}")
+                self.stats['read_errors'] += 1
+                self._stop_event.wait(0.1)
+                continue
+            if data:
+                self.handle_bytes(data)
+
+    def handle_bytes(self, data):
+        """
+        Decode received bytes and publish the newest command
+
+        :param data: Bytes read from the link
+        """
+        now = self.clock()
+        for command in self.parser.feed(data, now):
+            latest = self._latest
+            if latest is not None and now - latest.received <= self.timeout:
+                # 16-bit wraparound: newer if within half the sequence space ahead
+                if not 0 < (command.seq - latest.seq) & 0xFFFF < 0x8000:
+                    self.stats['out_of_order'] += 1
+                    continue
+            self._latest = command
+            self.stats['accepted'] += 1
+            self._new_command.set()
+
+    def setpoint(self, now=None):
+        """
+        Newest command, if it is still fresh
+
+        :param now: Optional timestamp from the control loop
+        :return: TeleopCommand, or None if nothing arrived within the timeout
+        """
+        latest = self._latest
+        if latest is None:
+            return None
+        if now is None:
+            now = self.clock()
+        if now - latest.received > self.timeout:
+            return None
+        return latest
+
+    def age(self, now=None):
+        """
+        :param now: Optional timestamp from the control loop
+        :return: Seconds since the newest command, or None if none yet
+        """
+        latest = self._latest
+        if latest is None:
+            return None
+        return (self.clock() if now is None else now) - latest.received
+
+    def wait(self, timeout):
+        """
+        Sleep until a new command arrives or the timeout passes
+
+        Lets the control loop react to a joystick change immediately
+        instead of at its next period.
+
+        :param timeout: Longest wait (seconds)
+        :return: True if a new command arrived
+        """
+        arrived = self._new_command.wait(timeout)
+        self._new_command.clear()
+        return arrived
+
+    def stop(self):
+        """
+        Stop the reader thread
+        """
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+def main():
+    """
+    Example usage of the teleop channel against the simulator
+    """
+    sim = hal.use_simulator()
+    joystick = sim.serial_device('/dev/ttyS0')
+    from .bluetooth_controller import BluetoothController
+    bt = BluetoothController(timeout=0.05)
+    channel = TeleopChannel.from_controller(bt)
+    channel.start()
+    try:
+        for seq in range(5):
+            sent = time.perf_counter()
+            joystick.write(encode_command(seq, throttle=0.2 * seq, steer=-0.1))
+            channel.wait(1.0)
+            latency_ms = (time.perf_counter() - sent) * 1000
+            print(f"{channel.setpoint()} after {latency_ms:.2f} ms")
+    finally:
+        channel.stop()
+        bt.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,529 @@
+import logging
+import math
+import os
+import signal
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor, wait
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+import numpy
+from .state_bus import pin_to_cores, process_context
+
+# Job states
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+DROPPED = 'dropped'
+
+logger = logging.getLogger('ComputeOffload')
+
+class SharedArrayHandle:
+    """
+    Picklable reference to a SharedArray: segment name, typecode and length.
+
+    This is all a job receives for an array argument; the worker maps the
+    same pages, so neither the input nor a result written in place is
+    ever pickled.
+    """
+    __slots__ = ('name', 'typecode', 'length')
+
+    def __init__(self, name, typecode, length):
+        self.name = name
+        self.typecode = typecode
+        self.length = length
+
+    def __getstate__(self):
+        return (self.name, self.typecode, self.length)
+
+    def __setstate__(self, state):
+        self.name, self.typecode, self.length = state
+
+    def __repr__(self):
+        return f"SharedArrayHandle({self.name!r}, {self.typecode!r}, {self.length})"
+
+    @contextmanager
+    def open(self):
+        """
+        Map the array in this process
+
+        Yields:
+            memoryview: Flat view with the array's typecode; released
+                        (and the segment detached) on exit
+        """
+        shm = shared_memory.SharedMemory(name=self.name)
+        raw = shm.buf[:self.length * array(self.typecode).itemsize]
+        values = raw.cast(self.typecode)
+        try:
+            yield values
+        finally:
+            values.release()
+            raw.release()
+            shm.close()
+
+class SharedArray:
+    def __init__(self, typecode, length, name=None):
+        """
+        Flat typed array in a shared memory segment owned by this process
+
+        Args:
+            typecode (str): array module typecode, e.g. 'd' or 'f'
+            length (int): Number of items (zero-filled)
+            name (str, optional): Segment name, generated when omitted
+        """
+        itemsize = array(typecode).itemsize
+        self.typecode = typecode
+        self.length = length
+        self.shm = shared_memory.SharedMemory(name=name, create=True, size=max(1, length * itemsize))
+        self._raw = self.shm.buf[:length * itemsize]
+        self.values = self._raw.cast(typecode)
+        self.handle = SharedArrayHandle(self.shm.name, typecode, length)
+
+    def __len__(self):
+        return self.length
+
+    def write(self, values, offset=0):
+        """
+        Copy values into the array starting at offset
+
+        Returns:
+            int: Number of items written
+        """
+        values = array(self.typecode, values)
+        self.values[offset:offset + len(values)] = values
+        return len(values)
+
+    def tolist(self):
+        return self.values.tolist()
+
+    def view(self):
+        """
+        Zero-copy NumPy view (delete it before close())
+        """
+        return numpy.frombuffer(self.values, dtype=numpy.dtype(self.typecode))
+
+    def close(self):
+        """
+        Detach and remove the segment (jobs using it must have finished)
+        """
+        self.values.release()
+        self._raw.release()
+        try:
+            self.shm.close()
+        except BufferError:
+            logger.warning(f"Shared array {self.shm.name} still has views in use")
+        self.shm.unlink()
+
+class OffloadJob:
+    """
+    One submitted job as seen by the control loop.
+
+    Never blocks: the loop reads state after ComputeOffload.collect().
+    A job ends DONE with its result, or DROPPED with the reason
+    ('superseded', 'expired', 'late', 'failed', 'cancelled').
+    """
+    __slots__ = ('key', 'function', 'args', 'deadline', 'callback', 'submitted',
+                 'future', 'state', 'reason', 'result', 'completed')
+
+    def __init__(self, key, function, args, deadline, callback, submitted):
+        self.key = key
+        self.function = function
+        self.args = args
+        self.deadline = deadline
+        self.callback = callback
+        self.submitted = submitted
+        self.future = None
+        self.state = QUEUED
+        self.reason = None
+        self.result = None
+        self.completed = None
+
+    @property
+    def finished(self):
+        return self.state in (DONE, DROPPED)
+
+    def __repr__(self):
+        return f"OffloadJob({self.key!r}, {self.state}{', ' + self.reason if self.reason else ''})"
+
+def _worker_init(cores, nice):
+    # Ctrl-C goes to the whole process group; the application shuts the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    if cores:
+        pin_to_cores(cores)
+    if nice:
+        try:
+            os.nice(nice)
+        except OSError as e:
+            logger.warning(f"Could not lower offload worker priority: {e}")
+
+def _worker_ready():
+    return os.getpid()
+
+class ComputeOffload:
+    def __init__(self, max_workers=2, cores=None, nice=10, clock=time.monotonic):
+        """
+        Runs heavy jobs (map updates, calibration fits, log analysis) in a
+        process pool, off the control loop
+
+        Jobs are module-level functions; array arguments are passed as
+        SharedArrayHandle so only names cross the process boundary.
+        Each job has a key, e.g. 'occupancy': one job per key runs at a
+        time, so jobs updating the same shared array never overlap, and
+        of the jobs submitted while one runs only the newest waits - the
+        others are dropped as superseded. A job whose deadline passes
+        before its result is collected is dropped as well, so the loop
+        never acts on stale results.
+
+        Bookkeeping happens in submit() and collect(), both called from
+        the control loop; neither waits for a worker once start() has
+        run. Workers start from a clean process
+        (state_bus.process_context()), so jobs and their arguments must
+        be picklable.
+
+        Args:
+            max_workers (int): Worker processes
+            cores (iterable, optional): CPU cores the workers are pinned to,
+                                        keeping them off the control core
+            nice (int): Niceness added to the workers, so a shared core
+                        still prefers the control loop
+            clock (callable): Monotonic time source in seconds
+        """
+        self.max_workers = max_workers
+        self.clock = clock
+        self.executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=process_context(),
+            initializer=_worker_init,
+            initargs=(tuple(cores) if cores else None, nice)
+        )
+        self._running = {}
+        self._waiting = {}
+        self.counts = {'submitted': 0, 'delivered': 0, 'superseded': 0, 'expired': 0,
+                       'late': 0, 'failed': 0, 'cancelled': 0}
+        self.worst_turnaround = 0.0
+
+    def start(self, timeout=30.0):
+        """
+        Start every worker process and wait until each has run a job
+
+        The pool otherwise starts a worker inside submit() whenever none
+        is idle, which blocks the caller for the process start; call
+        this before the control loop runs.
+
+        Args:
+            timeout (float): Seconds to wait for the workers
+
+        Returns:
+            bool: True if every worker started
+        """
+        # Each submit starts a worker while none is idle, so submitting
+        # one job per worker before waiting starts all of them
+        futures = [self.executor.submit(_worker_ready) for _ in range(self.max_workers)]
+        done, pending = wait(futures, timeout=timeout)
+        failed = [future for future in done if future.exception() is not None]
+        if pending or failed:
+            logger.error(f"Offload workers did not start ({len(pending)} pending, "
+                         f"{len(failed)} failed)")
+            return False
+        return True
+
+    def submit(self, key, function, *args, deadline=None, callback=None):
+        """
+        Queue a job; it starts now unless a job with the same key runs
+
+        Args:
+            key (str): Job stream, e.g. 'occupancy'
+            function (callable): Module-level function run in a worker
+            *args: Picklable arguments (SharedArrayHandle for arrays)
+            deadline (float, optional): Seconds from now within which the
+                                        result must be collected
+            callback (callable, optional): Called with the job from
+                                           collect() when its result is used
+
+        Returns:
+            OffloadJob: Handle to poll after collect()
+        """
+        now = self.clock()
+        job = OffloadJob(key, function, args, None if deadline is None else now + deadline,
+                         callback, now)
+        self.counts['submitted'] += 1
+        if key in self._running:
+            previous = self._waiting.get(key)
+            if previous is not None:
+                self._drop(previous, 'superseded')
+            self._waiting[key] = job
+        else:
+            self._dispatch(job)
+        return job
+
+    def _dispatch(self, job):
+        try:
+            job.future = self.executor.submit(job.function, *job.args)
+        except RuntimeError as e:
+            # Shut down, or a worker died and broke the pool
+            logger.error(f"Offload job {job.key} not started: {e}")
+            self._drop(job, 'failed')
+            return
+        job.state = RUNNING
+        self._running[job.key] = job
+
+    def _drop(self, job, reason):
+        job.state = DROPPED
+        job.reason = reason
+        self.counts[reason] += 1
+
+    def busy(self, key):
+        """
+        Returns:
+            bool: True while a job with this key runs or waits
+        """
+        return key in self._running or key in self._waiting
+
+    def collect(self, now=None):
+        """
+        Take finished results and start waiting jobs; never blocks
+
+        Call once per control tick. Callbacks of delivered jobs run here,
+        on the caller's thread.
+
+        Args:
+            now (float, optional): Timestamp, defaults to the clock
+
+        Returns:
+            list: Jobs delivered (DONE) by this call
+        """
+        if not self._running:
+            return []
+        if now is None:
+            now = self.clock()
+        delivered = []
+        for key, job in list(self._running.items()):
+            if not job.future.done():
+                continue
+            del self._running[key]
+            if self._finish(job, now):
+                delivered.append(job)
+
+            waiting = self._waiting.pop(key, None)
+            if waiting is not None:
+                if waiting.deadline is not None and now > waiting.deadline:
+                    self._drop(waiting, 'expired')
+                else:
+                    self._dispatch(waiting)
+
+        for job in delivered:
+            if job.callback:
+                try:
+                    job.callback(job)
+                except Exception as e:
+                    logger.error(f"Offload callback for {job.key} failed: {e}")
+        return delivered
+
+    def _finish(self, job, now):
+        job.completed = now
+        future, job.future = job.future, None
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Offload job {job.key} failed: {error}")
+            self._drop(job, 'failed')
+            return False
+        if job.deadline is not None and now > job.deadline:
+            self._drop(job, 'late')
+            return False
+        job.result = future.result()
+        job.state = DONE
+        self.counts['delivered'] += 1
+        turnaround = now - job.submitted
+        if turnaround > self.worst_turnaround:
+            self.worst_turnaround = turnaround
+        return True
+
+    def cancel(self, key):
+        """
+        Drop the waiting job of a key and, if it has not started, the
+        running one (a started job finishes, but its result is dropped)
+        """
+        waiting = self._waiting.pop(key, None)
+        if waiting is not None:
+            self._drop(waiting, 'cancelled')
+        job = self._running.get(key)
+        if job is not None:
+            job.deadline = -math.inf
+            if job.future.cancel():
+                del self._running[key]
+                job.future = None
+                self._drop(job, 'cancelled')
+
+    def stats(self):
+        """
+        Returns:
+            dict: Job counts by outcome, jobs in flight and the worst
+                  submit-to-collect time (seconds)
+        """
+        stats = dict(self.counts)
+        stats['running'] = len(self._running)
+        stats['waiting'] = len(self._waiting)
+        stats['worst_turnaround'] = self.worst_turnaround
+        return stats
+
+    def shutdown(self, wait=True):
+        """
+        Cancel waiting jobs and stop the workers
+        """
+        for key in list(self._waiting):
+            self._drop(self._waiting.pop(key), 'cancelled')
+        for job in self._running.values():
+            self._drop(job, 'cancelled')
+        self._running.clear()
+        self.executor.shutdown(wait=wait, cancel_futures=True)
+
+def _trace(x0, y0, x1, y1):
+    # Bresenham: cells from (x0, y0) up to, not including, (x1, y1)
+    dx, dy = abs(x1 - x0), -abs(y1 - y0)
+    step_x = 1 if x0 < x1 else -1
+    step_y = 1 if y0 < y1 else -1
+    error = dx + dy
+    while (x0, y0) != (x1, y1):
+        yield x0, y0
+        double = 2 * error
+        if double >= dy:
+            error += dy
+            x0 += step_x
+        if double <= dx:
+            error += dx
+            y0 += step_y
+
+def occupancy_update(grid, width, height, resolution, pose, ranges, angle_min, angle_step,
+                     max_range, hit=0.85, miss=-0.4, limit=5.0):
+    """
+    Job: ray-trace one range scan into a log-odds occupancy grid in place
+
+    Cells a beam passes get `miss` added, the cell it ends in `hit`
+    (beams at max_range only clear), each clamped to +-limit.
+
+    Args:
+        grid (SharedArrayHandle): width * height log-odds values, row-major
+        width (int): Cells along x
+        height (int): Cells along y
+        resolution (float): Cell size (m); cell (0, 0) starts at the origin
+        pose (tuple): Sensor (x, y, heading) in m and rad
+        ranges (SharedArrayHandle): Beam ranges (m)
+        angle_min (float): Angle of the first beam relative to the heading (rad)
+        angle_step (float): Angle between beams (rad)
+        max_range (float): Ranges at or beyond this are no-return beams
+
+    Returns:
+        int: Cell updates applied
+    """
+    x, y, heading = pose
+    origin_x, origin_y = int(x / resolution), int(y / resolution)
+    updates = 0
+    with grid.open() as cells, ranges.open() as beams:
+        for index, distance in enumerate(beams):
+            if not distance > 0.0:
+                continue
+            angle = heading + angle_min + index * angle_step
+            reach = min(distance, max_range)
+            end_x = int((x + reach * math.cos(angle)) / resolution)
+            end_y = int((y + reach * math.sin(angle)) / resolution)
+            for cell_x, cell_y in _trace(origin_x, origin_y, end_x, end_y):
+                if 0 <= cell_x < width and 0 <= cell_y < height:
+                    cell = cell_y * width + cell_x
+                    cells[cell] = max(-limit, cells[cell] + miss)
+                    updates += 1
+            if distance < max_range and 0 <= end_x < width and 0 <= end_y < height:
+                cell = end_y * width + end_x
+                cells[cell] = min(limit, cells[cell] + hit)
+                updates += 1
+    return updates
+
+def calibration_fit(samples, count, axes):
+    """
+    Job: per-axis offset (mean) and noise (standard deviation) of samples
+
+    Args:
+        samples (SharedArrayHandle): count * axes values, interleaved
+        count (int): Samples to use
+        axes (int): Values per sample
+
+    Returns:
+        dict: {'count', 'offset': [mean per axis], 'noise': [std per axis]}
+    """
+    with samples.open() as values:
+        data = numpy.frombuffer(values, dtype=numpy.dtype(samples.typecode),
+                                count=count * axes).reshape(count, axes)
+        offset = data.mean(axis=0).tolist()
+        noise = data.std(axis=0).tolist()
+        del data
+    return {'count': count, 'offset': offset, 'noise': noise}
+
+def channel_summary(run_directory, channel, start=None, end=None):
+    """
+    Job: statistics of every column of a recorded telemetry channel
+
+    The worker memory-maps the run itself; only the path goes over.
+
+    Args:
+        run_directory (str): Telemetry run directory
+        channel (str): Channel name, e.g. 'imu'
+        start (float, optional): First timestamp (inclusive)
+        end (float, optional): Last timestamp (exclusive)
+
+    Returns:
+        dict: {'count', 'columns': {column: {'mean', 'std', 'min', 'max'}}}
+    """
+    from .telemetry import TelemetryReader
+
+    reader = TelemetryReader(run_directory)
+    try:
+        columns = reader.columns(channel)
+        records = reader.read(channel, start, end)
+        summary = {'count': len(records), 'columns': {}}
+        if not len(records):
+            return summary
+        for column in columns:
+            values = records[column].astype(numpy.float64)
+            stats = (float(values.mean()), float(values.std()),
+                     float(values.min()), float(values.max()))
+            summary['columns'][column] = dict(zip(('mean', 'std', 'min', 'max'), stats))
+        del records
+        return summary
+    finally:
+        reader.close()
+
+def main():
+    """
+    Example: a 50 Hz loop feeding scans to the map while it keeps its period
+    """
+    logging.basicConfig(level=logging.INFO)
+    width = height = 200
+    beams = 360
+    offload = ComputeOffload(max_workers=max(1, (os.cpu_count() or 2) - 1))
+    offload.start()
+    grid = SharedArray('f', width * height)
+    scan = SharedArray('f', beams)
+    period = 0.02
+    worst = 0.0
+    try:
+        for tick in range(150):
+            start = time.perf_counter()
+            offload.collect()
+            if not offload.busy('occupancy'):
+                # Scan buffer is only rewritten once the last update read it
+                scan.write([2.0 + 0.5 * math.sin(beam * 0.1 + tick * 0.05) for beam in range(beams)])
+                pose = (5.0, 5.0, tick * 0.01)
+                offload.submit('occupancy', occupancy_update, grid.handle, width, height, 0.05,
+                               pose, scan.handle, 0.0, 2 * math.pi / beams, 4.0, deadline=0.5)
+            elapsed = time.perf_counter() - start
+            worst = max(worst, elapsed)
+            time.sleep(max(period - elapsed, 0.0))
+        occupied = sum(1 for value in grid.values if value > 0.0)
+        print(f"Occupied cells: {occupied}; worst loop work {worst * 1000:.2f} ms")
+        print(offload.stats())
+    finally:
+        offload.shutdown()
+        grid.close()
+        scan.close()
+
+if __name__ == "__main__":
+    main()
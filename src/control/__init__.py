@@ -0,0 +1,36 @@
+"""
+Control Package Initialization
+
+This module provides the closed-loop controllers used by the
+vehicle control loop.
+"""
+
+from .wheel_speed import (
+    PIDController,
+    FeedforwardTable,
+    GainSchedule,
+    WheelSpeedController,
+    SimulatedWheelPlant
+)
+from .suspension import (
+    AttitudeFilter,
+    SuspensionController,
+    RideHeightMonitor,
+    SimulatedSuspensionPlant
+)
+from .road_preview import RoadPreview, PreviewMonitor
+
+# Define which controllers will be exposed when using 'from control import *'
+__all__ = [
+    'PIDController',
+    'FeedforwardTable',
+    'GainSchedule',
+    'WheelSpeedController',
+    'SimulatedWheelPlant',
+    'AttitudeFilter',
+    'SuspensionController',
+    'RideHeightMonitor',
+    'SimulatedSuspensionPlant',
+    'RoadPreview',
+    'PreviewMonitor'
+]
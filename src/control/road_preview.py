@@ -0,0 +1,278 @@
+import math
+import threading
+import time
+import numpy
+
+class RoadPreview:
+    """
+    Road height profile ahead of the vehicle, from a forward-looking
+    range sensor and wheel odometry.
+
+    Heights live in a fixed-size ring of cells indexed by travel
+    distance, so each sample costs O(1) amortized: a cell holds the
+    height interpolated to its centre between the two samples either
+    side of it, and every cell is written about once per pass. Each cell
+    remembers which distance it was written for, so cells left over
+    from an earlier pass never read back as current road.
+    """
+
+    def __init__(self, length=2.0, resolution=0.01, mount_height=100.0, mount_offset=0.1,
+                 tilt=30.0, wheelbase=0.3, strut_speed=60.0, gain=1.0, lead_time=0.05,
+                 slope_window=0.04, max_gap=0.25):
+        """
+        Args:
+            length (float): Distance the profile spans (m)
+            resolution (float): Cell length (m)
+            mount_height (float): Sensor height above flat road (mm)
+            mount_offset (float): Sensor distance ahead of the front axle (m)
+            tilt (float): Beam angle below horizontal (degrees)
+            wheelbase (float): Front to rear axle distance (m)
+            strut_speed (float): Strut speed at full command (mm/s)
+            gain (float): Fraction of the road motion to cancel
+            lead_time (float): Actuator latency to anticipate (seconds)
+            slope_window (float): Span the road slope is taken over (m)
+            max_gap (float): Longest distance between samples that is
+                             interpolated (m); longer gaps stay unknown
+        """
+        if length < wheelbase + mount_offset:
+            raise ValueError("Profile length must cover the wheelbase and sensor offset")
+        self.resolution = resolution
+        self.size = int(round(length / resolution))
+        self.mount_height = mount_height
+        self.mount_offset = mount_offset
+        self.tilt = tilt
+        self.wheelbase = wheelbase
+        self.strut_speed = strut_speed
+        self.gain = gain
+        self.lead_time = lead_time
+        self.slope_cells = max(1, int(round(slope_window / resolution / 2)))
+        self.max_gap = max_gap
+
+        self.heights = numpy.zeros(self.size)
+        self.cells = numpy.full(self.size, -1, dtype=numpy.int64)
+        self.commands = [0.0, 0.0, 0.0, 0.0]
+        self.samples = 0
+        self._last = None
+        self._lock = threading.Lock()
+
+    def reset(self):
+        """
+        Forget the profile (e.g. after the vehicle was moved by hand)
+        """
+        with self._lock:
+            self.cells.fill(-1)
+            self._last = None
+
+    def add_sample(self, distance, range_mm, pitch=0.0):
+        """
+        Add one forward range reading
+
+        Args:
+            distance (float): Odometer reading when the range was taken (m)
+            range_mm (float): Measured range along the beam (mm)
+            pitch (float): Body pitch, nose up positive (degrees)
+
+        Returns:
+            float: Travel distance of the road point that was hit (m)
+        """
+        angle = math.radians(self.tilt - pitch)
+        position = distance + self.mount_offset + range_mm * math.cos(angle) / 1000.0
+        height = self.mount_height - range_mm * math.sin(angle)
+        resolution = self.resolution
+        cell = int(math.floor(position / resolution))
+
+        with self._lock:
+            last = self._last
+            if last is not None and 0 < position - last[0] <= self.max_gap:
+                # Every cell whose centre the road point passed since the last
+                # sample gets the height interpolated to that centre
+                last_position, last_height = last
+                slope = (height - last_height) / (position - last_position)
+                first = int(math.floor(last_position / resolution - 0.5)) + 1
+                end = int(math.floor(position / resolution - 0.5))
+                for passed in range(first, end + 1):
+                    centre = (passed + 0.5) * resolution
+                    self._write(passed, last_height + slope * (centre - last_position))
+            if self._height(cell) is None:
+                # Provisional until the road point passes the cell centre
+                self._write(cell, height)
+            self._last = (position, height)
+            self.samples += 1
+        return position
+
+    def _write(self, cell, height):
+        index = cell % self.size
+        self.heights[index] = height
+        self.cells[index] = cell
+
+    def height_at(self, position):
+        """
+        Args:
+            position (float): Travel distance (m)
+
+        Returns:
+            float: Road height there (mm), or None if not profiled
+        """
+        return self._height(int(math.floor(position / self.resolution)))
+
+    def _height(self, cell):
+        index = cell % self.size
+        if self.cells[index] != cell:
+            return None
+        return self.heights[index]
+
+    def slope_at(self, position):
+        """
+        Args:
+            position (float): Travel distance (m)
+
+        Returns:
+            float: Road slope there (mm per m), or None if not profiled
+        """
+        cell = int(math.floor(position / self.resolution))
+        half = self.slope_cells
+        ahead = self._height(cell + half)
+        behind = self._height(cell - half)
+        if ahead is None or behind is None:
+            return None
+        return (ahead - behind) / (2 * half * self.resolution)
+
+    def feedforward(self, distance, speed):
+        """
+        Strut commands that cancel the road motion each wheel is about
+        to see
+
+        Args:
+            distance (float): Current odometer reading (m)
+            speed (float): Vehicle speed (m/s)
+
+        Returns:
+            list: Command per corner (front left, front right, rear left,
+                  rear right); the list is reused
+        """
+        commands = self.commands
+        if speed <= 0:
+            for index in range(4):
+                commands[index] = 0.0
+            return commands
+
+        front = distance + speed * self.lead_time
+        scale = -self.gain * speed / self.strut_speed
+        for pair, position in ((0, front), (2, front - self.wheelbase)):
+            # Road rising under a wheel: shorten that strut to keep the body still
+            slope = self.slope_at(position)
+            command = scale * slope if slope is not None else 0.0
+            command = 1.0 if command > 1.0 else (-1.0 if command < -1.0 else command)
+            commands[pair] = command
+            commands[pair + 1] = command
+        return commands
+
+    def profile(self, start, end):
+        """
+        Road heights over a stretch, one per cell
+
+        Args:
+            start (float): First travel distance (m)
+            end (float): Last travel distance (m)
+
+        Returns:
+            numpy.ndarray: Heights (mm), NaN where not profiled; a copy,
+                           unaffected by later samples
+        """
+        first = int(math.floor(start / self.resolution))
+        last = int(math.floor(end / self.resolution))
+        cells = numpy.arange(first, last + 1)
+        indices = cells % self.size
+        with self._lock:
+            known = self.cells[indices] == cells
+            return numpy.where(known, self.heights[indices], numpy.nan)
+
+class PreviewMonitor:
+    def __init__(self, sensor, preview, odometer, pitch=None, interval=0.02):
+        """
+        Feeds forward range readings into a RoadPreview off the control loop
+
+        Args:
+            sensor (VL53L0XLidar): Forward-looking range sensor
+            preview (RoadPreview): Profile to update
+            odometer (callable): Returns the current travel distance (m)
+            pitch (callable, optional): Returns the body pitch (degrees)
+            interval (float): Seconds between readings
+        """
+        self.sensor = sensor
+        self.preview = preview
+        self.odometer = odometer
+        self.pitch = pitch
+        self.interval = interval
+        self.failed_reads = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def poll(self):
+        """
+        Take one reading into the profile
+
+        Returns:
+            float: Travel distance of the profiled point (m), or None
+        """
+        reading = self.sensor.read()
+        if not reading or not reading.get('valid_measurement'):
+            self.failed_reads += 1
+            return None
+        # The range is taken over the sensor's timing budget; the odometer
+        # is read once it is in, so the point lands slightly behind
+        pitch = self.pitch() if self.pitch else 0.0
+        return self.preview.add_sample(self.odometer(), float(reading['distance_mm']), pitch)
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='road-preview', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self.poll()
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+def main():
+    """
+    Example: preview a 20 mm bump and compare strut commands to the road
+    """
+    preview = RoadPreview()
+    speed = 1.0
+    dt = 0.01
+    distance = 0.0
+    angle = math.radians(preview.tilt)
+
+    def road(position):
+        if 1.0 <= position < 1.5:
+            return 20.0 * math.sin(math.pi * (position - 1.0) / 0.5) ** 2
+        return 0.0
+
+    start = time.perf_counter()
+    for step in range(200):
+        # Range from the sensor to the road point its beam hits
+        ahead = distance + preview.mount_offset
+        range_mm = preview.mount_height / math.sin(angle)
+        for _ in range(3):
+            hit = ahead + range_mm * math.cos(angle) / 1000.0
+            range_mm = (preview.mount_height - road(hit)) / math.sin(angle)
+        preview.add_sample(distance, range_mm)
+        commands = preview.feedforward(distance, speed)
+        if step % 10 == 0:
+            print(f"s={distance:.2f}m road={road(distance):4.1f}mm "
+                  f"front={commands[0] + 0.0:+.2f} rear={commands[2] + 0.0:+.2f}")
+        distance += speed * dt
+    per_step = (time.perf_counter() - start) / 200 * 1e6
+    print(f"{per_step:.1f} us per sample and feedforward")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,419 @@
+import math
+import threading
+import time
+
+# Corner order used by every per-corner list in this module
+CORNERS = ('front_left', 'front_right', 'rear_left', 'rear_right')
+
+# Modal mixing matrix, one row per corner: (heave, roll, pitch).
+# Positive roll raises the left side and positive pitch raises the nose,
+# so levelling commands lower the high side.
+MODAL_MIX = (
+    (1.0, 1.0, 1.0),
+    (1.0, -1.0, 1.0),
+    (1.0, 1.0, -1.0),
+    (1.0, -1.0, -1.0)
+)
+
+GRAVITY_MM = 9806.65
+
+class AttitudeFilter:
+    """
+    Complementary filter fusing MPU6050 gyro rates and accelerometer tilt.
+    """
+    __slots__ = ('alpha', 'roll', 'pitch', 'roll_rate', 'pitch_rate', 'vertical_accel',
+                 'timestamp', '_initialized')
+
+    def __init__(self, alpha=0.98):
+        """
+        Args:
+            alpha (float): Weight of the integrated gyro against the
+                           accelerometer angle per update
+        """
+        self.alpha = alpha
+        self.reset()
+
+    def reset(self):
+        self.roll = 0.0
+        self.pitch = 0.0
+        self.roll_rate = 0.0
+        self.pitch_rate = 0.0
+        self.vertical_accel = 0.0
+        self.timestamp = None
+        self._initialized = False
+
+    def update(self, imu_data, dt):
+        """
+        Fuse one IMU reading
+
+        A reading whose 'timestamp' is not newer than the last fused one
+        is skipped, so a repeated sample is never integrated twice.
+
+        Args:
+            imu_data (dict): MPU6050Sensor.read() result
+            dt (float): Time since the previous fused reading (seconds)
+
+        Returns:
+            tuple: (roll, pitch) in degrees, or None if the reading was skipped
+        """
+        timestamp = imu_data.get('timestamp')
+        if timestamp is not None:
+            if self.timestamp is not None and timestamp <= self.timestamp:
+                return None
+            self.timestamp = timestamp
+        accel = imu_data['acceleration']
+        gyro = imu_data['gyroscope']
+        ax, ay, az = accel['x'], accel['y'], accel['z']
+        accel_roll = math.degrees(math.atan2(ay, az))
+        accel_pitch = math.degrees(math.atan2(-ax, math.sqrt(ay * ay + az * az)))
+
+        self.roll_rate = gyro['x']
+        self.pitch_rate = gyro['y']
+        # Body vertical acceleration with gravity removed (g)
+        self.vertical_accel = az - 1.0
+        if not self._initialized:
+            self.roll, self.pitch = accel_roll, accel_pitch
+            self._initialized = True
+        else:
+            alpha = self.alpha
+            self.roll = alpha * (self.roll + self.roll_rate * dt) + (1 - alpha) * accel_roll
+            self.pitch = alpha * (self.pitch + self.pitch_rate * dt) + (1 - alpha) * accel_pitch
+        return self.roll, self.pitch
+
+class SuspensionController:
+    """
+    Per-corner hydraulic command from attitude, ride height and speed.
+
+    A modal controller: heave (mean ride height), roll and pitch are
+    each controlled separately, then mixed to the four corners through
+    MODAL_MIX. Levelling is PI on the fused angles; damping is skyhook,
+    proportional to the absolute body rates (gyro for roll and pitch,
+    leaky-integrated vertical acceleration for heave), with damping
+    raised in proportion to speed. update() works on preallocated
+    fixed-size lists with no loops over data of varying length, so every
+    tick costs the same.
+    """
+
+    def __init__(self, target_height=120.0, min_height=80.0, max_height=160.0,
+                 height_per_speed=-10.0, height_gain=0.02, height_integral=0.005,
+                 level_gain=0.08, level_integral=0.005, skyhook_heave=0.002,
+                 skyhook_roll=0.01, skyhook_pitch=0.01, speed_damping=0.5,
+                 height_timeout=0.5, velocity_leak=0.98):
+        """
+        Args:
+            target_height (float): Ride height at standstill (mm)
+            min_height (float): Lowest allowed corner height (mm)
+            max_height (float): Highest allowed corner height (mm)
+            height_per_speed (float): Ride height change per m/s (mm);
+                                      negative lowers the body at speed
+            height_gain (float): Heave command per mm of height error
+            height_integral (float): Heave integral gain (per mm·s)
+            level_gain (float): Roll/pitch command per degree of tilt
+            level_integral (float): Roll/pitch integral gain (per degree·s)
+            skyhook_heave (float): Heave command per mm/s of body velocity
+            skyhook_roll (float): Roll command per deg/s of roll rate
+            skyhook_pitch (float): Pitch command per deg/s of pitch rate
+            speed_damping (float): Relative skyhook increase per m/s
+            height_timeout (float): Age after which ride heights are
+                                    ignored (seconds)
+            velocity_leak (float): Per-tick decay of the integrated heave
+                                   velocity, removing accelerometer drift
+        """
+        self.target_height = target_height
+        self.min_height = min_height
+        self.max_height = max_height
+        self.height_per_speed = height_per_speed
+        self.height_gain = height_gain
+        self.height_integral = height_integral
+        self.level_gain = level_gain
+        self.level_integral = level_integral
+        self.skyhook_heave = skyhook_heave
+        self.skyhook_roll = skyhook_roll
+        self.skyhook_pitch = skyhook_pitch
+        self.speed_damping = speed_damping
+        self.height_timeout = height_timeout
+        self.velocity_leak = velocity_leak
+
+        self.attitude = AttitudeFilter()
+        self.commands = [0.0, 0.0, 0.0, 0.0]
+        self.heights = [None, None, None, None]
+        self.heights_updated = None
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """
+        Clear integrators, filters and commands
+        """
+        self.attitude.reset()
+        self.heave_velocity = 0.0
+        self._imu_dt = 0.0
+        self._integrals = [0.0, 0.0, 0.0]
+        self._modal = [0.0, 0.0, 0.0]
+        for index in range(4):
+            self.commands[index] = 0.0
+
+    def set_ride_heights(self, heights, timestamp):
+        """
+        Store the latest corner ride heights (any thread)
+
+        Args:
+            heights (list): Height per corner in CORNERS order (mm), None
+                            where a corner has no reading
+            timestamp (float): Monotonic time of the readings
+        """
+        with self._lock:
+            for index in range(4):
+                self.heights[index] = heights[index]
+            self.heights_updated = timestamp
+
+    def target_ride_height(self, speed):
+        """
+        Args:
+            speed (float): Vehicle speed (m/s)
+
+        Returns:
+            float: Ride height target for that speed (mm)
+        """
+        target = self.target_height + self.height_per_speed * abs(speed)
+        return min(self.max_height, max(self.min_height, target))
+
+    def update(self, imu_data, speed, dt, now, feedforward=None):
+        """
+        Compute one tick of corner commands
+
+        Args:
+            imu_data (dict): MPU6050Sensor.read() result, or None to
+                             hold the last attitude estimate (a sample
+                             already fused is held as well)
+            speed (float): Vehicle speed (m/s)
+            dt (float): Time since the previous update (seconds)
+            now (float): Monotonic time, for the ride height age check
+            feedforward (list, optional): Command per corner added before
+                                          limiting, e.g. from RoadPreview
+
+        Returns:
+            list: Command per corner in CORNERS order, -1 (release to
+                  lower) to 1 (pump to raise); the list is reused
+        """
+        attitude = self.attitude
+        if dt > 0:
+            # Time since the last fused sample, across ticks without a new one
+            self._imu_dt += dt
+        if imu_data is not None and self._imu_dt > 0 and attitude.update(imu_data, self._imu_dt):
+            self.heave_velocity = self.velocity_leak * (
+                self.heave_velocity + attitude.vertical_accel * GRAVITY_MM * self._imu_dt
+            )
+            self._imu_dt = 0.0
+
+        damping = 1.0 + self.speed_damping * abs(speed)
+
+        # Heave: height PI when fresh ride heights exist, skyhook always
+        with self._lock:
+            heights = self.heights
+            fresh = self.heights_updated is not None and now - self.heights_updated <= self.height_timeout
+            total = 0.0
+            count = 0
+            if fresh:
+                for height in heights:
+                    if height is not None:
+                        total += height
+                        count += 1
+        height_error = self.target_ride_height(speed) - total / count if count else 0.0
+
+        modal = self._modal
+        modal[0] = self._mode_output(
+            0, height_error, self.height_gain, self.height_integral if count else 0.0,
+            -self.skyhook_heave * damping * self.heave_velocity, dt
+        )
+        modal[1] = self._mode_output(
+            1, -attitude.roll, self.level_gain, self.level_integral,
+            -self.skyhook_roll * damping * attitude.roll_rate, dt
+        )
+        modal[2] = self._mode_output(
+            2, -attitude.pitch, self.level_gain, self.level_integral,
+            -self.skyhook_pitch * damping * attitude.pitch_rate, dt
+        )
+
+        commands = self.commands
+        for index in range(4):
+            mix = MODAL_MIX[index]
+            command = mix[0] * modal[0] + mix[1] * modal[1] + mix[2] * modal[2]
+            if feedforward is not None:
+                command += feedforward[index]
+            command = 1.0 if command > 1.0 else (-1.0 if command < -1.0 else command)
+            height = heights[index] if fresh else None
+            if height is not None:
+                # Never drive a corner past its travel
+                if command > 0 and height >= self.max_height:
+                    command = 0.0
+                elif command < 0 and height <= self.min_height:
+                    command = 0.0
+            commands[index] = command
+        return commands
+
+    def _mode_output(self, mode, error, gain, integral_gain, skyhook, dt):
+        """
+        PI plus skyhook output of one mode, with conditional integration
+        """
+        integrals = self._integrals
+        candidate = integrals[mode] + integral_gain * error * dt
+        output = gain * error + candidate + skyhook
+        if -1.0 < output < 1.0:
+            integrals[mode] = candidate
+            return output
+        # Saturated: hold the integral
+        return gain * error + integrals[mode] + skyhook
+
+class RideHeightMonitor:
+    def __init__(self, sensors, controller, interval=0.05, clock=time.monotonic):
+        """
+        Polls the corner range sensors off the control loop
+
+        VL53L0X reads block for their timing budget, so they run on
+        their own thread and only the latest heights reach the
+        controller.
+
+        Args:
+            sensors (list): Range sensor per corner (CORNERS order), None
+                            for corners without one
+            controller (SuspensionController): Receives the heights
+            interval (float): Seconds between polling rounds
+            clock (callable): Monotonic time source in seconds
+        """
+        self.sensors = sensors
+        self.controller = controller
+        self.interval = interval
+        self.clock = clock
+        self.failed_reads = 0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def poll(self):
+        """
+        Read every corner once and hand the heights to the controller
+
+        Returns:
+            list: Height per corner (mm), None where unavailable
+        """
+        heights = []
+        for sensor in self.sensors:
+            reading = sensor.read() if sensor is not None else None
+            if reading and reading.get('valid_measurement'):
+                heights.append(float(reading['distance_mm']))
+            else:
+                if sensor is not None:
+                    self.failed_reads += 1
+                heights.append(None)
+        self.controller.set_ride_heights(heights, self.clock())
+        return heights
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='ride-height', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self.poll()
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+class SimulatedSuspensionPlant:
+    """
+    Rigid body on four hydraulic struts, for tuning without hardware.
+
+    Each corner's strut height follows its flow command; roll and pitch
+    follow the height differences across the track and wheelbase.
+    """
+
+    def __init__(self, height=120.0, flow_rate=60.0, track=200.0, wheelbase=300.0):
+        """
+        Args:
+            height (float): Initial corner heights (mm)
+            flow_rate (float): Strut speed at full command (mm/s)
+            track (float): Left-right strut spacing (mm)
+            wheelbase (float): Front-rear strut spacing (mm)
+        """
+        self.heights = [height] * 4
+        self.flow_rate = flow_rate
+        self.track = track
+        self.wheelbase = wheelbase
+        self.roll_rate = 0.0
+        self.pitch_rate = 0.0
+
+    def attitude(self):
+        """
+        Returns:
+            tuple: (roll, pitch) in degrees
+        """
+        fl, fr, rl, rr = self.heights
+        roll = math.degrees(math.atan2((fl + rl) - (fr + rr), 2 * self.track))
+        pitch = math.degrees(math.atan2((fl + fr) - (rl + rr), 2 * self.wheelbase))
+        return roll, pitch
+
+    def step(self, commands, dt, disturbance=None):
+        """
+        Advance the plant
+
+        Args:
+            commands (list): Corner commands (-1 to 1)
+            dt (float): Step length (seconds)
+            disturbance (list, optional): Height change per corner (mm)
+                                          applied this step, e.g. a bump
+
+        Returns:
+            dict: IMU-style reading of the new attitude
+        """
+        roll, pitch = self.attitude()
+        for index in range(4):
+            self.heights[index] += commands[index] * self.flow_rate * dt
+            if disturbance:
+                self.heights[index] += disturbance[index]
+        new_roll, new_pitch = self.attitude()
+        self.roll_rate = (new_roll - roll) / dt
+        self.pitch_rate = (new_pitch - pitch) / dt
+
+        roll_rad, pitch_rad = math.radians(new_roll), math.radians(new_pitch)
+        return {
+            'acceleration': {
+                'x': -math.sin(pitch_rad),
+                'y': math.sin(roll_rad) * math.cos(pitch_rad),
+                'z': math.cos(roll_rad) * math.cos(pitch_rad)
+            },
+            'gyroscope': {'x': self.roll_rate, 'y': self.pitch_rate, 'z': 0.0}
+        }
+
+def main():
+    """
+    Example: level a simulated vehicle parked with its left side high
+    """
+    controller = SuspensionController()
+    plant = SimulatedSuspensionPlant()
+    plant.heights = [140.0, 110.0, 140.0, 110.0]
+    dt = 0.02
+    now = 0.0
+    imu_data = plant.step([0.0] * 4, dt)
+
+    start = time.perf_counter()
+    for step in range(250):
+        controller.set_ride_heights(plant.heights, now)
+        commands = controller.update(imu_data, 0.0, dt, now)
+        imu_data = plant.step(commands, dt)
+        now += dt
+        if step % 50 == 0:
+            roll, pitch = plant.attitude()
+            print(f"t={now:.2f}s roll={roll:+.2f} pitch={pitch:+.2f} "
+                  f"heights={[round(h, 1) for h in plant.heights]}")
+    per_tick = (time.perf_counter() - start) / 250 * 1e6
+    print(f"{per_tick:.1f} us per tick (controller and plant)")
+
+if __name__ == "__main__":
+    main()
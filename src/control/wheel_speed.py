@@ -0,0 +1,358 @@
+import math
+import random
+from bisect import bisect_right
+
+class PIDController:
+    """
+    PID controller with conditional-integration anti-windup.
+
+    The integral is stored as its output contribution, so gains can be
+    rescheduled on the fly without a bump in the output. update() only
+    does float arithmetic on slots and allocates nothing per call.
+    """
+    __slots__ = (
+        'kp', 'ki', 'kd', 'output_min', 'output_max',
+        'integral', '_prev_measurement', '_has_prev'
+    )
+
+    def __init__(self, kp, ki=0.0, kd=0.0, output_min=0.0, output_max=100.0):
+        """
+        Args:
+            kp (float): Proportional gain
+            ki (float): Integral gain (per second)
+            kd (float): Derivative gain (seconds)
+            output_min (float): Lower output clamp
+            output_max (float): Upper output clamp
+        """
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.output_min = output_min
+        self.output_max = output_max
+        self.reset()
+
+    def reset(self):
+        """
+        Clear the integral and derivative history
+        """
+        self.integral = 0.0
+        self._prev_measurement = 0.0
+        self._has_prev = False
+
+    def update(self, setpoint, measurement, dt, feedforward=0.0):
+        """
+        Compute one controller step
+
+        Args:
+            setpoint (float): Desired value
+            measurement (float): Measured value
+            dt (float): Time since the previous update (seconds)
+            feedforward (float): Open-loop output added before clamping
+
+        Returns:
+            float: Clamped controller output
+        """
+        error = setpoint - measurement
+        integral = self.integral + self.ki * error * dt
+
+        # Derivative on measurement avoids a kick on setpoint changes
+        derivative = 0.0
+        if self._has_prev and dt > 0:
+            derivative = -self.kd * (measurement - self._prev_measurement) / dt
+        self._prev_measurement = measurement
+        self._has_prev = True
+
+        output = feedforward + self.kp * error + integral + derivative
+
+        # Only integrate when it does not push further into saturation
+        if output > self.output_max:
+            output = self.output_max
+            if error > 0:
+                integral = self.integral
+        elif output < self.output_min:
+            output = self.output_min
+            if error < 0:
+                integral = self.integral
+
+        self.integral = integral
+        return output
+
+class FeedforwardTable:
+    """
+    Learned duty -> wheel speed map, inverted to give feedforward duty.
+
+    Speeds are kept non-decreasing in duty so the inverse lookup is a
+    bisect plus one linear interpolation.
+    """
+    __slots__ = ('duties', 'speeds', 'learning_rate')
+
+    def __init__(self, duties=None, speeds=None, max_speed=1.0, learning_rate=0.05):
+        """
+        Args:
+            duties (list, optional): Duty breakpoints (%), ascending
+            speeds (list, optional): Wheel speed at each breakpoint (m/s)
+            max_speed (float): Speed at 100% for the default linear table
+            learning_rate (float): Blend factor for learn() updates
+        """
+        if duties is None:
+            duties = [float(d) for d in range(0, 101, 10)]
+        if speeds is None:
+            speeds = [max_speed * d / 100 for d in duties]
+        if len(duties) != len(speeds) or len(duties) < 2:
+            raise ValueError("Feedforward table needs matching duty/speed lists")
+
+        self.duties = list(duties)
+        self.speeds = list(speeds)
+        self.learning_rate = learning_rate
+
+    def duty_for(self, speed):
+        """
+        Duty expected to hold a given wheel speed
+
+        Args:
+            speed (float): Wheel speed magnitude (m/s)
+
+        Returns:
+            float: Duty cycle (%)
+        """
+        speeds = self.speeds
+        if speed <= speeds[0]:
+            return self.duties[0]
+        if speed >= speeds[-1]:
+            return self.duties[-1]
+
+        i = bisect_right(speeds, speed)
+        low, high = speeds[i - 1], speeds[i]
+        if high == low:
+            return self.duties[i]
+        fraction = (speed - low) / (high - low)
+        return self.duties[i - 1] + fraction * (self.duties[i] - self.duties[i - 1])
+
+    def learn(self, duty, speed):
+        """
+        Blend a steady-state (duty, speed) observation into the table
+
+        Args:
+            duty (float): Duty that was applied (%)
+            speed (float): Wheel speed it produced (m/s)
+        """
+        duties = self.duties
+        if duty <= duties[0] or duty >= duties[-1]:
+            i = 0 if duty <= duties[0] else len(duties) - 1
+            self.speeds[i] += self.learning_rate * (speed - self.speeds[i])
+        else:
+            # Spread the correction over the two neighbouring breakpoints
+            i = bisect_right(duties, duty)
+            fraction = (duty - duties[i - 1]) / (duties[i] - duties[i - 1])
+            predicted = self.speeds[i - 1] + fraction * (self.speeds[i] - self.speeds[i - 1])
+            correction = self.learning_rate * (speed - predicted)
+            self.speeds[i - 1] += correction * (1 - fraction)
+            self.speeds[i] += correction * fraction
+
+        # Keep the map monotonic so duty_for() stays well defined
+        for j in range(1, len(self.speeds)):
+            if self.speeds[j] < self.speeds[j - 1]:
+                self.speeds[j] = self.speeds[j - 1]
+
+    def to_dict(self):
+        return {'duties': list(self.duties), 'speeds': list(self.speeds)}
+
+    @classmethod
+    def from_dict(cls, data, learning_rate=0.05):
+        return cls(data['duties'], data['speeds'], learning_rate=learning_rate)
+
+class GainSchedule:
+    """
+    PID gains interpolated against the target wheel speed.
+    """
+    __slots__ = ('speeds', 'kp', 'ki', 'kd')
+
+    def __init__(self, points):
+        """
+        Args:
+            points (list): (speed, kp, ki, kd) tuples
+        """
+        if not points:
+            raise ValueError("Gain schedule needs at least one point")
+        points = sorted(points)
+        self.speeds = [p[0] for p in points]
+        self.kp = [p[1] for p in points]
+        self.ki = [p[2] for p in points]
+        self.kd = [p[3] for p in points]
+
+    def apply(self, pid, speed):
+        """
+        Write the gains for a given speed into a PID controller
+
+        Args:
+            pid (PIDController): Controller to update in place
+            speed (float): Target wheel speed magnitude (m/s)
+        """
+        speeds = self.speeds
+        if speed <= speeds[0]:
+            i, fraction = 0, 0.0
+        elif speed >= speeds[-1]:
+            i, fraction = len(speeds) - 1, 0.0
+        else:
+            i = bisect_right(speeds, speed) - 1
+            fraction = (speed - speeds[i]) / (speeds[i + 1] - speeds[i])
+
+        if fraction == 0.0:
+            pid.kp, pid.ki, pid.kd = self.kp[i], self.ki[i], self.kd[i]
+        else:
+            pid.kp = self.kp[i] + fraction * (self.kp[i + 1] - self.kp[i])
+            pid.ki = self.ki[i] + fraction * (self.ki[i + 1] - self.ki[i])
+            pid.kd = self.kd[i] + fraction * (self.kd[i + 1] - self.kd[i])
+
+class WheelSpeedController:
+    """
+    Closed-loop speed control for one wheel.
+
+    Combines learned feedforward with a scheduled PID correction. The IR
+    speed sensor only reports speed magnitude, so the measurement is
+    signed with the direction the wheel is being driven.
+    """
+    __slots__ = (
+        'pid', 'feedforward', 'schedule', 'learn',
+        'steady_tolerance', 'duty', '_direction'
+    )
+
+    def __init__(self, pid=None, feedforward=None, schedule=None,
+                 learn=True, steady_tolerance=0.05, max_duty=100.0):
+        """
+        Args:
+            pid (PIDController, optional): Feedback controller
+            feedforward (FeedforwardTable, optional): Learned duty map
+            schedule (GainSchedule, optional): Speed-dependent PID gains
+            learn (bool): Update the feedforward table in steady state
+            steady_tolerance (float): Relative speed error treated as steady
+            max_duty (float): Duty clamp (%)
+        """
+        self.pid = pid or PIDController(kp=40.0, ki=120.0, kd=0.0, output_max=max_duty)
+        self.pid.output_min = 0.0
+        self.pid.output_max = max_duty
+        self.feedforward = feedforward or FeedforwardTable()
+        self.schedule = schedule
+        self.learn = learn
+        self.steady_tolerance = steady_tolerance
+        self.duty = 0.0
+        self._direction = 1
+
+    def reset(self):
+        """
+        Reset controller state (e.g. after an emergency stop)
+        """
+        self.pid.reset()
+        self.duty = 0.0
+
+    def update(self, target_speed, measured_speed, dt):
+        """
+        Compute the wheel duty for this control tick
+
+        Args:
+            target_speed (float): Signed wheel speed target (m/s)
+            measured_speed (float): Measured wheel speed magnitude (m/s)
+            dt (float): Time since the previous update (seconds)
+
+        Returns:
+            float: Signed duty (-100 to 100%)
+        """
+        if target_speed == 0:
+            self.reset()
+            return 0.0
+
+        direction = 1 if target_speed > 0 else -1
+        if direction != self._direction:
+            self.pid.reset()
+            self._direction = direction
+
+        target = abs(target_speed)
+        applied = abs(self.duty)
+
+        feedforward = self.feedforward.duty_for(target)
+        if (self.learn and applied > 0
+                and abs(target - measured_speed) <= self.steady_tolerance * target):
+            self.feedforward.learn(applied, measured_speed)
+            # Hand the learned part over from the integral so the output does not jump
+            learned = self.feedforward.duty_for(target)
+            self.pid.integral -= learned - feedforward
+            feedforward = learned
+
+        if self.schedule is not None:
+            self.schedule.apply(self.pid, target)
+
+        duty = self.pid.update(target, measured_speed, dt, feedforward)
+        self.duty = direction * duty
+        return self.duty
+
+class SimulatedWheelPlant:
+    """
+    First-order DC motor and wheel model for tuning without hardware.
+
+    Steady-state speed follows a deadband plus a mildly non-linear duty
+    curve, so the feedforward table has something to learn.
+    """
+
+    def __init__(self, max_speed=1.0, time_constant=0.15, deadband=8.0,
+                 curve=1.3, noise=0.0, load=0.0, seed=0):
+        """
+        Args:
+            max_speed (float): Free-running speed at 100% duty (m/s)
+            time_constant (float): Mechanical time constant (seconds)
+            deadband (float): Duty below which the wheel does not turn (%)
+            curve (float): Exponent of the duty -> speed curve
+            noise (float): Standard deviation of measurement noise (m/s)
+            load (float): Constant speed loss from load/friction (m/s)
+            seed (int): Random seed for reproducible noise
+        """
+        self.max_speed = max_speed
+        self.time_constant = time_constant
+        self.deadband = deadband
+        self.curve = curve
+        self.noise = noise
+        self.load = load
+        self.speed = 0.0
+        self._random = random.Random(seed)
+
+    def steady_speed(self, duty):
+        """
+        Speed the wheel settles at for a constant duty
+
+        Args:
+            duty (float): Signed duty (%)
+
+        Returns:
+            float: Signed wheel speed (m/s)
+        """
+        magnitude = abs(duty)
+        if magnitude <= self.deadband:
+            return 0.0
+        drive = ((magnitude - self.deadband) / (100 - self.deadband)) ** self.curve
+        speed = max(self.max_speed * drive - self.load, 0.0)
+        return speed if duty > 0 else -speed
+
+    def step(self, duty, dt):
+        """
+        Advance the plant
+
+        Args:
+            duty (float): Signed duty applied over the step (%)
+            dt (float): Step length (seconds)
+
+        Returns:
+            float: Signed wheel speed (m/s)
+        """
+        alpha = 1 - math.exp(-dt / self.time_constant)
+        self.speed += alpha * (self.steady_speed(duty) - self.speed)
+        return self.speed
+
+    def measure(self):
+        """
+        Speed magnitude as the IR speed sensor would report it
+
+        Returns:
+            float: Wheel speed magnitude (m/s)
+        """
+        if self.noise:
+            return max(abs(self.speed) + self._random.gauss(0.0, self.noise), 0.0)
+        return abs(self.speed)
@@ -1,5 +1,4 @@
-# import RPi.GPIO as GPIO
-import gpiozero as GPIO
+from .hal import GPIO
 import logging
 
 class GPIOManager:
@@ -13,12 +12,6 @@ class GPIOManager:
         self.config = config
         self.logger = logging.getLogger('GPIOManager')
         
-        # Setup logging
-        logging.basicConfig(
-            level=logging.INFO, 
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        
         # Set GPIO mode
         GPIO.setmode(GPIO.BCM)
         GPIO.setwarnings(False)
@@ -0,0 +1,155 @@
+"""
+Hardware Abstraction Layer
+
+Every device driver in the robotic vehicle project reaches GPIO, I2C,
+serial ports, the CAN bus and the clock through this package instead of
+importing the hardware libraries directly. The active backend is either
+the real Raspberry Pi hardware or an in-process simulator with virtual
+time, selected with the ROBOT_HAL_BACKEND environment variable
+('hardware' or 'sim') or set_backend()/use_simulator().
+"""
+
+import os
+import threading
+
+from .errors import HALError, SerialException, CANError
+
+_backend = None
+_backend_lock = threading.Lock()
+
+def create_backend(name):
+    """
+    Create a backend by name.
+
+    Args:
+        name (str): 'hardware' or 'sim'
+
+    Returns:
+        Backend instance
+    """
+    if name == 'hardware':
+        from .hardware import HardwareBackend
+        return HardwareBackend()
+    if name in ('sim', 'simulator'):
+        from .simulator import SimulatorBackend
+        return SimulatorBackend()
+    raise ValueError(f"Unknown HAL backend: {name}")
+
+def get_backend():
+    """
+    Return the active backend, creating it from ROBOT_HAL_BACKEND on first use.
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend(os.environ.get('ROBOT_HAL_BACKEND', 'hardware'))
+    return _backend
+
+def set_backend(backend):
+    """
+    Replace the active backend.
+
+    Args:
+        backend: Backend instance, or None to fall back to ROBOT_HAL_BACKEND
+
+    Returns:
+        The previous backend (or None)
+    """
+    global _backend
+    with _backend_lock:
+        previous = _backend
+        _backend = backend
+    return previous
+
+def use_simulator(**kwargs):
+    """
+    Install a fresh simulator backend.
+
+    Returns:
+        SimulatorBackend: The new backend, for scripting simulated devices
+    """
+    from .simulator import SimulatorBackend
+    backend = SimulatorBackend(**kwargs)
+    set_backend(backend)
+    return backend
+
+class _GPIOProxy:
+    """
+    RPi.GPIO-compatible module stand-in that forwards to the active backend.
+    """
+
+    def __getattr__(self, name):
+        return getattr(get_backend().gpio, name)
+
+GPIO = _GPIOProxy()
+
+def open_i2c(bus=1):
+    """
+    Open an SMBus-compatible I2C bus.
+    """
+    return get_backend().open_i2c(bus)
+
+def open_vl53l0x(i2c_bus=1, address=0x29):
+    """
+    Open a VL53L0X driver object exposing `range` and `measurement_timing_budget`.
+    """
+    return get_backend().open_vl53l0x(i2c_bus, address)
+
+def open_serial(port, baudrate=9600, timeout=1):
+    """
+    Open a pyserial-compatible serial port.
+
+    Raises:
+        SerialException: If the port cannot be opened
+    """
+    return get_backend().open_serial(port, baudrate, timeout)
+
+def open_can_bus(channel='can0', bitrate=500000):
+    """
+    Open a python-can compatible bus.
+    """
+    return get_backend().open_can_bus(channel, bitrate)
+
+def can_message(arbitration_id, data):
+    """
+    Build a CAN message object for the active backend.
+    """
+    return get_backend().can_message(arbitration_id, data)
+
+def monotonic():
+    """
+    Monotonic time in seconds (virtual under the simulator).
+    """
+    return get_backend().clock.monotonic()
+
+def time():
+    """
+    Wall-clock time in seconds since the epoch (virtual under the simulator).
+    """
+    return get_backend().clock.time()
+
+def sleep(seconds):
+    """
+    Sleep on the backend clock; the simulator advances virtual time instead.
+    """
+    get_backend().clock.sleep(seconds)
+
+__all__ = [
+    'HALError',
+    'SerialException',
+    'CANError',
+    'GPIO',
+    'create_backend',
+    'get_backend',
+    'set_backend',
+    'use_simulator',
+    'open_i2c',
+    'open_vl53l0x',
+    'open_serial',
+    'open_can_bus',
+    'can_message',
+    'monotonic',
+    'time',
+    'sleep'
+]
@@ -0,0 +1,14 @@
+class HALError(Exception):
+    """
+    Base class for hardware abstraction layer errors.
+    """
+
+class SerialException(HALError, IOError):
+    """
+    A serial port could not be opened or used.
+    """
+
+class CANError(HALError, IOError):
+    """
+    A CAN bus operation failed (e.g. bus-off).
+    """
@@ -0,0 +1,63 @@
+import time
+
+from .errors import SerialException
+
+class SystemClock:
+    """
+    Real time source used by the hardware backend.
+    """
+    monotonic = staticmethod(time.monotonic)
+    sleep = staticmethod(time.sleep)
+    time = staticmethod(time.time)
+
+class HardwareBackend:
+    """
+    Backend for the real vehicle.
+
+    Hardware libraries are imported on first use so that importing the
+    HAL never fails on a machine without them.
+    """
+    name = 'hardware'
+
+    def __init__(self):
+        self.clock = SystemClock()
+        self._gpio = None
+        self._can = None
+
+    @property
+    def gpio(self):
+        if self._gpio is None:
+            import RPi.GPIO as GPIO
+            self._gpio = GPIO
+        return self._gpio
+
+    def open_i2c(self, bus):
+        import smbus2
+        return smbus2.SMBus(bus)
+
+    def open_vl53l0x(self, i2c_bus, address):
+        import board
+        import busio
+        import adafruit_vl53l0x
+        i2c = busio.I2C(board.SCL, board.SDA)
+        return adafruit_vl53l0x.VL53L0X(i2c, address=address)
+
+    def open_serial(self, port, baudrate, timeout):
+        import serial
+        try:
+            return serial.Serial(port=port, baudrate=baudrate, timeout=timeout)
+        except serial.SerialException as e:
+            raise SerialException(str(e)) from e
+
+    def _can_module(self):
+        if self._can is None:
+            import can
+            self._can = can
+        return self._can
+
+    def open_can_bus(self, channel, bitrate):
+        can = self._can_module()
+        return can.interface.Bus(channel=channel, bustype='socketcan', bitrate=bitrate)
+
+    def can_message(self, arbitration_id, data):
+        return self._can_module().Message(arbitration_id=arbitration_id, data=data)
@@ -0,0 +1,703 @@
+import heapq
+import itertools
+import struct
+import threading
+import time as _real_time
+from collections import Counter, deque
+
+from .errors import SerialException, CANError
+
+class VirtualClock:
+    """
+    Deterministic simulation clock.
+
+    Time only moves when the owning thread sleeps or calls advance();
+    scheduled callbacks (GPIO edges, device events) run in time order as
+    it passes them. Other threads that sleep wait for virtual time to
+    catch up, bounded by max_real_wait of real time so they can never
+    hang a shutdown.
+    """
+
+    def __init__(self, start=0.0, epoch=1700000000.0, max_real_wait=0.05):
+        """
+        Args:
+            start (float): Initial monotonic time (seconds)
+            epoch (float): Wall-clock time corresponding to monotonic 0
+            max_real_wait (float): Longest real wait for non-owner threads
+        """
+        self._now = start
+        self.epoch = epoch
+        self.max_real_wait = max_real_wait
+        self.owner = threading.get_ident()
+        self._events = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+
+    def monotonic(self):
+        return self._now
+
+    def time(self):
+        return self.epoch + self._now
+
+    def call_at(self, when, callback, *args):
+        """
+        Schedule callback(*args) at a virtual time
+        """
+        with self._condition:
+            heapq.heappush(self._events, (when, next(self._sequence), callback, args))
+
+    def call_later(self, delay, callback, *args):
+        self.call_at(self._now + delay, callback, *args)
+
+    def advance(self, seconds):
+        """
+        Move virtual time forward, running due callbacks in order
+        """
+        self.advance_to(self._now + max(seconds, 0.0))
+
+    def advance_to(self, target):
+        while True:
+            with self._condition:
+                if not self._events or self._events[0][0] > target:
+                    self._now = max(self._now, target)
+                    self._condition.notify_all()
+                    return
+                when, _, callback, args = heapq.heappop(self._events)
+                self._now = max(self._now, when)
+                self._condition.notify_all()
+            # Run outside the lock: callbacks may schedule more events
+            callback(*args)
+
+    def sleep(self, seconds):
+        if threading.get_ident() == self.owner:
+            self.advance(seconds)
+            return
+
+        target = self._now + seconds
+        deadline = _real_time.monotonic() + self.max_real_wait
+        with self._condition:
+            while self._now < target:
+                remaining = deadline - _real_time.monotonic()
+                if remaining <= 0:
+                    return
+                self._condition.wait(remaining)
+
+    def wait_real(self, condition, timeout):
+        """
+        Wait on a device condition for at most max_real_wait real seconds
+        """
+        if timeout is None:
+            timeout = self.max_real_wait
+        condition.wait(min(timeout, self.max_real_wait))
+
+class SimPWM:
+    """
+    RPi.GPIO PWM object stand-in.
+    """
+
+    def __init__(self, gpio, channel, frequency):
+        self._gpio = gpio
+        self.channel = channel
+        self.frequency = frequency
+        self.duty_cycle = 0.0
+        self.running = False
+        gpio.pwm[channel] = self
+
+    def start(self, duty_cycle):
+        self.ChangeDutyCycle(duty_cycle)
+        self.running = True
+
+    def ChangeDutyCycle(self, duty_cycle):
+        if duty_cycle < 0 or duty_cycle > 100:
+            raise ValueError("dutycycle must have a value from 0.0 to 100.0")
+        self.duty_cycle = duty_cycle
+        self._gpio.write_count[self.channel] += 1
+
+    def ChangeFrequency(self, frequency):
+        if frequency <= 0:
+            raise ValueError("frequency must be greater than 0.0")
+        self.frequency = frequency
+
+    def stop(self):
+        self.running = False
+        self.duty_cycle = 0.0
+
+class SimGPIO:
+    """
+    In-process RPi.GPIO-compatible pin model.
+
+    Inputs are driven with set_input() or pulse_train(); edge callbacks
+    fire on the caller's thread at the virtual time of the edge, with
+    bouncetime applied in virtual milliseconds.
+    """
+    BCM = 11
+    BOARD = 10
+    OUT = 0
+    IN = 1
+    LOW = 0
+    HIGH = 1
+    PUD_OFF = 20
+    PUD_DOWN = 21
+    PUD_UP = 22
+    RISING = 31
+    FALLING = 32
+    BOTH = 33
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.mode = None
+        self.warnings = True
+        self.pins = {}
+        self.pwm = {}
+        self.write_count = Counter()
+        self._edge_detect = {}
+        self._lock = threading.RLock()
+
+    # RPi.GPIO API
+
+    def setmode(self, mode):
+        self.mode = mode
+
+    def getmode(self):
+        return self.mode
+
+    def setwarnings(self, flag):
+        self.warnings = flag
+
+    def setup(self, channel, direction, pull_up_down=PUD_OFF, initial=None):
+        for pin in self._channels(channel):
+            if direction == self.OUT:
+                value = self.LOW if initial is None else initial
+            else:
+                value = self.HIGH if pull_up_down == self.PUD_UP else self.LOW
+            self.pins[pin] = {'direction': direction, 'value': value, 'pull': pull_up_down}
+
+    def output(self, channel, value):
+        for pin in self._channels(channel):
+            state = self.pins.get(pin)
+            if state is None or state['direction'] != self.OUT:
+                raise RuntimeError("The GPIO channel has not been set up as an OUTPUT")
+            state['value'] = self.HIGH if value else self.LOW
+            self.write_count[pin] += 1
+
+    def input(self, channel):
+        state = self.pins.get(channel)
+        if state is None:
+            raise RuntimeError("You must setup() the GPIO channel first")
+        return state['value']
+
+    def PWM(self, channel, frequency):
+        return SimPWM(self, channel, frequency)
+
+    def add_event_detect(self, channel, edge, callback=None, bouncetime=None):
+        if channel not in self.pins or self.pins[channel]['direction'] != self.IN:
+            raise RuntimeError("You must setup() the GPIO channel as an input first")
+        if channel in self._edge_detect:
+            raise RuntimeError("Conflicting edge detection already enabled for this GPIO channel")
+        callbacks = [callback] if callback else []
+        self._edge_detect[channel] = {
+            'edge': edge,
+            'callbacks': callbacks,
+            'bouncetime': (bouncetime or 0) / 1000.0,
+            'last_event': None
+        }
+
+    def add_event_callback(self, channel, callback):
+        self._edge_detect[channel]['callbacks'].append(callback)
+
+    def remove_event_detect(self, channel):
+        self._edge_detect.pop(channel, None)
+
+    def cleanup(self, channel=None):
+        if channel is None:
+            self.pins.clear()
+            self.pwm.clear()
+            self._edge_detect.clear()
+            return
+        for pin in self._channels(channel):
+            self.pins.pop(pin, None)
+            self.pwm.pop(pin, None)
+            self._edge_detect.pop(pin, None)
+
+    # Simulation hooks
+
+    def set_input(self, channel, value):
+        """
+        Drive an input pin, firing edge callbacks on a level change
+        """
+        with self._lock:
+            state = self.pins.setdefault(
+                channel, {'direction': self.IN, 'value': self.LOW, 'pull': self.PUD_OFF}
+            )
+            value = self.HIGH if value else self.LOW
+            if state['value'] == value:
+                return
+            state['value'] = value
+
+            detect = self._edge_detect.get(channel)
+            if detect is None:
+                return
+            edge = self.RISING if value == self.HIGH else self.FALLING
+            if detect['edge'] not in (edge, self.BOTH):
+                return
+            now = self.clock.monotonic()
+            last = detect['last_event']
+            if last is not None and now - last < detect['bouncetime'] - 1e-9:
+                return
+            detect['last_event'] = now
+            callbacks = list(detect['callbacks'])
+
+        for callback in callbacks:
+            callback(channel)
+
+    def pulse_train(self, channel, frequency, duration, start=None, width=None):
+        """
+        Schedule a square wave on an input pin
+
+        Args:
+            channel (int): Input pin
+            frequency (float): Pulses per second
+            duration (float): Length of the train (seconds)
+            start (float, optional): Virtual start time, default now
+            width (float, optional): High time per pulse, default half period
+        """
+        if frequency <= 0:
+            return
+        period = 1.0 / frequency
+        width = width or period / 2
+        begin = self.clock.monotonic() if start is None else start
+        for i in range(int(duration * frequency)):
+            rise = begin + i * period
+            self.clock.call_at(rise, self.set_input, channel, 1)
+            self.clock.call_at(rise + width, self.set_input, channel, 0)
+
+    def pin_value(self, channel):
+        return self.pins[channel]['value']
+
+    def pwm_duty(self, channel):
+        pwm = self.pwm.get(channel)
+        return pwm.duty_cycle if pwm else None
+
+    @staticmethod
+    def _channels(channel):
+        if isinstance(channel, (list, tuple)):
+            return channel
+        return (channel,)
+
+class SimI2CDevice:
+    """
+    I2C device modelled as a 256-byte register map.
+    """
+
+    def __init__(self, address, size=256):
+        self.address = address
+        self.registers = bytearray(size)
+        self.read_count = 0
+        self.write_count = 0
+        self.fail_reads = 0
+
+    def read(self, register):
+        if self.fail_reads > 0:
+            self.fail_reads -= 1
+            raise OSError(5, "Input/output error")
+        self.read_count += 1
+        return self.registers[register]
+
+    def write(self, register, value):
+        self.write_count += 1
+        self.registers[register] = value & 0xFF
+        self.on_write(register, value & 0xFF)
+
+    def on_write(self, register, value):
+        """
+        Hook for device side effects of register writes
+        """
+
+    def set_int16(self, register, value):
+        struct.pack_into('>h', self.registers, register, int(value))
+
+    def set_uint16(self, register, value):
+        struct.pack_into('>H', self.registers, register, int(value))
+
+class SimMPU6050(SimI2CDevice):
+    """
+    MPU6050 register map with settable acceleration and rotation.
+    """
+    ADDRESS = 0x68
+    ACCEL_XOUT_H = 0x3B
+    TEMP_OUT_H = 0x41
+    GYRO_XOUT_H = 0x43
+    PWR_MGMT_1 = 0x6B
+    WHO_AM_I = 0x75
+    ACCEL_SCALE = 16384.0
+    GYRO_SCALE = 131.0
+
+    def __init__(self, address=ADDRESS):
+        super().__init__(address)
+        self.registers[self.WHO_AM_I] = 0x68
+        self.registers[self.PWR_MGMT_1] = 0x40  # Sleep bit set at power-up
+        self.set_motion(accel=(0.0, 0.0, 1.0), gyro=(0.0, 0.0, 0.0))
+        self.set_temperature(25.0)
+
+    @property
+    def awake(self):
+        return not self.registers[self.PWR_MGMT_1] & 0x40
+
+    def set_motion(self, accel=None, gyro=None):
+        """
+        Args:
+            accel (tuple, optional): x, y, z acceleration in g
+            gyro (tuple, optional): x, y, z rotation in degrees/sec
+        """
+        if accel is not None:
+            for i, value in enumerate(accel):
+                raw = max(-32768, min(32767, round(value * self.ACCEL_SCALE)))
+                self.set_int16(self.ACCEL_XOUT_H + 2 * i, raw)
+        if gyro is not None:
+            for i, value in enumerate(gyro):
+                raw = max(-32768, min(32767, round(value * self.GYRO_SCALE)))
+                self.set_int16(self.GYRO_XOUT_H + 2 * i, raw)
+
+    def set_temperature(self, celsius):
+        raw = max(-32768, min(32767, round((celsius - 36.53) * 340)))
+        self.set_int16(self.TEMP_OUT_H, raw)
+
+class SimVL53L0X(SimI2CDevice):
+    """
+    VL53L0X register map; the range result lives at RESULT_RANGE_STATUS + 10.
+    """
+    ADDRESS = 0x29
+    IDENTIFICATION_MODEL_ID = 0xC0
+    RESULT_RANGE_MM = 0x14 + 10
+
+    def __init__(self, address=ADDRESS, range_mm=500):
+        super().__init__(address)
+        self.registers[self.IDENTIFICATION_MODEL_ID] = 0xEE
+        self.set_range(range_mm)
+
+    def set_range(self, range_mm):
+        self.set_uint16(self.RESULT_RANGE_MM, max(0, min(65535, int(range_mm))))
+
+class SimI2CBus:
+    """
+    smbus2.SMBus-compatible access to the simulated devices on one bus.
+    """
+
+    def __init__(self, bus, devices):
+        self.bus = bus
+        self.devices = devices
+
+    def _device(self, address):
+        device = self.devices.get(address)
+        if device is None:
+            raise OSError(121, "Remote I/O error")
+        return device
+
+    def read_byte_data(self, i2c_addr, register, force=None):
+        return self._device(i2c_addr).read(register)
+
+    def write_byte_data(self, i2c_addr, register, value, force=None):
+        self._device(i2c_addr).write(register, value)
+
+    def read_i2c_block_data(self, i2c_addr, register, length, force=None):
+        device = self._device(i2c_addr)
+        return [device.read(register + i) for i in range(length)]
+
+    def write_i2c_block_data(self, i2c_addr, register, data, force=None):
+        device = self._device(i2c_addr)
+        for i, value in enumerate(data):
+            device.write(register + i, value)
+
+    def close(self):
+        pass
+
+class SimVL53L0XDriver:
+    """
+    Stand-in for adafruit_vl53l0x.VL53L0X reading the simulated register map.
+
+    A range read costs one measurement timing budget of virtual time.
+    """
+
+    def __init__(self, bus, address, clock):
+        self._bus = bus
+        self._address = address
+        self._clock = clock
+        self.measurement_timing_budget = 33000
+        if bus.read_byte_data(address, SimVL53L0X.IDENTIFICATION_MODEL_ID) != 0xEE:
+            raise RuntimeError("Failed to find expected ID register values. Check wiring!")
+
+    @property
+    def range(self):
+        self._clock.sleep(self.measurement_timing_budget / 1e6)
+        high, low = self._bus.read_i2c_block_data(self._address, SimVL53L0X.RESULT_RANGE_MM, 2)
+        return (high << 8) | low
+
+class SimSerialPort:
+    """
+    pyserial.Serial-compatible end of a simulated serial link.
+    """
+
+    def __init__(self, link, rx, tx, baudrate, timeout, port=None):
+        self._link = link
+        self._rx = rx
+        self._tx = tx
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.is_open = True
+        self.bytes_written = 0
+        self.bytes_read = 0
+
+    @property
+    def in_waiting(self):
+        return len(self._rx)
+
+    def write(self, data):
+        if not self.is_open:
+            raise SerialException("Attempting to use a port that is not open")
+        data = bytes(data)
+        self.bytes_written += len(data)
+        self._link.transfer(self, data)
+        return len(data)
+
+    def _take(self, count):
+        data = bytes(self._rx[:count])
+        del self._rx[:count]
+        self.bytes_read += len(data)
+        return data
+
+    def read(self, size=1):
+        with self._link.condition:
+            if not self._rx:
+                self._link.clock.wait_real(self._link.condition, self.timeout)
+            return self._take(min(size, len(self._rx)))
+
+    def readline(self):
+        with self._link.condition:
+            index = self._rx.find(b'\n')
+            if index < 0:
+                self._link.clock.wait_real(self._link.condition, self.timeout)
+                index = self._rx.find(b'\n')
+            if index < 0:
+                return self._take(len(self._rx))
+            return self._take(index + 1)
+
+    def reset_input_buffer(self):
+        with self._link.condition:
+            self._rx.clear()
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.is_open = False
+
+class SimSerialLink:
+    """
+    Loopback between a host port (the driver) and a device port (the test).
+
+    A responder callable receives each complete line written by the host
+    and may return bytes to send back, which makes request/response
+    devices (AT modules, the Arduino JSON protocol) answer immediately.
+    """
+
+    def __init__(self, name, clock):
+        self.name = name
+        self.clock = clock
+        self.condition = threading.Condition()
+        self._host_rx = bytearray()
+        self._device_rx = bytearray()
+        self._line_buffer = bytearray()
+        self.responder = None
+        self.host = None
+        self.device = SimSerialPort(self, self._device_rx, self._host_rx, 0, 0, name)
+
+    def open_host(self, baudrate, timeout):
+        self.host = SimSerialPort(self, self._host_rx, self._device_rx, baudrate, timeout, self.name)
+        return self.host
+
+    def set_responder(self, responder):
+        self.responder = responder
+
+    def transfer(self, sender, data):
+        reply = b''
+        with self.condition:
+            if sender is self.device:
+                self._host_rx.extend(data)
+            elif self.responder is None:
+                self._device_rx.extend(data)
+            else:
+                self._line_buffer.extend(data)
+                while True:
+                    index = self._line_buffer.find(b'\n')
+                    if index < 0:
+                        break
+                    line = bytes(self._line_buffer[:index + 1])
+                    del self._line_buffer[:index + 1]
+                    reply += self.responder(line) or b''
+                self._host_rx.extend(reply)
+            self.condition.notify_all()
+
+class SimCANMessage:
+    """
+    python-can Message stand-in.
+    """
+    __slots__ = ('arbitration_id', 'data', 'timestamp', 'is_extended_id', 'dlc', 'channel')
+
+    def __init__(self, arbitration_id=0, data=b'', timestamp=0.0, is_extended_id=False, channel=None):
+        self.arbitration_id = arbitration_id
+        self.data = bytearray(data)
+        if len(self.data) > 8:
+            raise ValueError("CAN frame data is limited to 8 bytes")
+        self.timestamp = timestamp
+        self.is_extended_id = is_extended_id
+        self.dlc = len(self.data)
+        self.channel = channel
+
+    def __repr__(self):
+        return (f"SimCANMessage(arbitration_id={self.arbitration_id:#x}, "
+                f"data={bytes(self.data).hex()}, timestamp={self.timestamp:.6f})")
+
+class SimCANNetwork:
+    """
+    Virtual CAN channel connecting every bus opened on it.
+    """
+
+    def __init__(self, channel, clock):
+        self.channel = channel
+        self.clock = clock
+        self.buses = []
+        self.frames_sent = 0
+        self.bus_off = False
+
+    def deliver(self, message, sender):
+        self.frames_sent += 1
+        for bus in list(self.buses):
+            if bus is not sender or bus.receive_own_messages:
+                bus._enqueue(message)
+
+class SimCANBus:
+    """
+    python-can BusABC-compatible endpoint on a SimCANNetwork.
+    """
+
+    def __init__(self, network, bitrate, receive_own_messages=False):
+        self.network = network
+        self.channel_info = f"sim:{network.channel}"
+        self.bitrate = bitrate
+        self.receive_own_messages = receive_own_messages
+        self._queue = deque()
+        self._condition = threading.Condition()
+        self._filters = None
+        self.fail_sends = 0
+        network.buses.append(self)
+
+    @property
+    def state(self):
+        # python-can BusState names
+        return 'ERROR' if self.network.bus_off else 'ACTIVE'
+
+    def send(self, msg, timeout=None):
+        if self.network.bus_off:
+            raise CANError("Bus is in bus-off state")
+        if self.fail_sends > 0:
+            self.fail_sends -= 1
+            raise CANError("Transmit buffer full")
+        msg.timestamp = self.network.clock.time()
+        msg.channel = self.network.channel
+        self.network.deliver(msg, self)
+
+    def _enqueue(self, msg):
+        if not self._matches(msg):
+            return
+        with self._condition:
+            self._queue.append(msg)
+            self._condition.notify()
+
+    def _matches(self, msg):
+        if not self._filters:
+            return True
+        return any(
+            msg.arbitration_id & f['can_mask'] == f['can_id'] & f['can_mask']
+            for f in self._filters
+        )
+
+    def recv(self, timeout=None):
+        with self._condition:
+            if not self._queue:
+                self.network.clock.wait_real(self._condition, timeout)
+            return self._queue.popleft() if self._queue else None
+
+    def set_filters(self, filters=None):
+        self._filters = filters
+
+    def shutdown(self):
+        if self in self.network.buses:
+            self.network.buses.remove(self)
+
+class SimulatorBackend:
+    """
+    Deterministic in-process backend for off-vehicle runs and benchmarks.
+
+    Bus 1 starts with an MPU6050 at 0x68 and a VL53L0X at 0x29; serial
+    ports and CAN channels are created on first open.
+    """
+    name = 'sim'
+
+    def __init__(self, clock=None, max_real_wait=0.05):
+        self.clock = clock or VirtualClock(max_real_wait=max_real_wait)
+        self.gpio = SimGPIO(self.clock)
+        self.i2c_devices = {1: {}}
+        self.add_i2c_device(SimMPU6050())
+        self.add_i2c_device(SimVL53L0X())
+        self.serial_links = {}
+        self.can_networks = {}
+        self.missing_ports = set()
+
+    # I2C
+
+    def add_i2c_device(self, device, bus=1):
+        self.i2c_devices.setdefault(bus, {})[device.address] = device
+        return device
+
+    def i2c_device(self, address, bus=1):
+        return self.i2c_devices[bus][address]
+
+    def open_i2c(self, bus):
+        return SimI2CBus(bus, self.i2c_devices.setdefault(bus, {}))
+
+    def open_vl53l0x(self, i2c_bus, address):
+        return SimVL53L0XDriver(self.open_i2c(i2c_bus), address, self.clock)
+
+    # Serial
+
+    def serial_link(self, port):
+        link = self.serial_links.get(port)
+        if link is None:
+            link = self.serial_links[port] = SimSerialLink(port, self.clock)
+        return link
+
+    def serial_device(self, port):
+        """
+        Device-side end of a serial port, for scripting the peer
+        """
+        return self.serial_link(port).device
+
+    def open_serial(self, port, baudrate, timeout):
+        if port in self.missing_ports:
+            raise SerialException(f"could not open port {port}: No such file or directory")
+        return self.serial_link(port).open_host(baudrate, timeout)
+
+    # CAN
+
+    def can_network(self, channel):
+        network = self.can_networks.get(channel)
+        if network is None:
+            network = self.can_networks[channel] = SimCANNetwork(channel, self.clock)
+        return network
+
+    def open_can_bus(self, channel, bitrate):
+        return SimCANBus(self.can_network(channel), bitrate)
+
+    def can_message(self, arbitration_id, data):
+        return SimCANMessage(arbitration_id=arbitration_id, data=data)
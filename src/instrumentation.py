@@ -0,0 +1,461 @@
+import functools
+import importlib
+import json
+import logging
+import sys
+import threading
+import time
+from collections import Counter
+
+# Log-linear buckets: 2**SUB_BUCKET_BITS sub-buckets per power of two,
+# about 6% relative precision over 1 ns .. 2**50 ns
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+BUCKET_COUNT = SUB_BUCKETS * 52
+
+# Methods wrapped by Instrumentation.instrument_hot_paths()
+HOT_PATHS = (
+    ('.sensors.mpu6050', 'MPU6050', 'read_raw_data', 'imu.read_raw_data'),
+    ('.sensors.vl53l0x_lidar', 'VL53L0XLidar', 'read', 'lidar.read'),
+    ('.actuators.differential_drive', 'DifferentialDrive', 'update', 'drive.update'),
+    ('.communication.can_interface', 'CANInterface', 'send_message', 'can.send_message'),
+    ('.communication.arduino_interface', 'ArduinoInterface', 'send_command', 'arduino.send_command'),
+    ('.vehicle_control', 'VehicleController', 'control_tick', 'control.tick')
+)
+
+def _bucket_index(value_ns):
+    if value_ns < SUB_BUCKETS:
+        return max(value_ns, 0)
+    shift = value_ns.bit_length() - SUB_BUCKET_BITS - 1
+    index = SUB_BUCKETS * (shift + 1) + (value_ns >> shift) - SUB_BUCKETS
+    return min(index, BUCKET_COUNT - 1)
+
+def _bucket_upper(index):
+    if index < SUB_BUCKETS:
+        return index
+    shift = index // SUB_BUCKETS - 1
+    mantissa = index % SUB_BUCKETS + SUB_BUCKETS
+    return ((mantissa + 1) << shift) - 1
+
+class LatencyHistogram:
+    __slots__ = ('name', 'counts', 'count', 'total_ns', 'min_ns', 'max_ns', '_lock')
+
+    def __init__(self, name=''):
+        """
+        HDR-style latency histogram with fixed log-linear buckets
+
+        Recording is O(1) with no allocation; percentiles are resolved to
+        the upper edge of their bucket.
+
+        Args:
+            name (str): Metric name
+        """
+        self.name = name
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+        self._lock = threading.Lock()
+
+    def record_ns(self, value_ns):
+        with self._lock:
+            self.counts[_bucket_index(value_ns)] += 1
+            self.count += 1
+            self.total_ns += value_ns
+            if self.min_ns is None or value_ns < self.min_ns:
+                self.min_ns = value_ns
+            if value_ns > self.max_ns:
+                self.max_ns = value_ns
+
+    def record(self, seconds):
+        self.record_ns(int(seconds * 1e9))
+
+    def percentile(self, percent):
+        """
+        Args:
+            percent (float): 0 to 100
+
+        Returns:
+            int: Latency in nanoseconds (0 if empty)
+        """
+        with self._lock:
+            if not self.count:
+                return 0
+            target = max(1, -(-self.count * percent // 100))
+            seen = 0
+            for index, bucket_count in enumerate(self.counts):
+                seen += bucket_count
+                if seen >= target:
+                    return min(_bucket_upper(index), self.max_ns)
+            return self.max_ns
+
+    def merge(self, other):
+        with self._lock:
+            for index, bucket_count in enumerate(other.counts):
+                self.counts[index] += bucket_count
+            self.count += other.count
+            self.total_ns += other.total_ns
+            if other.min_ns is not None and (self.min_ns is None or other.min_ns < self.min_ns):
+                self.min_ns = other.min_ns
+            self.max_ns = max(self.max_ns, other.max_ns)
+
+    def reset(self):
+        with self._lock:
+            self.counts = [0] * BUCKET_COUNT
+            self.count = 0
+            self.total_ns = 0
+            self.min_ns = None
+            self.max_ns = 0
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: count, mean/min/p50/p90/p99/p999/max in microseconds
+        """
+        snapshot = {'count': self.count}
+        snapshot['mean_us'] = self.total_ns / self.count / 1000 if self.count else 0.0
+        snapshot['min_us'] = (self.min_ns or 0) / 1000
+        for label, percent in (('p50', 50), ('p90', 90), ('p99', 99), ('p999', 99.9)):
+            snapshot[f'{label}_us'] = self.percentile(percent) / 1000
+        snapshot['max_us'] = self.max_ns / 1000
+        return snapshot
+
+class _Timer:
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.histogram.record_ns(time.perf_counter_ns() - self.start)
+        return False
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+class OverrunProfiler:
+    def __init__(self, duration=0.5, interval=0.001, cooldown=10.0, on_report=None):
+        """
+        Sampling profiler armed by a control loop overrun
+
+        On trigger a background thread samples the loop thread's stack
+        every interval for duration seconds and reports the collapsed
+        stacks (flamegraph format, most frequent first).
+
+        Args:
+            duration (float): Sampling window after an overrun (seconds)
+            interval (float): Stack sample period (seconds)
+            cooldown (float): Minimum time between profiles (seconds)
+            on_report (callable, optional): Called with the report dict;
+                                            defaults to logging a summary
+        """
+        self.duration = duration
+        self.interval = interval
+        self.cooldown = cooldown
+        self.on_report = on_report
+        self.logger = logging.getLogger('OverrunProfiler')
+
+        self.reports = []
+        self._last_trigger = None
+        self._thread = None
+
+    @property
+    def busy(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def trigger(self, thread_id=None, reason=''):
+        """
+        Start profiling a thread unless a profile ran recently
+
+        Args:
+            thread_id (int, optional): Thread to sample, defaults to the caller
+            reason (str): Recorded in the report
+
+        Returns:
+            bool: True if profiling started
+        """
+        now = time.monotonic()
+        if self.busy or (self._last_trigger is not None and now - self._last_trigger < self.cooldown):
+            return False
+        self._last_trigger = now
+        if thread_id is None:
+            thread_id = threading.get_ident()
+
+        self._thread = threading.Thread(
+            target=self._sample, args=(thread_id, reason), name='overrun-profiler', daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def wait(self, timeout=None):
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _sample(self, thread_id, reason):
+        stacks = Counter()
+        samples = 0
+        deadline = time.monotonic() + self.duration
+        while time.monotonic() < deadline:
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                break
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno})")
+                frame = frame.f_back
+            stacks[';'.join(reversed(names))] += 1
+            samples += 1
+            del frame
+            time.sleep(self.interval)
+
+        report = {
+            'reason': reason,
+            'timestamp': time.time(),
+            'samples': samples,
+            'stacks': stacks.most_common()
+        }
+        self.reports.append(report)
+        if self.on_report:
+            self.on_report(report)
+        elif stacks:
+            top, top_count = stacks.most_common(1)[0]
+            self.logger.warning(
+                f"Overrun profile ({reason}): {samples} samples, hottest "
+                f"{100 * top_count / samples:.0f}%: {top.rsplit(';', 1)[-1]}"
+            )
+
+    @staticmethod
+    def collapsed(report):
+        """
+        Args:
+            report (dict): Report from the profiler
+
+        Returns:
+            str: 'frame;frame;frame count' lines for flamegraph tools
+        """
+        return '\n'.join(f"{stack} {count}" for stack, count in report['stacks'])
+
+class Instrumentation:
+    def __init__(self, enabled=False):
+        """
+        Registry of latency histograms for the hot paths
+
+        When disabled the decorators and timers cost one attribute check
+        and the method wrappers from instrument() are not installed at all.
+
+        Args:
+            enabled (bool): Start recording immediately
+        """
+        self.enabled = enabled
+        self.histograms = {}
+        self.profiler = None
+        self.overruns = Counter()
+        self._patched = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(name, LatencyHistogram(name))
+        return histogram
+
+    def timer(self, name):
+        """
+        Context manager timing a block
+
+        Args:
+            name (str): Histogram name
+
+        Returns:
+            Context manager (a shared no-op when disabled)
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self.histogram(name))
+
+    def timed(self, name=None):
+        """
+        Decorator timing every call of a function
+
+        Args:
+            name (str, optional): Histogram name, defaults to the qualified name
+        """
+        def _decorator(function):
+            label = name or function.__qualname__
+
+            @functools.wraps(function)
+            def _wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                start = time.perf_counter_ns()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.histogram(label).record_ns(time.perf_counter_ns() - start)
+
+            return _wrapper
+        return _decorator
+
+    def instrument(self, owner, attribute, name=None):
+        """
+        Wrap an existing method in place (undone by uninstrument_all)
+
+        Args:
+            owner (type): Class (or module) holding the function
+            attribute (str): Function name
+            name (str, optional): Histogram name
+        """
+        key = (owner, attribute)
+        if key in self._patched:
+            return
+        original = getattr(owner, attribute)
+        histogram = self.histogram(name or f"{owner.__name__}.{attribute}")
+
+        @functools.wraps(original)
+        def _wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                histogram.record_ns(time.perf_counter_ns() - start)
+
+        self._patched[key] = original
+        setattr(owner, attribute, _wrapper)
+
+    def instrument_hot_paths(self):
+        """
+        Wrap the sensor, motor, bus and control tick hot paths (HOT_PATHS)
+        """
+        for module_name, class_name, attribute, name in HOT_PATHS:
+            module = importlib.import_module(module_name, __package__)
+            self.instrument(getattr(module, class_name), attribute, name)
+
+    def uninstrument_all(self):
+        for (owner, attribute), original in self._patched.items():
+            setattr(owner, attribute, original)
+        self._patched.clear()
+
+    def enable(self, hot_paths=True):
+        """
+        Start recording
+
+        Args:
+            hot_paths (bool): Also wrap the HOT_PATHS methods
+        """
+        self.enabled = True
+        if hot_paths:
+            self.instrument_hot_paths()
+
+    def disable(self):
+        """
+        Stop recording and remove all method wrappers
+        """
+        self.enabled = False
+        self.uninstrument_all()
+
+    def record_loop(self, name, duration, budget):
+        """
+        Record one loop iteration and react to an overrun
+
+        Args:
+            name (str): Loop histogram name
+            duration (float): Iteration time (seconds)
+            budget (float): Loop period (seconds)
+
+        Returns:
+            bool: True if the iteration overran its budget
+        """
+        if not self.enabled:
+            return duration > budget
+        self.histogram(name).record(duration)
+        if duration <= budget:
+            return False
+        self.overruns[name] += 1
+        if self.profiler:
+            self.profiler.trigger(reason=f"{name} took {duration * 1000:.2f} ms of {budget * 1000:.2f} ms")
+        return True
+
+    def reset(self):
+        for histogram in list(self.histograms.values()):
+            histogram.reset()
+        self.overruns.clear()
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: Histogram snapshots by name, plus overrun counts
+        """
+        return {
+            'histograms': {
+                name: histogram.snapshot()
+                for name, histogram in sorted(self.histograms.items())
+            },
+            'overruns': dict(self.overruns)
+        }
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self, prefix='vehicle'):
+        """
+        Histograms as Prometheus summaries (quantiles in seconds)
+        """
+        metric = f"{prefix}_latency_seconds"
+        lines = [
+            f"# HELP {metric} Hot path latency",
+            f"# TYPE {metric} summary"
+        ]
+        for name, histogram in sorted(self.histograms.items()):
+            for quantile in (0.5, 0.9, 0.99, 0.999):
+                value = histogram.percentile(quantile * 100) / 1e9
+                lines.append(f'{metric}{{path="{name}",quantile="{quantile}"}} {value}')
+            lines.append(f'{metric}_sum{{path="{name}"}} {histogram.total_ns / 1e9}')
+            lines.append(f'{metric}_count{{path="{name}"}} {histogram.count}')
+        for name, count in sorted(self.overruns.items()):
+            lines.append(f'{prefix}_loop_overruns_total{{loop="{name}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+# Process-wide registry used by the decorators in the drivers
+registry = Instrumentation()
+
+def main():
+    """
+    Example usage of the instrumentation registry
+    """
+    registry.enable(hot_paths=False)
+    registry.profiler = OverrunProfiler(duration=0.2)
+
+    @registry.timed('example.work')
+    def work(n):
+        return sum(range(n))
+
+    for n in range(1000):
+        work(n * 10)
+
+    budget = 0.005
+    for _ in range(20):
+        start = time.perf_counter()
+        with registry.timer('example.tick'):
+            work(50000)
+        registry.record_loop('example.loop', time.perf_counter() - start, budget)
+
+    registry.profiler.wait()
+    print(registry.to_json())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+import atexit
+import json
+import logging
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+class DropCountingQueueHandler(QueueHandler):
+    def __init__(self, log_queue):
+        """
+        Queue handler that never blocks the logging thread
+
+        Records that do not fit in the bounded queue are dropped and
+        counted; once there is room again a single WARNING record reports
+        how many were lost.
+
+        Args:
+            log_queue (queue.Queue): Bounded queue shared with the listener
+        """
+        super().__init__(log_queue)
+        self.dropped = 0
+        self.enqueued = 0
+        self.max_depth = 0
+        self._unreported = 0
+        self._lock = threading.Lock()
+
+    def enqueue(self, record):
+        with self._lock:
+            if self._unreported:
+                try:
+                    self.queue.put_nowait(self._drop_record(self._unreported))
+                    self._unreported = 0
+                except queue.Full:
+                    pass
+            try:
+                self.queue.put_nowait(record)
+                self.enqueued += 1
+            except queue.Full:
+                self.dropped += 1
+                self._unreported += 1
+                return
+            depth = self.queue.qsize()
+            if depth > self.max_depth:
+                self.max_depth = depth
+
+    def _drop_record(self, count):
+        return logging.LogRecord(
+            'LoggingPipeline', logging.WARNING, __file__, 0,
+            f"Log queue full: dropped {count} record(s)", None, None
+        )
+
+class SizeAndTimeRotatingFileHandler(RotatingFileHandler):
+    def __init__(self, filename, max_bytes=10 * 1024 * 1024, backup_count=5,
+                 interval=24 * 3600, encoding='utf-8', clock=time.time):
+        """
+        Rotate the log file when it grows past max_bytes or every interval
+
+        Args:
+            filename (str): Log file path
+            max_bytes (int): Size limit per file (0 disables size rotation)
+            backup_count (int): Rotated files kept (.1 is the newest)
+            interval (float): Time between rotations in seconds (0 disables)
+            encoding (str): File encoding
+            clock (callable): Wall-clock time source
+        """
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding=encoding)
+        self.interval = interval
+        self.clock = clock
+        self.rollover_at = self._next_rollover()
+
+    def _next_rollover(self):
+        if not self.interval:
+            return None
+        return self.clock() + self.interval
+
+    def shouldRollover(self, record):
+        if self.rollover_at is not None and self.clock() >= self.rollover_at:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        self.rollover_at = self._next_rollover()
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Compact one-object-per-line output for machine parsing.
+    """
+
+    def format(self, record):
+        entry = {
+            't': round(record.created, 6),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'msg': record.getMessage()
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, separators=(',', ':'), default=str)
+
+class _DrainingQueueListener(QueueListener):
+    def enqueue_sentinel(self):
+        # The listener is still draining, so a blocking put always gets room
+        self.queue.put(self._sentinel)
+
+class LoggingPipeline:
+    def __init__(self, handlers, queue_size=10000, level=logging.INFO):
+        """
+        Asynchronous logging: callers enqueue, one thread does the I/O
+
+        Args:
+            handlers (list): Output handlers run on the listener thread
+            queue_size (int): Records buffered before new ones are dropped
+            level (int): Root logger level
+        """
+        self.handlers = list(handlers)
+        self.level = level
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.queue_handler = DropCountingQueueHandler(self.queue)
+        self.listener = _DrainingQueueListener(self.queue, *self.handlers, respect_handler_level=True)
+
+        self._previous_handlers = None
+        self._previous_level = None
+        self.running = False
+
+    def start(self):
+        """
+        Route the root logger through the queue
+        """
+        if self.running:
+            return
+        root = logging.getLogger()
+        self._previous_handlers = root.handlers[:]
+        self._previous_level = root.level
+        for handler in self._previous_handlers:
+            root.removeHandler(handler)
+        root.addHandler(self.queue_handler)
+        root.setLevel(self.level)
+
+        self.listener.start()
+        self.running = True
+        atexit.register(self.stop)
+
+    def stop(self):
+        """
+        Flush queued records, close the handlers and restore the root logger
+        """
+        if not self.running:
+            return
+        self.running = False
+        atexit.unregister(self.stop)
+
+        root = logging.getLogger()
+        root.removeHandler(self.queue_handler)
+        self.listener.stop()
+
+        dropped = self.queue_handler._unreported
+        for handler in self.handlers:
+            if dropped:
+                handler.handle(self.queue_handler._drop_record(dropped))
+            handler.flush()
+            handler.close()
+
+        for handler in self._previous_handlers:
+            root.addHandler(handler)
+        root.setLevel(self._previous_level)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Records enqueued and dropped, current and peak queue depth
+        """
+        return {
+            'enqueued': self.queue_handler.enqueued,
+            'dropped': self.queue_handler.dropped,
+            'queue_depth': self.queue.qsize(),
+            'max_queue_depth': self.queue_handler.max_depth,
+            'queue_size': self.queue.maxsize
+        }
@@ -1,9 +1,15 @@
 import sys
 import logging
 import signal
-from utils import ConfigManager, LoggingManager
-from gpio_setup import GPIOManager
-from vehicle_control import VehicleController
+import threading
+import time
+from . import hal
+from .instrumentation import registry, OverrunProfiler
+from .utils import LoggingManager
+from .settings import load_settings, ConfigWatcher, ConfigError
+from .gpio_setup import GPIOManager
+from .vehicle_control import VehicleController
+from .bringup import BringUpOrchestrator, BringUpError
 
 class RoboticVehicleApp:
     def __init__(self):
@@ -14,34 +20,422 @@ class RoboticVehicleApp:
         LoggingManager.setup_logging()
         self.logger = logging.getLogger('RoboticVehicleApp')
         
-        # Load configuration
-        self.config = ConfigManager.load_config()
-        if not self.config:
-            self.logger.critical("Failed to load configuration. Exiting.")
+        # Load and validate the layered configuration
+        try:
+            self.config = load_settings()
+        except ConfigError as e:
+            self.logger.critical(f"Invalid configuration: {e}. Exiting.")
             sys.exit(1)
+        self.config_watcher = ConfigWatcher(self.config)
+        self._stop_event = threading.Event()
+        
+        # Bring up devices in parallel, in dependency order
+        try:
+            self.devices = self.bring_up_devices()
+        except BringUpError as e:
+            self.logger.critical(f"Device bring-up failed: {e}. Exiting.")
+            sys.exit(1)
+        self.gpio_manager = self.devices['gpio']
+        
+        # A gyro recalibration started during bring-up must finish before
+        # anything drives: a bias measured in motion would be cached
+        self.calibration_store.wait()
         
-        # Initialize GPIO
-        self.gpio_manager = GPIOManager(self.config)
-        self.setup_gpio()
+        # Optional multi-process state bus: IMU sampling moves to its own process
+        self.state_bus = None
+        self.launcher = None
+        imu_sensor = self.devices['imu_calibrated']
+        if self.config.state_bus.enabled:
+            imu_sensor = self.start_state_bus(imu_sensor)
         
         # Initialize Vehicle Controller
-        self.vehicle_controller = VehicleController(self.config)
+        self.vehicle_controller = VehicleController(
+            self.config,
+            imu_sensor=imu_sensor,
+            drive_train=self.devices['drive_train'],
+            bluetooth_controller=self.devices['bluetooth'],
+            calibrate=False
+        )
+        self.vehicle_controller.calibration_store = self.calibration_store
+        self.config_watcher.subscribe(self.vehicle_controller.apply_config)
+        
+        # Optional hot path latency histograms and overrun profiling
+        instrumentation = self.config.instrumentation
+        if instrumentation.enabled:
+            if instrumentation.profile_on_overrun:
+                registry.profiler = OverrunProfiler(duration=instrumentation.profile_duration)
+            registry.enable(hot_paths=instrumentation.hot_paths)
+        
+        # Optional system metrics endpoint (CPU, thermal throttling, I/O)
+        self.metrics_sampler = None
+        self.metrics_server = None
+        if self.config.metrics.enabled:
+            self.start_metrics()
+        
+        # Optional columnar telemetry of IMU readings and wheel commands
+        self.telemetry = None
+        if self.config.telemetry.enabled:
+            self.start_telemetry()
+        
+        # Optional process pool for heavy jobs (map updates, calibration fits, log analysis)
+        self.offload = None
+        if self.config.offload.enabled:
+            self.start_offload()
+        
+        # Optional joystick teleoperation over the Bluetooth link
+        self.teleop = None
+        if self.config.teleop.enabled:
+            self.start_teleop()
+        
+        # Optional status downlink over the Bluetooth link
+        self.downlink = None
+        if self.config.downlink.enabled:
+            self.start_downlink()
+        
+        # Optional reconnecting supervision of the communication links
+        self.supervisor = None
+        if self.config.supervisor.enabled:
+            self.start_supervisor()
+        
+        # Optional heartbeat watchdog that stops the motors if the loop hangs
+        self.watchdog = None
+        if self.config.watchdog.enabled:
+            self.start_watchdog()
         
         # Setup signal handlers for graceful shutdown
         self.setup_signal_handlers()
     
+    def bring_up_devices(self):
+        """
+        Initialize hardware concurrently through the bring-up orchestrator
+        
+        The serial links dominate boot time, so they run alongside GPIO
+        and IMU setup instead of after them. Optional links (Arduino, CAN)
+        are only brought up when configured and may fail without stopping
+        the vehicle.
+        
+        Returns:
+            dict: Initialized devices by name
+        """
+        from .sensors.mpu6050 import MPU6050Sensor
+        from .actuators.differential_drive import DifferentialDrive
+        from .communication.bluetooth_controller import BluetoothController
+        from .sensors.calibration_store import CalibrationStore
+        
+        self.calibration_store = CalibrationStore.from_config(self.config.calibration)
+        communication = self.config.communication
+        bringup_config = self.config.bringup
+        motor_pins = self.config.gpio.dc_motor_pins
+        orchestrator = BringUpOrchestrator(max_workers=bringup_config.max_workers)
+        
+        def _gpio(deps):
+            manager = GPIOManager(self.config)
+            self.gpio_manager = manager
+            self.setup_gpio()
+            return manager
+        
+        def _calibrate_imu(deps):
+            # Cached calibration when valid, full calibration in the background otherwise
+            self.calibration_store.restore(deps['imu'])
+            return deps['imu']
+        
+        orchestrator.add('gpio', _gpio)
+        orchestrator.add('imu', lambda deps: MPU6050Sensor(), retries=2)
+        orchestrator.add('imu_calibrated', _calibrate_imu, depends_on=['imu'])
+        orchestrator.add(
+            'drive_train',
+            lambda deps: DifferentialDrive.from_pins(motor_pins.left.pins, motor_pins.right.pins),
+            depends_on=['gpio']
+        )
+        orchestrator.add(
+            'bluetooth',
+            lambda deps: BluetoothController(**communication.bluetooth.to_dict()),
+            timeout=bringup_config.serial_timeout,
+            retries=bringup_config.serial_retries
+        )
+        
+        if communication.arduino:
+            from .communication.arduino_interface import ArduinoInterface
+            orchestrator.add(
+                'arduino',
+                lambda deps: ArduinoInterface(**communication.arduino.to_dict()),
+                timeout=bringup_config.serial_timeout,
+                retries=bringup_config.serial_retries,
+                required=False
+            )
+        if communication.can:
+            from .communication.can_interface import CANInterface
+            orchestrator.add(
+                'can',
+                lambda deps: CANInterface(**communication.can.to_dict()),
+                retries=1,
+                required=False
+            )
+        
+        return orchestrator.run()
+    
+    def start_metrics(self):
+        """
+        Start the system metrics sampler and its HTTP endpoint
+        """
+        from .system_metrics import SystemMetricsSampler, MetricsServer
+        
+        metrics = self.config.metrics
+        self.metrics_sampler = SystemMetricsSampler(capacity=metrics.history)
+        self.metrics_sampler.start(interval=metrics.interval)
+        try:
+            sources = [registry.to_prometheus] if registry.enabled else []
+            self.metrics_server = MetricsServer(
+                self.metrics_sampler, host=metrics.host, port=metrics.port,
+                unix_path=metrics.unix_path, sources=sources
+            )
+            self.metrics_server.start()
+        except OSError as e:
+            self.logger.error(f"Metrics endpoint unavailable: {e}")
+    
+    def start_telemetry(self):
+        """
+        Open a telemetry run and attach it to the vehicle controller
+        """
+        from .telemetry import TelemetryRecorder
+        
+        telemetry = self.config.telemetry
+        try:
+            self.telemetry = TelemetryRecorder(
+                telemetry.directory,
+                chunk_records=telemetry.chunk_records,
+                flush_records=telemetry.flush_records,
+                flush_interval=telemetry.flush_interval
+            )
+        except OSError as e:
+            self.logger.error(f"Telemetry recording unavailable: {e}")
+            return
+        self.telemetry.start()
+        self.vehicle_controller.attach_telemetry(self.telemetry)
+        self.logger.info(f"Recording telemetry to {self.telemetry.directory}")
+    
+    def start_offload(self):
+        """
+        Start the compute offload workers
+        
+        With telemetry recording, the workers also summarize the
+        `summary_channel` records flushed during the latest
+        `summary_interval` seconds; a summary not collected within one
+        interval is dropped.
+        """
+        from .compute_offload import ComputeOffload
+        
+        offload_config = self.config.offload
+        self.offload = ComputeOffload(
+            max_workers=offload_config.max_workers,
+            cores=offload_config.cores(),
+            nice=offload_config.nice,
+            clock=hal.monotonic
+        )
+        # Workers start here, before the loop, not inside its first submit()
+        if not self.offload.start():
+            self.logger.warning("Compute offload workers not ready, the first jobs may stall the loop")
+        self.summary_interval = offload_config.summary_interval
+        self._next_summary = hal.monotonic() + self.summary_interval
+        self.telemetry_summary = None
+        
+        def _apply_interval(config, changed):
+            self.summary_interval = config.offload.summary_interval
+        self.config_watcher.subscribe(_apply_interval)
+        self.logger.info(f"Compute offload started ({offload_config.max_workers} workers)")
+    
+    def poll_offload(self):
+        """
+        Take finished offload results and queue the periodic telemetry
+        summary; never waits for a worker
+        """
+        from .compute_offload import channel_summary
+        
+        self.offload.collect()
+        if not self.telemetry:
+            return
+        now = hal.monotonic()
+        if now < self._next_summary or self.offload.busy('telemetry.summary'):
+            return
+        self._next_summary = now + self.summary_interval
+        start = self.telemetry.clock() - self.summary_interval
+        self.offload.submit(
+            'telemetry.summary', channel_summary,
+            self.telemetry.directory, self.config.offload.summary_channel, start,
+            deadline=self.summary_interval, callback=self._store_summary
+        )
+    
+    def _store_summary(self, job):
+        self.telemetry_summary = job.result
+        self.logger.debug(f"Telemetry summary: {job.result}")
+    
+    def start_teleop(self):
+        """
+        Start the teleop reader on the Bluetooth serial link
+        """
+        from .communication.teleop_channel import TeleopChannel
+        
+        self.teleop = TeleopChannel.from_controller(
+            self.devices['bluetooth'], timeout=self.config.teleop.timeout
+        )
+        self.teleop.start()
+        
+        def _apply_timeout(config, changed):
+            self.teleop.timeout = config.teleop.timeout
+        self.config_watcher.subscribe(_apply_timeout)
+        self.logger.info("Teleop channel listening")
+    
+    def start_downlink(self):
+        """
+        Start the telemetry downlink sender on the Bluetooth serial link
+        """
+        from .communication.telemetry_downlink import TelemetryDownlink
+        
+        downlink_config = self.config.downlink
+        self.downlink = TelemetryDownlink.from_controller(
+            self.devices['bluetooth'],
+            rate=downlink_config.rate,
+            min_rate=downlink_config.min_rate,
+            max_rate=downlink_config.max_rate,
+            keyframe_interval=downlink_config.keyframe_interval
+        )
+        self.downlink.start()
+        
+        def _apply_rates(config, changed):
+            min_rate, max_rate = config.downlink.min_rate, config.downlink.max_rate
+            self.downlink.min_rate = min_rate
+            self.downlink.max_rate = max_rate
+            self.downlink.rate = max(min_rate, min(max_rate, self.downlink.rate))
+        self.config_watcher.subscribe(_apply_rates)
+        self.logger.info("Telemetry downlink sending")
+    
+    def start_supervisor(self):
+        """
+        Supervise the Bluetooth, Arduino and CAN links
+        
+        Links that failed bring-up are retried in the background; the
+        teleop reader and downlink follow the Bluetooth port when it is
+        reopened.
+        """
+        from .communication.link_supervisor import LinkSupervisor, default_activity
+        from .communication.arduino_interface import ArduinoInterface
+        from .communication.can_interface import CANInterface
+        
+        supervisor_config = self.config.supervisor
+        communication = self.config.communication
+        self.supervisor = LinkSupervisor(
+            check_interval=supervisor_config.check_interval,
+            backoff=supervisor_config.backoff,
+            max_backoff=supervisor_config.max_backoff
+        )
+        
+        def _rebind_bluetooth(bluetooth):
+            for user in (self.teleop, self.downlink):
+                if user:
+                    user.serial_conn = bluetooth.serial_conn
+        
+        # Teleop traffic is the Bluetooth link's heartbeat when enabled
+        teleop = self.teleop
+        self.supervisor.add_link(
+            'bluetooth', self.devices['bluetooth'],
+            stall_timeout=supervisor_config.stall_timeout if teleop else None,
+            activity=(lambda bluetooth: teleop.parser.frames) if teleop else default_activity,
+            on_reconnect=_rebind_bluetooth
+        )
+        if communication.arduino:
+            self.supervisor.add_link(
+                'arduino', self.devices.get('arduino'),
+                factory=lambda: ArduinoInterface(**communication.arduino.to_dict())
+            )
+        if communication.can:
+            self.supervisor.add_link(
+                'can', self.devices.get('can'),
+                factory=lambda: CANInterface(**communication.can.to_dict())
+            )
+        self.supervisor.start()
+        self.logger.info(f"Supervising links: {', '.join(self.supervisor.links)}")
+    
+    def start_state_bus(self, imu_sensor):
+        """
+        Create the shared-memory state bus and move IMU acquisition to
+        its own process, pinned to its own core
+        
+        Args:
+            imu_sensor (MPU6050Sensor): Calibrated IMU of this process;
+                                        its bias is handed to the worker
+        
+        Returns:
+            BusIMUReader: Drop-in IMU for the controller
+        """
+        from .state_bus import StateBus, ProcessLauncher, BusIMUReader, imu_acquisition, pin_to_cores
+        
+        bus_config = self.config.state_bus
+        # The worker takes over the sensor, so the bias must be final
+        self.calibration_store.wait()
+        self.state_bus = StateBus.create(name=bus_config.name)
+        self.launcher = ProcessLauncher(bus_config.name)
+        acquisition_core = bus_config.acquisition_core
+        self.launcher.add(
+            'imu-acquisition', imu_acquisition,
+            args=(bus_config.imu_rate, dict(imu_sensor.gyro_offset)),
+            cores=[acquisition_core] if acquisition_core is not None else None
+        )
+        self.launcher.start()
+        if bus_config.control_core is not None:
+            pin_to_cores([bus_config.control_core])
+        
+        reader = BusIMUReader(self.state_bus, max_age=bus_config.imu_max_age)
+        
+        def _apply_max_age(config, changed):
+            reader.max_age = config.state_bus.imu_max_age
+        self.config_watcher.subscribe(_apply_max_age)
+        self.logger.info(f"State bus {bus_config.name} up ({self.state_bus.size} bytes)")
+        return reader
+    
+    def publish_state(self):
+        """
+        Publish the controller's wheel and command state on the bus
+        """
+        controller = self.vehicle_controller
+        measured, targets = controller.wheel_speed_measured, controller.wheel_speed_targets
+        self.state_bus.write('wheels', (measured[0], measured[1], targets[0], targets[1]))
+        left, right = controller.drive_train.targets()
+        self.state_bus.write('drive_command', (left, right, controller.status_flags))
+    
+    def start_watchdog(self):
+        """
+        Arm the safety watchdog on the control loop heartbeat
+        
+        Started before the vehicle first drives: arming times one pass
+        of the stop path, which drives the actuator outputs low.
+        """
+        from .safety_watchdog import HeartbeatBoard, SafetyWatchdog
+        
+        watchdog_config = self.config.watchdog
+        pins, pwms = self.vehicle_controller.safety_outputs()
+        self.watchdog = SafetyWatchdog(
+            HeartbeatBoard(['control']),
+            {'control': watchdog_config.timeout},
+            pins=pins,
+            pwms=pwms,
+            poll_interval=watchdog_config.poll_interval,
+            separate_process=watchdog_config.separate_process,
+            priority=watchdog_config.priority
+        )
+        self.watchdog.start()
+        mode = 'process' if watchdog_config.separate_process else 'thread'
+        self.logger.info(f"Safety watchdog armed ({mode}, {watchdog_config.timeout * 1000:.0f} ms deadline)")
+    
     def setup_gpio(self):
         """
         Setup GPIO pins based on configuration
         """
         try:
             # Setup output pins from configuration
-            output_pins = self.config.get('gpio', {})
-            self.gpio_manager.setup_output_pins(output_pins)
+            self.gpio_manager.setup_output_pins(self.config.gpio.output_pins())
             
             # Setup input pins from configuration
-            input_pins = self.config.get('sensors', {})
-            self.gpio_manager.setup_input_pins(input_pins)
+            self.gpio_manager.setup_input_pins(self.config.input_pins())
         except Exception as e:
             self.logger.error(f"GPIO setup failed: {e}")
     
@@ -72,10 +466,37 @@ class RoboticVehicleApp:
         try:
             self.logger.info("Robotic Vehicle Application Started")
             
-            # Example driving sequence
-            self.vehicle_controller.drive(speed=0.5, direction='forward')
-            
-            # Add more application logic here
+            # Control loop; picks up hot-reloaded loop rate and thresholds
+            self.config_watcher.start()
+            while not self._stop_event.is_set():
+                period = self.vehicle_controller.config.control.loop_period
+                start = time.perf_counter()
+                now = hal.monotonic()
+                if self.watchdog:
+                    if self.watchdog.tripped:
+                        # The watchdog already cut the outputs; latch the stop
+                        self.logger.critical(f"Safety watchdog tripped: {self.watchdog.stats()}")
+                        self.vehicle_controller.emergency_stop()
+                        break
+                    self.watchdog.board.beat('control')
+                if self.teleop:
+                    self.vehicle_controller.apply_teleop(self.teleop.setpoint(now))
+                self.vehicle_controller.control_tick(now)
+                if self.state_bus:
+                    self.publish_state()
+                if self.offload:
+                    self.poll_offload()
+                if self.supervisor:
+                    self.vehicle_controller.apply_link_health(self.supervisor.health())
+                if self.downlink:
+                    self.downlink.publish(self.vehicle_controller.downlink_status())
+                elapsed = time.perf_counter() - start
+                registry.record_loop('control.loop', elapsed, period)
+                if self.teleop:
+                    # A new joystick frame ends the wait early
+                    self.teleop.wait(max(period - elapsed, 0.0))
+                else:
+                    hal.sleep(max(period - elapsed, 0.0))
             
         except Exception as e:
             self.logger.critical(f"Application error: {e}")
@@ -87,8 +508,39 @@ class RoboticVehicleApp:
         """
         Perform final cleanup
         """
+        self._stop_event.set()
+        if self.watchdog:
+            self.watchdog.stop()
+        self.config_watcher.stop()
+        if registry.enabled:
+            self.logger.info(f"Latency snapshot: {registry.to_json()}")
+            registry.disable()
+        if self.metrics_server:
+            self.metrics_server.stop()
+        if self.metrics_sampler:
+            self.metrics_sampler.stop()
+        if self.teleop:
+            self.teleop.stop()
+        if self.supervisor:
+            self.supervisor.stop()
+        if self.downlink:
+            self.downlink.stop()
+        if self.offload:
+            self.offload.shutdown(wait=False)
+        if self.telemetry:
+            self.telemetry.close()
+        if self.vehicle_controller.ride_height_monitor:
+            self.vehicle_controller.ride_height_monitor.stop()
+        if self.vehicle_controller.preview_monitor:
+            self.vehicle_controller.preview_monitor.stop()
+        if self.launcher:
+            self.launcher.stop()
+        if self.state_bus:
+            self.state_bus.close()
+            self.state_bus.unlink()
         self.gpio_manager.cleanup()
         self.logger.info("Application shutdown complete")
+        LoggingManager.shutdown()
 
 def main():
     """
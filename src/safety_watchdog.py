@@ -0,0 +1,426 @@
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from . import hal
+from .state_bus import process_context
+
+# Layout of the shared status array
+STATUS_TRIPPED = 0
+STATUS_SOURCE = 1
+STATUS_TRIP_TIME = 2
+STATUS_TRIP_LATENCY = 3
+STATUS_WORST_GAP = 4
+STATUS_STOP_TIME = 5
+STATUS_CHECKS = 6
+STATUS_STOP_REQUEST = 7
+STATUS_ARMED = 8
+STATUS_STOP_FAILURES = 9
+STATUS_PRIORITY = 10
+STATUS_SIZE = 11
+
+# STATUS_PRIORITY values
+PRIORITY_DEFAULT = 0
+PRIORITY_RAISED = 1
+PRIORITY_UNSUPPORTED = 2
+PRIORITY_REFUSED = 3
+
+logger = logging.getLogger('SafetyWatchdog')
+
+class HeartbeatBoard:
+    """
+    Heartbeat timestamps and watchdog status in shared memory.
+
+    Both live in multiprocessing RawArrays, so a beat is one lock-free
+    store of a double and reads the same from a watchdog thread or a
+    watchdog process. Timestamps come from the system-wide monotonic
+    clock, which every process shares.
+    """
+
+    def __init__(self, names, clock=time.monotonic, beats=None, status=None):
+        """
+        Args:
+            names (list): Heartbeat sources, e.g. ['control']
+            clock (callable): Monotonic time source in seconds
+            beats (RawArray, optional): Heartbeats of an existing board
+            status (RawArray, optional): Status of an existing board
+        """
+        self.names = tuple(names)
+        self.index = {name: index for index, name in enumerate(self.names)}
+        self.beats = multiprocessing.RawArray('d', len(self.names)) if beats is None else beats
+        self.status = multiprocessing.RawArray('d', STATUS_SIZE) if status is None else status
+        self.clock = clock
+
+    def beat(self, name, now=None):
+        """
+        Record that a source is alive
+
+        Args:
+            name (str): Heartbeat source
+            now (float, optional): Timestamp, defaults to the clock
+        """
+        self.beats[self.index[name]] = self.clock() if now is None else now
+
+    def last_beat(self, name):
+        """
+        Returns:
+            float: Timestamp of the source's latest beat
+        """
+        return self.beats[self.index[name]]
+
+    @property
+    def tripped(self):
+        return bool(self.status[STATUS_TRIPPED])
+
+    def trip_source(self):
+        """
+        Returns:
+            str: Source whose deadline was missed, or None before a trip
+        """
+        if not self.tripped:
+            return None
+        return self.names[int(self.status[STATUS_SOURCE])]
+
+class EmergencyStopPath:
+    def __init__(self, pins, pwms=(), gpio=None, setup=False):
+        """
+        Minimal, pre-resolved path from a trip to motor outputs off
+
+        Everything a trip needs is looked up here, so trip() is a
+        straight run of duty and pin writes. PWM objects can only be
+        reached from their own process; a watchdog process instead
+        drives the PWM and direction pins low. That leaves a motor
+        H-bridge unpowered whatever the PWM thread does, but an output
+        with no direction pin (a strut pump or valve) is set again by
+        its software PWM thread on the next cycle, so only a thread
+        watchdog can hold those off.
+
+        Args:
+            pins (list): Actuator output pins to drive low
+            pwms (list): PWM objects set to 0% duty first
+            gpio: GPIO module, defaults to the active HAL backend's
+            setup (bool): Configure the pins as outputs (a fresh process)
+        """
+        gpio = gpio or hal.get_backend().gpio
+        if setup:
+            gpio.setmode(gpio.BCM)
+            for pin in pins:
+                gpio.setup(pin, gpio.OUT)
+        self.pins = tuple(pins)
+        self._output = gpio.output
+        self._low = gpio.LOW
+        self._duty_writers = tuple(pwm.ChangeDutyCycle for pwm in pwms)
+        self.failures = 0
+
+    def trip(self):
+        """
+        Stop every output; a failed write does not skip the others
+
+        Returns:
+            float: Seconds the writes took
+        """
+        start = time.perf_counter()
+        for write in self._duty_writers:
+            try:
+                write(0)
+            except Exception:
+                self.failures += 1
+        output, low = self._output, self._low
+        for pin in self.pins:
+            try:
+                output(pin, low)
+            except Exception:
+                self.failures += 1
+        return time.perf_counter() - start
+
+def _raise_priority(priority):
+    """
+    Run the calling thread under SCHED_FIFO (Linux, needs CAP_SYS_NICE)
+
+    Does not log, so a watchdog process can call it.
+
+    Returns:
+        int: PRIORITY_* outcome
+    """
+    if not priority:
+        return PRIORITY_DEFAULT
+    if not hasattr(os, 'sched_setscheduler'):
+        return PRIORITY_UNSUPPORTED
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+    except (OSError, ValueError):
+        return PRIORITY_REFUSED
+    return PRIORITY_RAISED
+
+def _log_priority(outcome, priority):
+    if outcome == PRIORITY_RAISED:
+        logger.info(f"Watchdog running at SCHED_FIFO priority {priority}")
+    elif outcome == PRIORITY_UNSUPPORTED:
+        logger.warning("Real-time priority not supported on this platform")
+    elif outcome == PRIORITY_REFUSED:
+        logger.warning(f"Could not raise watchdog priority to SCHED_FIFO {priority}")
+
+class SafetyWatchdog:
+    def __init__(self, board, deadlines, pins=(), pwms=(), poll_interval=0.002,
+                 separate_process=False, priority=0, on_trip=None):
+        """
+        Stops the actuators when a heartbeat misses its deadline
+
+        Runs independently of the control loop, so a loop stuck on a
+        blocking read still gets its motors stopped. A trip latches:
+        the watchdog stops checking and the outputs stay off until the
+        application restarts.
+
+        Worst-case trip time after a deadline is the longest gap between
+        two checks plus the stop path time; both are measured while
+        running (see stats()).
+
+        A watchdog process starts from a clean process (see
+        state_bus.process_context()) and never logs: it reports through
+        the board's status array, and the owner logs from stats(). It can
+        only drive pins low, which software-PWM outputs without a
+        direction pin do not stay (see EmergencyStopPath).
+
+        Args:
+            board (HeartbeatBoard): Shared heartbeats
+            deadlines (dict): Source name -> longest silence (seconds)
+            pins (list): Actuator output pins driven low on a trip
+            pwms (list): PWM objects zeroed on a trip (thread mode only)
+            poll_interval (float): Seconds between checks
+            separate_process (bool): Run in its own process instead of a thread
+            priority (int): SCHED_FIFO priority for the watchdog (0 keeps
+                            the default scheduler)
+            on_trip (callable, optional): Called with the source name after
+                                          the outputs are off (thread mode only)
+        """
+        self.board = board
+        self.deadlines = dict(deadlines)
+        self._deadlines = tuple(
+            (board.index[name], timeout) for name, timeout in self.deadlines.items()
+        )
+        self.pins = tuple(pins)
+        self.poll_interval = poll_interval
+        self.separate_process = separate_process
+        self.priority = priority
+        self.on_trip = on_trip
+        # A process builds its own stop path; a thread gets it ready now
+        self.stop_path = None if separate_process else EmergencyStopPath(pins, pwms)
+        self._last_check = None
+        self._stop_event = threading.Event()
+        self._worker = None
+
+    def arm(self, now=None):
+        """
+        Start all deadlines from now and time one pass of the stop path
+
+        Arm before the actuators run: the timing pass really drives the
+        outputs low.
+        """
+        board = self.board
+        now = board.clock() if now is None else now
+        for name in board.names:
+            board.beat(name, now)
+        self._last_check = None
+        if self.stop_path is not None:
+            board.status[STATUS_STOP_TIME] = self.stop_path.trip()
+        board.status[STATUS_ARMED] = 1
+
+    def check(self, now=None):
+        """
+        One watchdog pass; trips on the first missed deadline
+
+        Args:
+            now (float, optional): Timestamp, defaults to the board clock
+
+        Returns:
+            bool: True once tripped
+        """
+        status = self.board.status
+        if status[STATUS_TRIPPED]:
+            return True
+        if now is None:
+            now = self.board.clock()
+
+        last = self._last_check
+        if last is not None and now - last > status[STATUS_WORST_GAP]:
+            status[STATUS_WORST_GAP] = now - last
+        self._last_check = now
+        status[STATUS_CHECKS] += 1
+
+        beats = self.board.beats
+        for index, timeout in self._deadlines:
+            due = beats[index] + timeout
+            if now > due:
+                self._trip(index, due)
+                return True
+        return False
+
+    def _trip(self, index, due):
+        stop_time = self.stop_path.trip()
+        done = self.board.clock()
+        status = self.board.status
+        status[STATUS_SOURCE] = index
+        status[STATUS_TRIP_TIME] = done
+        status[STATUS_TRIP_LATENCY] = done - due
+        status[STATUS_STOP_FAILURES] = self.stop_path.failures
+        if stop_time > status[STATUS_STOP_TIME]:
+            status[STATUS_STOP_TIME] = stop_time
+        # Set last, so a reader that sees the flag sees the whole record
+        status[STATUS_TRIPPED] = 1
+        if self.separate_process:
+            # Running in the watchdog process: the owner reports the trip
+            return
+
+        name = self.board.names[index]
+        logger.critical(
+            f"Heartbeat '{name}' missed its {self.deadlines[name] * 1000:.0f} ms deadline: "
+            f"actuators stopped {(done - due) * 1000:.2f} ms after it"
+        )
+        if self.stop_path.failures:
+            logger.error(f"{self.stop_path.failures} stop path writes failed")
+        if self.on_trip:
+            try:
+                self.on_trip(name)
+            except Exception as e:
+                logger.error(f"Watchdog trip callback failed: {e}")
+
+    @property
+    def tripped(self):
+        return self.board.tripped
+
+    def stats(self):
+        """
+        Returns:
+            dict: Trip state and measured timings (seconds)
+        """
+        status = self.board.status
+        return {
+            'tripped': self.board.tripped,
+            'source': self.board.trip_source(),
+            'checks': int(status[STATUS_CHECKS]),
+            'worst_poll_gap': status[STATUS_WORST_GAP],
+            'stop_time': status[STATUS_STOP_TIME],
+            'stop_failures': int(status[STATUS_STOP_FAILURES]),
+            'trip_latency': status[STATUS_TRIP_LATENCY] if self.board.tripped else None,
+            'worst_case_trip_time': status[STATUS_WORST_GAP] + status[STATUS_STOP_TIME]
+        }
+
+    def start(self, timeout=5.0):
+        """
+        Arm the watchdog and start its thread or process
+
+        Returns once armed: arming drives the outputs low, so it must not
+        overlap the first drive command.
+
+        Args:
+            timeout (float): Longest wait for a watchdog process to arm (seconds)
+
+        Returns:
+            bool: True if the watchdog is armed
+        """
+        if self._worker and self._worker.is_alive():
+            return self.armed
+        status = self.board.status
+        status[STATUS_STOP_REQUEST] = 0
+        status[STATUS_ARMED] = 0
+        status[STATUS_PRIORITY] = PRIORITY_DEFAULT
+        self._stop_event.clear()
+        if self.separate_process:
+            board = self.board
+            status[STATUS_STOP_TIME] = 0.0
+            self._worker = process_context().Process(
+                target=_watchdog_process,
+                args=(board.names, board.beats, board.status, self.deadlines, self.pins,
+                      self.poll_interval, self.priority, hal.get_backend().name),
+                name='safety-watchdog',
+                daemon=True
+            )
+        else:
+            self.arm()
+            self._worker = threading.Thread(target=self._run, name='safety-watchdog', daemon=True)
+        self._worker.start()
+
+        deadline = time.monotonic() + timeout
+        while not status[STATUS_ARMED] and self._worker.is_alive() and time.monotonic() < deadline:
+            time.sleep(0.001)
+        if not status[STATUS_ARMED]:
+            logger.error("Safety watchdog did not arm")
+        elif self.separate_process:
+            _log_priority(int(status[STATUS_PRIORITY]), self.priority)
+        return self.armed
+
+    @property
+    def armed(self):
+        return bool(self.board.status[STATUS_ARMED])
+
+    def _run(self):
+        _log_priority(_raise_priority(self.priority), self.priority)
+        status = self.board.status
+        while not status[STATUS_STOP_REQUEST]:
+            if self.check():
+                break
+            self._stop_event.wait(self.poll_interval)
+
+    def stop(self):
+        """
+        Stop watching (e.g. on a clean shutdown)
+        """
+        self.board.status[STATUS_STOP_REQUEST] = 1
+        self._stop_event.set()
+        if self._worker:
+            self._worker.join(timeout=1.0)
+            self._worker = None
+
+def _watchdog_process(names, beats, status, deadlines, pins, poll_interval, priority, backend):
+    """
+    Watchdog process entry point: own GPIO handle, own scheduler priority
+
+    Logs nothing; everything it has to report goes into the status array.
+    """
+    hal.set_backend(hal.create_backend(backend))
+    board = HeartbeatBoard(names, beats=beats, status=status)
+    watchdog = SafetyWatchdog(board, deadlines, poll_interval=poll_interval,
+                              separate_process=True, priority=priority)
+    watchdog.stop_path = EmergencyStopPath(pins, setup=True)
+    # Before arming, so the owner finds the outcome once start() returns
+    status[STATUS_PRIORITY] = _raise_priority(priority)
+    watchdog.arm()
+    while not status[STATUS_STOP_REQUEST]:
+        if watchdog.check():
+            break
+        time.sleep(poll_interval)
+
+def main():
+    """
+    Example: a control loop that hangs, and the watchdog that stops it
+    """
+    logging.basicConfig(level=logging.INFO)
+    sim = hal.use_simulator()
+    gpio = hal.get_backend().gpio
+    gpio.setmode(gpio.BCM)
+    pins = (18, 23, 24)
+    for pin in pins:
+        gpio.setup(pin, gpio.OUT)
+    pwm = gpio.PWM(18, 1000)
+    pwm.start(0)
+
+    board = HeartbeatBoard(['control'])
+    watchdog = SafetyWatchdog(board, {'control': 0.05}, pins=pins, pwms=[pwm], poll_interval=0.001)
+    watchdog.start()
+
+    pwm.ChangeDutyCycle(60)
+    gpio.output(23, gpio.HIGH)
+    for _ in range(20):
+        board.beat('control')
+        time.sleep(0.01)
+    print("Control loop hangs...")
+    time.sleep(0.2)
+    print(f"Duty {sim.gpio.pwm_duty(18)}%, dir pin {gpio.input(23)}")
+    stats = watchdog.stats()
+    print(f"Tripped by '{stats['source']}' {stats['trip_latency'] * 1000:.2f} ms after the deadline; "
+          f"worst case {stats['worst_case_trip_time'] * 1000:.2f} ms")
+    watchdog.stop()
+
+if __name__ == "__main__":
+    main()
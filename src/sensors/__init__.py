@@ -3,23 +3,48 @@ Sensors Package Initialization
 
 This module provides a centralized import and initialization 
 for all sensor interfaces in the robotic vehicle project.
+
+Sensor classes are loaded from their modules on first access, so
+importing the package touches no hardware and pulls in no drivers.
 """
 
-from .mpu6050 import MPU6050Sensor
-from .vl53l0x_lidar import VL53L0XLidar
-from .ir_speed_sensor import IRSpeedSensor
-from .proximity_sensor import ProximitySensor
-from .microwave_radar import MicrowaveRadarSensor
+import importlib
+
+# Public name -> defining submodule, resolved on first access (PEP 562)
+_LAZY_IMPORTS = {
+    'BaseSensor': '.base_sensor',
+    'MPU6050Sensor': '.mpu6050',
+    'VL53L0XLidar': '.vl53l0x_lidar',
+    'IRSpeedSensor': '.ir_speed_sensor',
+    'ProximitySensor': '.proximity_sensor',
+    'MicrowaveRadarSensor': '.microwave_radar',
+    'CalibrationStore': '.calibration_store'
+}
 
 # Define which sensors will be exposed when using 'from sensors import *'
 __all__ = [
+    'BaseSensor',
     'MPU6050Sensor',
     'VL53L0XLidar', 
     'IRSpeedSensor', 
     'ProximitySensor', 
-    'MicrowaveRadarSensor'
+    'MicrowaveRadarSensor',
+    'CalibrationStore',
+    'initialize_all_sensors'
 ]
 
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
 def initialize_all_sensors():
     """
     Initialize all sensor modules with default configurations.
@@ -27,6 +52,12 @@ def initialize_all_sensors():
     Returns:
         dict: A dictionary of initialized sensor instances
     """
+    from .mpu6050 import MPU6050Sensor
+    from .vl53l0x_lidar import VL53L0XLidar
+    from .ir_speed_sensor import IRSpeedSensor
+    from .proximity_sensor import ProximitySensor
+    from .microwave_radar import MicrowaveRadarSensor
+    
     sensors = {
         'imu': MPU6050Sensor(),
         'lidar': VL53L0XLidar(),
@@ -42,4 +73,4 @@ def initialize_all_sensors():
         except Exception as e:
             print(f"Error initializing {name} sensor: {e}")
     
-    return sensors
\ No newline at end of file
+    return sensors
@@ -0,0 +1,73 @@
+import logging
+
+class BaseSensor:
+    def __init__(self, name):
+        """
+        Common base for all sensor drivers
+        
+        Args:
+            name (str): Human-readable sensor name, also used as logger name
+        """
+        self.name = name
+        # Calibration cache key; drivers replace it with their bus address
+        self.device_id = name
+        self.logger = logging.getLogger(name)
+    
+    def initialize(self):
+        """
+        Optional post-construction setup hook
+        """
+    
+    def read(self):
+        """
+        Take one measurement
+        
+        Returns:
+            dict: Measurement values
+        """
+        raise NotImplementedError
+    
+    def calibrate(self):
+        """
+        Run the sensor's calibration routine
+        
+        Returns:
+            dict: Calibration data
+        """
+        raise NotImplementedError
+    
+    def read_temperature(self):
+        """
+        Sensor temperature, stored alongside cached calibration
+        
+        Returns:
+            float: Degrees Celsius, or None if the sensor has no thermometer
+        """
+        return None
+    
+    def apply_calibration(self, calibration_data):
+        """
+        Restore calibration data loaded from the calibration cache
+        
+        Args:
+            calibration_data (dict): Data previously returned by calibrate()
+        """
+        raise NotImplementedError
+    
+    def validate_calibration(self, calibration_data):
+        """
+        Quick sanity check of cached calibration data against the sensor
+        
+        Args:
+            calibration_data (dict): Cached calibration data
+        
+        Returns:
+            bool: True if the data can be used
+        """
+        return True
+    
+    def log_info(self, message):
+        self.logger.info(message)
+    
+    def log_error(self, message):
+        self.logger.error(message)
@@ -0,0 +1,260 @@
+import json
+import logging
+import os
+import threading
+from .. import hal
+
+DEFAULT_PATH = 'config/sensor_calibration.json'
+FORMAT_VERSION = 1
+
+class CalibrationStore:
+    def __init__(self, path=DEFAULT_PATH, max_age=7 * 24 * 3600,
+                 max_temperature_delta=10.0, clock=hal.time):
+        """
+        Persisted per-device calibration results
+
+        Each entry keeps the calibration data together with the device ID,
+        the sensor temperature at calibration time and a timestamp. At boot
+        restore() applies a cached entry after a quick sanity sample and
+        only falls back to the full (slow) calibration routine, on a
+        background thread, when the entry is missing, stale or invalid.
+
+        Args:
+            path (str): JSON file holding the cache
+            max_age (float): Entries older than this are stale (seconds)
+            max_temperature_delta (float): Entries taken at a temperature
+                                           further than this from the
+                                           current one are stale (deg C)
+            clock (callable): Wall-clock time source in seconds
+        """
+        self.path = path
+        self.max_age = max_age
+        self.max_temperature_delta = max_temperature_delta
+        self.clock = clock
+        self.logger = logging.getLogger('CalibrationStore')
+
+        self._lock = threading.Lock()
+        self._threads = []
+        self.entries = self.load()
+
+    @classmethod
+    def from_config(cls, calibration_config):
+        """
+        Build the store from the 'calibration' configuration section
+
+        Args:
+            calibration_config (CalibrationConfig): path, max_age_days and
+                                                    max_temperature_delta
+
+        Returns:
+            CalibrationStore: Store instance
+        """
+        return cls(
+            path=calibration_config.path,
+            max_age=calibration_config.max_age_days * 24 * 3600,
+            max_temperature_delta=calibration_config.max_temperature_delta
+        )
+
+    def load(self):
+        """
+        Read the cache file
+
+        Returns:
+            dict: Entries by device ID (empty if the file is missing or corrupt)
+        """
+        try:
+            with open(self.path, 'r') as cache_file:
+                content = json.load(cache_file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable calibration cache {self.path}: {e}")
+            return {}
+
+        if not isinstance(content, dict) or content.get('version') != FORMAT_VERSION:
+            self.logger.warning(f"Ignoring calibration cache with unknown format: {self.path}")
+            return {}
+        return dict(content.get('devices', {}))
+
+    def save(self):
+        """
+        Write the cache file atomically
+        """
+        with self._lock:
+            content = {'version': FORMAT_VERSION, 'devices': self.entries}
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            # Write then rename, so a power cut never leaves half a file
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w') as cache_file:
+                json.dump(content, cache_file, indent=4, sort_keys=True)
+                cache_file.flush()
+                os.fsync(cache_file.fileno())
+            os.replace(temp_path, self.path)
+
+    def get(self, device_id):
+        """
+        Args:
+            device_id (str): Device identifier
+
+        Returns:
+            dict: Entry with 'data', 'temperature' and 'timestamp', or None
+        """
+        with self._lock:
+            return self.entries.get(device_id)
+
+    def put(self, device_id, calibration_data, temperature=None, save=True):
+        """
+        Store a calibration result
+
+        Args:
+            device_id (str): Device identifier
+            calibration_data (dict): JSON-serializable calibration data
+            temperature (float, optional): Sensor temperature (deg C)
+            save (bool): Write the cache file immediately
+        """
+        with self._lock:
+            self.entries[device_id] = {
+                'device_id': device_id,
+                'data': calibration_data,
+                'temperature': temperature,
+                'timestamp': self.clock()
+            }
+        if save:
+            self.save()
+
+    def is_stale(self, entry, temperature=None):
+        """
+        Check an entry's age and temperature against the limits
+
+        Args:
+            entry (dict): Cache entry
+            temperature (float, optional): Current sensor temperature
+
+        Returns:
+            bool: True if the entry should not be trusted
+        """
+        age = self.clock() - entry.get('timestamp', 0)
+        if age < 0 or age > self.max_age:
+            return True
+
+        cached_temperature = entry.get('temperature')
+        if temperature is not None and cached_temperature is not None:
+            if abs(temperature - cached_temperature) > self.max_temperature_delta:
+                return True
+        return False
+
+    def restore(self, sensor, background=True):
+        """
+        Apply cached calibration to a sensor, recalibrating if needed
+
+        Args:
+            sensor (BaseSensor): Sensor with device_id, apply_calibration()
+                                 and validate_calibration()
+            background (bool): Run a needed recalibration on a background
+                               thread instead of blocking
+
+        Returns:
+            str: 'cached', 'recalibrating', 'calibrated' or 'failed'
+        """
+        temperature = sensor.read_temperature()
+        entry = self.get(sensor.device_id)
+
+        reason = None
+        if entry is None:
+            reason = "no cached calibration"
+        elif self.is_stale(entry, temperature):
+            reason = "cached calibration is stale"
+        else:
+            try:
+                if sensor.validate_calibration(entry['data']):
+                    sensor.apply_calibration(entry['data'])
+                    self.logger.info(f"{sensor.device_id}: using cached calibration")
+                    return 'cached'
+                reason = "cached calibration failed the sanity check"
+            except Exception as e:
+                reason = f"cached calibration unusable ({e})"
+
+        self.logger.info(f"{sensor.device_id}: {reason}, recalibrating")
+
+        if entry is not None:
+            # Keep the old values in use until the new calibration lands
+            try:
+                sensor.apply_calibration(entry['data'])
+            except Exception:
+                pass
+
+        if not background:
+            return 'calibrated' if self.recalibrate(sensor, temperature) else 'failed'
+
+        thread = threading.Thread(
+            target=self.recalibrate,
+            args=(sensor, temperature),
+            name=f"calibrate-{sensor.device_id}",
+            daemon=True
+        )
+        self._threads.append(thread)
+        thread.start()
+        return 'recalibrating'
+
+    def recalibrate(self, sensor, temperature=None):
+        """
+        Run the sensor's full calibration and cache the result
+
+        Args:
+            sensor (BaseSensor): Sensor to calibrate
+            temperature (float, optional): Temperature to record
+
+        Returns:
+            dict: Calibration data, or None on failure
+        """
+        calibration_data = sensor.calibrate()
+        if calibration_data is None:
+            self.logger.error(f"{sensor.device_id}: calibration failed, cache not updated")
+            return None
+
+        if temperature is None:
+            temperature = sensor.read_temperature()
+        try:
+            self.put(sensor.device_id, calibration_data, temperature)
+        except OSError as e:
+            self.logger.error(f"Could not write calibration cache {self.path}: {e}")
+        return calibration_data
+
+    def wait(self, timeout=None):
+        """
+        Wait for background recalibrations to finish
+
+        Args:
+            timeout (float, optional): Maximum wait per calibration (seconds)
+
+        Returns:
+            bool: True if none are still running
+        """
+        for thread in list(self._threads):
+            thread.join(timeout)
+        self._threads = [thread for thread in self._threads if thread.is_alive()]
+        return not self._threads
+
+def main():
+    """
+    Example usage of the calibration store
+    """
+    from .mpu6050 import MPU6050Sensor
+
+    try:
+        store = CalibrationStore()
+        imu = MPU6050Sensor()
+
+        status = store.restore(imu)
+        print(f"IMU calibration: {status}")
+
+        store.wait()
+        print("Cached entry:", store.get(imu.device_id))
+    except Exception as e:
+        print(f"Error: {e}")
+
+if __name__ == "__main__":
+    main()
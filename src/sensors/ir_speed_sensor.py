@@ -1,7 +1,6 @@
-# import RPi.GPIO as GPIO
-import gpiozero as GPIO
-import time
-from . import BaseSensor
+from .. import hal
+from ..hal import GPIO
+from .base_sensor import BaseSensor
 
 class IRSpeedSensor(BaseSensor):
     def __init__(self, pin, wheel_circumference=0.5):
@@ -15,14 +14,16 @@ class IRSpeedSensor(BaseSensor):
         super().__init__("IR Speed Sensor")
         
         self.pin = pin
+        self.device_id = f"ir-speed@gpio-{pin}"
         self.wheel_circumference = wheel_circumference
+        self.calibration = None
         
         # Setup GPIO for interrupt
         GPIO.setup(pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
         
         # Tracking variables
         self.pulse_count = 0
-        self.last_time = time.time()
+        self.last_time = hal.monotonic()
     
     def _pulse_callback(self, channel):
         """
@@ -31,7 +32,7 @@ class IRSpeedSensor(BaseSensor):
         Args:
             channel (int): GPIO channel that triggered the interrupt
         """
-        current_time = time.time()
+        current_time = hal.monotonic()
         self.pulse_count += 1
     
     def start_monitoring(self):
@@ -57,7 +58,7 @@ class IRSpeedSensor(BaseSensor):
             dict: Speed and distance information
         """
         try:
-            current_time = time.time()
+            current_time = hal.monotonic()
             time_elapsed = current_time - self.last_time
             
             # Calculate rotations
@@ -106,7 +107,7 @@ class IRSpeedSensor(BaseSensor):
                 reading = self.read()
                 if reading:
                     readings.append(reading['speed_mps'])
-                time.sleep(0.5)
+                hal.sleep(0.5)
             
             calibration_data = {
                 'avg_speed': sum(readings) / len(readings) if readings else 0,
@@ -114,8 +115,36 @@ class IRSpeedSensor(BaseSensor):
                 'max_speed': max(readings) if readings else 0
             }
             
+            self.calibration = calibration_data
             self.log_info(f"Sensor calibration complete: {calibration_data}")
             return calibration_data
         except Exception as e:
             self.log_error(f"Calibration failed: {e}")
-            return None
\ No newline at end of file
+            return None
+    
+    def apply_calibration(self, calibration_data):
+        """
+        Restore the at-rest speed baseline from the calibration cache
+        
+        Args:
+            calibration_data (dict): Data previously returned by calibrate()
+        """
+        self.calibration = {
+            key: float(calibration_data[key]) for key in ('avg_speed', 'min_speed', 'max_speed')
+        }
+    
+    def validate_calibration(self, calibration_data, tolerance=0.05):
+        """
+        Check one speed reading against the cached at-rest baseline
+        
+        Args:
+            calibration_data (dict): Cached calibration data
+            tolerance (float): Allowed speed above the cached maximum (m/s)
+        
+        Returns:
+            bool: True if the wheel reads as still as when calibrated
+        """
+        reading = self.read()
+        if reading is None:
+            return False
+        return reading['speed_mps'] <= calibration_data['max_speed'] + tolerance
\ No newline at end of file
@@ -1,27 +1,34 @@
-# import RPi.GPIO as GPIO
-import gpiozero as GPIO
-import time
-from . import BaseSensor
+from collections import deque
+from .. import hal
+from ..hal import GPIO
+from .base_sensor import BaseSensor
 
 class MicrowaveRadarSensor(BaseSensor):
-    def __init__(self, pin, sensitivity=1.0):
+    def __init__(self, pin, sensitivity=1.0, window=60.0, max_events=1000):
         """
         Initialize RCWL-0516 Microwave Radar Sensor
         
         Args:
             pin (int): GPIO pin number
             sensitivity (float): Sensor sensitivity adjustment
+            window (float): Motion frequency window (seconds)
+            max_events (int): Cap on remembered motion events, so
+                              continuous motion at a high read rate
+                              stays bounded
         """
         super().__init__("RCWL-0516 Microwave Radar")
         
         self.pin = pin
+        self.device_id = f"rcwl0516@gpio-{pin}"
         self.sensitivity = sensitivity
+        self.calibration = None
         
         # Setup GPIO
         GPIO.setup(pin, GPIO.IN)
         
-        # Tracking variables
-        self.motion_events = []
+        # Tracking variables (oldest first)
+        self.window = window
+        self.motion_events = deque(maxlen=max_events)
     
     def read(self):
         """
@@ -34,16 +41,15 @@ class MicrowaveRadarSensor(BaseSensor):
             # Check motion state
             is_motion_detected = GPIO.input(self.pin) == GPIO.HIGH
             
-            current_time = time.time()
+            current_time = hal.time()
             
             if is_motion_detected:
                 self.motion_events.append(current_time)
             
-            # Clean up old events (last 60 seconds)
-            self.motion_events = [
-                event for event in self.motion_events 
-                if current_time - event < 60
-            ]
+            # Clean up old events from the front of the window
+            events = self.motion_events
+            while events and current_time - events[0] >= self.window:
+                events.popleft()
             
             result = {
                 'motion_detected': is_motion_detected,
@@ -73,7 +79,7 @@ class MicrowaveRadarSensor(BaseSensor):
             for _ in range(50):  # 5 seconds of sampling
                 reading = self.read()
                 motion_readings.append(reading['motion_detected'])
-                time.sleep(0.1)
+                hal.sleep(0.1)
             
             # Calculate motion detection characteristics
             detection_rate = sum(motion_readings) / len(motion_readings)
@@ -84,8 +90,43 @@ class MicrowaveRadarSensor(BaseSensor):
                 'recommended_sensitivity': self.sensitivity
             }
             
+            self.calibration = calibration_data
             self.log_info(f"Microwave radar calibration: {calibration_data}")
             return calibration_data
         except Exception as e:
             self.log_error(f"Calibration failed: {e}")
-            return None
\ No newline at end of file
+            return None
+    
+    def apply_calibration(self, calibration_data):
+        """
+        Restore the motion baseline from the calibration cache
+        
+        Args:
+            calibration_data (dict): Data previously returned by calibrate()
+        """
+        self.calibration = {
+            key: float(calibration_data[key])
+            for key in ('detection_rate', 'false_positive_rate', 'recommended_sensitivity')
+        }
+    
+    def validate_calibration(self, calibration_data, samples=5, tolerance=0.5):
+        """
+        Check a few back-to-back readings against the cached detection rate
+        
+        Args:
+            calibration_data (dict): Cached calibration data
+            samples (int): Readings to take
+            tolerance (float): Allowed difference in detection rate
+        
+        Returns:
+            bool: True if the motion baseline still matches
+        """
+        if calibration_data['recommended_sensitivity'] != self.sensitivity:
+            return False
+        detections = 0
+        for _ in range(samples):
+            reading = self.read()
+            if reading is None:
+                return False
+            detections += reading['motion_detected']
+        return abs(detections / samples - calibration_data['detection_rate']) <= tolerance
\ No newline at end of file
@@ -1,6 +1,7 @@
-import smbus2
 import time
 import math
+from .. import hal
+from .base_sensor import BaseSensor
 
 class MPU6050:
     # MPU6050 device address
@@ -9,6 +10,7 @@ class MPU6050:
     # Register addresses
     PWR_MGMT_1 = 0x6B
     ACCEL_XOUT_H = 0x3B
+    TEMP_OUT_H = 0x41
     GYRO_XOUT_H = 0x43
 
     # Configuration constants
@@ -21,7 +23,7 @@ class MPU6050:
         
         :param bus: I2C bus number (default 1 for Raspberry Pi)
         """
-        self.bus = smbus2.SMBus(bus)
+        self.bus = hal.open_i2c(bus)
         
         # Wake up the MPU6050 by writing 0 to power management register
         self.bus.write_byte_data(self.DEVICE_ADDRESS, self.PWR_MGMT_1, 0)
@@ -76,6 +78,15 @@ class MPU6050:
             'z': round(z, 2)
         }
 
+    def get_temperature(self):
+        """
+        Get die temperature
+        
+        :return: Temperature in degrees Celsius
+        """
+        raw = self.read_raw_data(self.TEMP_OUT_H)
+        return round(raw / 340.0 + 36.53, 2)
+
     def calculate_angle(self):
         """
         Calculate tilt angles using accelerometer data
@@ -95,6 +106,111 @@ class MPU6050:
             'pitch': round(pitch, 2)
         }
 
+class MPU6050Sensor(BaseSensor):
+    def __init__(self, bus=1, calibration_samples=100):
+        """
+        MPU6050 wrapped in the common sensor interface
+        
+        Args:
+            bus (int): I2C bus number
+            calibration_samples (int): Samples averaged by calibrate()
+        """
+        super().__init__("MPU6050 IMU")
+        
+        self.device = MPU6050(bus)
+        self.device_id = f"mpu6050@i2c-{bus}:0x{MPU6050.DEVICE_ADDRESS:02x}"
+        self.calibration_samples = calibration_samples
+        self.gyro_offset = {'x': 0.0, 'y': 0.0, 'z': 0.0}
+    
+    def read(self):
+        """
+        Read acceleration and bias-corrected rotation
+        
+        Returns:
+            dict: 'acceleration' (g), 'gyroscope' (deg/s) and 'timestamp'
+        """
+        try:
+            gyro = self.device.get_gyro_data()
+            for axis, offset in self.gyro_offset.items():
+                gyro[axis] = round(gyro[axis] - offset, 2)
+            
+            return {
+                'acceleration': self.device.get_accel_data(),
+                'gyroscope': gyro,
+                'timestamp': hal.time()
+            }
+        except Exception as e:
+            self.log_error(f"IMU read failed: {e}")
+            return None
+    
+    def calibrate(self):
+        """
+        Estimate the gyroscope bias with the vehicle at rest
+        
+        Returns:
+            dict: Calibration data
+        """
+        try:
+            totals = {'x': 0.0, 'y': 0.0, 'z': 0.0}
+            for _ in range(self.calibration_samples):
+                gyro = self.device.get_gyro_data()
+                for axis in totals:
+                    totals[axis] += gyro[axis]
+                hal.sleep(0.005)
+            
+            self.gyro_offset = {
+                axis: total / self.calibration_samples
+                for axis, total in totals.items()
+            }
+            
+            calibration_data = {'gyro_offset': dict(self.gyro_offset)}
+            self.log_info(f"IMU calibration complete: {calibration_data}")
+            return calibration_data
+        except Exception as e:
+            self.log_error(f"Calibration failed: {e}")
+            return None
+
+    def read_temperature(self):
+        try:
+            return self.device.get_temperature()
+        except Exception as e:
+            self.log_error(f"IMU temperature read failed: {e}")
+            return None
+    
+    def apply_calibration(self, calibration_data):
+        """
+        Restore a gyroscope bias from the calibration cache
+        
+        Args:
+            calibration_data (dict): Data previously returned by calibrate()
+        """
+        offset = calibration_data['gyro_offset']
+        self.gyro_offset = {axis: float(offset[axis]) for axis in ('x', 'y', 'z')}
+    
+    def validate_calibration(self, calibration_data, samples=10, tolerance=1.0):
+        """
+        Check a cached gyroscope bias against a short sample at rest
+        
+        Args:
+            calibration_data (dict): Cached calibration data
+            samples (int): Gyroscope samples to average
+            tolerance (float): Allowed residual bias per axis (deg/s)
+        
+        Returns:
+            bool: True if the cached bias still matches the sensor
+        """
+        offset = calibration_data['gyro_offset']
+        totals = {'x': 0.0, 'y': 0.0, 'z': 0.0}
+        for _ in range(samples):
+            gyro = self.device.get_gyro_data()
+            for axis in totals:
+                totals[axis] += gyro[axis]
+        
+        return all(
+            abs(totals[axis] / samples - offset[axis]) <= tolerance
+            for axis in totals
+        )
+
 def main():
     """
     Example usage of MPU6050 sensor
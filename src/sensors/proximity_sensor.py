@@ -1,7 +1,6 @@
-# import RPi.GPIO as GPIO
-import gpiozero as GPIO
-import time
-from . import BaseSensor
+from .. import hal
+from ..hal import GPIO
+from .base_sensor import BaseSensor
 
 class ProximitySensor(BaseSensor):
     def __init__(self, pin, detection_range=10):
@@ -34,7 +33,7 @@ class ProximitySensor(BaseSensor):
             result = {
                 'detected': is_detected,
                 'range_cm': self.detection_range if is_detected else None,
-                'timestamp': time.time()
+                'timestamp': hal.time()
             }
             
             if is_detected:
@@ -58,7 +57,7 @@ class ProximitySensor(BaseSensor):
             for _ in range(10):
                 reading = self.read()
                 readings.append(reading['detected'])
-                time.sleep(0.1)
+                hal.sleep(0.1)
             
             # Calculate detection reliability
             detection_rate = sum(readings) / len(readings)
@@ -1,29 +1,30 @@
-import board
-import busio
-import adafruit_vl53l0x
 import logging
-from . import BaseSensor
+from .. import hal
+from .base_sensor import BaseSensor
 
 class VL53L0XLidar(BaseSensor):
-    def __init__(self, i2c_bus=1, address=0x29):
+    def __init__(self, i2c_bus=1, address=0x29, timing_budget=200000):
         """
         Initialize VL53L0X LIDAR sensor
         
         Args:
             i2c_bus (int): I2C bus number
             address (int): I2C device address
+            timing_budget (int): Measurement time per reading (microseconds);
+                                 shorter is faster but noisier
         """
         super().__init__("VL53L0X LIDAR")
+        # Several lidars share a bus (ride height, road preview); the
+        # address tells their cached calibrations apart
+        self.device_id = f"vl53l0x@i2c-{i2c_bus}:0x{address:02x}"
+        self.calibration = None
         
         try:
-            # Create I2C bus
-            i2c = busio.I2C(board.SCL, board.SDA)
-            
-            # Initialize VL53L0X sensor
-            self.sensor = adafruit_vl53l0x.VL53L0X(i2c)
+            # Initialize VL53L0X sensor on the I2C bus
+            self.sensor = hal.open_vl53l0x(i2c_bus, address)
             
             # Configure sensor (optional advanced settings)
-            self.sensor.measurement_timing_budget = 200000  # 200ms
+            self.sensor.measurement_timing_budget = timing_budget
             
             self.log_info("VL53L0X LIDAR initialized successfully")
         except Exception as e:
@@ -74,8 +75,39 @@ class VL53L0XLidar(BaseSensor):
                 'average_distance': sum(readings) / len(readings)
             }
             
+            self.calibration = calibration_data
             self.log_info(f"Calibration complete: {calibration_data}")
             return calibration_data
         except Exception as e:
             self.log_error(f"Calibration failed: {e}")
-            return None
\ No newline at end of file
+            return None
+    
+    def apply_calibration(self, calibration_data):
+        """
+        Restore the self-test ranges from the calibration cache
+        
+        Args:
+            calibration_data (dict): Data previously returned by calibrate()
+        """
+        self.calibration = {
+            key: float(calibration_data[key])
+            for key in ('min_distance', 'max_distance', 'average_distance')
+        }
+    
+    def validate_calibration(self, calibration_data, tolerance=50):
+        """
+        Check one range reading against the cached self-test spread
+        
+        Args:
+            calibration_data (dict): Cached calibration data
+            tolerance (float): Allowed range outside the cached spread (mm)
+        
+        Returns:
+            bool: True if the sensor still sees what it saw when calibrated
+        """
+        reading = self.read()
+        if not reading or not reading['valid_measurement']:
+            return False
+        distance = reading['distance_mm']
+        return (calibration_data['min_distance'] - tolerance <= distance
+                <= calibration_data['max_distance'] + tolerance)
\ No newline at end of file
@@ -0,0 +1,830 @@
+import copy
+import json
+import logging
+import os
+import threading
+
+DEFAULT_CONFIG_PATH = 'config/config.json'
+DEFAULT_HARDWARE_MAP_PATH = 'config/hardware_map.txt'
+ENV_PREFIX = 'ROBOT_CONFIG__'
+
+REQUIRED = object()
+
+class ConfigError(Exception):
+    """
+    The configuration is missing, unreadable or does not match the schema.
+    """
+
+class Field:
+    __slots__ = ('name', 'kind', 'default', 'minimum', 'maximum', 'hot')
+
+    def __init__(self, name, kind, default=REQUIRED, minimum=None, maximum=None, hot=False):
+        """
+        One typed configuration value
+
+        Args:
+            name (str): Key in the configuration file
+            kind (type): int, float, str, bool or a Section subclass
+            default: Raw default value (REQUIRED if the key must be set,
+                     None for optional settings)
+            minimum (float, optional): Smallest allowed number
+            maximum (float, optional): Largest allowed number
+            hot (bool): Safe to change while running (applied on hot reload)
+        """
+        self.name = name
+        self.kind = kind
+        self.default = default
+        self.minimum = minimum
+        self.maximum = maximum
+        self.hot = hot
+
+    def compile(self, value, path):
+        if value is REQUIRED:
+            value = self.default
+            if value is REQUIRED:
+                raise ConfigError(f"{path}: required setting is missing")
+        if value is None:
+            if self.default is None:
+                return None
+            raise ConfigError(f"{path}: must not be null")
+
+        kind = self.kind
+        if isinstance(kind, type) and issubclass(kind, Section):
+            return kind.compile(value, path)
+
+        if kind is float and isinstance(value, int) and not isinstance(value, bool):
+            value = float(value)
+        if not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+            raise ConfigError(f"{path}: expected {kind.__name__}, got {type(value).__name__} {value!r}")
+
+        if self.minimum is not None and value < self.minimum:
+            raise ConfigError(f"{path}: {value} is below the minimum {self.minimum}")
+        if self.maximum is not None and value > self.maximum:
+            raise ConfigError(f"{path}: {value} is above the maximum {self.maximum}")
+        return value
+
+class Section:
+    """
+    Frozen, slotted configuration record compiled from a raw dict.
+
+    Subclasses list their Field objects in FIELDS and set __slots__ to the
+    field names; instances are read-only and compare by value.
+    """
+    __slots__ = ()
+    FIELDS = ()
+
+    def __init__(self, **values):
+        for field in self.FIELDS:
+            object.__setattr__(self, field.name, values[field.name])
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(
+            getattr(self, field.name) == getattr(other, field.name)
+            for field in self.FIELDS
+        )
+
+    def __hash__(self):
+        return hash(tuple(getattr(self, field.name) for field in self.FIELDS))
+
+    def __repr__(self):
+        values = ', '.join(f"{field.name}={getattr(self, field.name)!r}" for field in self.FIELDS)
+        return f"{type(self).__name__}({values})"
+
+    @classmethod
+    def compile(cls, raw, path=''):
+        """
+        Validate a raw dict and build the section
+
+        Args:
+            raw (dict): Raw configuration values
+            path (str): Dotted location, used in error messages
+
+        Returns:
+            Section: Compiled section
+
+        Raises:
+            ConfigError: On unknown keys, missing keys, wrong types or
+                         out-of-range values
+        """
+        if not isinstance(raw, dict):
+            raise ConfigError(f"{path or 'config'}: expected a mapping, got {type(raw).__name__}")
+
+        prefix = f"{path}." if path else ''
+        known = {field.name for field in cls.FIELDS}
+        unknown = sorted(set(raw) - known)
+        if unknown:
+            raise ConfigError(f"{prefix}{unknown[0]}: unknown setting")
+
+        values = {
+            field.name: field.compile(raw.get(field.name, REQUIRED), prefix + field.name)
+            for field in cls.FIELDS
+        }
+        section = cls(**values)
+        section.validate(path)
+        return section
+
+    def validate(self, path):
+        """
+        Cross-field checks, run after the fields compiled
+        """
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: Plain nested dict, suitable for JSON or **kwargs
+        """
+        result = {}
+        for field in self.FIELDS:
+            value = getattr(self, field.name)
+            result[field.name] = value.to_dict() if isinstance(value, Section) else value
+        return result
+
+    def changes(self, other, path=''):
+        """
+        Settings that differ between two compiled configurations
+
+        Args:
+            other (Section): Configuration to compare with
+            path (str): Dotted prefix for the returned names
+
+        Returns:
+            list: (dotted name, hot) for every changed setting
+        """
+        prefix = f"{path}." if path else ''
+        changed = []
+        for field in self.FIELDS:
+            old = getattr(self, field.name)
+            new = getattr(other, field.name)
+            if old == new:
+                continue
+            if isinstance(old, Section) and isinstance(new, Section):
+                changed.extend(old.changes(new, prefix + field.name))
+            else:
+                changed.append((prefix + field.name, field.hot))
+        return changed
+
+    def with_hot_changes(self, other, path=''):
+        """
+        Copy of this configuration with only the hot settings taken from other
+
+        Every merged section is validated again: hot values that passed
+        with the new cold ones may not pass with the current ones.
+
+        Args:
+            other (Section): Newly loaded configuration
+            path (str): Dotted location, used in error messages
+
+        Returns:
+            Section: Merged configuration
+
+        Raises:
+            ConfigError: If the merged configuration fails validation
+        """
+        prefix = f"{path}." if path else ''
+        values = {}
+        for field in self.FIELDS:
+            old = getattr(self, field.name)
+            new = getattr(other, field.name)
+            if isinstance(old, Section) and isinstance(new, Section):
+                values[field.name] = old.with_hot_changes(new, prefix + field.name)
+            else:
+                values[field.name] = new if field.hot else old
+        merged = type(self)(**values)
+        merged.validate(path)
+        return merged
+
+class MotorPins(Section):
+    FIELDS = (
+        Field('pwm', int, minimum=0, maximum=27),
+        Field('dir1', int, minimum=0, maximum=27),
+        Field('dir2', int, minimum=0, maximum=27)
+    )
+    __slots__ = tuple(field.name for field in FIELDS)
+
+    @property
+    def pins(self):
+        return (self.pwm, self.dir1, self.dir2)
+
+class DriveConfig(Section):
+    FIELDS = (
+        Field('left', MotorPins),
+        Field('right', MotorPins)
+    )
+    __slots__ = tuple(field.name for field in FIELDS)
+
+class GPIOConfig(Section):
+    FIELDS = (
+        Field('dc_motor_pins', DriveConfig),
+    )
+    __slots__ = tuple(field.name for field in FIELDS)
+
+    def output_pins(self):
+        """
+        Returns:
+            dict: Output pin number by name
+        """
+        pins = {}
+        for side in ('left', 'right'):
+            motor = getattr(self.dc_motor_pins, side)
+            pins[f"{side}_motor_pwm"] = motor.pwm
+            pins[f"{side}_motor_dir1"] = motor.dir1
+            pins[f"{side}_motor_dir2"] = motor.dir2
+        return pins
+
+class SerialLinkConfig(Section):
+    FIELDS = (
+        Field('port', str),
+        Field('baudrate', int, minimum=1),
+        Field('timeout', float, default=1.0, minimum=0)
+    )
+    __slots__ = tuple(field.name for field in FIELDS)
+
+class CANConfig(Section):
+    FIELDS = (
+        Field('channel', str, default='can0'),
+        Field('bitrate', int, default=500000, minimum=1),
+        Field('max_queue', int, default=1000, minimum=1)
+    )
+    __slots__ = tuple(field.name for field in FIELDS)
+
+class CommunicationConfig(Section):
+    FIELDS = (
+        Field('bluetooth', SerialLinkConfig),
+        Field('arduino', SerialLinkConfig, default=None),
+        Field('can', CANConfig, default=None)
+    )
+    __slots__ = tuple(field.name for field in FIELDS)
+
+class SpeedControlConfig(Section):
+    FIELDS = (
+        Field('left_sensor_pin', int, minimum=0, maximum=27),
+        Field('right_sensor_pin', int, minimum=0, maximum=27),
+        Field('wheel_circumference', float, default=0.5, minimum=0.001),
+        Field('max_speed', float, default=1.0, minimum=0.001, hot=True)
+    )
+    __slots__ = tuple(field.name for field in FIELDS)
+
+class CalibrationConfig(Section):
+    FIELDS = (
+        Field('path', str, default='config/sensor_calibration.json'),
+        Field('max_age_days', float, default=7.0, minimum=0, hot=True),
+        Field('max_temperature_delta', float, default=10.0, minimum=0, hot=True)
+    )
+    __slots__ = tuple(field.name for field in FIELDS)
+
+class BringUpConfig(Section):
+    FIELDS = (
+        Field('max_workers', int, default=4, minimum=1),
+        Field('serial_timeout', float, default=3.0, minimum=0.001),
+        Field('serial_retries', int, default=2, minimum=0)
+    )
+    __slots__ = tuple(field.name for field in FIELDS)
+
+class ControlConfig(Section):
+    FIELDS = (
+        Field('loop_rate_hz', float, default=50.0, minimum=1, maximum=1000, hot=True),
+        Field('stability_threshold', float, default=0.5, minimum=0, hot=True)
+    )
+    __slots__ = tuple(field.name for field in FIELDS)
+
+    @property
+    def loop_period(self):
+        return 1.0 / self.loop_rate_hz
+
+class MetricsConfig(Section):
+    FIELDS = (
+        Field('enabled', bool, default=False),
+        Field('interval', float, default=1.0, minimum=0.05),
+        Field('history', int, default=600, minimum=1),
+        Field('host', str, default='127.0.0.1'),
+        Field('port', int, default=9108, minimum=0, maximum=65535),
+        Field('unix_path', str, default=None)
+    )
+    __slots__ = tuple(field.name for field in FIELDS)
+
+class InstrumentationConfig(Section):
+    FIELDS = (
+        Field('enabled', bool, default=False),
+        Field('hot_paths', bool, default=True),
+        Field('profile_on_overrun', bool, default=False),
+        Field('profile_duration', float, default=0.5, minimum=0.01)
+    )
+    __slots__ = tuple(field.name for field in FIELDS)
+
+class TeleopConfig(Section):
+    FIELDS = (
+        Field('enabled', bool, default=False),
+        Field('timeout', float, default=0.25, minimum=0.01, hot=True)
+    )
+    __slots__ = tuple(field.name for field in FIELDS)
+
+class DownlinkConfig(Section):
+    FIELDS = (
+        Field('enabled', bool, default=False),
+        Field('rate', float, default=10.0, minimum=0.1),
+        Field('min_rate', float, default=1.0, minimum=0.1, hot=True),
+        Field('max_rate', float, default=20.0, minimum=0.1, hot=True),
+        Field('keyframe_interval', int, default=20, minimum=1)
+    )
+    __slots__ = tuple(field.name for field in FIELDS)
+
+    def validate(self, path):
+        if not self.min_rate <= self.rate <= self.max_rate:
+            raise ConfigError(f"{path}: rate must lie between min_rate and max_rate")
+
+class SupervisorConfig(Section):
+    FIELDS = (
+        Field('enabled', bool, default=False),
+        Field('check_interval', float, default=0.1, minimum=0.01),
+        Field('stall_timeout', float, default=2.0, minimum=0.01),
+        Field('backoff', float, default=0.5, minimum=0.01),
+        Field('max_backoff', float, default=30.0, minimum=0.01),
+        Field('degraded_health', float, default=0.5, minimum=0, maximum=1, hot=True),
+        Field('degraded_speed', float, default=0.5, minimum=0, maximum=1, hot=True)
+    )
+    __slots__ = tuple(field.name for field in FIELDS)
+
+class WatchdogConfig(Section):
+    FIELDS = (
+        Field('enabled', bool, default=False),
+        Field('timeout', float, default=0.25, minimum=0.005),
+        Field('poll_interval', float, default=0.002, minimum=0.0005),
+        Field('separate_process', bool, default=False),
+        Field('priority', int, default=0, minimum=0, maximum=99)
+    )
+    __slots__ = tuple(field.name for field in FIELDS)
+
+    def validate(self, path):
+        if self.poll_interval >= self.timeout:
+            raise ConfigError(f"{path}: poll_interval must be shorter than timeout")
+
+class StateBusConfig(Section):
+    FIELDS = (
+        Field('enabled', bool, default=False),
+        Field('name', str, default='robot_state'),
+        Field('imu_rate', float, default=200.0, minimum=1, maximum=1000),
+        Field('imu_max_age', float, default=0.1, minimum=0.001, hot=True),
+        Field('acquisition_core', int, default=None, minimum=0),
+        Field('control_core', int, default=None, minimum=0)
+    )
+    __slots__ = tuple(field.name for field in FIELDS)
+
+class OffloadConfig(Section):
+    FIELDS = (
+        Field('enabled', bool, default=False),
+        Field('max_workers', int, default=2, minimum=1, maximum=16),
+        Field('first_core', int, default=None, minimum=0),
+        Field('nice', int, default=10, minimum=0, maximum=19),
+        Field('summary_interval', float, default=5.0, minimum=0.1, hot=True),
+        Field('summary_channel', str, default='imu')
+    )
+    __slots__ = tuple(field.name for field in FIELDS)
+
+    def cores(self):
+        """
+        Returns:
+            list: Cores the workers are pinned to (empty: not pinned)
+        """
+        if self.first_core is None:
+            return []
+        return list(range(self.first_core, self.first_core + self.max_workers))
+
+class StrutConfig(Section):
+    FIELDS = (
+        Field('pump_pin', int, minimum=0, maximum=27),
+        Field('valve_pin', int, minimum=0, maximum=27),
+        Field('lidar_address', int, default=None, minimum=0x08, maximum=0x77)
+    )
+    __slots__ = tuple(field.name for field in FIELDS)
+
+class PreviewConfig(Section):
+    FIELDS = (
+        Field('lidar_address', int, minimum=0x08, maximum=0x77),
+        Field('timing_budget', int, default=33000, minimum=20000),
+        Field('interval', float, default=0.02, minimum=0.005),
+        Field('mount_height', float, default=100.0, minimum=1),
+        Field('mount_offset', float, default=0.1, minimum=0),
+        Field('tilt', float, default=30.0, minimum=1, maximum=90),
+        Field('wheelbase', float, default=0.3, minimum=0.01),
+        Field('length', float, default=2.0, minimum=0.1),
+        Field('resolution', float, default=0.01, minimum=0.001),
+        Field('strut_speed', float, default=60.0, minimum=0.1),
+        Field('lead_time', float, default=0.05, minimum=0, hot=True),
+        Field('gain', float, default=1.0, minimum=0, maximum=2, hot=True)
+    )
+    __slots__ = tuple(field.name for field in FIELDS)
+
+    def validate(self, path):
+        if self.length < self.wheelbase + self.mount_offset:
+            raise ConfigError(f"{path}: length must cover wheelbase and mount_offset")
+
+class SuspensionConfig(Section):
+    FIELDS = (
+        Field('front_left', StrutConfig),
+        Field('front_right', StrutConfig),
+        Field('rear_left', StrutConfig),
+        Field('rear_right', StrutConfig),
+        Field('i2c_bus', int, default=1, minimum=0),
+        Field('height_interval', float, default=0.05, minimum=0.01),
+        Field('pwm_frequency', float, default=100.0, minimum=1),
+        Field('max_active_pumps', int, default=2, minimum=1, maximum=4, hot=True),
+        Field('target_height', float, default=120.0, minimum=0, hot=True),
+        Field('min_height', float, default=80.0, minimum=0),
+        Field('max_height', float, default=160.0, minimum=0),
+        Field('height_per_speed', float, default=-10.0, hot=True),
+        Field('level_gain', float, default=0.08, minimum=0, hot=True),
+        Field('skyhook_gain', float, default=0.01, minimum=0, hot=True),
+        Field('preview', PreviewConfig, default=None)
+    )
+    __slots__ = tuple(field.name for field in FIELDS)
+
+    CORNERS = ('front_left', 'front_right', 'rear_left', 'rear_right')
+
+    def struts(self):
+        """
+        Returns:
+            list: StrutConfig per corner, front left to rear right
+        """
+        return [getattr(self, corner) for corner in self.CORNERS]
+
+    def output_pins(self):
+        """
+        Returns:
+            dict: Pump and valve pin number by name
+        """
+        pins = {}
+        for corner in self.CORNERS:
+            strut = getattr(self, corner)
+            pins[f"{corner}_pump"] = strut.pump_pin
+            pins[f"{corner}_valve"] = strut.valve_pin
+        return pins
+
+    def validate(self, path):
+        if not self.min_height < self.target_height < self.max_height:
+            raise ConfigError(f"{path}: target_height must lie between min_height and max_height")
+        addresses = [strut.lidar_address for strut in self.struts() if strut.lidar_address is not None]
+        if self.preview is not None:
+            addresses.append(self.preview.lidar_address)
+        if len(set(addresses)) != len(addresses):
+            raise ConfigError(f"{path}: lidar addresses must be unique on the I2C bus")
+
+class TelemetryConfig(Section):
+    FIELDS = (
+        Field('enabled', bool, default=False),
+        Field('directory', str, default='telemetry'),
+        Field('chunk_records', int, default=65536, minimum=1),
+        Field('flush_records', int, default=512, minimum=1),
+        Field('flush_interval', float, default=1.0, minimum=0.01)
+    )
+    __slots__ = tuple(field.name for field in FIELDS)
+
+class VehicleConfig(Section):
+    FIELDS = (
+        Field('gpio', GPIOConfig),
+        Field('communication', CommunicationConfig),
+        Field('speed_control', SpeedControlConfig, default=None),
+        Field('calibration', CalibrationConfig, default={}),
+        Field('bringup', BringUpConfig, default={}),
+        Field('control', ControlConfig, default={}),
+        Field('metrics', MetricsConfig, default={}),
+        Field('instrumentation', InstrumentationConfig, default={}),
+        Field('telemetry', TelemetryConfig, default={}),
+        Field('teleop', TeleopConfig, default={}),
+        Field('downlink', DownlinkConfig, default={}),
+        Field('supervisor', SupervisorConfig, default={}),
+        Field('suspension', SuspensionConfig, default=None),
+        Field('watchdog', WatchdogConfig, default={}),
+        Field('state_bus', StateBusConfig, default={}),
+        Field('offload', OffloadConfig, default={})
+    )
+    __slots__ = tuple(field.name for field in FIELDS)
+
+    def input_pins(self):
+        """
+        Returns:
+            dict: Input pin number by name
+        """
+        if self.speed_control is None:
+            return {}
+        return {
+            'left_speed_sensor': self.speed_control.left_sensor_pin,
+            'right_speed_sensor': self.speed_control.right_sensor_pin
+        }
+
+    def validate(self, path):
+        owners = {}
+        pins = list(self.gpio.output_pins().items()) + list(self.input_pins().items())
+        if self.suspension is not None:
+            pins += list(self.suspension.output_pins().items())
+            if self.suspension.preview is not None and self.speed_control is None:
+                # Without wheel speeds the odometer never advances
+                raise ConfigError("suspension.preview: requires speed_control for wheel odometry")
+            if self.watchdog.enabled and self.watchdog.separate_process:
+                # Strut pumps and valves have no direction pin: a watchdog
+                # process drives them low, their PWM thread turns them on again
+                raise ConfigError("watchdog.separate_process: cannot stop the suspension struts, "
+                                  "use the watchdog thread")
+        for name, pin in pins:
+            if pin in owners:
+                raise ConfigError(f"GPIO {pin} assigned to both {owners[pin]} and {name}")
+            owners[pin] = name
+        worker_cores = set(self.offload.cores())
+        for core_name in ('acquisition_core', 'control_core'):
+            if getattr(self.state_bus, core_name) in worker_cores:
+                raise ConfigError(f"offload.first_core: workers would share state_bus.{core_name}")
+
+# Lowest layer: values every vehicle starts from
+DEFAULTS = {
+    'communication': {
+        'bluetooth': {'port': '/dev/ttyS0', 'baudrate': 9600}
+    }
+}
+
+# hardware_map.txt key -> configuration path
+HARDWARE_MAP_KEYS = {
+    'LEFT_MOTOR_PWM': ('gpio', 'dc_motor_pins', 'left', 'pwm'),
+    'LEFT_MOTOR_DIR1': ('gpio', 'dc_motor_pins', 'left', 'dir1'),
+    'LEFT_MOTOR_DIR2': ('gpio', 'dc_motor_pins', 'left', 'dir2'),
+    'RIGHT_MOTOR_PWM': ('gpio', 'dc_motor_pins', 'right', 'pwm'),
+    'RIGHT_MOTOR_DIR1': ('gpio', 'dc_motor_pins', 'right', 'dir1'),
+    'RIGHT_MOTOR_DIR2': ('gpio', 'dc_motor_pins', 'right', 'dir2'),
+    'BLUETOOTH_SERIAL_PORT': ('communication', 'bluetooth', 'port')
+}
+
+def deep_merge(base, override):
+    """
+    Merge nested dicts; values in override win
+
+    Args:
+        base (dict): Lower layer
+        override (dict): Higher layer
+
+    Returns:
+        dict: New merged dict
+    """
+    merged = copy.deepcopy(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = deep_merge(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+def _set_path(tree, path, value):
+    for key in path[:-1]:
+        tree = tree.setdefault(key, {})
+    tree[path[-1]] = value
+
+def read_hardware_map(path=DEFAULT_HARDWARE_MAP_PATH):
+    """
+    Parse the KEY = VALUE pin map into a configuration layer
+
+    Args:
+        path (str): hardware_map.txt location
+
+    Returns:
+        dict: Raw configuration layer (empty if the file is missing)
+    """
+    layer = {}
+    try:
+        with open(path, 'r') as map_file:
+            lines = map_file.readlines()
+    except FileNotFoundError:
+        return layer
+
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#') or '=' not in line:
+            continue
+        key, value = (part.strip() for part in line.split('=', 1))
+        target = HARDWARE_MAP_KEYS.get(key)
+        if target is None:
+            continue
+        if target[-1] != 'port':
+            try:
+                value = int(value)
+            except ValueError:
+                raise ConfigError(f"{path}:{number}: {key} must be a pin number, got {value!r}")
+        _set_path(layer, target, value)
+    return layer
+
+def read_config_file(path=DEFAULT_CONFIG_PATH):
+    """
+    Args:
+        path (str): JSON configuration file
+
+    Returns:
+        dict: Raw configuration layer (empty if the file is missing)
+
+    Raises:
+        ConfigError: If the file exists but is not a JSON object
+    """
+    try:
+        with open(path, 'r') as config_file:
+            content = json.load(config_file)
+    except FileNotFoundError:
+        return {}
+    except json.JSONDecodeError as e:
+        raise ConfigError(f"{path}: invalid JSON ({e})")
+    if not isinstance(content, dict):
+        raise ConfigError(f"{path}: top level must be an object")
+    return content
+
+def read_environment(environ=None, prefix=ENV_PREFIX):
+    """
+    Overrides from ROBOT_CONFIG__SECTION__KEY=value variables
+
+    Values are parsed as JSON when possible (numbers, booleans, objects)
+    and used as plain strings otherwise.
+
+    Args:
+        environ (dict, optional): Environment, defaults to os.environ
+        prefix (str): Variable name prefix
+
+    Returns:
+        dict: Raw configuration layer
+    """
+    if environ is None:
+        environ = os.environ
+
+    layer = {}
+    for name, raw_value in environ.items():
+        if not name.startswith(prefix):
+            continue
+        path = [part.lower() for part in name[len(prefix):].split('__') if part]
+        if not path:
+            continue
+        try:
+            value = json.loads(raw_value)
+        except ValueError:
+            value = raw_value
+        _set_path(layer, path, value)
+    return layer
+
+def compile_config(raw):
+    """
+    Validate a raw configuration dict on top of the defaults
+
+    Args:
+        raw (dict): Raw configuration
+
+    Returns:
+        VehicleConfig: Compiled configuration
+    """
+    return VehicleConfig.compile(deep_merge(DEFAULTS, raw))
+
+def load_settings(config_path=DEFAULT_CONFIG_PATH, hardware_map_path=DEFAULT_HARDWARE_MAP_PATH,
+                  environ=None):
+    """
+    Load and compile the layered configuration
+
+    Layers, lowest first: built-in defaults, the hardware_map.txt pin map,
+    the JSON configuration file, then environment overrides.
+
+    Args:
+        config_path (str): JSON configuration file
+        hardware_map_path (str): Pin map file
+        environ (dict, optional): Environment, defaults to os.environ
+
+    Returns:
+        VehicleConfig: Compiled configuration
+
+    Raises:
+        ConfigError: If the result does not match the schema
+    """
+    raw = read_hardware_map(hardware_map_path)
+    raw = deep_merge(raw, read_config_file(config_path))
+    raw = deep_merge(raw, read_environment(environ))
+    return compile_config(raw)
+
+class ConfigWatcher:
+    def __init__(self, config, load=load_settings, paths=(DEFAULT_CONFIG_PATH, DEFAULT_HARDWARE_MAP_PATH),
+                 interval=1.0):
+        """
+        Hot reload for the safe (hot) settings
+
+        The watched files are polled for modification; on a change the
+        configuration is reloaded and validated, hot settings (loop rates,
+        thresholds) are applied and subscribers notified, and changes to
+        anything else are logged as needing a restart.
+
+        Args:
+            config (VehicleConfig): Configuration currently in use
+            load (callable): Returns a freshly compiled configuration
+            paths (iterable): Files to watch
+            interval (float): Poll period for the background thread (seconds)
+        """
+        self.config = config
+        self.load = load
+        self.paths = tuple(paths)
+        self.interval = interval
+        self.logger = logging.getLogger('ConfigWatcher')
+
+        self._subscribers = []
+        self._signatures = self._snapshot()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def subscribe(self, callback):
+        """
+        Args:
+            callback (callable): Called with (new_config, changed_names)
+        """
+        self._subscribers.append(callback)
+
+    def _snapshot(self):
+        signatures = []
+        for path in self.paths:
+            try:
+                stat = os.stat(path)
+                signatures.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signatures.append(None)
+        return signatures
+
+    def check(self):
+        """
+        Reload if a watched file changed
+
+        Returns:
+            list: Names of the hot settings applied (empty if none)
+        """
+        signatures = self._snapshot()
+        if signatures == self._signatures:
+            return []
+        self._signatures = signatures
+
+        try:
+            new_config = self.load()
+        except ConfigError as e:
+            self.logger.error(f"Configuration reload rejected, keeping current settings: {e}")
+            return []
+
+        changes = self.config.changes(new_config)
+        restart = [name for name, hot in changes if not hot]
+        applied = [name for name, hot in changes if hot]
+        if restart:
+            self.logger.warning(f"Restart required to apply: {', '.join(restart)}")
+        if not applied:
+            return []
+
+        try:
+            merged = self.config.with_hot_changes(new_config)
+        except ConfigError as e:
+            self.logger.error(f"Configuration reload rejected, keeping current settings: {e}")
+            return []
+        self.config = merged
+        self.logger.info(f"Applied configuration changes: {', '.join(applied)}")
+        for callback in self._subscribers:
+            try:
+                callback(self.config, applied)
+            except Exception as e:
+                self.logger.error(f"Configuration subscriber failed: {e}")
+        return applied
+
+    def start(self):
+        """
+        Poll for changes on a background thread
+        """
+        if self._thread and self._thread.is_alive():
+            return
+
+        def _watch():
+            while not self._stop_event.wait(self.interval):
+                self.check()
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=_watch, name='config-watcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Stop the background thread
+        """
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+def main():
+    """
+    Example usage of the layered configuration
+    """
+    try:
+        config = load_settings()
+        print("Left motor pins:", config.gpio.dc_motor_pins.left.pins)
+        print("Bluetooth:", config.communication.bluetooth)
+        print("Control loop:", config.control.loop_rate_hz, "Hz")
+    except ConfigError as e:
+        print(f"Configuration error: {e}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,497 @@
+import argparse
+import gc
+import json
+import logging
+import random
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+from . import hal
+from .hal.simulator import SimulatorBackend
+from .instrumentation import LatencyHistogram
+from .settings import compile_config
+
+RADAR_PIN = 16
+
+SOAK_CONFIG = {
+    'gpio': {
+        'dc_motor_pins': {
+            'left': {'pwm': 18, 'dir1': 23, 'dir2': 24},
+            'right': {'pwm': 25, 'dir1': 8, 'dir2': 7}
+        }
+    },
+    'speed_control': {'left_sensor_pin': 5, 'right_sensor_pin': 6, 'max_speed': 1.0},
+    'communication': {
+        'bluetooth': {'port': '/dev/soak-bluetooth'},
+        'arduino': {'port': '/dev/soak-arduino', 'baudrate': 115200},
+        'can': {'channel': 'soak0'}
+    },
+    'control': {'loop_rate_hz': 100}
+}
+
+# Mission profile: (seconds, speed, direction), repeated for the whole run
+MISSION = (
+    (20.0, 0.6, 'forward'),
+    (3.0, 0.4, 'left'),
+    (20.0, 0.6, 'forward'),
+    (3.0, 0.4, 'right'),
+    (5.0, 0.3, 'reverse')
+)
+
+# Absolute growth below these is noise, not a leak
+SERIES_SLACK = {
+    'allocated_blocks': 5000,
+    'traced_bytes': 512 * 1024,
+    'gc_objects': 2000
+}
+
+class FaultPlan:
+    def __init__(self, imu_noise=0.02, imu_dropout_rate=0.01, imu_dropout_reads=6,
+                 can_error_rate=0.01, bus_off_rate=0.0005, bus_off_duration=0.5,
+                 serial_garbage_rate=0.005, seed=0):
+        """
+        What to inject and how often
+
+        Rates are events per virtual second, so they do not depend on
+        the tick length.
+
+        Args:
+            imu_noise (float): Gaussian noise on every IMU axis (g, and
+                               x100 deg/s on the gyro)
+            imu_dropout_rate (float): I2C read failure bursts per second
+            imu_dropout_reads (int): Register reads that fail per burst
+            can_error_rate (float): Single transmit failures per second
+            bus_off_rate (float): Bus-off episodes per second
+            bus_off_duration (float): Length of a bus-off episode (seconds)
+            serial_garbage_rate (float): Corrupt Arduino lines per second
+            seed (int): Random seed, so a failing run can be replayed
+        """
+        self.imu_noise = imu_noise
+        self.imu_dropout_rate = imu_dropout_rate
+        self.imu_dropout_reads = imu_dropout_reads
+        self.can_error_rate = can_error_rate
+        self.bus_off_rate = bus_off_rate
+        self.bus_off_duration = bus_off_duration
+        self.serial_garbage_rate = serial_garbage_rate
+        self.seed = seed
+
+class SoakHarness:
+    def __init__(self, duration=8 * 3600, tick=0.01, faults=None, config=None,
+                 sample_interval=60.0, can_rate=50.0, arduino_rate=10.0, radar_rate=10.0,
+                 drain_can=False, trace_memory=False, warmup=0.25, growth_tolerance=0.1):
+        """
+        Long mission soak test on the simulator under virtual time
+
+        Drives VehicleController, the IMU, radar, CAN and Arduino links
+        tick by tick on a SimulatorBackend whose clock only moves when the
+        harness advances it, so an 8-hour mission runs as fast as the CPU
+        allows. Faults from the FaultPlan are injected along the way, and
+        memory, queue depths and latency are sampled every
+        sample_interval virtual seconds.
+
+        Args:
+            duration (float): Virtual mission length (seconds)
+            tick (float): Control loop period (seconds)
+            faults (FaultPlan, optional): Injected faults, defaults to FaultPlan()
+            config (dict, optional): Raw vehicle configuration, defaults to SOAK_CONFIG
+            sample_interval (float): Virtual seconds between samples
+            can_rate (float): Status frames per second each way on CAN
+            arduino_rate (float): Arduino sensor frames per second
+            radar_rate (float): Radar reads per second
+            drain_can (bool): Consume the CAN receive queue like an
+                              application would (off: a stalled consumer)
+            trace_memory (bool): Measure bytes with tracemalloc (slower)
+            warmup (float): Fraction of samples ignored by the growth check
+            growth_tolerance (float): Relative growth flagged as a leak
+        """
+        self.duration = duration
+        self.tick = tick
+        self.faults = faults or FaultPlan()
+        self.config = compile_config(config or SOAK_CONFIG)
+        self.sample_interval = sample_interval
+        self.can_rate = can_rate
+        self.arduino_rate = arduino_rate
+        self.radar_rate = radar_rate
+        self.drain_can = drain_can
+        self.trace_memory = trace_memory
+        self.warmup = warmup
+        self.growth_tolerance = growth_tolerance
+
+        self.logger = logging.getLogger('SoakHarness')
+        self.random = random.Random(self.faults.seed)
+        self.fault_counts = Counter()
+        self.event_counts = Counter()
+        self.histograms = {}
+        self.interval_histogram = LatencyHistogram('control.tick')
+        self.samples = []
+        self.sim = None
+
+    # Setup
+
+    def setup(self):
+        """
+        Install a fresh simulator and bring up the devices on it
+        """
+        from .vehicle_control import VehicleController
+        from .sensors.mpu6050 import MPU6050Sensor
+        from .sensors.microwave_radar import MicrowaveRadarSensor
+        from .communication.can_interface import CANInterface
+        from .communication.arduino_interface import ArduinoInterface
+
+        self.sim = SimulatorBackend()
+        self._previous_backend = hal.set_backend(self.sim)
+
+        communication = self.config.communication
+        self.controller = VehicleController(self.config, calibrate=False)
+        self.imu = MPU6050Sensor()
+        self.imu_device = self.sim.i2c_device(0x68)
+        self.radar = MicrowaveRadarSensor(RADAR_PIN)
+        self.can = CANInterface(**communication.can.to_dict())
+        self.can_peer = hal.open_can_bus(communication.can.channel, communication.can.bitrate)
+        self.can_network = self.sim.can_network(communication.can.channel)
+        self.arduino = ArduinoInterface(**communication.arduino.to_dict())
+        self.arduino_device = self.sim.serial_device(communication.arduino.port)
+
+        self.can_status = hal.can_message(0x200, b'{"v":1}')
+        self._radar_motion = False
+
+    def teardown(self):
+        """
+        Close the devices and restore the previous HAL backend
+        """
+        if self.sim is None:
+            return
+        try:
+            self.controller.stop()
+            self.arduino.close()
+            self.can.close()
+            self.can_peer.shutdown()
+        except Exception as e:
+            self.logger.error(f"Soak teardown failed: {e}")
+        finally:
+            hal.set_backend(self._previous_backend)
+            self.sim = None
+
+    # Run
+
+    def run(self):
+        """
+        Run the whole mission
+
+        Returns:
+            dict: Report from report()
+        """
+        if self.trace_memory:
+            tracemalloc.start()
+        real_start = time.perf_counter()
+        self.setup()
+        try:
+            self._run_ticks()
+        finally:
+            self.teardown()
+            if self.trace_memory:
+                tracemalloc.stop()
+        return self.report(time.perf_counter() - real_start)
+
+    def _run_ticks(self):
+        clock = self.sim.clock
+        tick = self.tick
+        ticks = int(round(self.duration / tick))
+        every = {
+            'can': self._every(self.can_rate),
+            'arduino': self._every(self.arduino_rate),
+            'radar': self._every(self.radar_rate)
+        }
+        sample_every = max(int(round(self.sample_interval / tick)), 1)
+        mission_step = -1
+        mission_end = 0.0
+        timer = time.perf_counter_ns
+
+        self._sample(0)
+        for index in range(1, ticks + 1):
+            clock.advance(tick)
+            now = clock.monotonic()
+            if (index - 1) % sample_every == 0:
+                self._feed_encoders(now)
+            self._inject_faults()
+
+            if now >= mission_end:
+                mission_step = (mission_step + 1) % len(MISSION)
+                seconds, speed, direction = MISSION[mission_step]
+                mission_end = now + seconds
+                self._timed('vehicle.drive', self.controller.drive, speed, direction)
+
+            start = timer()
+            imu_data = self.imu.read()
+            self._record('imu.read', timer() - start)
+            if imu_data is None:
+                self.event_counts['imu_failed_reads'] += 1
+
+            start = timer()
+            self.controller.control_tick(now)
+            elapsed = timer() - start
+            self._record('control.tick', elapsed)
+            self.interval_histogram.record_ns(elapsed)
+
+            if index % every['can'] == 0:
+                self._can_traffic()
+            if index % every['arduino'] == 0:
+                self._arduino_traffic()
+            if index % every['radar'] == 0:
+                self._radar_read()
+
+            if index % sample_every == 0:
+                self._sample(index)
+
+    def _every(self, rate):
+        return max(int(round(1.0 / (rate * self.tick))), 1)
+
+    def _chance(self, rate):
+        return rate > 0 and self.random.random() < rate * self.tick
+
+    def _record(self, name, elapsed_ns):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = LatencyHistogram(name)
+        histogram.record_ns(elapsed_ns)
+
+    def _timed(self, name, function, *args):
+        start = time.perf_counter_ns()
+        result = function(*args)
+        self._record(name, time.perf_counter_ns() - start)
+        return result
+
+    # Simulated world
+
+    def _feed_encoders(self, now):
+        # Pulses for the next sample interval, scheduled in chunks so the
+        # clock's event heap stays small over a long run
+        speed_control = self.config.speed_control
+        for side, pin in enumerate((speed_control.left_sensor_pin, speed_control.right_sensor_pin)):
+            target = abs(self.controller.wheel_speed_targets[side])
+            frequency = target / speed_control.wheel_circumference
+            self.sim.gpio.pulse_train(pin, min(frequency, 15.0), self.sample_interval, start=now)
+
+    def _inject_faults(self):
+        faults = self.faults
+        noise = faults.imu_noise
+        gauss = self.random.gauss
+        self.imu_device.set_motion(
+            accel=(gauss(0.0, noise), gauss(0.0, noise), 1.0 + gauss(0.0, noise)),
+            gyro=(gauss(0.0, noise * 100), gauss(0.0, noise * 100), gauss(0.0, noise * 100))
+        )
+
+        if self._chance(faults.imu_dropout_rate):
+            self.imu_device.fail_reads = faults.imu_dropout_reads
+            self.fault_counts['imu_dropout'] += 1
+        if self._chance(faults.can_error_rate):
+            self.can.bus.fail_sends += 1
+            self.fault_counts['can_tx_error'] += 1
+        if self._chance(faults.bus_off_rate) and not self.can_network.bus_off:
+            self.can_network.bus_off = True
+            self.sim.clock.call_later(faults.bus_off_duration, self._bus_on)
+            self.fault_counts['can_bus_off'] += 1
+        if self._chance(faults.serial_garbage_rate):
+            self.arduino_device.write(b'\x00\xff{"temperature": 2\n')
+            self.fault_counts['serial_garbage'] += 1
+
+    def _bus_on(self):
+        self.can_network.bus_off = False
+
+    def _can_traffic(self):
+        self._timed('can.send', self.can.send_message, 0x123, {'v': 1})
+        try:
+            self.can_peer.send(self.can_status)
+        except hal.CANError:
+            self.event_counts['can_peer_tx_failed'] += 1
+
+        start = time.perf_counter_ns()
+        message = self.can.bus.recv(timeout=0)
+        while message is not None:
+            self.can._dispatch(message)
+            message = self.can.bus.recv(timeout=0)
+        self._record('can.receive', time.perf_counter_ns() - start)
+
+        # The peer node consumes what the vehicle sent
+        while self.can_peer.recv(timeout=0) is not None:
+            self.event_counts['can_peer_received'] += 1
+
+        if self.drain_can:
+            self.event_counts['can_consumed'] += len(self.can.get_messages())
+
+    def _arduino_traffic(self):
+        frame = {'temperature': round(25 + self.random.gauss(0, 0.5), 2), 'distance': 400}
+        self.arduino_device.write((json.dumps(frame) + '\n').encode())
+        connection = self.arduino.serial_conn
+        while connection.in_waiting:
+            parsed = self._timed('arduino.parse', self.arduino._parse_frame, connection.readline())
+            if parsed is None:
+                self.event_counts['arduino_invalid_frames'] += 1
+
+    def _radar_read(self):
+        # Motion comes and goes in episodes of a few seconds to minutes
+        if self.random.random() < (0.02 if self._radar_motion else 0.01):
+            self._radar_motion = not self._radar_motion
+            self.sim.gpio.set_input(RADAR_PIN, self._radar_motion)
+        self._timed('radar.read', self.radar.read)
+
+    # Measurements
+
+    def _sample(self, index):
+        gc.collect()
+        sample = {
+            'virtual_time': index * self.tick,
+            'allocated_blocks': sys.getallocatedblocks(),
+            'gc_objects': len(gc.get_objects()),
+            'can_receive_queue': len(self.can.receive_queue),
+            'radar_events': len(self.radar.motion_events),
+            'arduino_backlog': self.arduino.serial_conn.in_waiting,
+            'clock_events': len(self.sim.clock._events),
+            'tick_p99_us': self.interval_histogram.snapshot()['p99_us']
+        }
+        if self.trace_memory:
+            sample['traced_bytes'] = tracemalloc.get_traced_memory()[0]
+        self.interval_histogram.reset()
+        self.samples.append(sample)
+
+    @staticmethod
+    def _slope(points):
+        count = len(points)
+        mean_x = sum(x for x, _ in points) / count
+        mean_y = sum(y for _, y in points) / count
+        spread = sum((x - mean_x) ** 2 for x, _ in points)
+        if spread == 0:
+            return 0.0
+        return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+
+    def analyze(self):
+        """
+        Fit a trend to every sampled series after the warmup
+
+        A series is flagged as growing when its fitted growth across the
+        analyzed span exceeds growth_tolerance of its starting value plus
+        the series' absolute slack.
+
+        Returns:
+            dict: Series name -> first, last, max, slope_per_hour, growing
+        """
+        skip = int(len(self.samples) * self.warmup)
+        analyzed = self.samples[skip:]
+        series = {}
+        if len(analyzed) < 3:
+            return series
+
+        for name in self.samples[0]:
+            if name in ('virtual_time', 'tick_p99_us'):
+                continue
+            points = [(sample['virtual_time'], sample[name]) for sample in analyzed]
+            slope = self._slope(points)
+            span = points[-1][0] - points[0][0]
+            first = points[0][1]
+            allowed = self.growth_tolerance * abs(first) + SERIES_SLACK.get(name, 1)
+            series[name] = {
+                'first': first,
+                'last': points[-1][1],
+                'max': max(sample[name] for sample in self.samples),
+                'slope_per_hour': slope * 3600,
+                'growing': slope * span > allowed
+            }
+        return series
+
+    def report(self, real_seconds=None):
+        """
+        Summarize the run
+
+        Args:
+            real_seconds (float, optional): Wall time the run took
+
+        Returns:
+            dict: Timing, injected faults, observed errors, latency per
+                  path, series trends and the names of growing series
+        """
+        series = self.analyze()
+        virtual_seconds = self.samples[-1]['virtual_time'] if self.samples else 0.0
+        return {
+            'virtual_seconds': virtual_seconds,
+            'real_seconds': real_seconds,
+            'speedup': virtual_seconds / real_seconds if real_seconds else None,
+            'faults': dict(self.fault_counts),
+            'events': dict(self.event_counts, can_dropped_messages=self.can.dropped_messages),
+            'latency': {name: histogram.snapshot() for name, histogram in sorted(self.histograms.items())},
+            'series': series,
+            'leaks': sorted(name for name, trend in series.items() if trend['growing']),
+            'samples': self.samples
+        }
+
+def format_report(report):
+    """
+    Render a soak report as text
+
+    Args:
+        report (dict): Report from SoakHarness.run()
+
+    Returns:
+        str: Multi-line summary
+    """
+    lines = [f"Virtual time: {report['virtual_seconds'] / 3600:.2f} h"]
+    if report['real_seconds']:
+        lines[0] += f" in {report['real_seconds']:.1f} s real ({report['speedup']:.0f}x)"
+    lines.append("Faults injected: " + (', '.join(f"{k}={v}" for k, v in sorted(report['faults'].items())) or 'none'))
+    lines.append("Errors observed: " + (', '.join(f"{k}={v}" for k, v in sorted(report['events'].items())) or 'none'))
+    lines.append("Latency (us):        p50      p99     p999      max")
+    for name, snapshot in report['latency'].items():
+        lines.append(
+            f"  {name:<16} {snapshot['p50_us']:>8.1f} {snapshot['p99_us']:>8.1f} "
+            f"{snapshot['p999_us']:>8.1f} {snapshot['max_us']:>8.1f}"
+        )
+    lines.append("Series:                first       last        max   per hour")
+    for name, trend in report['series'].items():
+        flag = '  GROWING' if trend['growing'] else ''
+        lines.append(
+            f"  {name:<18} {trend['first']:>10,} {trend['last']:>10,} {trend['max']:>10,} "
+            f"{trend['slope_per_hour']:>+10,.1f}{flag}"
+        )
+    lines.append("Leaks: " + (', '.join(report['leaks']) or 'none'))
+    return '\n'.join(lines)
+
+def main(argv=None):
+    """
+    Run a soak test from the command line
+
+    Example:
+        python -m src.soak --hours 8 --json soak.json
+    """
+    parser = argparse.ArgumentParser(description="Virtual-time soak test on the simulator")
+    parser.add_argument('--hours', type=float, default=8.0, help="Virtual mission length")
+    parser.add_argument('--tick', type=float, default=0.01, help="Control loop period (s)")
+    parser.add_argument('--seed', type=int, default=0, help="Fault injection seed")
+    parser.add_argument('--no-faults', action='store_true', help="Run without injected faults")
+    parser.add_argument('--drain-can', action='store_true', help="Consume the CAN receive queue")
+    parser.add_argument('--trace-memory', action='store_true', help="Track bytes with tracemalloc")
+    parser.add_argument('--json', help="Write the full report to this file")
+    args = parser.parse_args(argv)
+
+    # Injected faults log an error each; keep the console readable
+    logging.basicConfig(level=logging.CRITICAL)
+
+    if args.no_faults:
+        faults = FaultPlan(imu_noise=0.0, imu_dropout_rate=0, can_error_rate=0,
+                           bus_off_rate=0, serial_garbage_rate=0, seed=args.seed)
+    else:
+        faults = FaultPlan(seed=args.seed)
+    harness = SoakHarness(
+        duration=args.hours * 3600, tick=args.tick, faults=faults,
+        drain_can=args.drain_can, trace_memory=args.trace_memory
+    )
+    report = harness.run()
+    print(format_report(report))
+
+    if args.json:
+        with open(args.json, 'w') as report_file:
+            json.dump(report, report_file, indent=2)
+    return 1 if report['leaks'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,494 @@
+import json
+import logging
+import multiprocessing
+import os
+import struct
+import time
+import zlib
+from multiprocessing import shared_memory
+import numpy
+from .telemetry import COLUMN_TYPES
+
+MAGIC = b'RSB1'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<4sHHI')
+SEQUENCE = struct.Struct('<Q')
+
+# Records start on their own cache line, so two writer processes never
+# share one
+RECORD_ALIGN = 64
+
+# Fixed records of the vehicle state; every record also carries the
+# float64 timestamp 't' (monotonic seconds, shared by all processes)
+STATE_SCHEMA = {
+    'imu': [('ax', 'f4'), ('ay', 'f4'), ('az', 'f4'), ('gx', 'f4'), ('gy', 'f4'), ('gz', 'f4')],
+    'wheels': [
+        ('left_speed', 'f4'), ('right_speed', 'f4'),
+        ('left_target', 'f4'), ('right_target', 'f4')
+    ],
+    'drive_command': [('left_duty', 'f4'), ('right_duty', 'f4'), ('flags', 'u4')]
+}
+
+logger = logging.getLogger('StateBus')
+
+class StateBusError(Exception):
+    """
+    Raised for a segment that does not match the schema, or a record
+    whose writer stopped in the middle of an update
+    """
+
+# Let a descheduled writer finish before the next read attempt
+_yield = getattr(os, 'sched_yield', lambda: time.sleep(0))
+
+def _align(size):
+    return -(-size // RECORD_ALIGN) * RECORD_ALIGN
+
+class StateRecord:
+    def __init__(self, name, fields, offset):
+        """
+        One seqlock-versioned, fixed-layout record in the segment
+
+        The sequence number is odd while the writer updates the payload
+        and even when it is consistent. Readers copy the payload and
+        retry if the sequence changed meanwhile, so they never block the
+        writer. Each record has exactly one writer process.
+
+        Args:
+            name (str): Record name
+            fields (list): (field name, type) pairs, types from COLUMN_TYPES
+            offset (int): Byte offset in the segment
+        """
+        self.name = name
+        self.fields = [('t', 'f8')] + [(field, kind) for field, kind in fields]
+        for field, kind in self.fields:
+            if kind not in COLUMN_TYPES:
+                raise ValueError(f"{name}.{field}: unknown field type {kind!r}")
+        self.columns = tuple(field for field, _ in self.fields)
+        self.payload = struct.Struct('<' + ''.join(COLUMN_TYPES[kind][0] for _, kind in self.fields))
+        self.offset = offset
+        self.size = _align(SEQUENCE.size + self.payload.size)
+        self._buffer = None
+
+    def describe(self):
+        return {'offset': self.offset, 'fields': [list(field) for field in self.fields]}
+
+    def write(self, t, values):
+        """
+        Publish new values (writer process only)
+
+        Args:
+            t (float): Timestamp (monotonic seconds)
+            values (tuple): Field values in schema order
+        """
+        buffer, offset = self._buffer, self.offset
+        sequence = SEQUENCE.unpack_from(buffer, offset)[0] | 1
+        SEQUENCE.pack_into(buffer, offset, sequence)
+        self.payload.pack_into(buffer, offset + SEQUENCE.size, t, *values)
+        SEQUENCE.pack_into(buffer, offset, sequence + 1)
+
+    def read(self, timeout=0.1):
+        """
+        Consistent snapshot, decoded straight from shared memory
+
+        Args:
+            timeout (float): Longest wait for a writer that is mid-update
+                             (it may have been descheduled); the CPU is
+                             yielded between attempts
+
+        Returns:
+            tuple: (sequence, values including 't'), or None if never written
+
+        Raises:
+            StateBusError: If the writer does not finish its update in time
+        """
+        buffer, offset = self._buffer, self.offset
+        unpack_sequence, unpack_payload = SEQUENCE.unpack_from, self.payload.unpack_from
+        payload_offset = offset + SEQUENCE.size
+        deadline = None
+        while True:
+            before = unpack_sequence(buffer, offset)[0]
+            if not before & 1:
+                if before == 0:
+                    return None
+                values = unpack_payload(buffer, payload_offset)
+                if unpack_sequence(buffer, offset)[0] == before:
+                    return before, values
+            if deadline is None:
+                deadline = time.monotonic() + timeout
+            elif time.monotonic() > deadline:
+                raise StateBusError(f"Record {self.name}: writer stalled mid-update")
+            _yield()
+
+    def sequence(self):
+        return SEQUENCE.unpack_from(self._buffer, self.offset)[0]
+
+class StateBus:
+    def __init__(self, schema=STATE_SCHEMA, name='robot_state', create=False, clock=time.monotonic):
+        """
+        Latest-value state shared between processes in one
+        multiprocessing.shared_memory segment
+
+        The layout is computed from the schema by every process; a
+        checksum in the segment header catches processes built with a
+        different schema. CPython issues no memory barriers, so the
+        seqlock relies on a write's stores becoming visible in order:
+        guaranteed on x86, and on the Pi's ARM cores only made likely by
+        the interpreter work between them. Use it for state rewritten
+        every cycle, where a rare torn read is replaced by the next one,
+        not for one-off messages.
+
+        Args:
+            schema (dict): Record name -> (field name, type) list
+            name (str): Shared memory segment name
+            create (bool): Create (and own) the segment instead of attaching
+            clock (callable): Default timestamp source for write()
+
+        Raises:
+            StateBusError: If an attached segment does not match the schema
+        """
+        self.name = name
+        self.clock = clock
+        self.records = {}
+        offset = _align(HEADER.size)
+        for record_name, fields in schema.items():
+            record = StateRecord(record_name, fields, offset)
+            self.records[record_name] = record
+            offset += record.size
+        self.size = offset
+        layout = json.dumps(
+            {record_name: record.describe() for record_name, record in self.records.items()},
+            sort_keys=True
+        )
+        self.layout_id = zlib.crc32(layout.encode())
+
+        self.owner = create
+        if create:
+            self.shm = self._create_segment()
+            HEADER.pack_into(self.shm.buf, 0, MAGIC, FORMAT_VERSION, len(self.records), self.layout_id)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            magic, version, count, layout_id = HEADER.unpack_from(self.shm.buf, 0)
+            if magic != MAGIC or version != FORMAT_VERSION or layout_id != self.layout_id:
+                self.shm.close()
+                raise StateBusError(f"Segment {name}: layout does not match this schema")
+        for record in self.records.values():
+            record._buffer = self.shm.buf
+
+    def _create_segment(self):
+        try:
+            return shared_memory.SharedMemory(name=self.name, create=True, size=self.size)
+        except FileExistsError:
+            # Left behind by a run that did not shut down cleanly
+            logger.warning(f"Replacing stale state segment {self.name}")
+            stale = shared_memory.SharedMemory(name=self.name)
+            stale.close()
+            stale.unlink()
+            return shared_memory.SharedMemory(name=self.name, create=True, size=self.size)
+
+    @classmethod
+    def create(cls, schema=STATE_SCHEMA, name='robot_state'):
+        """
+        Create the segment (the launching process)
+        """
+        return cls(schema, name, create=True)
+
+    @classmethod
+    def attach(cls, name='robot_state', schema=STATE_SCHEMA):
+        """
+        Attach to an existing segment (worker processes)
+        """
+        return cls(schema, name, create=False)
+
+    def write(self, record, values, t=None):
+        """
+        Publish a record (only from the record's writer process)
+
+        Args:
+            record (str): Record name
+            values (tuple): Field values in schema order, without 't'
+            t (float, optional): Timestamp, defaults to the clock
+        """
+        self.records[record].write(self.clock() if t is None else t, values)
+
+    def read(self, record):
+        """
+        Args:
+            record (str): Record name
+
+        Returns:
+            tuple: Values including 't' first, or None if never written
+        """
+        snapshot = self.records[record].read()
+        return snapshot[1] if snapshot else None
+
+    def read_dict(self, record):
+        """
+        Returns:
+            dict: Field name -> value, or None if never written
+        """
+        values = self.read(record)
+        return dict(zip(self.records[record].columns, values)) if values else None
+
+    def sequence(self, record):
+        """
+        Returns:
+            int: Record version; changes with every write, odd mid-write
+        """
+        return self.records[record].sequence()
+
+    def view(self, record):
+        """
+        Zero-copy view of a record's payload
+
+        Values can change under the view; check that sequence() is even
+        and the same before and after using it.
+
+        Returns:
+            numpy.ndarray: Structured 0-d array with the record's fields
+        """
+        record = self.records[record]
+        start = record.offset + SEQUENCE.size
+        dtype = numpy.dtype([(field, COLUMN_TYPES[kind][1]) for field, kind in record.fields])
+        return numpy.ndarray((), dtype=dtype, buffer=self.shm.buf, offset=start)
+
+    def close(self):
+        """
+        Detach from the segment (views handed out must be released first)
+        """
+        for record in self.records.values():
+            record._buffer = None
+        try:
+            self.shm.close()
+        except BufferError:
+            logger.warning(f"State segment {self.name} still has views in use")
+
+    def unlink(self):
+        """
+        Remove the segment (owner only, after every process detached)
+        """
+        if self.owner:
+            self.shm.unlink()
+
+class BusIMUReader:
+    def __init__(self, bus, max_age=0.1):
+        """
+        MPU6050Sensor-compatible reader of the IMU record, so the
+        controller can run with acquisition in another process
+
+        Args:
+            bus (StateBus): Attached state bus
+            max_age (float): Oldest sample still returned (seconds)
+        """
+        self.bus = bus
+        self.max_age = max_age
+        # Fixed offset, so one sample always maps to the same wall-clock time
+        self._epoch = time.time() - bus.clock()
+
+    def read(self):
+        """
+        Returns:
+            dict: 'acceleration' (g), 'gyroscope' (deg/s) and 'timestamp',
+                  or None if no fresh sample exists
+        """
+        values = self.bus.read('imu')
+        if values is None:
+            return None
+        t, ax, ay, az, gx, gy, gz = values
+        age = self.bus.clock() - t
+        if age > self.max_age:
+            return None
+        return {
+            'acceleration': {'x': ax, 'y': ay, 'z': az},
+            'gyroscope': {'x': gx, 'y': gy, 'z': gz},
+            'timestamp': t + self._epoch
+        }
+
+def pin_to_cores(cores):
+    """
+    Restrict the calling process to some CPU cores (Linux)
+
+    Args:
+        cores (iterable): Core numbers
+
+    Returns:
+        bool: True if the affinity was applied
+    """
+    cores = set(cores)
+    if not hasattr(os, 'sched_setaffinity'):
+        logger.warning("CPU affinity not supported on this platform")
+        return False
+    try:
+        os.sched_setaffinity(0, cores)
+        return True
+    except OSError as e:
+        logger.warning(f"Could not pin process {os.getpid()} to cores {sorted(cores)}: {e}")
+        return False
+
+def process_context():
+    """
+    Multiprocessing context for worker processes
+
+    The application already runs threads (log listener, telemetry
+    flusher, link supervisor, watchdog) when workers start; a forked
+    child could inherit a lock one of them held and deadlock on its first
+    log call. Workers start from a clean forkserver process instead, or
+    are spawned where forkserver is not available.
+
+    Returns:
+        multiprocessing context
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+def _process_main(name, target, bus_name, stop_event, cores, args):
+    if cores:
+        pin_to_cores(cores)
+    try:
+        target(bus_name, stop_event, *args)
+    except Exception as e:
+        logger.exception(f"Process {name} failed: {e}")
+        raise SystemExit(1)
+
+class ProcessLauncher:
+    def __init__(self, bus_name='robot_state'):
+        """
+        Starts worker processes on the state bus, each pinned to its cores
+
+        Workers are called as target(bus_name, stop_event, *args) and
+        should attach to the bus and return once stop_event is set. They
+        start from a clean process (see process_context()), so targets
+        and arguments must be picklable.
+
+        Args:
+            bus_name (str): Shared memory segment the workers attach to
+        """
+        self.bus_name = bus_name
+        self.specs = {}
+        self.processes = {}
+        self._context = process_context()
+        self._stop_event = self._context.Event()
+
+    def add(self, name, target, args=(), cores=None):
+        """
+        Register a worker
+
+        Args:
+            name (str): Process name
+            target (callable): Module-level worker function
+            args (tuple): Extra worker arguments
+            cores (list, optional): CPU cores to pin the worker to
+        """
+        self.specs[name] = (target, tuple(args), tuple(cores) if cores else None)
+
+    def start(self):
+        """
+        Start every registered worker that is not running
+        """
+        self._stop_event.clear()
+        for name, (target, args, cores) in self.specs.items():
+            process = self.processes.get(name)
+            if process and process.is_alive():
+                continue
+            process = self._context.Process(
+                target=_process_main,
+                args=(name, target, self.bus_name, self._stop_event, cores, args),
+                name=name,
+                daemon=True
+            )
+            process.start()
+            self.processes[name] = process
+            logger.info(f"Started {name} (pid {process.pid}, cores {list(cores) if cores else 'any'})")
+
+    def status(self):
+        """
+        Returns:
+            dict: Process name -> alive, pid, exit code and cores
+        """
+        return {
+            name: {
+                'alive': process.is_alive(),
+                'pid': process.pid,
+                'exitcode': process.exitcode,
+                'cores': list(self.specs[name][2] or ())
+            }
+            for name, process in self.processes.items()
+        }
+
+    def stop(self, timeout=2.0):
+        """
+        Ask every worker to stop; terminate the ones that do not
+        """
+        self._stop_event.set()
+        deadline = time.monotonic() + timeout
+        for name, process in self.processes.items():
+            process.join(max(deadline - time.monotonic(), 0.0))
+            if process.is_alive():
+                logger.warning(f"{name} did not stop in time, terminating")
+                process.terminate()
+                process.join()
+        self.processes = {}
+
+def imu_acquisition(bus_name, stop_event, rate=200.0, gyro_offset=None, i2c_bus=1):
+    """
+    Worker: sample the MPU6050 at a fixed rate into the 'imu' record
+
+    Args:
+        bus_name (str): State bus segment
+        stop_event (multiprocessing.Event): Set to stop
+        rate (float): Samples per second
+        gyro_offset (dict, optional): Gyroscope bias from calibration
+        i2c_bus (int): I2C bus number
+    """
+    from .sensors.mpu6050 import MPU6050Sensor
+
+    bus = StateBus.attach(bus_name)
+    sensor = MPU6050Sensor(i2c_bus)
+    if gyro_offset:
+        sensor.apply_calibration({'gyro_offset': gyro_offset})
+    period = 1.0 / rate
+    next_sample = time.monotonic()
+    try:
+        while not stop_event.is_set():
+            reading = sensor.read()
+            if reading:
+                accel, gyro = reading['acceleration'], reading['gyroscope']
+                bus.write('imu', (accel['x'], accel['y'], accel['z'], gyro['x'], gyro['y'], gyro['z']))
+            next_sample += period
+            delay = next_sample - time.monotonic()
+            if delay > 0:
+                stop_event.wait(delay)
+            else:
+                # Overran: restart the schedule instead of bursting to catch up
+                next_sample = time.monotonic()
+    finally:
+        bus.close()
+
+def main():
+    """
+    Example: IMU acquisition in its own process, read from this one
+    """
+    logging.basicConfig(level=logging.INFO)
+    os.environ.setdefault('ROBOT_HAL_BACKEND', 'sim')
+    bus = StateBus.create(name='robot_state_demo')
+    launcher = ProcessLauncher(bus.name)
+    launcher.add('imu', imu_acquisition, args=(200.0,), cores=[0])
+    launcher.start()
+    pin_to_cores([min(1, os.cpu_count() - 1)])
+    imu = BusIMUReader(bus)
+    try:
+        time.sleep(0.3)
+        print(imu.read())
+        start = time.perf_counter()
+        for _ in range(10000):
+            bus.read('imu')
+        print(f"{(time.perf_counter() - start) / 10000 * 1e6:.2f} us per consistent read, "
+              f"sequence {bus.sequence('imu')}")
+        print(launcher.status())
+    finally:
+        launcher.stop()
+        bus.close()
+        bus.unlink()
+
+if __name__ == "__main__":
+    main()
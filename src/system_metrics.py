@@ -0,0 +1,496 @@
+import json
+import logging
+import os
+import re
+import socketserver
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Raspberry Pi firmware throttle flags (get_throttled)
+THROTTLE_FLAGS = {
+    0: 'under_voltage',
+    1: 'arm_freq_capped',
+    2: 'throttled',
+    3: 'soft_temp_limit'
+}
+
+_PARTITION = re.compile(r'^((sd|vd|hd|xvd)[a-z]+\d+|.+\dp\d+)$')
+
+class RingBuffer:
+    __slots__ = ('capacity', '_items', '_next', '_count')
+
+    def __init__(self, capacity):
+        """
+        Fixed-size history; the oldest entry is overwritten when full
+
+        Args:
+            capacity (int): Number of entries kept
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._items = [None] * capacity
+        self._next = 0
+        self._count = 0
+
+    def append(self, item):
+        self._items[self._next] = item
+        self._next = (self._next + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def latest(self):
+        if not self._count:
+            return None
+        return self._items[self._next - 1]
+
+    def snapshot(self):
+        """
+        Returns:
+            list: Entries, oldest first
+        """
+        if self._count < self.capacity:
+            return self._items[:self._count]
+        return self._items[self._next:] + self._items[:self._next]
+
+    def __len__(self):
+        return self._count
+
+class ProcfsReader:
+    def __init__(self, proc_root='/proc', sys_root='/sys', pid='self'):
+        """
+        Raw system counters from /proc and /sys (Linux, no dependencies)
+
+        Args:
+            proc_root (str): procfs mount point
+            sys_root (str): sysfs mount point
+            pid (str): Process to report on
+        """
+        self.proc_root = proc_root
+        self.sys_root = sys_root
+        self.pid = str(pid)
+        self.clock_ticks = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+        self.page_size = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+    @classmethod
+    def available(cls):
+        return os.path.exists('/proc/stat')
+
+    def _read(self, *parts):
+        with open(os.path.join(*parts), 'r') as counter_file:
+            return counter_file.read()
+
+    def _optional(self, *parts):
+        try:
+            return self._read(*parts).strip()
+        except OSError:
+            return None
+
+    def read(self):
+        """
+        Returns:
+            dict: Cumulative counters and instantaneous gauges
+        """
+        counters = {}
+
+        # Per-core (busy, total) jiffies
+        cores = []
+        for line in self._read(self.proc_root, 'stat').splitlines():
+            if line.startswith('cpu') and line[3:4].isdigit():
+                values = [int(value) for value in line.split()[1:]]
+                idle = values[3] + (values[4] if len(values) > 4 else 0)
+                total = sum(values[:8])
+                cores.append((total - idle, total))
+        counters['cpu'] = cores
+
+        meminfo = {}
+        for line in self._read(self.proc_root, 'meminfo').splitlines():
+            name, _, value = line.partition(':')
+            meminfo[name] = int(value.split()[0]) * 1024
+        counters['mem_total'] = meminfo.get('MemTotal', 0)
+        counters['mem_available'] = meminfo.get('MemAvailable', meminfo.get('MemFree', 0))
+
+        rx = tx = 0
+        for line in self._read(self.proc_root, 'net', 'dev').splitlines()[2:]:
+            interface, _, values = line.partition(':')
+            if interface.strip() == 'lo':
+                continue
+            values = values.split()
+            rx += int(values[0])
+            tx += int(values[8])
+        counters['net'] = (rx, tx)
+
+        read_bytes = write_bytes = 0
+        diskstats = self._optional(self.proc_root, 'diskstats') or ''
+        for line in diskstats.splitlines():
+            values = line.split()
+            name = values[2]
+            if name.startswith(('loop', 'ram', 'zram')) or _PARTITION.match(name):
+                continue
+            read_bytes += int(values[5]) * 512
+            write_bytes += int(values[9]) * 512
+        counters['disk'] = (read_bytes, write_bytes)
+
+        # Process: fields after the parenthesised command name
+        stat = self._read(self.proc_root, self.pid, 'stat')
+        fields = stat[stat.rindex(')') + 2:].split()
+        counters['process_cpu'] = (int(fields[11]) + int(fields[12])) / self.clock_ticks
+        counters['process_threads'] = int(fields[17])
+        counters['process_rss'] = int(fields[21]) * self.page_size
+
+        temperature = self._optional(self.sys_root, 'class', 'thermal', 'thermal_zone0', 'temp')
+        counters['temperature'] = int(temperature) / 1000.0 if temperature else None
+
+        frequency = self._optional(self.sys_root, 'devices', 'system', 'cpu', 'cpu0', 'cpufreq', 'scaling_cur_freq')
+        counters['cpu_freq_mhz'] = int(frequency) / 1000.0 if frequency else None
+
+        throttled = self._optional(self.sys_root, 'devices', 'platform', 'soc', 'soc:firmware', 'get_throttled')
+        counters['throttled'] = int(throttled, 16) if throttled else None
+        return counters
+
+class PsutilReader:
+    """
+    Raw system counters from psutil, for platforms without procfs.
+    """
+
+    @classmethod
+    def available(cls):
+        return psutil is not None
+
+    def __init__(self):
+        self.process = psutil.Process()
+
+    def read(self):
+        counters = {}
+        cores = []
+        for times in psutil.cpu_times(percpu=True):
+            total = sum(times)
+            idle = times.idle + getattr(times, 'iowait', 0)
+            cores.append((total - idle, total))
+        counters['cpu'] = cores
+
+        memory = psutil.virtual_memory()
+        counters['mem_total'] = memory.total
+        counters['mem_available'] = memory.available
+
+        net = psutil.net_io_counters()
+        counters['net'] = (net.bytes_recv, net.bytes_sent) if net else (0, 0)
+        disk = psutil.disk_io_counters()
+        counters['disk'] = (disk.read_bytes, disk.write_bytes) if disk else (0, 0)
+
+        with self.process.oneshot():
+            cpu_times = self.process.cpu_times()
+            counters['process_cpu'] = cpu_times.user + cpu_times.system
+            counters['process_threads'] = self.process.num_threads()
+            counters['process_rss'] = self.process.memory_info().rss
+
+        temperature = None
+        sensors_temperatures = getattr(psutil, 'sensors_temperatures', None)
+        if sensors_temperatures:
+            for entries in sensors_temperatures().values():
+                if entries:
+                    temperature = entries[0].current
+                    break
+        counters['temperature'] = temperature
+        frequency = psutil.cpu_freq()
+        counters['cpu_freq_mhz'] = frequency.current if frequency else None
+        counters['throttled'] = None
+        return counters
+
+class SystemMetricsSampler:
+    def __init__(self, capacity=600, reader=None, clock=time.monotonic, wall_clock=time.time):
+        """
+        Periodic system metrics with a fixed-size history
+
+        Each sample turns cumulative counters (CPU jiffies, network and
+        disk bytes, process CPU time) into rates against the previous
+        sample, so one sample costs a handful of small /proc reads.
+
+        Args:
+            capacity (int): Samples kept in the ring buffer
+            reader (object, optional): Counter source with read(); defaults
+                                       to procfs, then psutil
+            clock (callable): Monotonic time source for rates
+            wall_clock (callable): Timestamp source stored in samples
+        """
+        if reader is None:
+            if ProcfsReader.available():
+                reader = ProcfsReader()
+            elif PsutilReader.available():
+                reader = PsutilReader()
+        self.reader = reader
+        self.clock = clock
+        self.wall_clock = wall_clock
+        self.history = RingBuffer(capacity)
+        self.logger = logging.getLogger('SystemMetrics')
+
+        self._previous = None
+        self._previous_time = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def sample(self):
+        """
+        Take one sample and append it to the history
+
+        Returns:
+            dict: Sample, or None if no counter source is available
+        """
+        if self.reader is None:
+            return None
+        counters = self.reader.read()
+        now = self.clock()
+
+        with self._lock:
+            previous = self._previous
+            elapsed = now - self._previous_time if previous else 0.0
+            self._previous = counters
+            self._previous_time = now
+
+        def _rate(current, last):
+            return (current - last) / elapsed if elapsed > 0 else 0.0
+
+        core_percent = []
+        busy_delta = total_delta = 0
+        for index, (busy, total) in enumerate(counters['cpu']):
+            if previous and index < len(previous['cpu']):
+                last_busy, last_total = previous['cpu'][index]
+                core_busy, core_total = busy - last_busy, total - last_total
+            else:
+                core_busy, core_total = busy, total
+            busy_delta += core_busy
+            total_delta += core_total
+            core_percent.append(round(100.0 * core_busy / core_total, 1) if core_total else 0.0)
+
+        mem_total = counters['mem_total']
+        throttled = counters['throttled']
+        sample = {
+            'timestamp': self.wall_clock(),
+            'monotonic': now,
+            'cpu_percent': round(100.0 * busy_delta / total_delta, 1) if total_delta else 0.0,
+            'cpu_core_percent': core_percent,
+            'cpu_temperature_c': counters['temperature'],
+            'cpu_freq_mhz': counters['cpu_freq_mhz'],
+            'throttled_flags': throttled,
+            'throttled': bool(throttled & 0xF) if throttled is not None else None,
+            'memory_percent': round(100.0 * (mem_total - counters['mem_available']) / mem_total, 1) if mem_total else 0.0,
+            'memory_available_bytes': counters['mem_available'],
+            'net_rx_bps': 0.0,
+            'net_tx_bps': 0.0,
+            'disk_read_bps': 0.0,
+            'disk_write_bps': 0.0,
+            'process_cpu_percent': 0.0,
+            'process_rss_bytes': counters['process_rss'],
+            'process_threads': counters['process_threads']
+        }
+        if previous:
+            sample['net_rx_bps'] = _rate(counters['net'][0], previous['net'][0])
+            sample['net_tx_bps'] = _rate(counters['net'][1], previous['net'][1])
+            sample['disk_read_bps'] = _rate(counters['disk'][0], previous['disk'][0])
+            sample['disk_write_bps'] = _rate(counters['disk'][1], previous['disk'][1])
+            sample['process_cpu_percent'] = round(100.0 * _rate(counters['process_cpu'], previous['process_cpu']), 1)
+
+        with self._lock:
+            self.history.append(sample)
+        return sample
+
+    def latest(self):
+        with self._lock:
+            return self.history.latest()
+
+    def samples(self, since=None):
+        """
+        Args:
+            since (float, optional): Only samples taken at or after this
+                                     monotonic time
+
+        Returns:
+            list: Samples, oldest first
+        """
+        with self._lock:
+            samples = self.history.snapshot()
+        if since is not None:
+            samples = [sample for sample in samples if sample['monotonic'] >= since]
+        return samples
+
+    def start(self, interval=1.0):
+        """
+        Sample on a background thread
+
+        Args:
+            interval (float): Sample period in seconds
+        """
+        if self._thread and self._thread.is_alive():
+            return
+
+        def _run():
+            while True:
+                try:
+                    self.sample()
+                except Exception as e:
+                    self.logger.error(f"Metrics sample failed: {e}")
+                if self._stop_event.wait(interval):
+                    break
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=_run, name='system-metrics', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def to_prometheus(self, prefix='vehicle'):
+        """
+        Latest sample in the Prometheus text exposition format
+
+        Args:
+            prefix (str): Metric name prefix
+
+        Returns:
+            str: Exposition text (empty if nothing was sampled yet)
+        """
+        sample = self.latest()
+        if sample is None:
+            return ''
+
+        lines = []
+
+        def _gauge(name, help_text, values):
+            # values: [(labels, value)], labels '' for an unlabelled gauge
+            values = [(labels, value) for labels, value in values if value is not None]
+            if not values:
+                return
+            metric = f"{prefix}_{name}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} gauge")
+            for labels, value in values:
+                label_text = f"{{{labels}}}" if labels else ''
+                lines.append(f"{metric}{label_text} {float(value)}")
+
+        _gauge('cpu_percent', "CPU utilisation, all cores", [('', sample['cpu_percent'])])
+        _gauge('cpu_core_percent', "CPU utilisation per core",
+               [(f'core="{index}"', value) for index, value in enumerate(sample['cpu_core_percent'])])
+        _gauge('cpu_temperature_celsius', "SoC temperature", [('', sample['cpu_temperature_c'])])
+        _gauge('cpu_frequency_mhz', "Current CPU clock", [('', sample['cpu_freq_mhz'])])
+        flags = sample['throttled_flags']
+        if flags is not None:
+            _gauge('throttled', "Firmware throttle flags (1 = active now)",
+                   [(f'reason="{name}"', (flags >> bit) & 1) for bit, name in THROTTLE_FLAGS.items()])
+        _gauge('memory_percent', "Memory in use", [('', sample['memory_percent'])])
+        _gauge('memory_available_bytes', "Memory available", [('', sample['memory_available_bytes'])])
+        _gauge('network_bytes_per_second', "Network throughput, all interfaces except lo",
+               [('direction="rx"', sample['net_rx_bps']), ('direction="tx"', sample['net_tx_bps'])])
+        _gauge('disk_bytes_per_second', "Disk throughput, whole devices",
+               [('direction="read"', sample['disk_read_bps']), ('direction="write"', sample['disk_write_bps'])])
+        _gauge('process_cpu_percent', "CPU used by this process (100 = one core)",
+               [('', sample['process_cpu_percent'])])
+        _gauge('process_rss_bytes', "Resident memory of this process", [('', sample['process_rss_bytes'])])
+        _gauge('process_threads', "Threads in this process", [('', sample['process_threads'])])
+        return '\n'.join(lines) + '\n'
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    sampler = None
+
+    sources = ()
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            text = self.sampler.to_prometheus() + ''.join(source() for source in self.sources)
+            body = text.encode()
+            content_type = 'text/plain; version=0.0.4'
+        elif self.path == '/metrics.json':
+            body = json.dumps(self.sampler.samples()).encode()
+            content_type = 'application/json'
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Keep scrapes out of the vehicle log
+        pass
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+class MetricsServer:
+    def __init__(self, sampler, host='127.0.0.1', port=9108, unix_path=None, sources=()):
+        """
+        Serve /metrics (Prometheus text) and /metrics.json (history)
+
+        Args:
+            sampler (SystemMetricsSampler): Metrics source
+            host (str): TCP bind address
+            port (int): TCP port (0 picks a free one)
+            unix_path (str, optional): Serve on this Unix socket instead of TCP
+            sources (iterable): Extra callables returning exposition text
+        """
+        handler = type('MetricsRequestHandler', (_MetricsRequestHandler,), {
+            'sampler': sampler,
+            'sources': tuple(sources)
+        })
+        self.unix_path = unix_path
+        if unix_path:
+            if os.path.exists(unix_path):
+                os.unlink(unix_path)
+            self.server = _UnixHTTPServer(unix_path, handler)
+        else:
+            self.server = ThreadingHTTPServer((host, port), handler)
+            self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def address(self):
+        return self.server.server_address
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name='metrics-server', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        if self.unix_path and os.path.exists(self.unix_path):
+            os.unlink(self.unix_path)
+
+def main():
+    """
+    Example usage of the metrics sampler and endpoint
+    """
+    sampler = SystemMetricsSampler()
+    server = None
+    try:
+        sampler.start(interval=1.0)
+        server = MetricsServer(sampler)
+        server.start()
+        print(f"Serving metrics on http://{server.address[0]}:{server.address[1]}/metrics")
+
+        while True:
+            time.sleep(5)
+            print(sampler.latest())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sampler.stop()
+        if server:
+            server.stop()
+
+if __name__ == "__main__":
+    main()
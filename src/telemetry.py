@@ -0,0 +1,470 @@
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+import numpy
+from . import hal
+
+FORMAT_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+INDEX_NAME = 'index.json'
+CHUNK_PATTERN = 'chunk-{:06d}.bin'
+
+# Column type -> (struct code, numpy type string); all little-endian, unpadded
+COLUMN_TYPES = {
+    'f8': ('d', '<f8'),
+    'f4': ('f', '<f4'),
+    'i8': ('q', '<i8'),
+    'i4': ('i', '<i4'),
+    'i2': ('h', '<i2'),
+    'i1': ('b', '|i1'),
+    'u8': ('Q', '<u8'),
+    'u4': ('I', '<u4'),
+    'u2': ('H', '<u2'),
+    'u1': ('B', '|u1'),
+    'bool': ('?', '|b1')
+}
+
+_CHANNEL_NAME = re.compile(r'^[A-Za-z0-9_.-]+$')
+
+def _write_json(path, document):
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as json_file:
+        json.dump(document, json_file, indent=1)
+    os.replace(temp_path, path)
+
+class TelemetryChannel:
+    def __init__(self, directory, name, fields, chunk_records):
+        """
+        Append-only column of fixed-size records split into chunk files
+
+        Every record starts with the float64 timestamp 't'. Chunks hold
+        at most chunk_records records and are listed with their time
+        range in index.json, rewritten atomically on each flush.
+
+        Args:
+            directory (str): Run directory
+            name (str): Channel name (letters, digits, '_', '.', '-')
+            fields (list): (column name, type) pairs, types from COLUMN_TYPES
+            chunk_records (int): Records per chunk file
+        """
+        if not _CHANNEL_NAME.match(name):
+            raise ValueError(f"Invalid telemetry channel name: {name!r}")
+        self.name = name
+        self.fields = [('t', 'f8')] + [(column, kind) for column, kind in fields]
+        for column, kind in self.fields:
+            if kind not in COLUMN_TYPES:
+                raise ValueError(f"{name}.{column}: unknown column type {kind!r}")
+        self.struct = struct.Struct('<' + ''.join(COLUMN_TYPES[kind][0] for _, kind in self.fields))
+        self.chunk_records = chunk_records
+        self.directory = os.path.join(directory, name)
+        os.makedirs(self.directory, exist_ok=True)
+
+        self.chunks = []
+        self.records = 0
+        self.last_time = None
+        self._buffer = bytearray()
+        self._pending = []
+        self._file = None
+
+    def describe(self):
+        return {
+            'fields': [[column, COLUMN_TYPES[kind][1]] for column, kind in self.fields],
+            'record_size': self.struct.size,
+            'chunk_records': self.chunk_records
+        }
+
+    def append(self, timestamp, values):
+        """
+        Buffer one record (call with the recorder lock held)
+
+        Returns:
+            bool: False if the timestamp went backwards and the record was dropped
+        """
+        if self.last_time is not None and timestamp < self.last_time:
+            return False
+        self._buffer += self.struct.pack(timestamp, *values)
+        self._pending.append(timestamp)
+        self.last_time = timestamp
+        return True
+
+    def take(self):
+        """
+        Hand over the buffered records for writing
+
+        Returns:
+            tuple: (bytes, timestamps)
+        """
+        data, timestamps = bytes(self._buffer), self._pending
+        self._buffer = bytearray()
+        self._pending = []
+        return data, timestamps
+
+    def write(self, data, timestamps):
+        """
+        Append taken records to the chunk files and update the index
+
+        Args:
+            data (bytes): Packed records
+            timestamps (list): Their timestamps
+        """
+        size = self.struct.size
+        offset = 0
+        while offset < len(timestamps):
+            if not self.chunks or self.chunks[-1]['count'] >= self.chunk_records:
+                self._open_chunk(len(self.chunks))
+            chunk = self.chunks[-1]
+            count = min(self.chunk_records - chunk['count'], len(timestamps) - offset)
+            self._file.write(data[offset * size:(offset + count) * size])
+            if chunk['count'] == 0:
+                chunk['t_start'] = timestamps[offset]
+            chunk['t_end'] = timestamps[offset + count - 1]
+            chunk['count'] += count
+            offset += count
+
+        if self._file:
+            self._file.flush()
+        self.records += len(timestamps)
+        _write_json(os.path.join(self.directory, INDEX_NAME), {'chunks': self.chunks})
+
+    def _open_chunk(self, number):
+        if self._file:
+            self._file.close()
+        filename = CHUNK_PATTERN.format(number)
+        self._file = open(os.path.join(self.directory, filename), 'ab')
+        self.chunks.append({'file': filename, 'count': 0, 't_start': None, 't_end': None})
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+class TelemetryRecorder:
+    def __init__(self, directory='telemetry', run_name=None, chunk_records=65536,
+                 flush_records=512, flush_interval=1.0, clock=hal.monotonic, wall_clock=hal.time):
+        """
+        Record sensor streams and actuator commands as columnar binary files
+
+        Each channel is a sequence of fixed-size little-endian records
+        (a NumPy structured dtype) in chunk files, so a run can be
+        memory-mapped and sliced by time offline with TelemetryReader.
+        record() only packs into an in-memory batch; batches are written
+        by the background flusher (start()) or inline once flush_records
+        records are pending.
+
+        Args:
+            directory (str): Parent directory for runs
+            run_name (str, optional): Run directory name, defaults to the
+                                      wall-clock start time
+            chunk_records (int): Records per chunk file
+            flush_records (int): Pending records that trigger a flush
+            flush_interval (float): Background flush period (seconds)
+            clock (callable): Record timestamp source (monotonic seconds)
+            wall_clock (callable): Wall-clock source for the manifest
+        """
+        self.logger = logging.getLogger('TelemetryRecorder')
+        self.clock = clock
+        self.chunk_records = chunk_records
+        self.flush_records = flush_records
+        self.flush_interval = flush_interval
+        started = wall_clock()
+        if run_name is None:
+            run_name = time.strftime('run-%Y%m%d-%H%M%S', time.gmtime(started))
+        # Never append to an earlier run that got the same name
+        self.directory = os.path.join(directory, run_name)
+        suffix = 0
+        while os.path.exists(os.path.join(self.directory, MANIFEST_NAME)):
+            suffix += 1
+            self.directory = os.path.join(directory, f"{run_name}-{suffix}")
+        os.makedirs(self.directory, exist_ok=True)
+
+        self.manifest = {
+            'version': FORMAT_VERSION,
+            'started': started,
+            'clock_offset': started - clock(),
+            'channels': {}
+        }
+        self.channels = {}
+        self.stats = {'records': 0, 'flushes': 0, 'out_of_order': 0, 'bytes': 0}
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._write_manifest()
+
+    def _write_manifest(self):
+        _write_json(os.path.join(self.directory, MANIFEST_NAME), self.manifest)
+
+    def add_channel(self, name, fields):
+        """
+        Declare a channel (repeat declarations must match)
+
+        Args:
+            name (str): Channel name
+            fields (list): (column name, type) pairs, e.g. [('ax', 'f4')]
+
+        Returns:
+            TelemetryChannel: The channel
+        """
+        with self._lock:
+            channel = self.channels.get(name)
+            if channel is not None:
+                if channel.fields[1:] != [(column, kind) for column, kind in fields]:
+                    raise ValueError(f"Telemetry channel {name} already declared with other fields")
+                return channel
+            channel = TelemetryChannel(self.directory, name, fields, self.chunk_records)
+            self.channels[name] = channel
+            self.manifest['channels'][name] = channel.describe()
+            self._write_manifest()
+            return channel
+
+    def record(self, name, values, timestamp=None):
+        """
+        Append one record to a channel
+
+        Args:
+            name (str): Declared channel name
+            values (sequence): One value per declared column
+            timestamp (float, optional): Monotonic time, defaults to now
+        """
+        if timestamp is None:
+            timestamp = self.clock()
+        with self._lock:
+            if not self.channels[name].append(timestamp, values):
+                self.stats['out_of_order'] += 1
+                return
+            self.stats['records'] += 1
+            self._pending += 1
+            full = self._pending >= self.flush_records
+
+        if full:
+            if self._thread:
+                self._wake.set()
+            else:
+                self.flush()
+
+    def flush(self):
+        """
+        Write every pending record to disk
+        """
+        with self._write_lock:
+            with self._lock:
+                batches = [(channel, channel.take()) for channel in self.channels.values()]
+                self._pending = 0
+            for channel, (data, timestamps) in batches:
+                if timestamps:
+                    channel.write(data, timestamps)
+                    self.stats['bytes'] += len(data)
+            self.stats['flushes'] += 1
+
+    def start(self):
+        """
+        Flush on a background thread every flush_interval seconds, or
+        sooner when a batch fills
+        """
+        if self._thread and self._thread.is_alive():
+            return
+
+        def _run():
+            while not self._stop_event.is_set():
+                self._wake.wait(self.flush_interval)
+                self._wake.clear()
+                try:
+                    self.flush()
+                except Exception as e:
+                    self.logger.error(f"Telemetry flush failed: {e}")
+
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=_run, name='telemetry-writer', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def close(self):
+        """
+        Stop the flusher, write what is pending and close the chunk files
+        """
+        self.stop()
+        self.flush()
+        for channel in self.channels.values():
+            channel.close()
+
+class TelemetryReader:
+    def __init__(self, run_directory):
+        """
+        Offline access to a recorded run
+
+        read() returns structured arrays backed by numpy.memmap, so
+        slicing a multi-GB run by time only touches the pages it needs.
+
+        Args:
+            run_directory (str): Directory written by TelemetryRecorder
+        """
+        self.directory = run_directory
+        with open(os.path.join(run_directory, MANIFEST_NAME), 'r') as manifest_file:
+            self.manifest = json.load(manifest_file)
+        if self.manifest.get('version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported telemetry format: {self.manifest.get('version')}")
+        self._maps = {}
+
+    @property
+    def channels(self):
+        return sorted(self.manifest['channels'])
+
+    def columns(self, name):
+        return [column for column, _ in self.manifest['channels'][name]['fields']]
+
+    def dtype(self, name):
+        """
+        NumPy structured dtype of a channel's records
+        """
+        return numpy.dtype([tuple(field) for field in self.manifest['channels'][name]['fields']])
+
+    def chunks(self, name):
+        """
+        Chunk files of a channel with their record counts and time ranges
+
+        The index is rewritten on each flush, so records flushed after a
+        crash-interrupted index write are still found from the file sizes.
+
+        Returns:
+            list: {'file', 'count', 't_start', 't_end'} per chunk, in order
+        """
+        record_size = self.manifest['channels'][name]['record_size']
+        directory = os.path.join(self.directory, name)
+        try:
+            with open(os.path.join(directory, INDEX_NAME), 'r') as index_file:
+                indexed = {chunk['file']: chunk for chunk in json.load(index_file)['chunks']}
+        except FileNotFoundError:
+            indexed = {}
+
+        chunks = []
+        for filename in sorted(os.listdir(directory)):
+            if not filename.startswith('chunk-'):
+                continue
+            count = os.path.getsize(os.path.join(directory, filename)) // record_size
+            if count == 0:
+                continue
+            chunk = indexed.get(filename)
+            if chunk is None or chunk['count'] != count:
+                chunk = {'file': filename, 'count': count,
+                         't_start': self._timestamp(name, filename, 0),
+                         't_end': self._timestamp(name, filename, count - 1)}
+            chunks.append(chunk)
+        return chunks
+
+    def _map(self, name, filename, size):
+        # Remapped when a chunk of a run still being recorded has grown
+        key = (name, filename)
+        mapped = self._maps.get(key)
+        if mapped is None or len(mapped) < size:
+            if mapped is not None:
+                mapped.close()
+            with open(os.path.join(self.directory, name, filename), 'rb') as chunk_file:
+                mapped = self._maps[key] = mmap.mmap(chunk_file.fileno(), 0, access=mmap.ACCESS_READ)
+        return mapped
+
+    def _timestamp(self, name, filename, index):
+        record_size = self.manifest['channels'][name]['record_size']
+        offset = index * record_size
+        return struct.unpack_from('<d', self._map(name, filename, offset + record_size), offset)[0]
+
+    def time_range(self, name):
+        """
+        Returns:
+            tuple: (first, last) timestamp of a channel, or None if empty
+        """
+        chunks = self.chunks(name)
+        if not chunks:
+            return None
+        return chunks[0]['t_start'], chunks[-1]['t_end']
+
+    def _bisect(self, name, filename, count, timestamp):
+        # First record index with t >= timestamp
+        low, high = 0, count
+        while low < high:
+            middle = (low + high) // 2
+            if self._timestamp(name, filename, middle) < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def read(self, name, start=None, end=None):
+        """
+        Records with start <= t < end
+
+        Only chunks overlapping the range are mapped. Within a chunk the
+        bounds are found by binary search on the timestamp column.
+
+        Args:
+            name (str): Channel name
+            start (float, optional): First timestamp (inclusive)
+            end (float, optional): Last timestamp (exclusive)
+
+        Returns:
+            numpy structured array (a zero-copy memmap view when the range
+            lies in one chunk)
+        """
+        parts = []
+        for chunk in self.chunks(name):
+            if start is not None and chunk['t_end'] < start:
+                continue
+            if end is not None and chunk['t_start'] >= end:
+                break
+            filename, count = chunk['file'], chunk['count']
+            first = 0 if start is None else self._bisect(name, filename, count, start)
+            last = count if end is None else self._bisect(name, filename, count, end)
+            if first < last:
+                parts.append((filename, count, first, last))
+
+        dtype = self.dtype(name)
+        views = [
+            numpy.memmap(os.path.join(self.directory, name, filename), dtype=dtype,
+                         mode='r', shape=(count,))[first:last]
+            for filename, count, first, last in parts
+        ]
+        if not views:
+            return numpy.empty(0, dtype=dtype)
+        if len(views) == 1:
+            return views[0]
+        return numpy.concatenate(views)
+
+    def close(self):
+        for mapped in self._maps.values():
+            mapped.close()
+        self._maps.clear()
+
+def main():
+    """
+    Example: record a simulated IMU stream, then slice it offline
+    """
+    import tempfile
+    sim = hal.use_simulator()
+    with tempfile.TemporaryDirectory() as directory:
+        recorder = TelemetryRecorder(directory, run_name='example', chunk_records=1000)
+        recorder.add_channel('imu', [('ax', 'f4'), ('ay', 'f4'), ('az', 'f4')])
+        for i in range(5000):
+            sim.clock.advance(0.01)
+            recorder.record('imu', (0.01 * (i % 7), 0.0, 1.0))
+        recorder.close()
+
+        reader = TelemetryReader(recorder.directory)
+        print("Channels:", reader.channels, "range:", reader.time_range('imu'))
+        window = reader.read('imu', start=10.0, end=10.1)
+        print(f"{len(window)} records between t=10.0 and t=10.1")
+        reader.close()
+
+if __name__ == "__main__":
+    main()
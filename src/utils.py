@@ -2,7 +2,14 @@ import os
 import json
 import logging
 from datetime import datetime
-import psutil
+from .logging_pipeline import (
+    LoggingPipeline, SizeAndTimeRotatingFileHandler, JsonLinesFormatter, LOG_FORMAT
+)
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
 
 class SystemUtils:
     @staticmethod
@@ -12,7 +19,13 @@ class SystemUtils:
         
         Returns:
             dict: System performance and resource metrics
+        
+        For periodic sampling with history and rates use
+        system_metrics.SystemMetricsSampler instead.
         """
+        if psutil is None:
+            logging.error("psutil is not installed; use SystemMetricsSampler instead")
+            return {}
         try:
             return {
                 'cpu_usage': psutil.cpu_percent(),
@@ -33,6 +46,8 @@ class SystemUtils:
         Returns:
             dict: Network interface stats
         """
+        if psutil is None:
+            return {}
         try:
             net_stats = psutil.net_io_counters()
             return {
@@ -84,23 +99,62 @@ class ConfigManager:
             logging.error(f"Error saving configuration: {e}")
 
 class LoggingManager:
+    pipeline = None
+    
     @staticmethod
-    def setup_logging(log_dir='logs', log_level=logging.INFO):
+    def setup_logging(log_dir='logs', log_level=logging.INFO, max_bytes=10 * 1024 * 1024,
+                      backup_count=5, rotate_interval=24 * 3600, json_lines=False,
+                      queue_size=10000, console=True):
         """
         Setup logging configuration
         
+        Log calls only enqueue the record; a listener thread writes the
+        console and the rotating log file, so no caller blocks on I/O.
+        Calling this again returns the running pipeline.
+        
         Args:
             log_dir (str): Directory to store log files
             log_level (int): Logging level
+            max_bytes (int): Rotate the log file past this size (0 disables)
+            backup_count (int): Rotated log files kept
+            rotate_interval (float): Rotate the log file every interval seconds (0 disables)
+            json_lines (bool): Write the log file as compact JSON lines
+            queue_size (int): Records buffered before new ones are dropped
+            console (bool): Also log to the console
+        
+        Returns:
+            LoggingPipeline: The running pipeline (see stats())
         """
+        if LoggingManager.pipeline and LoggingManager.pipeline.running:
+            return LoggingManager.pipeline
+        
         os.makedirs(log_dir, exist_ok=True)
-        log_file = os.path.join(log_dir, f"robotic_vehicle_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log")
+        extension = 'jsonl' if json_lines else 'log'
+        log_file = os.path.join(log_dir, f"robotic_vehicle_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}")
+        
+        file_handler = SizeAndTimeRotatingFileHandler(
+            log_file,
+            max_bytes=max_bytes,
+            backup_count=backup_count,
+            interval=rotate_interval
+        )
+        file_handler.setFormatter(JsonLinesFormatter() if json_lines else logging.Formatter(LOG_FORMAT))
+        handlers = [file_handler]
         
-        logging.basicConfig(
-            level=log_level,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file),
-                logging.StreamHandler()
-            ]
-        )
\ No newline at end of file
+        if console:
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+            handlers.append(console_handler)
+        
+        LoggingManager.pipeline = LoggingPipeline(handlers, queue_size=queue_size, level=log_level)
+        LoggingManager.pipeline.start()
+        return LoggingManager.pipeline
+    
+    @staticmethod
+    def shutdown():
+        """
+        Flush queued log records and close the log files
+        """
+        if LoggingManager.pipeline:
+            LoggingManager.pipeline.stop()
+            LoggingManager.pipeline = None
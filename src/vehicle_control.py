@@ -1,48 +1,212 @@
-# import RPi.GPIO as GPIO
-import gpiozero as GPIO
-import time
 import logging
+from . import hal
 from .sensors.mpu6050 import MPU6050Sensor
-from .actuators.motor_controller import MotorController
+from .sensors.ir_speed_sensor import IRSpeedSensor
+from .sensors.calibration_store import CalibrationStore
+from .sensors.vl53l0x_lidar import VL53L0XLidar
+from .actuators.differential_drive import DifferentialDrive
+from .actuators.hydraulic_corner import HydraulicCorner, SuspensionActuators
+from .control.wheel_speed import WheelSpeedController, FeedforwardTable
+from .control.suspension import SuspensionController, RideHeightMonitor
+from .control.road_preview import RoadPreview, PreviewMonitor
 from .communication.bluetooth_controller import BluetoothController
+from .communication.teleop_channel import MODE_STOP
+from .communication.telemetry_downlink import (
+    FLAG_ESTOP, FLAG_UNSTABLE, FLAG_LINK_LOST, FLAG_DEGRADED
+)
+from .settings import compile_config
 
 class VehicleController:
-    def __init__(self, config):
+    def __init__(self, config, imu_sensor=None, drive_train=None,
+                 bluetooth_controller=None, calibrate=True):
         """
         Initialize vehicle control system
         
+        Devices not passed in are created here; main.py passes the ones
+        brought up in parallel by the bring-up orchestrator.
+        
         Args:
-            config (dict): System configuration
+            config (VehicleConfig): Compiled configuration (a raw dict is
+                                    compiled on the way in)
+            imu_sensor (MPU6050Sensor, optional): Initialized IMU
+            drive_train (DifferentialDrive, optional): Initialized drive
+            bluetooth_controller (BluetoothController, optional): Connected link
+            calibrate (bool): Calibrate the IMU (skip if already calibrated)
         """
+        if isinstance(config, dict):
+            config = compile_config(config)
         self.config = config
         self.logger = logging.getLogger('VehicleController')
         
         # Initialize sensors
-        self.imu_sensor = MPU6050Sensor()
+        self.imu_sensor = imu_sensor or MPU6050Sensor()
         
-        # Initialize motor controller
-        self.motor_controller = MotorController(
-            config['gpio']['dc_motor_pins']
+        # Initialize left/right drive motors
+        motor_pins = config.gpio.dc_motor_pins
+        self.drive_train = drive_train or DifferentialDrive.from_pins(
+            motor_pins.left.pins, motor_pins.right.pins
         )
         
+        # Optional closed-loop wheel speed control from the IR speed sensors
+        self.speed_sensors = None
+        self.speed_controllers = None
+        self.wheel_speed_targets = [0.0, 0.0]
+        self.wheel_speed_measured = [0.0, 0.0]
+        self._last_tick = None
+        self.telemetry = None
+        self._teleop_seq = None
+        self.last_imu = None
+        self.status_flags = 0
+        self.speed_limit = 1.0
+        if config.speed_control:
+            self._setup_speed_control(config.speed_control)
+        
+        # Optional active hydro-suspension
+        self.suspension = None
+        self.suspension_actuators = None
+        self.ride_height_monitor = None
+        self.road_preview = None
+        self.preview_monitor = None
+        self.odometer = 0.0
+        if config.suspension:
+            self._setup_suspension(config.suspension)
+        
         # Initialize communication
-        self.bluetooth_controller = BluetoothController(
-            config['communication']['bluetooth']
+        self.bluetooth_controller = bluetooth_controller or BluetoothController(
+            **config.communication.bluetooth.to_dict()
         )
         
         # Calibrate sensors
-        self._calibrate_sensors()
+        if calibrate:
+            self._calibrate_sensors()
+    
+    def _setup_speed_control(self, speed_config):
+        """
+        Create per-wheel speed sensors and controllers
+        
+        Args:
+            speed_config (SpeedControlConfig): Sensor pins, wheel
+                                               circumference and max speed
+        """
+        circumference = speed_config.wheel_circumference
+        self.max_wheel_speed = speed_config.max_speed
+        
+        self.speed_sensors = (
+            IRSpeedSensor(speed_config.left_sensor_pin, circumference),
+            IRSpeedSensor(speed_config.right_sensor_pin, circumference)
+        )
+        self.speed_controllers = tuple(
+            WheelSpeedController(feedforward=FeedforwardTable(max_speed=self.max_wheel_speed))
+            for _ in range(2)
+        )
+        for sensor in self.speed_sensors:
+            sensor.start_monitoring()
+    
+    def _setup_suspension(self, suspension_config):
+        """
+        Create the strut actuators, the suspension controller and, for
+        corners with a ride height lidar, the background height monitor
+        
+        Args:
+            suspension_config (SuspensionConfig): Strut pins, lidar
+                                                  addresses and gains
+        """
+        struts = suspension_config.struts()
+        self.suspension = SuspensionController(
+            target_height=suspension_config.target_height,
+            min_height=suspension_config.min_height,
+            max_height=suspension_config.max_height,
+            height_per_speed=suspension_config.height_per_speed,
+            level_gain=suspension_config.level_gain,
+            skyhook_roll=suspension_config.skyhook_gain,
+            skyhook_pitch=suspension_config.skyhook_gain
+        )
+        self.suspension_actuators = SuspensionActuators(
+            [
+                HydraulicCorner(strut.pump_pin, strut.valve_pin, suspension_config.pwm_frequency)
+                for strut in struts
+            ],
+            max_active_pumps=suspension_config.max_active_pumps
+        )
+        
+        if any(strut.lidar_address is not None for strut in struts):
+            sensors = [
+                VL53L0XLidar(suspension_config.i2c_bus, strut.lidar_address)
+                if strut.lidar_address is not None else None
+                for strut in struts
+            ]
+            self.ride_height_monitor = RideHeightMonitor(
+                sensors, self.suspension, interval=suspension_config.height_interval,
+                clock=hal.monotonic
+            )
+            self.ride_height_monitor.start()
+        
+        preview_config = suspension_config.preview
+        if preview_config:
+            self.road_preview = RoadPreview(
+                length=preview_config.length,
+                resolution=preview_config.resolution,
+                mount_height=preview_config.mount_height,
+                mount_offset=preview_config.mount_offset,
+                tilt=preview_config.tilt,
+                wheelbase=preview_config.wheelbase,
+                strut_speed=preview_config.strut_speed,
+                gain=preview_config.gain,
+                lead_time=preview_config.lead_time
+            )
+            self.preview_monitor = PreviewMonitor(
+                VL53L0XLidar(suspension_config.i2c_bus, preview_config.lidar_address,
+                             timing_budget=preview_config.timing_budget),
+                self.road_preview,
+                odometer=lambda: self.odometer,
+                pitch=lambda: self.suspension.attitude.pitch,
+                interval=preview_config.interval
+            )
+            self.preview_monitor.start()
+    
+    # Telemetry channels written when a recorder is attached
+    TELEMETRY_CHANNELS = {
+        'imu': [('ax', 'f4'), ('ay', 'f4'), ('az', 'f4'), ('gx', 'f4'), ('gy', 'f4'), ('gz', 'f4')],
+        'wheels': [
+            ('left_command', 'f4'), ('right_command', 'f4'),
+            ('left_target', 'f4'), ('right_target', 'f4'),
+            ('left_measured', 'f4'), ('right_measured', 'f4')
+        ]
+    }
+    
+    def attach_telemetry(self, recorder):
+        """
+        Record IMU readings and wheel commands from now on
+        
+        Args:
+            recorder (TelemetryRecorder): Open recorder
+        """
+        for name, fields in self.TELEMETRY_CHANNELS.items():
+            recorder.add_channel(name, fields)
+        self.telemetry = recorder
     
     def _calibrate_sensors(self):
         """
         Calibrate vehicle sensors
+        
+        Cached calibration is reused when it is fresh and passes a quick
+        sanity check; otherwise the full calibration runs in the background.
         """
         try:
-            self.imu_sensor.calibrate()
-            self.logger.info("Sensors calibrated successfully")
+            self.calibration_store = CalibrationStore.from_config(self.config.calibration)
+            status = self.calibration_store.restore(self.imu_sensor)
+            self.logger.info(f"IMU calibration: {status}")
         except Exception as e:
             self.logger.error(f"Sensor calibration failed: {e}")
     
+    # Wheel speed multipliers (left, right) for each drive direction
+    DIRECTION_MIX = {
+        'forward': (1, 1),
+        'reverse': (-1, -1),
+        'left': (-1, 1),
+        'right': (1, -1)
+    }
+    
     def drive(self, speed, direction):
         """
         Control vehicle movement
@@ -53,52 +217,308 @@ class VehicleController:
         """
         try:
             # Read IMU for stability
-            imu_data = self.imu_sensor.read()
+            imu_data = self._read_imu()
             
             # Adjust motor control based on IMU data
             if self._is_stable(imu_data):
-                self.motor_controller.set_speed(speed)
-                self.motor_controller.set_direction(direction)
+                self.status_flags &= ~FLAG_UNSTABLE
+                left_mix, right_mix = self.DIRECTION_MIX[direction]
+                speed *= self.speed_limit
+                if self.speed_controllers:
+                    # Closed loop: control_tick() turns these into duty
+                    self.wheel_speed_targets[0] = left_mix * speed * self.max_wheel_speed
+                    self.wheel_speed_targets[1] = right_mix * speed * self.max_wheel_speed
+                else:
+                    self.drive_train.set_wheels(
+                        left_mix * speed * 100,
+                        right_mix * speed * 100
+                    )
                 self.logger.info(f"Driving: speed={speed}, direction={direction}")
             else:
                 self.logger.warning("Vehicle stability compromised. Stopping motors.")
+                self.status_flags |= FLAG_UNSTABLE
                 self.stop()
         except Exception as e:
             self.logger.error(f"Driving error: {e}")
             self.stop()
     
+    def _read_imu(self, now=None):
+        """
+        Read the IMU, keep the reading as last_imu and record it
+        
+        Args:
+            now (float, optional): Telemetry timestamp, defaults to the
+                                   recorder clock
+        
+        Returns:
+            dict: IMU reading, or None if the read failed
+        """
+        imu_data = self.imu_sensor.read()
+        self.last_imu = imu_data
+        if self.telemetry and imu_data:
+            accel, gyro = imu_data['acceleration'], imu_data['gyroscope']
+            self.telemetry.record('imu', (
+                accel['x'], accel['y'], accel['z'], gyro['x'], gyro['y'], gyro['z']
+            ), now)
+        return imu_data
+    
+    def apply_teleop(self, command):
+        """
+        Follow a teleoperation setpoint
+        
+        Arcade mixing: throttle drives both wheels, steer adds to the
+        left and takes from the right. A command already applied is
+        skipped; losing the link (None) after driving stops the vehicle.
+        
+        Args:
+            command (TeleopCommand): Fresh setpoint, or None if the link
+                                     timed out
+        """
+        if command is None:
+            if self._teleop_seq is not None:
+                self.logger.warning("Teleop link lost. Stopping motors.")
+                self._teleop_seq = None
+                self.status_flags |= FLAG_LINK_LOST
+                self.stop()
+            return
+        if command.seq == self._teleop_seq:
+            return
+        self._teleop_seq = command.seq
+        self.status_flags &= ~FLAG_LINK_LOST
+        
+        if command.mode == MODE_STOP:
+            self.stop()
+            return
+        
+        left = max(-1.0, min(1.0, command.throttle + command.steer)) * self.speed_limit
+        right = max(-1.0, min(1.0, command.throttle - command.steer)) * self.speed_limit
+        if self.speed_controllers:
+            self.wheel_speed_targets[0] = left * self.max_wheel_speed
+            self.wheel_speed_targets[1] = right * self.max_wheel_speed
+        else:
+            self.drive_train.set_wheels(left * 100, right * 100)
+    
+    def apply_link_health(self, health):
+        """
+        Cap the speed while a supervised communication link is unhealthy
+        
+        The wheel targets already commanded are rescaled as soon as the
+        cap changes; later drive and teleop commands are capped as well.
+        
+        Args:
+            health (dict): Link name -> health score (0 to 1)
+        """
+        supervisor = self.config.supervisor
+        degraded = sorted(name for name, score in health.items() if score < supervisor.degraded_health)
+        limit = supervisor.degraded_speed if degraded else 1.0
+        if limit != self.speed_limit:
+            if degraded:
+                self.logger.warning(f"Degraded links: {', '.join(degraded)}. Speed limited to {limit:.0%}.")
+                self.status_flags |= FLAG_DEGRADED
+            else:
+                self.logger.info("All links healthy. Speed limit lifted.")
+                self.status_flags &= ~FLAG_DEGRADED
+            self._rescale_targets(limit)
+            self.speed_limit = limit
+    
+    def _rescale_targets(self, limit):
+        """
+        Scale the wheel targets commanded under the current speed limit
+        to a new one
+        
+        Args:
+            limit (float): New speed limit (0 to 1)
+        """
+        if self.speed_limit <= 0:
+            # Nothing to scale back up from; the next command restarts
+            return
+        scale = limit / self.speed_limit
+        if self.speed_controllers:
+            self.wheel_speed_targets[0] *= scale
+            self.wheel_speed_targets[1] *= scale
+        else:
+            left, right = self.drive_train.targets()
+            self.drive_train.set_wheels(
+                max(-100.0, min(100.0, left * scale)),
+                max(-100.0, min(100.0, right * scale))
+            )
+    
+    def control_tick(self, now=None):
+        """
+        Per-iteration actuator update for the control loop
+        
+        Reads the IMU once, runs the wheel speed controllers when
+        closed-loop control is configured, then finishes any wheel
+        direction change still waiting out its deadtime, and updates the
+        suspension struts.
+        
+        Args:
+            now (float, optional): Loop timestamp (monotonic seconds)
+        """
+        if now is None:
+            now = hal.monotonic()
+        dt = 0.0 if self._last_tick is None else now - self._last_tick
+        imu_data = self._read_imu(now)
+        
+        if self.speed_controllers:
+            self.drive_train.set_wheels(
+                self._wheel_duty(0, dt),
+                self._wheel_duty(1, dt),
+                now
+            )
+        else:
+            self.drive_train.update(now)
+        
+        if self.suspension:
+            speed = 0.5 * (self.wheel_speed_measured[0] + self.wheel_speed_measured[1])
+            self.odometer += speed * dt
+            feedforward = None
+            if self.road_preview:
+                feedforward = self.road_preview.feedforward(self.odometer, speed)
+            self.suspension_actuators.apply(
+                self.suspension.update(imu_data, speed, dt, now, feedforward)
+            )
+        
+        if self.telemetry:
+            left, right = self.drive_train.targets()
+            self.telemetry.record('wheels', (
+                left, right,
+                self.wheel_speed_targets[0], self.wheel_speed_targets[1],
+                self.wheel_speed_measured[0], self.wheel_speed_measured[1]
+            ), now)
+        
+        self._last_tick = now
+    
+    def _wheel_duty(self, side, dt):
+        """
+        Closed-loop duty for one wheel from its IR speed reading
+        """
+        reading = self.speed_sensors[side].read()
+        measured = reading['speed_mps'] if reading else 0.0
+        self.wheel_speed_measured[side] = measured
+        return self.speed_controllers[side].update(
+            self.wheel_speed_targets[side], measured, dt
+        )
+    
+    def downlink_status(self):
+        """
+        Current status for the telemetry downlink
+        
+        Returns:
+            dict: Values keyed by downlink field name
+        """
+        left, right = self.drive_train.targets()
+        status = {
+            'flags': self.status_flags,
+            'teleop_seq': self._teleop_seq or 0,
+            'left_command': left,
+            'right_command': right,
+            'left_speed': self.wheel_speed_measured[0],
+            'right_speed': self.wheel_speed_measured[1]
+        }
+        imu_data = self.last_imu
+        if imu_data:
+            accel, gyro = imu_data['acceleration'], imu_data['gyroscope']
+            status.update(
+                ax=accel['x'], ay=accel['y'], az=accel['z'],
+                gx=gyro['x'], gy=gyro['y'], gz=gyro['z']
+            )
+        return status
+    
     def stop(self):
         """
         Stop vehicle movement
         """
-        self.motor_controller.stop()
+        self.wheel_speed_targets[0] = 0.0
+        self.wheel_speed_targets[1] = 0.0
+        if self.speed_controllers:
+            for controller in self.speed_controllers:
+                controller.reset()
+        if self.suspension:
+            # Struts hold their height with pumps off and valves closed
+            self.suspension.reset()
+            self.suspension_actuators.hold()
+        self.drive_train.stop()
         self.logger.info("Vehicle stopped")
     
-    def _is_stable(self, imu_data, threshold=0.5):
+    def _is_stable(self, imu_data, threshold=None):
         """
         Check vehicle stability based on IMU data
         
         Args:
             imu_data (dict): IMU sensor readings
-            threshold (float): Stability threshold
+            threshold (float, optional): Stability threshold, defaults
+                                         to control.stability_threshold
         
         Returns:
             bool: Vehicle stability status
         """
         if not imu_data:
             return False
+        if threshold is None:
+            threshold = self.config.control.stability_threshold
         
+        # Gravity reads as +1 g on z when the vehicle is level and at rest
         accel = imu_data['acceleration']
         stability = all(
             abs(axis) < threshold 
-            for axis in [accel['x'], accel['y'], accel['z']]
+            for axis in [accel['x'], accel['y'], accel['z'] - 1.0]
         )
         
         return stability
     
+    def apply_config(self, config, changed=()):
+        """
+        Take over hot-reloaded settings
+        
+        Args:
+            config (VehicleConfig): Configuration with the new hot settings
+            changed (iterable): Names of the settings that changed
+        """
+        self.config = config
+        if self.speed_controllers and config.speed_control:
+            self.max_wheel_speed = config.speed_control.max_speed
+        if self.suspension and config.suspension:
+            suspension_config = config.suspension
+            self.suspension.target_height = suspension_config.target_height
+            self.suspension.height_per_speed = suspension_config.height_per_speed
+            self.suspension.level_gain = suspension_config.level_gain
+            self.suspension.skyhook_roll = suspension_config.skyhook_gain
+            self.suspension.skyhook_pitch = suspension_config.skyhook_gain
+            self.suspension_actuators.max_active_pumps = suspension_config.max_active_pumps
+            if self.road_preview and suspension_config.preview:
+                self.road_preview.gain = suspension_config.preview.gain
+                self.road_preview.lead_time = suspension_config.preview.lead_time
+        if hasattr(self, 'calibration_store'):
+            self.calibration_store.max_age = config.calibration.max_age_days * 24 * 3600
+            self.calibration_store.max_temperature_delta = config.calibration.max_temperature_delta
+        self.logger.info(f"Configuration updated: {', '.join(changed)}")
+    
+    def safety_outputs(self):
+        """
+        Actuator outputs the safety watchdog forces off
+        
+        The strut pump and valve outputs are software PWM with no
+        direction pin, so only a watchdog thread, which zeroes their
+        duty, holds them off; settings refuse a watchdog process while
+        suspension is configured.
+        
+        Returns:
+            tuple: (output pins, PWM objects) of the drive motors and,
+                   when configured, the suspension struts
+        """
+        pins = list(self.config.gpio.output_pins().values())
+        pwms = [getattr(motor, 'pwm', None) for motor in getattr(self.drive_train, 'motors', ())]
+        if self.suspension_actuators:
+            pins += list(self.config.suspension.output_pins().values())
+            for corner in self.suspension_actuators.corners:
+                pwms += [corner.pump_pwm, corner.valve_pwm]
+        return pins, [pwm for pwm in pwms if pwm is not None]
+    
     def emergency_stop(self):
         """
         Immediate emergency stop procedure
         """
+        self.status_flags |= FLAG_ESTOP
         self.stop()
         self.logger.critical("EMERGENCY STOP ACTIVATED")
\ No newline at end of file
@@ -0,0 +1,140 @@
+import unittest
+import sys
+import os
+import time
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import hal
+from src.hal.simulator import SimulatorBackend
+from src.communication.at_command import ATCommandEngine, ATCommandError
+
+PORT = '/dev/ttyS0'
+
+class TestATCommandEngine(unittest.TestCase):
+    def setUp(self):
+        self.sim = SimulatorBackend()
+        self.previous = hal.set_backend(self.sim)
+        self.replies = {
+            b'AT': b'OK\r\n',
+            b'AT+VERSION?': b'+VERSION:3.0\r\nOK\r\n',
+            b'AT+BAD': b'ERROR:(0)\r\n',
+            b'AT+NAME=RoboVehicle': b'OKsetname\r\n'
+        }
+        self.sim.serial_link(PORT).set_responder(lambda line: self.replies.get(line.strip(), b''))
+        self.port = hal.open_serial(PORT, 38400, 0.05)
+        self.engine = ATCommandEngine(self.port, timeout=0.5)
+
+    def tearDown(self):
+        hal.set_backend(self.previous)
+
+    def test_execute_returns_on_final_line(self):
+        """
+        Test a command completes on OK without waiting out the timeout
+        """
+        response = self.engine.execute('AT+VERSION?', expect=r'VERSION:3')
+        self.assertTrue(response.ok)
+        self.assertEqual(response.lines, ['+VERSION:3.0'])
+        self.assertEqual(response.status, 'OK')
+        self.assertLess(response.elapsed, 0.25)
+
+        # HC-06 style replies count as OK
+        self.assertTrue(self.engine.execute('AT+NAME=RoboVehicle').ok)
+
+    def test_error_timeout_and_expectation(self):
+        """
+        Test ERROR, silence and a failed expectation raise ATCommandError
+        """
+        with self.assertRaises(ATCommandError) as error:
+            self.engine.execute('AT+BAD')
+        self.assertEqual(error.exception.response.status, 'ERROR:(0)')
+
+        start = time.monotonic()
+        with self.assertRaises(ATCommandError) as error:
+            self.engine.execute('AT+SILENT', timeout=0.1)
+        self.assertEqual(error.exception.response.status, 'TIMEOUT')
+        self.assertLess(time.monotonic() - start, 0.5)
+
+        with self.assertRaises(ATCommandError):
+            self.engine.execute('AT+VERSION?', expect=r'VERSION:4')
+
+    def test_late_reply_discarded(self):
+        """
+        Test a reply arriving after its command timed out does not
+        complete the next command
+        """
+        with self.assertRaises(ATCommandError):
+            self.engine.execute('AT+SLOW', timeout=0.1)
+        # The module answers the timed-out command late, with a partial line left over
+        self.sim.serial_link(PORT).device.write(b'OK\r\n+PART')
+        self.replies[b'AT+CHECK'] = b'ERROR:(1)\r\n'
+        with self.assertRaises(ATCommandError) as error:
+            self.engine.execute('AT+CHECK')
+        self.assertEqual(error.exception.response.status, 'ERROR:(1)')
+
+    def test_run_script(self):
+        """
+        Test a batch stops on the first failure unless told to carry on
+        """
+        script = ['AT', ('AT+VERSION?', r'VERSION:'), 'AT+BAD', 'AT+NAME=RoboVehicle']
+        with self.assertRaises(ATCommandError):
+            self.engine.run_script(script)
+
+        responses = self.engine.run_script(script, stop_on_error=False)
+        self.assertEqual([response.ok for response in responses], [True, True, False, True])
+
+    def test_scan_streams_results(self):
+        """
+        Test scan results reach the callback before the scan finishes
+        """
+        device = self.sim.serial_device(PORT)
+        seen = []
+        scan = self.engine.scan(duration=2.0, callback=seen.append)
+
+        device.write(b'+INQ:1234:56:abcdef,1F00,7FFF\r\n')
+        deadline = time.monotonic() + 1.0
+        while not seen and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(seen, ['+INQ:1234:56:abcdef,1F00,7FFF'])
+        self.assertFalse(scan.done)
+
+        device.write(b'+INQ:9876:54:fedcba,5A020C,7FFF\r\nOK\r\n')
+        results = scan.wait(2.0)
+        self.assertTrue(scan.done)
+        self.assertEqual(len(results), 2)
+        self.assertEqual(scan.response.status, 'OK')
+
+    def test_scan_cancel(self):
+        """
+        Test a cancelled scan ends early
+        """
+        scan = self.engine.scan(duration=5.0)
+        scan.cancel()
+        scan.wait(1.0)
+        self.assertTrue(scan.done)
+        self.assertEqual(scan.response.status, 'CANCELLED')
+
+class TestBluetoothConfiguration(unittest.TestCase):
+    def test_configure_module_without_sleeps(self):
+        """
+        Test module setup runs at the speed of the replies
+        """
+        from src.communication.bluetooth_controller import BluetoothController
+
+        sim = SimulatorBackend()
+        previous = hal.set_backend(sim)
+        try:
+            sim.serial_link(PORT).set_responder(lambda line: b'OK\r\n')
+            bt = BluetoothController(PORT, timeout=0.05)
+            start = time.monotonic()
+            responses = bt.configure_module()
+            self.assertLess(time.monotonic() - start, 0.5)
+            self.assertEqual([response.command for response in responses][-1], 'AT+RESET')
+            self.assertTrue(all(response.ok for response in responses))
+            bt.close()
+        finally:
+            hal.set_backend(previous)
+
+if __name__ == '__main__':
+    unittest.main()
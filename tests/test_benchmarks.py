@@ -0,0 +1,72 @@
+import unittest
+import sys
+import os
+import tempfile
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.harness import (
+    Benchmark, THROUGHPUT, LATENCY, MEMORY, compare, load_benchmarks,
+    save_results, load_results
+)
+
+def _document(**values):
+    kinds = {'imu.read': THROUGHPUT, 'control.tick': LATENCY, 'memory.loop': MEMORY}
+    return {'commit': 'abc123', 'results': {
+        name: {'value': value, 'kind': kinds[name], 'unit': 'x', 'higher_is_better': kinds[name] == THROUGHPUT}
+        for name, value in values.items()
+    }}
+
+class TestBenchmarkHarness(unittest.TestCase):
+    def test_compare_flags_regressions_by_direction(self):
+        """
+        Test throughput drops and latency or memory rises are regressions
+        """
+        baseline = _document(**{'imu.read': 1000.0, 'control.tick': 10.0, 'memory.loop': 0.0})
+        current = _document(**{'imu.read': 800.0, 'control.tick': 8.0, 'memory.loop': 2000.0})
+        current['results']['new.bench'] = dict(current['results']['imu.read'])
+
+        rows = {row['name']: row for row in compare(current, baseline, tolerance=0.15)}
+        self.assertEqual(rows['imu.read']['status'], 'regression')
+        self.assertAlmostEqual(rows['imu.read']['change'], -0.2)
+        self.assertEqual(rows['control.tick']['status'], 'improvement')
+        # Within the absolute slack for memory growth
+        self.assertEqual(rows['memory.loop']['status'], 'ok')
+        self.assertEqual(rows['new.bench']['status'], 'new')
+
+        current['results']['memory.loop']['value'] = 50000.0
+        rows = {row['name']: row for row in compare(current, baseline)}
+        self.assertEqual(rows['memory.loop']['status'], 'regression')
+
+    def test_results_round_trip(self):
+        """
+        Test results documents are stored and read back as JSON
+        """
+        with tempfile.TemporaryDirectory() as tempdir:
+            path = os.path.join(tempdir, 'results', 'abc123.json')
+            document = _document(**{'imu.read': 1000.0})
+            save_results(document, path)
+            self.assertEqual(load_results(path), document)
+            self.assertIsNone(load_results(os.path.join(tempdir, 'missing.json')))
+
+    def test_simulated_benchmarks_run(self):
+        """
+        Test each benchmark kind runs on the simulator with a tiny scale
+        """
+        registry = load_benchmarks()
+        for name in ('imu.read', 'can.decode', 'arduino.parse', 'control.tick'):
+            self.assertIn(name, registry)
+
+        for name in ('imu.read', 'control.tick'):
+            result = registry[name].run(scale=0.01)
+            self.assertGreater(result['value'], 0)
+
+        leak = []
+        result = Benchmark('leak', lambda sim: (lambda: leak.append(bytes(100))),
+                           MEMORY, 'bytes', number=1000, rounds=1, warmup=0).run()
+        self.assertGreater(result['value'], 100 * 1000)
+        self.assertEqual(result['stats']['iterations'], 1000)
+
+if __name__ == '__main__':
+    unittest.main()
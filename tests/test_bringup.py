@@ -0,0 +1,129 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.bringup import BringUpOrchestrator, BringUpError
+
+class TestBringUpOrchestrator(unittest.TestCase):
+    def setUp(self):
+        """
+        Create an orchestrator without backoff jitter
+        """
+        self.orchestrator = BringUpOrchestrator(max_workers=4, jitter=0)
+
+    def test_independent_devices_run_concurrently(self):
+        """
+        Test independent slow devices overlap instead of adding up
+        """
+        barrier = threading.Barrier(3, timeout=2)
+
+        def _slow(deps):
+            barrier.wait()
+            time.sleep(0.1)
+            return 'up'
+
+        for name in ('a', 'b', 'c'):
+            self.orchestrator.add(name, _slow)
+
+        start = time.monotonic()
+        devices = self.orchestrator.run()
+        self.assertLess(time.monotonic() - start, 0.25)
+        self.assertEqual(devices, {'a': 'up', 'b': 'up', 'c': 'up'})
+
+    def test_dependencies_receive_results(self):
+        """
+        Test a device starts after its dependencies and gets their objects
+        """
+        order = []
+
+        def _device(name, value):
+            def _factory(deps):
+                order.append(name)
+                return value + sum(deps.values())
+            return _factory
+
+        self.orchestrator.add('motor', _device('motor', 10), depends_on=['gpio'])
+        self.orchestrator.add('gpio', _device('gpio', 1))
+        self.orchestrator.add('drive', _device('drive', 100), depends_on=['motor', 'gpio'])
+
+        devices = self.orchestrator.run()
+        self.assertEqual(order, ['gpio', 'motor', 'drive'])
+        self.assertEqual(devices['drive'], 112)
+
+    def test_retry_with_backoff(self):
+        """
+        Test a flaky device succeeds on a later attempt
+        """
+        calls = []
+
+        def _flaky(deps):
+            calls.append(time.monotonic())
+            if len(calls) < 3:
+                raise OSError("port busy")
+            return 'serial'
+
+        self.orchestrator.add('bluetooth', _flaky, retries=3, backoff=0.02)
+        devices = self.orchestrator.run()
+
+        self.assertEqual(devices['bluetooth'], 'serial')
+        self.assertEqual(len(calls), 3)
+        self.assertGreaterEqual(calls[2] - calls[1], 0.04 - 0.005)
+
+        entry = self.orchestrator.timeline()[0]
+        self.assertEqual(entry['status'], 'ok')
+        self.assertEqual(entry['attempts'], 3)
+
+    def test_timeout_skips_dependents(self):
+        """
+        Test a hung optional device times out and its dependents are skipped
+        """
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        self.orchestrator.add('arduino', lambda deps: release.wait(), timeout=0.05, required=False)
+        self.orchestrator.add('sensors', lambda deps: 'ok', depends_on=['arduino'], required=False)
+        self.orchestrator.add('gpio', lambda deps: 'ok')
+
+        devices = self.orchestrator.run()
+        self.assertEqual(devices, {'gpio': 'ok'})
+
+        status = {entry['name']: entry['status'] for entry in self.orchestrator.timeline()}
+        self.assertEqual(status, {'arduino': 'timeout', 'sensors': 'skipped', 'gpio': 'ok'})
+        self.assertIn('arduino', self.orchestrator.format_timeline())
+
+    def test_required_failure_raises(self):
+        """
+        Test a failed required device aborts bring-up
+        """
+        def _broken(deps):
+            raise OSError("no IMU on the bus")
+
+        self.orchestrator.add('imu', _broken, retries=1, backoff=0.01)
+        with self.assertRaises(BringUpError) as context:
+            self.orchestrator.run()
+        self.assertIn('no IMU on the bus', str(context.exception))
+
+    def test_graph_validation(self):
+        """
+        Test unknown dependencies and cycles are rejected up front
+        """
+        self.orchestrator.add('a', lambda deps: 1, depends_on=['b'])
+        self.orchestrator.add('b', lambda deps: 2, depends_on=['a'])
+        with self.assertRaises(ValueError):
+            self.orchestrator.run()
+
+        orchestrator = BringUpOrchestrator()
+        orchestrator.add('a', lambda deps: 1, depends_on=['missing'])
+        with self.assertRaises(ValueError):
+            orchestrator.run()
+
+        with self.assertRaises(ValueError):
+            orchestrator.add('a', lambda deps: 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import hal
+from src.hal.simulator import SimulatorBackend
+from src.sensors.calibration_store import CalibrationStore
+from src.sensors.mpu6050 import MPU6050Sensor
+
+class TestCalibrationStore(unittest.TestCase):
+    def setUp(self):
+        """
+        Simulated IMU with a gyro bias and an empty cache file
+        """
+        self.sim = SimulatorBackend()
+        self.previous = hal.set_backend(self.sim)
+
+        self.imu_device = self.sim.i2c_device(0x68)
+        self.imu = MPU6050Sensor(calibration_samples=20)
+        self.imu_device.set_motion(gyro=(1.5, -0.5, 0.25))
+
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tempdir.name, 'sensor_calibration.json')
+
+    def tearDown(self):
+        hal.set_backend(self.previous)
+        self.tempdir.cleanup()
+
+    def _store(self):
+        return CalibrationStore(self.path, max_age=3600, max_temperature_delta=5.0)
+
+    def test_first_boot_calibrates_and_persists(self):
+        """
+        Test a missing entry triggers calibration and is written to disk
+        """
+        store = self._store()
+        self.assertEqual(store.restore(self.imu, background=False), 'calibrated')
+        self.assertAlmostEqual(self.imu.gyro_offset['x'], 1.5, places=1)
+
+        with open(self.path) as cache_file:
+            content = json.load(cache_file)
+        entry = content['devices'][self.imu.device_id]
+        self.assertEqual(entry['device_id'], 'mpu6050@i2c-1:0x68')
+        self.assertAlmostEqual(entry['temperature'], 25.0, places=1)
+        self.assertEqual(entry['timestamp'], hal.time())
+
+    def test_valid_cache_skips_calibration(self):
+        """
+        Test a fresh entry that passes the sanity sample is reused
+        """
+        self._store().restore(self.imu, background=False)
+
+        imu = MPU6050Sensor()
+        imu.calibrate = lambda: self.fail("full calibration should not run")
+        self.assertEqual(self._store().restore(imu), 'cached')
+        self.assertAlmostEqual(imu.gyro_offset['y'], -0.5, places=1)
+
+    def test_stale_or_invalid_cache_recalibrates(self):
+        """
+        Test age, temperature drift and a failed sanity check each recalibrate
+        """
+        self._store().restore(self.imu, background=False)
+
+        hal.sleep(7200)
+        self.assertEqual(self._store().restore(self.imu, background=False), 'calibrated')
+
+        self.imu_device.set_temperature(40.0)
+        self.assertEqual(self._store().restore(self.imu, background=False), 'calibrated')
+
+        # Bias drifted: cached offset no longer matches the sensor at rest
+        self.imu_device.set_motion(gyro=(4.0, -0.5, 0.25))
+        store = self._store()
+        self.assertEqual(store.restore(self.imu), 'recalibrating')
+        self.assertTrue(store.wait(timeout=10))
+        self.assertAlmostEqual(self.imu.gyro_offset['x'], 4.0, places=1)
+        self.assertAlmostEqual(store.get(self.imu.device_id)['data']['gyro_offset']['x'], 4.0, places=1)
+
+    def test_lidars_cached_per_address(self):
+        """
+        Test lidars on one bus get their own entries and reuse them
+        """
+        from src.hal.simulator import SimVL53L0X
+        from src.sensors.vl53l0x_lidar import VL53L0XLidar
+
+        self.sim.add_i2c_device(SimVL53L0X(address=0x30, range_mm=120))
+        self.sim.add_i2c_device(SimVL53L0X(address=0x31, range_mm=300))
+        lidars = [VL53L0XLidar(address=0x30), VL53L0XLidar(address=0x31)]
+        self.assertEqual([lidar.device_id for lidar in lidars],
+                         ['vl53l0x@i2c-1:0x30', 'vl53l0x@i2c-1:0x31'])
+        store = self._store()
+        for lidar in lidars:
+            self.assertEqual(store.restore(lidar, background=False), 'calibrated')
+
+        lidar = VL53L0XLidar(address=0x31)
+        lidar.calibrate = lambda: self.fail("full calibration should not run")
+        self.assertEqual(self._store().restore(lidar), 'cached')
+        self.assertEqual(lidar.calibration['average_distance'], 300.0)
+
+        # Remounted: the range no longer matches the cached self-test
+        self.sim.i2c_device(0x30).set_range(200)
+        self.assertEqual(self._store().restore(VL53L0XLidar(address=0x30), background=False),
+                         'calibrated')
+
+    def test_corrupt_cache_is_ignored(self):
+        """
+        Test an unreadable cache file falls back to calibration
+        """
+        with open(self.path, 'w') as cache_file:
+            cache_file.write('{not json')
+
+        store = self._store()
+        self.assertEqual(store.entries, {})
+        self.assertEqual(store.restore(self.imu, background=False), 'calibrated')
+        self.assertIn(self.imu.device_id, self._store().entries)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+import unittest
+import sys
+import os
+import struct
+import threading
+import time
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import hal
+from src.hal.simulator import SimulatorBackend
+from src.communication.manager import CommunicationManager
+
+class FakeInterface:
+    """
+    Records what it is sent; optionally blocks or fails
+    """
+
+    def __init__(self, wire_format='json-line', gate=None, fail=False):
+        self.WIRE_FORMAT = wire_format
+        self.gate = gate
+        self.fail = fail
+        self.sent = []
+        self.connected = False
+
+    def connect(self):
+        self.connected = True
+        return True
+
+    def send(self, payload):
+        if self.gate is not None:
+            self.gate.wait(5.0)
+        if self.fail:
+            raise IOError("link down")
+        self.sent.append(payload)
+
+    def disconnect(self):
+        self.connected = False
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+class TestCommunicationManager(unittest.TestCase):
+    def setUp(self):
+        self.gate = threading.Event()
+        self.slow = FakeInterface(gate=self.gate)
+        self.serial = FakeInterface()
+        self.can = FakeInterface('can')
+        self.manager = CommunicationManager(
+            {'bluetooth': self.slow, 'arduino': self.serial, 'can': self.can}, max_queue=5
+        )
+        self.manager.register_topic('speed', {'left': float, 'right': float}, can_id=0x120, can_format='ff')
+        self.manager.initialize_all()
+
+    def tearDown(self):
+        self.gate.set()
+        self.manager.close_all_connections()
+
+    def test_slow_interface_does_not_delay_others(self):
+        """
+        Test a blocked Bluetooth write leaves CAN and Arduino unaffected
+        """
+        for step in range(3):
+            self.manager.publish('speed', {'left': float(step), 'right': 0.5})
+
+        self.assertTrue(wait_for(lambda: len(self.can.sent) == 3 and len(self.serial.sent) == 3))
+        self.assertEqual(self.slow.sent, [])
+        self.assertEqual(self.can.sent[2], (0x120, struct.pack('<ff', 2.0, 0.5)))
+        self.assertEqual(self.serial.sent[0], b'{"topic":"speed","data":{"left":0.0,"right":0.5}}\n')
+
+        self.gate.set()
+        self.assertTrue(wait_for(lambda: len(self.slow.sent) == 3))
+
+    def test_encoded_once_per_wire_format(self):
+        """
+        Test interfaces sharing a wire format reuse one encoding
+        """
+        self.gate.set()
+        for step in range(4):
+            self.manager.publish('speed', {'left': float(step), 'right': 0.0})
+        self.assertTrue(wait_for(lambda: len(self.slow.sent) == 4 and len(self.serial.sent) == 4))
+        self.assertEqual(self.manager.metrics()['encodes'], {'json-line': 4, 'can': 4})
+        self.assertIs(self.slow.sent[0], self.serial.sent[0])
+
+    def test_schema_and_routing(self):
+        """
+        Test payloads are type checked and topics route to their destinations
+        """
+        with self.assertRaises(TypeError):
+            self.manager.publish('speed', {'left': 1, 'right': 0.0})
+        with self.assertRaises(TypeError):
+            self.manager.publish('speed', {'left': 1.0})
+        with self.assertRaises(KeyError):
+            self.manager.publish('unknown', {})
+        with self.assertRaises(ValueError):
+            self.manager.register_topic('speed', {'left': float})
+
+        self.manager.register_topic('diag', destinations=['arduino'])
+        self.assertEqual(self.manager.publish('diag', {'ok': True}), 1)
+        self.assertTrue(wait_for(lambda: len(self.serial.sent) == 1))
+
+        # No arbitration ID: CAN skips the topic
+        self.manager.register_topic('note')
+        self.manager.publish('note', 'hello', destinations=['can'])
+        self.assertTrue(wait_for(lambda: self.manager.metrics()['can']['skipped'] == 1))
+        self.assertEqual(self.can.sent, [])
+
+    def test_local_subscribers(self):
+        """
+        Test in-process subscribers receive published payloads
+        """
+        received = []
+        self.manager.subscribe('speed', lambda topic, payload: received.append((topic, payload)))
+        self.manager.publish('speed', {'left': 1.0, 'right': 2.0}, destinations=[])
+        self.assertTrue(wait_for(lambda: received))
+        self.assertEqual(received, [('speed', {'left': 1.0, 'right': 2.0})])
+
+    def test_metrics_count_drops_and_failures(self):
+        """
+        Test full queues drop the oldest message and send errors are counted
+        """
+        for step in range(10):
+            self.manager.publish('speed', {'left': float(step), 'right': 0.0}, destinations=['bluetooth'])
+        metrics = self.manager.metrics()['bluetooth']
+        self.assertEqual(metrics['queued'], 10)
+        self.assertGreaterEqual(metrics['dropped'], 4)
+        self.assertLessEqual(metrics['queue_depth'], 5)
+
+        self.gate.set()
+        self.assertTrue(wait_for(lambda: self.manager.metrics()['bluetooth']['queue_depth'] == 0))
+        self.assertEqual(self.slow.sent[-1], b'{"topic":"speed","data":{"left":9.0,"right":0.0}}\n')
+
+        self.serial.fail = True
+        self.manager.broadcast_message('ping', ['arduino'])
+        self.assertTrue(wait_for(lambda: self.manager.metrics()['arduino']['failed'] == 1))
+        self.assertEqual(self.manager.metrics()['arduino']['last_error'], 'link down')
+
+class TestManagerOnSimulator(unittest.TestCase):
+    def test_real_interfaces(self):
+        """
+        Test the bus drives the actual interface classes on the simulator
+        """
+        from src.communication.bluetooth_controller import BluetoothController
+        from src.communication.can_interface import CANInterface
+
+        sim = SimulatorBackend()
+        previous = hal.set_backend(sim)
+        try:
+            peer = hal.open_can_bus('can0', 500000)
+            phone = sim.serial_device('/dev/ttyS0')
+            manager = CommunicationManager({
+                'bluetooth': BluetoothController(timeout=0.05),
+                'can': CANInterface()
+            })
+            self.assertEqual(manager.initialize_all(), {'bluetooth': True, 'can': True})
+            self.assertEqual(manager.broadcast_message('hello'), 2)
+            manager.close_all_connections()
+
+            self.assertEqual(phone.read(64), b'{"topic":"broadcast","data":"hello"}\n')
+            frame = peer.recv(timeout=0)
+            self.assertEqual(frame.arbitration_id, CommunicationManager.BROADCAST_CAN_ID)
+            self.assertEqual(bytes(frame.data), b'"hello"')
+            self.assertEqual(manager.metrics()['can']['sent'], 1)
+        finally:
+            hal.set_backend(previous)
+
+if __name__ == '__main__':
+    unittest.main()
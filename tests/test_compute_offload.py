@@ -0,0 +1,249 @@
+import unittest
+import sys
+import os
+import math
+import pickle
+import tempfile
+import time
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.compute_offload import (
+    ComputeOffload, SharedArray, occupancy_update, calibration_fit, channel_summary,
+    DONE, DROPPED, RUNNING, QUEUED
+)
+from src.settings import compile_config, ConfigError
+
+def add_in_place(values, amount):
+    with values.open() as view:
+        count = len(view)
+        for index in range(count):
+            view[index] += amount
+    return count
+
+def sleep_then_return(seconds, value):
+    time.sleep(seconds)
+    return value
+
+def fail():
+    raise ValueError("bad input")
+
+def spin(seconds):
+    end = time.perf_counter() + seconds
+    count = 0
+    while time.perf_counter() < end:
+        count += 1
+    return count
+
+def wait_for(offload, job, timeout=20.0):
+    delivered = []
+    deadline = time.monotonic() + timeout
+    while not job.finished and time.monotonic() < deadline:
+        delivered += offload.collect()
+        time.sleep(0.005)
+    return delivered
+
+class TestSharedArray(unittest.TestCase):
+    def test_handle_pickles_name_only(self):
+        """
+        Test a handle pickles to a few bytes whatever the array size
+        """
+        shared = SharedArray('d', 100000)
+        try:
+            data = pickle.dumps(shared.handle)
+            self.assertLess(len(data), 200)
+            handle = pickle.loads(data)
+            shared.write([1.5, 2.5], offset=10)
+            with handle.open() as view:
+                self.assertEqual(view[10:12].tolist(), [1.5, 2.5])
+                view[0] = 7.0
+            self.assertEqual(shared.values[0], 7.0)
+        finally:
+            shared.close()
+
+class TestComputeOffload(unittest.TestCase):
+    def setUp(self):
+        self.offload = ComputeOffload(max_workers=2, nice=0)
+
+    def tearDown(self):
+        self.offload.shutdown()
+
+    def test_result_written_in_place(self):
+        """
+        Test a worker updates a shared array the parent then reads
+        """
+        shared = SharedArray('d', 1000)
+        try:
+            shared.write([1.0] * 1000)
+            job = self.offload.submit('add', add_in_place, shared.handle, 2.0)
+            delivered = wait_for(self.offload, job)
+            self.assertEqual(delivered, [job])
+            self.assertEqual(job.state, DONE)
+            self.assertEqual(job.result, 1000)
+            self.assertEqual(set(shared.tolist()), {3.0})
+        finally:
+            shared.close()
+
+    def test_started_pool_submits_without_waiting(self):
+        """
+        Test the first submit after start() does not wait for a worker to start
+        """
+        self.assertTrue(self.offload.start())
+        began = time.perf_counter()
+        jobs = [self.offload.submit(key, sleep_then_return, 0.0, key) for key in ('a', 'b')]
+        self.assertLess(time.perf_counter() - began, 0.01)
+        for job in jobs:
+            wait_for(self.offload, job)
+        self.assertEqual([job.result for job in jobs], ['a', 'b'])
+
+    def test_newest_waiting_job_wins(self):
+        """
+        Test jobs submitted while their key runs are coalesced to the newest
+        """
+        first = self.offload.submit('stream', sleep_then_return, 0.2, 1)
+        second = self.offload.submit('stream', sleep_then_return, 0.0, 2)
+        third = self.offload.submit('stream', sleep_then_return, 0.0, 3)
+        self.assertEqual(first.state, RUNNING)
+        self.assertEqual((second.state, second.reason), (DROPPED, 'superseded'))
+        self.assertEqual(third.state, QUEUED)
+        self.assertTrue(self.offload.busy('stream'))
+
+        wait_for(self.offload, first)
+        self.assertEqual(first.result, 1)
+        self.assertEqual(third.state, RUNNING)
+        wait_for(self.offload, third)
+        self.assertEqual(third.result, 3)
+        self.assertFalse(self.offload.busy('stream'))
+        self.assertEqual(self.offload.stats()['superseded'], 1)
+
+    def test_stale_results_dropped(self):
+        """
+        Test results collected after their deadline are never delivered
+        """
+        now = [0.0]
+        self.offload.clock = lambda: now[0]
+        late = self.offload.submit('slow', sleep_then_return, 0.0, 'old', deadline=0.1)
+        waiting = self.offload.submit('slow', sleep_then_return, 0.0, 'older', deadline=0.1)
+        callbacks = []
+        fresh = self.offload.submit('fast', sleep_then_return, 0.0, 'new', deadline=1.0,
+                                    callback=callbacks.append)
+        while late.future is not None and not late.future.done():
+            time.sleep(0.005)
+        while fresh.future is not None and not fresh.future.done():
+            time.sleep(0.005)
+
+        now[0] = 0.5
+        self.assertEqual(self.offload.collect(), [fresh])
+        self.assertEqual(callbacks, [fresh])
+        self.assertEqual((late.state, late.reason), (DROPPED, 'late'))
+        self.assertEqual((waiting.state, waiting.reason), (DROPPED, 'expired'))
+        self.assertIsNone(late.result)
+
+    def test_failed_job_reported(self):
+        """
+        Test an exception in a job drops it without raising in the loop
+        """
+        job = self.offload.submit('bad', fail)
+        wait_for(self.offload, job)
+        self.assertEqual((job.state, job.reason), (DROPPED, 'failed'))
+        self.assertEqual(self.offload.stats()['failed'], 1)
+
+    def test_loop_keeps_period(self):
+        """
+        Test a loop collecting every tick holds its period while workers compute
+        """
+        if (os.cpu_count() or 1) < 3:
+            self.skipTest("needs a free core per worker")
+        period = 0.01
+        worst = 0.0
+        end = time.monotonic() + 1.0
+        while time.monotonic() < end:
+            start = time.perf_counter()
+            self.offload.collect()
+            if not self.offload.busy('spin'):
+                self.offload.submit('spin', spin, 0.3)
+            elapsed = time.perf_counter() - start
+            worst = max(worst, elapsed)
+            time.sleep(max(period - elapsed, 0.0))
+        self.assertLess(worst, period)
+        self.assertGreater(self.offload.stats()['delivered'], 0)
+
+class TestJobs(unittest.TestCase):
+    def test_occupancy_update(self):
+        """
+        Test a beam clears the cells it crosses and marks where it ends
+        """
+        width, height, resolution = 20, 20, 0.1
+        grid = SharedArray('f', width * height)
+        ranges = SharedArray('f', 2)
+        try:
+            # One beam straight along +x hitting at 1.0 m, one without a return
+            ranges.write([1.0, 5.0])
+            updates = occupancy_update(grid.handle, width, height, resolution, (0.05, 0.05, 0.0),
+                                       ranges.handle, 0.0, math.pi / 2, 1.5)
+            cells = grid.tolist()
+            self.assertLess(cells[5], 0.0)
+            self.assertAlmostEqual(cells[10], 0.85, places=5)
+            self.assertEqual(cells[11], 0.0)
+            self.assertLess(cells[5 * width], 0.0)
+            self.assertEqual(updates, 10 + 1 + 15)
+        finally:
+            grid.close()
+            ranges.close()
+
+    def test_calibration_fit(self):
+        """
+        Test per-axis offset and noise of interleaved samples
+        """
+        samples = SharedArray('d', 3 * 4)
+        try:
+            samples.write([1.0, 10.0, 0.0,
+                           3.0, 10.0, 0.0,
+                           1.0, 10.0, 0.0,
+                           3.0, 10.0, 0.0])
+            fit = calibration_fit(samples.handle, 4, 3)
+            self.assertEqual(fit['count'], 4)
+            self.assertEqual(fit['offset'], [2.0, 10.0, 0.0])
+            self.assertEqual(fit['noise'], [1.0, 0.0, 0.0])
+        finally:
+            samples.close()
+
+    def test_channel_summary(self):
+        """
+        Test column statistics of a recorded telemetry channel
+        """
+        from src.telemetry import TelemetryRecorder
+        with tempfile.TemporaryDirectory() as directory:
+            recorder = TelemetryRecorder(directory, run_name='run')
+            recorder.add_channel('wheels', [('left', 'f8'), ('right', 'f8')])
+            for index in range(10):
+                recorder.record('wheels', (float(index), 1.0), timestamp=float(index))
+            recorder.close()
+            summary = channel_summary(recorder.directory, 'wheels', start=5.0)
+            self.assertEqual(summary['count'], 5)
+            self.assertEqual(summary['columns']['left']['mean'], 7.0)
+            self.assertEqual(summary['columns']['left']['max'], 9.0)
+            self.assertEqual(summary['columns']['right']['std'], 0.0)
+
+class TestOffloadConfig(unittest.TestCase):
+    def test_workers_kept_off_control_core(self):
+        """
+        Test worker cores may not include the state bus cores
+        """
+        config = {
+            'gpio': {'dc_motor_pins': {
+                'left': {'pwm': 18, 'dir1': 23, 'dir2': 24},
+                'right': {'pwm': 25, 'dir1': 8, 'dir2': 7}
+            }},
+            'communication': {'bluetooth': {'port': '/dev/ttyS0', 'baudrate': 9600}},
+            'state_bus': {'control_core': 1},
+            'offload': {'first_core': 2, 'max_workers': 2}
+        }
+        self.assertEqual(compile_config(config).offload.cores(), [2, 3])
+        config['offload']['first_core'] = 0
+        with self.assertRaises(ConfigError):
+            compile_config(config)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+from unittest.mock import Mock, call
+import sys
+import os
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.actuators.differential_drive import DifferentialDrive
+
+class TestDifferentialDrive(unittest.TestCase):
+    def setUp(self):
+        """
+        Build a drive around mock motors and a manual clock
+        """
+        self.now = 0.0
+        self.left = Mock()
+        self.right = Mock()
+        self.drive = DifferentialDrive(
+            self.left, self.right,
+            track_width=0.2, max_wheel_speed=1.0, deadtime=0.05,
+            clock=lambda: self.now
+        )
+
+    def test_both_wheels_written_in_one_update(self):
+        """
+        Test a single command updates both wheels
+        """
+        self.drive.set_wheels(50, 30)
+        self.left.apply_direction.assert_called_with(1)
+        self.left.apply_duty.assert_called_with(50)
+        self.right.apply_direction.assert_called_with(1)
+        self.right.apply_duty.assert_called_with(30)
+        self.assertFalse(self.drive.pending)
+
+    def test_unchanged_command_skips_writes(self):
+        """
+        Test repeating a command does not touch the pins again
+        """
+        self.drive.set_wheels(50, 50)
+        writes = self.drive.stats['pin_writes']
+        self.left.reset_mock()
+
+        self.drive.set_wheels(50, 50)
+        self.assertEqual(self.drive.stats['pin_writes'], writes)
+        self.left.apply_duty.assert_not_called()
+        self.left.apply_direction.assert_not_called()
+
+    def test_reversal_waits_out_deadtime(self):
+        """
+        Test a direction change coasts before reversing
+        """
+        self.drive.set_wheels(60, 60)
+        self.left.reset_mock()
+
+        self.drive.set_wheels(-60, 60)
+        self.assertEqual(
+            self.left.mock_calls,
+            [call.apply_duty(0.0), call.apply_direction(0)]
+        )
+        self.assertTrue(self.drive.pending)
+
+        self.now = 0.01
+        self.assertTrue(self.drive.update())
+        self.left.apply_direction.assert_called_with(0)
+
+        self.now = 0.06
+        self.assertFalse(self.drive.update())
+        self.left.apply_direction.assert_called_with(-1)
+        self.left.apply_duty.assert_called_with(60)
+
+    def test_velocity_mixing_and_desaturation(self):
+        """
+        Test (v, omega) maps to wheel speeds and keeps the turn ratio
+        """
+        self.drive.set_velocity(0.5, 0.0)
+        self.left.apply_duty.assert_called_with(50)
+        self.right.apply_duty.assert_called_with(50)
+
+        self.drive.set_velocity(1.0, 5.0)
+        # Left 0.5 m/s, right 1.5 m/s -> scaled to 33.3% / 100%
+        self.right.apply_duty.assert_called_with(100)
+        self.assertAlmostEqual(self.left.apply_duty.call_args[0][0], 33.3, places=1)
+
+    def test_out_of_range_rejected(self):
+        """
+        Test wheel speeds beyond 100% raise
+        """
+        with self.assertRaises(ValueError):
+            self.drive.set_wheels(120, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+import unittest
+import sys
+import os
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import hal
+from src.hal.simulator import SimulatorBackend
+
+class TestSimulatorBackend(unittest.TestCase):
+    def setUp(self):
+        """
+        Install a fresh simulator for each test
+        """
+        self.sim = SimulatorBackend()
+        self.previous = hal.set_backend(self.sim)
+
+    def tearDown(self):
+        hal.set_backend(self.previous)
+
+    def test_virtual_sleep_is_instant(self):
+        """
+        Test sleeping advances virtual time only
+        """
+        hal.sleep(3600)
+        self.assertEqual(hal.monotonic(), 3600)
+        self.assertEqual(hal.time(), self.sim.clock.epoch + 3600)
+
+    def test_gpio_edges_and_bouncetime(self):
+        """
+        Test scheduled edges fire callbacks with debounce in virtual time
+        """
+        from src.sensors.ir_speed_sensor import IRSpeedSensor
+
+        sensor = IRSpeedSensor(pin=17, wheel_circumference=0.2)
+        sensor.start_monitoring()
+
+        # 10 Hz train is counted; a 100 Hz train is debounced to 20 Hz (50 ms)
+        self.sim.gpio.pulse_train(17, frequency=10, duration=1.0)
+        hal.sleep(1.0)
+        self.assertEqual(sensor.read()['rotations'], 10)
+
+        self.sim.gpio.pulse_train(17, frequency=100, duration=1.0)
+        hal.sleep(1.0)
+        self.assertEqual(sensor.read()['rotations'], 20)
+
+    def test_pwm_and_outputs(self):
+        """
+        Test motor writes land on the simulated pins
+        """
+        from src.actuators.motor_controller import DCMotor
+
+        motor = DCMotor(pwm_pin=18, dir_pin1=23, dir_pin2=24)
+        motor.set_speed(40, direction=-1)
+        self.assertEqual(self.sim.gpio.pwm_duty(18), 40)
+        self.assertEqual(self.sim.gpio.pin_value(23), 0)
+        self.assertEqual(self.sim.gpio.pin_value(24), 1)
+
+        with self.assertRaises(ValueError):
+            motor.pwm.ChangeDutyCycle(120)
+
+    def test_i2c_register_maps(self):
+        """
+        Test the MPU6050 and VL53L0X drivers read the simulated registers
+        """
+        from src.sensors.mpu6050 import MPU6050
+        from src.sensors.vl53l0x_lidar import VL53L0XLidar
+
+        imu = MPU6050()
+        self.assertTrue(self.sim.i2c_device(0x68).awake)
+        self.sim.i2c_device(0x68).set_motion(accel=(0.5, -0.25, 1.0), gyro=(0.0, 10.0, -5.0))
+        self.assertEqual(imu.get_accel_data(), {'x': 0.5, 'y': -0.25, 'z': 1.0})
+        self.assertEqual(imu.get_gyro_data(), {'x': 0.0, 'y': 10.0, 'z': -5.0})
+
+        lidar = VL53L0XLidar()
+        self.sim.i2c_device(0x29).set_range(742)
+        self.assertEqual(lidar.read()['distance_mm'], 742)
+
+        with self.assertRaises(OSError):
+            hal.open_i2c(1).read_byte_data(0x50, 0)
+
+    def test_serial_loopback(self):
+        """
+        Test a scripted device answers on the simulated serial port
+        """
+        link = self.sim.serial_link('/dev/ttyACM0')
+        link.set_responder(lambda line: b'{"echo": true}\n')
+
+        port = hal.open_serial('/dev/ttyACM0', 115200, timeout=1)
+        port.write(b'{"type": "ping"}\n')
+        self.assertEqual(port.readline(), b'{"echo": true}\n')
+
+        link.set_responder(None)
+        port.write(b'raw')
+        self.assertEqual(self.sim.serial_device('/dev/ttyACM0').read(3), b'raw')
+
+        self.sim.missing_ports.add('/dev/ttyUSB9')
+        with self.assertRaises(hal.SerialException):
+            hal.open_serial('/dev/ttyUSB9')
+
+    def test_can_virtual_bus(self):
+        """
+        Test frames are delivered between buses on one channel
+        """
+        sender = hal.open_can_bus('can0')
+        receiver = hal.open_can_bus('can0')
+        receiver.set_filters([{'can_id': 0x100, 'can_mask': 0x700, 'extended': False}])
+
+        sender.send(hal.can_message(0x123, [1, 2, 3]))
+        sender.send(hal.can_message(0x223, [4]))
+        message = receiver.recv(timeout=0)
+        self.assertEqual(message.arbitration_id, 0x123)
+        self.assertEqual(bytes(message.data), b'\x01\x02\x03')
+        self.assertIsNone(receiver.recv(timeout=0))
+
+        self.sim.can_network('can0').bus_off = True
+        with self.assertRaises(hal.CANError):
+            sender.send(hal.can_message(0x123, [1]))
+
+class TestHardwareBackend(unittest.TestCase):
+    def test_system_clock(self):
+        """
+        Test the hardware backend imports without its libraries and its
+        clock reads real time
+        """
+        import time
+        from src.hal.hardware import HardwareBackend
+
+        clock = HardwareBackend().clock
+        start = clock.monotonic()
+        clock.sleep(0.01)
+        self.assertGreaterEqual(clock.monotonic() - start, 0.01)
+        self.assertAlmostEqual(clock.time(), time.time(), delta=1.0)
+
+if __name__ == '__main__':
+    unittest.main()
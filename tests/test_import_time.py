@@ -0,0 +1,73 @@
+import unittest
+import subprocess
+import sys
+import os
+import json
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Generous for a Raspberry Pi 4; a dev box imports in ~10 ms
+IMPORT_BUDGET_MS = 100
+
+HARDWARE_MODULES = ['RPi', 'serial', 'can', 'smbus2', 'board', 'busio', 'adafruit_vl53l0x']
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import src.sensors, src.actuators, src.communication
+elapsed_ms = (time.perf_counter() - start) * 1000
+from src import hal
+print(json.dumps({
+    'elapsed_ms': elapsed_ms,
+    'loaded': [m for m in %r if m in sys.modules],
+    'backend_created': hal._backend is not None,
+    'manager_created': src.communication._manager is not None
+}))
+""" % (HARDWARE_MODULES,)
+
+class TestImportTime(unittest.TestCase):
+    def run_probe(self):
+        """
+        Import the packages in a fresh interpreter and report what happened
+        """
+        env = dict(os.environ, ROBOT_HAL_BACKEND='hardware')
+        output = subprocess.check_output(
+            [sys.executable, '-c', PROBE], cwd=PROJECT_ROOT, env=env
+        )
+        return json.loads(output)
+
+    def test_import_is_side_effect_free(self):
+        """
+        Test importing opens no devices and loads no hardware libraries
+        """
+        result = self.run_probe()
+        self.assertEqual(result['loaded'], [])
+        self.assertFalse(result['backend_created'])
+        self.assertFalse(result['manager_created'])
+
+    def test_import_time_budget(self):
+        """
+        Test package import stays under the startup budget
+        """
+        # Best of three to ignore a cold filesystem cache
+        elapsed = min(self.run_probe()['elapsed_ms'] for _ in range(3))
+        self.assertLess(elapsed, IMPORT_BUDGET_MS,
+                        f"Package import took {elapsed:.1f} ms")
+
+    def test_lazy_attributes_resolve(self):
+        """
+        Test lazily exported names still resolve
+        """
+        sys.path.insert(0, PROJECT_ROOT)
+        import src.sensors
+        import src.actuators
+        import src.communication
+
+        self.assertEqual(src.sensors.VL53L0XLidar.__name__, 'VL53L0XLidar')
+        self.assertEqual(src.actuators.DifferentialDrive.__name__, 'DifferentialDrive')
+        self.assertEqual(src.communication.CANInterface.__name__, 'CANInterface')
+        with self.assertRaises(AttributeError):
+            src.sensors.VL53L0XSensor
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,132 @@
+import unittest
+import sys
+import os
+import threading
+import time
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import hal
+from src.hal.simulator import SimulatorBackend
+from src.instrumentation import LatencyHistogram, Instrumentation, OverrunProfiler
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles_within_bucket_precision(self):
+        """
+        Test percentiles land within the log-bucket error of the true value
+        """
+        histogram = LatencyHistogram('test')
+        for value in range(1, 100001):
+            histogram.record_ns(value * 10)
+
+        self.assertEqual(histogram.count, 100000)
+        for percent, expected in ((50, 500000), (99, 990000)):
+            actual = histogram.percentile(percent)
+            self.assertGreaterEqual(actual, expected)
+            self.assertLess(actual, expected * 1.07)
+        self.assertEqual(histogram.percentile(100), 1000000)
+
+        snapshot = histogram.snapshot()
+        self.assertEqual(snapshot['max_us'], 1000.0)
+        self.assertEqual(snapshot['min_us'], 0.01)
+        self.assertAlmostEqual(snapshot['mean_us'], 500.005)
+
+    def test_merge_and_reset(self):
+        """
+        Test merging per-thread histograms and resetting
+        """
+        first, second = LatencyHistogram(), LatencyHistogram()
+        first.record(0.001)
+        second.record(0.003)
+        first.merge(second)
+        self.assertEqual(first.count, 2)
+        self.assertEqual(first.max_ns, 3000000)
+
+        first.reset()
+        self.assertEqual(first.snapshot()['count'], 0)
+        self.assertEqual(first.percentile(99), 0)
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.sim = SimulatorBackend()
+        self.previous = hal.set_backend(self.sim)
+        self.registry = Instrumentation()
+
+    def tearDown(self):
+        self.registry.disable()
+        hal.set_backend(self.previous)
+
+    def test_disabled_records_nothing(self):
+        """
+        Test timers and decorators are inert while disabled
+        """
+        @self.registry.timed('work')
+        def work():
+            return 42
+
+        with self.registry.timer('block'):
+            self.assertEqual(work(), 42)
+        self.assertEqual(self.registry.snapshot()['histograms'], {})
+
+        self.registry.enable(hot_paths=False)
+        with self.registry.timer('block'):
+            work()
+        histograms = self.registry.snapshot()['histograms']
+        self.assertEqual(histograms['work']['count'], 1)
+        self.assertEqual(histograms['block']['count'], 1)
+
+    def test_hot_path_wrappers(self):
+        """
+        Test the driver methods are wrapped on enable and restored on disable
+        """
+        from src.actuators.differential_drive import DifferentialDrive
+
+        original = DifferentialDrive.update
+        drive = DifferentialDrive.from_pins((18, 23, 24), (25, 8, 7))
+
+        self.registry.enable()
+        self.assertIsNot(DifferentialDrive.update, original)
+        for speed in (10, 20, 30):
+            drive.set_wheels(speed, speed)
+        self.assertEqual(self.sim.gpio.pwm_duty(18), 30)
+        self.assertEqual(self.registry.histogram('drive.update').count, 3)
+
+        self.registry.disable()
+        self.assertIs(DifferentialDrive.update, original)
+
+        text = self.registry.to_prometheus()
+        self.assertIn('vehicle_latency_seconds_count{path="drive.update"} 3', text)
+
+    def test_overrun_triggers_profiler(self):
+        """
+        Test a loop overrun samples the loop thread's stack
+        """
+        self.registry.enable(hot_paths=False)
+        self.registry.profiler = OverrunProfiler(duration=0.1, interval=0.001)
+
+        def busy_loop_body(deadline):
+            while time.monotonic() < deadline:
+                pass
+
+        def loop():
+            self.assertFalse(self.registry.record_loop('loop', 0.001, 0.01))
+            self.assertTrue(self.registry.record_loop('loop', 0.05, 0.01))
+            busy_loop_body(time.monotonic() + 0.2)
+
+        thread = threading.Thread(target=loop)
+        thread.start()
+        thread.join()
+        self.registry.profiler.wait(5)
+
+        self.assertEqual(self.registry.snapshot()['overruns'], {'loop': 1})
+        report = self.registry.profiler.reports[0]
+        self.assertIn('loop took 50.00 ms', report['reason'])
+        self.assertGreater(report['samples'], 0)
+        self.assertIn('busy_loop_body', OverrunProfiler.collapsed(report))
+
+        # Cooldown: a second overrun right away does not profile again
+        self.assertFalse(self.registry.profiler.trigger())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,219 @@
+import unittest
+import sys
+import os
+import logging
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import hal
+from src.hal.simulator import SimulatorBackend
+from src.communication.link_supervisor import (
+    LinkSupervisor, LINK_UP, LINK_BUS_OFF, LINK_DOWN
+)
+
+class FlakyLink:
+    """
+    Interface stand-in with controllable activity, errors and reopen failures
+    """
+
+    def __init__(self, reopen_failures=0):
+        self.rx_count = 0
+        self.error_count = 0
+        self.reopen_failures = reopen_failures
+        self.reopened = 0
+
+    def reopen(self):
+        if self.reopen_failures:
+            self.reopen_failures -= 1
+            raise IOError("device not present")
+        self.reopened += 1
+
+class TestLinkSupervisor(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.now = 0.0
+        self.supervisor = LinkSupervisor(backoff=1.0, max_backoff=8.0, jitter=0.0, clock=lambda: self.now)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def _step(self, seconds=0.1):
+        self.now += seconds
+        self.supervisor.check()
+
+    def test_stall_triggers_reopen_with_backoff(self):
+        """
+        Test a silent link is reopened, retried with growing delays, and recovers
+        """
+        link = FlakyLink(reopen_failures=2)
+        supervised = self.supervisor.add_link('arduino', link, stall_timeout=0.5)
+
+        for _ in range(4):
+            link.rx_count += 1
+            self._step()
+        self.assertEqual(supervised.state, LINK_UP)
+        self.assertEqual(supervised.health, 1.0)
+
+        # Silence past the stall timeout: first attempt fails, retry after 1 s, then 2 s
+        attempts = []
+        for _ in range(40):
+            self._step()
+            if supervised.failures and (not attempts or attempts[-1][1] != supervised.failures):
+                attempts.append((round(self.now, 1), supervised.failures))
+            if link.reopened:
+                break
+        self.assertEqual(link.reopened, 1)
+        self.assertEqual([failures for _, failures in attempts], [1, 2, 3])
+        self.assertAlmostEqual(attempts[1][0] - attempts[0][0], 1.0, places=1)
+        self.assertAlmostEqual(attempts[2][0] - attempts[1][0], 2.0, places=1)
+        self.assertEqual(supervised.last_error, 'device not present')
+        self.assertLess(supervised.health, 0.5)
+
+        # Traffic resumes: failures reset and health climbs back
+        for _ in range(30):
+            link.rx_count += 1
+            self._step()
+        self.assertEqual(supervised.state, LINK_UP)
+        self.assertEqual(supervised.failures, 0)
+        self.assertGreater(supervised.health, 0.9)
+
+    def test_error_burst_and_quiet_links(self):
+        """
+        Test error bursts reconnect, a few errors only lower the score, quiet links are fine
+        """
+        link = FlakyLink()
+        supervised = self.supervisor.add_link('bluetooth', link, error_threshold=3)
+        for _ in range(20):
+            self._step()
+        self.assertEqual(supervised.state, LINK_UP)
+        self.assertEqual(supervised.health, 1.0)
+
+        link.error_count += 1
+        self._step()
+        self.assertEqual(link.reopened, 0)
+        self.assertAlmostEqual(supervised.health, 0.95)
+
+        link.error_count += 5
+        self.supervisor.check(self.now)
+        self.assertEqual(link.reopened, 1)
+        self.assertEqual(supervised.state, LINK_UP)
+        self.assertEqual(supervised.reconnects, 1)
+
+    def test_failed_bringup_retried_by_factory(self):
+        """
+        Test a link missing at boot is created once its factory succeeds
+        """
+        attempts = []
+
+        def factory():
+            attempts.append(self.now)
+            if len(attempts) < 3:
+                raise IOError("no such port")
+            return FlakyLink()
+
+        rebound = []
+        supervised = self.supervisor.add_link('can', factory=factory, on_reconnect=rebound.append)
+        self.assertEqual(supervised.state, LINK_DOWN)
+        for _ in range(50):
+            self._step()
+        self.assertEqual(len(attempts), 3)
+        self.assertIsNotNone(supervised.interface)
+        self.assertEqual(rebound, [supervised.interface])
+        self.assertEqual(self.supervisor.status()['can']['reconnects'], 1)
+
+class TestSupervisedInterfaces(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.sim = SimulatorBackend()
+        self.previous = hal.set_backend(self.sim)
+        self.supervisor = LinkSupervisor(jitter=0.0, clock=hal.monotonic)
+
+    def tearDown(self):
+        hal.set_backend(self.previous)
+        logging.disable(logging.NOTSET)
+
+    def test_closed_serial_port_reopened(self):
+        """
+        Test an Arduino whose port disappeared is reopened in place
+        """
+        from src.communication.arduino_interface import ArduinoInterface
+
+        arduino = ArduinoInterface(timeout=0.05)
+        supervised = self.supervisor.add_link('arduino', arduino)
+        old_port = arduino.serial_conn
+        old_port.close()
+
+        self.supervisor.check()
+        self.assertIsNot(arduino.serial_conn, old_port)
+        self.assertTrue(arduino.serial_conn.is_open)
+        self.assertEqual(supervised.reconnects, 1)
+
+        self.sim.serial_device('/dev/ttyACM0').write(b'{"ok": true}\n')
+        self.assertEqual(arduino.send_command({'type': 'ping'}), {'ok': True})
+
+    def test_can_bus_off_recovery(self):
+        """
+        Test bus-off is detected and the bus reopened once it clears
+        """
+        from src.communication.can_interface import CANInterface
+
+        can = CANInterface()
+        supervised = self.supervisor.add_link('can', can)
+        network = self.sim.can_network('can0')
+        network.bus_off = True
+        self.supervisor.check()
+        self.assertEqual(supervised.state, LINK_BUS_OFF)
+        self.assertEqual(supervised.last_error, 'still bus_off after reopen')
+
+        network.bus_off = False
+        self.sim.clock.advance(5)
+        self.supervisor.check()
+        self.assertEqual(supervised.state, LINK_UP)
+        peer = hal.open_can_bus('can0', 500000)
+        can.send_message(0x123, [1, 2])
+        self.assertEqual(peer.recv(timeout=0).arbitration_id, 0x123)
+
+class TestDegradedSpeed(unittest.TestCase):
+    def test_speed_capped_while_link_degraded(self):
+        """
+        Test the controller limits speed while a link is unhealthy
+        """
+        from unittest.mock import MagicMock
+        from src.vehicle_control import VehicleController
+        from src.communication.teleop_channel import TeleopCommand, MODE_DRIVE
+        from src.communication.telemetry_downlink import FLAG_DEGRADED
+
+        logging.disable(logging.CRITICAL)
+        try:
+            config = {
+                'gpio': {'dc_motor_pins': {
+                    'left': {'pwm': 18, 'dir1': 23, 'dir2': 24},
+                    'right': {'pwm': 25, 'dir1': 8, 'dir2': 7}
+                }},
+                'communication': {'bluetooth': {'port': '/dev/ttyS0', 'baudrate': 9600}},
+                'supervisor': {'degraded_health': 0.5, 'degraded_speed': 0.25}
+            }
+            drive_train = MagicMock()
+            controller = VehicleController(config, imu_sensor=MagicMock(), drive_train=drive_train,
+                                           bluetooth_controller=MagicMock(), calibrate=False)
+
+            # Already driving at full speed: capped at once, not on the next command
+            drive_train.targets.return_value = (100.0, -60.0)
+            controller.apply_link_health({'bluetooth': 0.9, 'can': 0.2})
+            self.assertEqual(controller.speed_limit, 0.25)
+            self.assertTrue(controller.status_flags & FLAG_DEGRADED)
+            drive_train.set_wheels.assert_called_with(25.0, -15.0)
+            controller.apply_teleop(TeleopCommand(1, 1.0, 0.0, MODE_DRIVE))
+            drive_train.set_wheels.assert_called_with(25.0, 25.0)
+
+            drive_train.targets.return_value = (25.0, 25.0)
+            controller.apply_link_health({'bluetooth': 0.9, 'can': 0.8})
+            self.assertEqual(controller.speed_limit, 1.0)
+            drive_train.set_wheels.assert_called_with(100.0, 100.0)
+            self.assertFalse(controller.status_flags & FLAG_DEGRADED)
+        finally:
+            logging.disable(logging.NOTSET)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import unittest
+import sys
+import os
+import json
+import logging
+import tempfile
+import threading
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.logging_pipeline import (
+    LoggingPipeline, SizeAndTimeRotatingFileHandler, JsonLinesFormatter
+)
+
+class _BlockingHandler(logging.Handler):
+    """
+    Output handler that stalls until released, like a slow SD card.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.unblock = threading.Event()
+        self.records = []
+
+    def emit(self, record):
+        self.unblock.wait(5)
+        self.records.append(record.getMessage())
+
+class TestLoggingPipeline(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.logger = logging.getLogger('test.pipeline')
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_slow_output_never_blocks_callers(self):
+        """
+        Test a stalled handler fills the bounded queue and drops are counted
+        """
+        handler = _BlockingHandler()
+        pipeline = LoggingPipeline([handler], queue_size=10)
+        pipeline.start()
+        try:
+            for i in range(100):
+                self.logger.info("sample %d", i)
+            stats = pipeline.stats()
+            self.assertGreater(stats['dropped'], 0)
+            self.assertEqual(stats['enqueued'] + stats['dropped'], 100)
+            self.assertLessEqual(stats['max_queue_depth'], 10)
+        finally:
+            handler.unblock.set()
+            pipeline.stop()
+
+        self.assertIn("sample 0", handler.records)
+        self.assertTrue(any("dropped" in message for message in handler.records))
+
+    def test_root_logger_restored(self):
+        """
+        Test stop() flushes the queue and puts the original handlers back
+        """
+        root = logging.getLogger()
+        before = root.handlers[:]
+
+        path = os.path.join(self.tempdir.name, 'vehicle.log')
+        pipeline = LoggingPipeline([logging.FileHandler(path)])
+        pipeline.start()
+        self.assertEqual(root.handlers, [pipeline.queue_handler])
+        self.logger.info("flushed on stop")
+        pipeline.stop()
+
+        self.assertEqual(root.handlers, before)
+        with open(path) as log_file:
+            self.assertIn("flushed on stop", log_file.read())
+
+    def test_json_lines(self):
+        """
+        Test compact JSON output including exception text
+        """
+        formatter = JsonLinesFormatter()
+        try:
+            raise ValueError("bad reading")
+        except ValueError:
+            record = self.logger.makeRecord(
+                'test.pipeline', logging.ERROR, __file__, 1, "IMU %s", ('failed',), sys.exc_info()
+            )
+
+        line = formatter.format(record)
+        self.assertNotIn('\n', line.replace('\\n', ''))
+        entry = json.loads(line)
+        self.assertEqual(entry['msg'], "IMU failed")
+        self.assertEqual(entry['level'], 'ERROR')
+        self.assertIn("ValueError: bad reading", entry['exc'])
+
+    def test_size_and_time_rotation(self):
+        """
+        Test rotation on size and on the time interval
+        """
+        now = [1000.0]
+        path = os.path.join(self.tempdir.name, 'vehicle.log')
+        handler = SizeAndTimeRotatingFileHandler(
+            path, max_bytes=200, backup_count=2, interval=60, clock=lambda: now[0]
+        )
+        handler.setFormatter(logging.Formatter('%(message)s'))
+
+        def _emit(message):
+            handler.handle(self.logger.makeRecord('test', logging.INFO, __file__, 1, message, None, None))
+
+        for _ in range(5):
+            _emit('x' * 90)
+        self.assertTrue(os.path.exists(path + '.1'))
+        self.assertTrue(os.path.exists(path + '.2'))
+        self.assertFalse(os.path.exists(path + '.3'))
+
+        _emit('short')
+        now[0] += 61
+        _emit('after interval')
+        handler.close()
+
+        with open(path) as log_file:
+            self.assertEqual(log_file.read(), 'after interval\n')
+
+if __name__ == '__main__':
+    unittest.main()
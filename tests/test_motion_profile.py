@@ -0,0 +1,84 @@
+import unittest
+import sys
+import os
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.actuators.motion_profile import SpeedProfile, RampEngine
+
+class TestSpeedProfile(unittest.TestCase):
+    def test_trapezoidal_profile(self):
+        """
+        Test a constant-acceleration ramp
+        """
+        profile = SpeedProfile(0, 80, max_accel=40)
+        self.assertEqual(profile.profile_type, 'trapezoidal')
+        self.assertAlmostEqual(profile.duration, 2.0)
+        self.assertAlmostEqual(profile.speed_at(1.0), 40)
+        self.assertEqual(profile.speed_at(5.0), 80)
+
+    def test_s_curve_is_continuous_and_monotonic(self):
+        """
+        Test the S-curve reaches the target smoothly in both directions
+        """
+        for start, target in ((0, 100), (60, -20), (10, 12)):
+            profile = SpeedProfile(start, target, max_accel=50, max_jerk=200)
+            samples = [profile.speed_at(i * profile.duration / 200) for i in range(201)]
+            self.assertAlmostEqual(samples[0], start)
+            self.assertAlmostEqual(samples[-1], target)
+
+            steps = [b - a for a, b in zip(samples, samples[1:])]
+            sign = 1 if target > start else -1
+            self.assertTrue(all(sign * step >= -1e-9 for step in steps))
+            # No jumps: each step bounded by the acceleration limit
+            dt = profile.duration / 200
+            self.assertTrue(all(abs(step) <= 50 * dt + 1e-9 for step in steps))
+
+class TestRampEngine(unittest.TestCase):
+    def setUp(self):
+        self.outputs = []
+        self.engine = RampEngine(self.outputs.append, max_accel=100.0)
+
+    def test_ramp_advances_only_on_tick(self):
+        """
+        Test ramps progress from ticks and report progress
+        """
+        self.engine.ramp_to(50, now=0.0)
+        self.assertEqual(self.outputs, [])
+
+        self.engine.tick(now=0.25)
+        self.assertAlmostEqual(self.outputs[-1], 25)
+        self.assertAlmostEqual(self.engine.progress(now=0.25)['fraction'], 0.5)
+
+        self.engine.tick(now=1.0)
+        self.assertEqual(self.outputs[-1], 50)
+        self.assertFalse(self.engine.active)
+
+    def test_retarget_mid_ramp(self):
+        """
+        Test a new target continues from the current speed
+        """
+        self.engine.ramp_to(100, now=0.0)
+        self.engine.tick(now=0.5)
+        profile = self.engine.ramp_to(0, now=0.5)
+        self.assertAlmostEqual(profile.start_speed, 50)
+
+        self.engine.tick(now=0.75)
+        self.assertAlmostEqual(self.outputs[-1], 25)
+
+    def test_cancel(self):
+        """
+        Test cancellation holds or stops the output
+        """
+        self.engine.ramp_to(100, now=0.0)
+        self.engine.tick(now=0.3)
+        self.engine.cancel()
+        self.engine.tick(now=1.0)
+        self.assertAlmostEqual(self.engine.speed, 30)
+
+        self.engine.cancel(stop=True)
+        self.assertEqual(self.outputs[-1], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+from unittest.mock import Mock
+import sys
+import os
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.actuators.pump_scheduler import FlowModel, PumpScheduler
+
+class TestPumpScheduler(unittest.TestCase):
+    def setUp(self):
+        """
+        Scheduler around a mock pump with a 10 ml/s flow at 100%
+        """
+        self.pump = Mock()
+        self.scheduler = PumpScheduler(self.pump, FlowModel(max_flow=10.0, min_intensity=0.0))
+
+    def test_pulse_pattern_runs_from_ticks(self):
+        """
+        Test an on/off pattern is executed without sleeping
+        """
+        job = self.scheduler.submit(intensity=100, on_time=0.5, off_time=0.5, cycles=3)
+
+        self.scheduler.tick(now=0.0)
+        self.pump.turn_on.assert_called_once_with(intensity=100)
+
+        self.scheduler.tick(now=0.75)
+        self.pump.turn_off.assert_called_once()
+        self.assertAlmostEqual(self.scheduler.delivered_volume(job), 5.0)
+
+        self.scheduler.tick(now=10.0)
+        self.assertEqual(self.scheduler.status(job)['state'], 'done')
+        self.assertAlmostEqual(self.scheduler.delivered_volume(job), 15.0)
+        self.assertEqual(self.pump.turn_on.call_count, 3)
+
+    def test_volume_dose(self):
+        """
+        Test a volume dose runs for the flow-model time
+        """
+        job = self.scheduler.submit(intensity=50, volume=10.0)
+        self.scheduler.tick(now=0.0)
+        self.scheduler.tick(now=1.0)
+        self.assertEqual(self.scheduler.status(job)['state'], 'running')
+        self.assertAlmostEqual(self.scheduler.delivered_volume(job), 5.0)
+
+        self.scheduler.tick(now=2.5)
+        self.assertEqual(self.scheduler.status(job)['state'], 'done')
+        self.assertAlmostEqual(self.scheduler.delivered_volume(job), 10.0)
+
+    def test_priority_preemption_and_resume(self):
+        """
+        Test a higher-priority dose interrupts and the low one resumes
+        """
+        low = self.scheduler.submit(intensity=100, on_time=2.0)
+        self.scheduler.tick(now=0.0)
+
+        high = self.scheduler.submit(intensity=100, on_time=1.0, priority=5)
+        self.scheduler.tick(now=1.0)
+        self.assertEqual(self.scheduler.status(low)['state'], 'preempted')
+        self.assertEqual(self.scheduler.status(high)['state'], 'running')
+
+        self.scheduler.tick(now=2.0)
+        self.assertEqual(self.scheduler.status(high)['state'], 'done')
+        self.scheduler.tick(now=3.0)
+        self.assertEqual(self.scheduler.status(low)['state'], 'done')
+        self.assertAlmostEqual(self.scheduler.delivered_volume(low), 20.0)
+        self.assertAlmostEqual(self.scheduler.delivered_volume(), 30.0)
+
+    def test_emergency_stop(self):
+        """
+        Test emergency stop turns the pump off and drops all jobs
+        """
+        running = self.scheduler.submit(intensity=100, on_time=5.0)
+        queued = self.scheduler.submit(intensity=100, on_time=5.0)
+        self.scheduler.tick(now=0.0)
+
+        self.scheduler.emergency_stop()
+        self.pump.turn_off.assert_called()
+        self.assertEqual(self.scheduler.status(running)['state'], 'cancelled')
+        self.assertEqual(self.scheduler.status(queued)['state'], 'cancelled')
+        with self.assertRaises(RuntimeError):
+            self.scheduler.submit(intensity=100, on_time=1.0)
+
+        self.scheduler.resume()
+        self.scheduler.submit(intensity=100, on_time=1.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+import unittest
+import sys
+import os
+import math
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.control.road_preview import RoadPreview, PreviewMonitor
+from src.control.suspension import SuspensionController
+from src.settings import compile_config, ConfigError
+
+def range_to(preview, distance, road):
+    """
+    Range the forward sensor reads at an odometer distance over a road
+    """
+    angle = math.radians(preview.tilt)
+    range_mm = preview.mount_height / math.sin(angle)
+    for _ in range(5):
+        hit = distance + preview.mount_offset + range_mm * math.cos(angle) / 1000.0
+        range_mm = (preview.mount_height - road(hit)) / math.sin(angle)
+    return range_mm
+
+def ramp(position):
+    # 10 mm rise per 0.1 m between 1.0 m and 1.2 m, then a 20 mm plateau
+    return min(20.0, max(0.0, (position - 1.0) * 100.0))
+
+class StubLidar:
+    def __init__(self, readings):
+        self.readings = list(readings)
+
+    def read(self):
+        distance = self.readings.pop(0)
+        if distance is None:
+            return None
+        return {'distance_mm': distance, 'valid_measurement': True}
+
+class TestRoadPreview(unittest.TestCase):
+    def drive(self, preview, road, end, step=0.01, speed=1.0):
+        distance = 0.0
+        while distance < end:
+            preview.add_sample(distance, range_to(preview, distance, road))
+            distance += step
+        return distance
+
+    def test_profile_matches_road(self):
+        """
+        Test the stored profile reproduces the road heights
+        """
+        preview = RoadPreview()
+        self.drive(preview, ramp, 1.2)
+        for position in (1.05, 1.15, 1.3):
+            self.assertAlmostEqual(preview.height_at(position), ramp(position), delta=1.0)
+        self.assertAlmostEqual(preview.slope_at(1.1), 100.0, delta=5.0)
+        self.assertIsNone(preview.height_at(5.0))
+
+    def test_gaps_interpolated_and_old_cells_ignored(self):
+        """
+        Test skipped cells are filled, long gaps are not, and cells from
+        the previous pass around the ring read as unknown
+        """
+        preview = RoadPreview(length=1.0, resolution=0.01, max_gap=0.1)
+        preview.add_sample(0.0, range_to(preview, 0.0, ramp))
+        start = preview.add_sample(0.05, range_to(preview, 0.05, ramp))
+        self.assertIsNotNone(preview.height_at(start - 0.025))
+
+        far = preview.add_sample(0.5, range_to(preview, 0.5, ramp))
+        self.assertIsNone(preview.height_at(far - 0.2))
+
+        # One full ring later the same cell index holds a different distance
+        self.assertIsNone(preview.height_at(start + 1.0))
+        self.assertIsNotNone(preview.height_at(start))
+
+    def test_feedforward_front_then_rear(self):
+        """
+        Test front struts react at the bump and rear ones a wheelbase later
+        """
+        preview = RoadPreview(wheelbase=0.3, lead_time=0.0, strut_speed=200.0)
+        self.drive(preview, ramp, 1.3)
+        commands = preview.feedforward(1.1, 1.0)
+        self.assertAlmostEqual(commands[0], -0.5, delta=0.05)
+        self.assertEqual(commands[0], commands[1])
+        self.assertEqual(commands[2], 0.0)
+
+        commands = preview.feedforward(1.4, 1.0)
+        self.assertEqual(commands[0], 0.0)
+        self.assertAlmostEqual(commands[2], -0.5, delta=0.05)
+
+        commands = preview.feedforward(1.1, 0.0)
+        self.assertEqual(list(commands), [0.0] * 4)
+
+    def test_profile_window(self):
+        """
+        Test profile() returns one height per cell with NaN for unknown ones
+        """
+        preview = RoadPreview()
+        self.drive(preview, ramp, 0.9)
+        heights = list(preview.profile(1.0, 2.0))
+        self.assertEqual(len(heights), 101)
+        self.assertAlmostEqual(heights[10], 10.0, delta=1.0)
+        self.assertTrue(math.isnan(heights[-1]))
+
+    def test_feedforward_reaches_controller(self):
+        """
+        Test the suspension controller adds feedforward before limiting
+        """
+        controller = SuspensionController()
+        level = {'acceleration': {'x': 0.0, 'y': 0.0, 'z': 1.0},
+                 'gyroscope': {'x': 0.0, 'y': 0.0, 'z': 0.0}}
+        commands = controller.update(level, 1.0, 0.02, 0.0, feedforward=[-0.4, -0.4, 2.0, 0.0])
+        self.assertEqual(list(commands), [-0.4, -0.4, 1.0, 0.0])
+
+    def test_monitor_feeds_preview(self):
+        """
+        Test the monitor samples at the current odometer reading
+        """
+        preview = RoadPreview()
+        odometer = [0.0]
+        monitor = PreviewMonitor(StubLidar([200.0, None]), preview, lambda: odometer[0])
+        odometer[0] = 0.5
+        position = monitor.poll()
+        self.assertAlmostEqual(position, 0.5 + 0.1 + 0.2 * math.cos(math.radians(30)))
+        self.assertIsNone(monitor.poll())
+        self.assertEqual(monitor.failed_reads, 1)
+
+class TestPreviewConfig(unittest.TestCase):
+    def test_lidar_addresses_unique(self):
+        """
+        Test the preview lidar may not share an address with a corner lidar
+        """
+        config = {
+            'gpio': {'dc_motor_pins': {
+                'left': {'pwm': 18, 'dir1': 23, 'dir2': 24},
+                'right': {'pwm': 25, 'dir1': 8, 'dir2': 7}
+            }},
+            'communication': {'bluetooth': {'port': '/dev/ttyS0', 'baudrate': 9600}},
+            'speed_control': {'left_sensor_pin': 16, 'right_sensor_pin': 17},
+            'suspension': {
+                'front_left': {'pump_pin': 5, 'valve_pin': 6, 'lidar_address': 0x30},
+                'front_right': {'pump_pin': 12, 'valve_pin': 13},
+                'rear_left': {'pump_pin': 19, 'valve_pin': 26},
+                'rear_right': {'pump_pin': 20, 'valve_pin': 21},
+                'preview': {'lidar_address': 0x31}
+            }
+        }
+        self.assertEqual(compile_config(config).suspension.preview.timing_budget, 33000)
+        config['suspension']['preview']['lidar_address'] = 0x30
+        with self.assertRaises(ConfigError):
+            compile_config(config)
+
+    def test_requires_speed_control(self):
+        """
+        Test the preview is refused without wheel odometry
+        """
+        config = {
+            'gpio': {'dc_motor_pins': {
+                'left': {'pwm': 18, 'dir1': 23, 'dir2': 24},
+                'right': {'pwm': 25, 'dir1': 8, 'dir2': 7}
+            }},
+            'communication': {'bluetooth': {'port': '/dev/ttyS0', 'baudrate': 9600}},
+            'suspension': {
+                'front_left': {'pump_pin': 5, 'valve_pin': 6},
+                'front_right': {'pump_pin': 12, 'valve_pin': 13},
+                'rear_left': {'pump_pin': 19, 'valve_pin': 26},
+                'rear_right': {'pump_pin': 20, 'valve_pin': 21},
+                'preview': {'lidar_address': 0x31}
+            }
+        }
+        with self.assertRaises(ConfigError):
+            compile_config(config)
+        config['speed_control'] = {'left_sensor_pin': 16, 'right_sensor_pin': 17}
+        self.assertIsNotNone(compile_config(config).suspension.preview)
+
+if __name__ == '__main__':
+    unittest.main()
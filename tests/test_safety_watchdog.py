@@ -0,0 +1,202 @@
+import unittest
+import sys
+import os
+import time
+import logging
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import hal
+from src.hal.simulator import SimulatorBackend
+from src.safety_watchdog import HeartbeatBoard, SafetyWatchdog, EmergencyStopPath
+from src.settings import compile_config, ConfigError
+
+PINS = (18, 23, 24)
+
+class TestSafetyWatchdog(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.sim = SimulatorBackend()
+        self.previous = hal.set_backend(self.sim)
+        gpio = self.sim.gpio
+        gpio.setmode(gpio.BCM)
+        for pin in PINS:
+            gpio.setup(pin, gpio.OUT)
+        self.pwm = gpio.PWM(18, 1000)
+        self.pwm.start(0)
+        self.now = 0.0
+        self.board = HeartbeatBoard(['control', 'teleop'], clock=lambda: self.now)
+
+    def tearDown(self):
+        hal.set_backend(self.previous)
+        logging.disable(logging.NOTSET)
+
+    def drive_motor(self):
+        self.pwm.ChangeDutyCycle(70)
+        self.sim.gpio.output(23, self.sim.gpio.HIGH)
+
+    def motor_off(self):
+        return self.sim.gpio.pwm_duty(18) == 0 and self.sim.gpio.input(23) == 0
+
+    def test_trips_on_missed_deadline(self):
+        """
+        Test a silent source stops the outputs and latches
+        """
+        tripped = []
+        watchdog = SafetyWatchdog(self.board, {'control': 0.1}, pins=PINS, pwms=[self.pwm],
+                                  on_trip=tripped.append)
+        watchdog.arm()
+        self.drive_motor()
+
+        for _ in range(5):
+            self.now += 0.05
+            self.board.beat('control')
+            self.assertFalse(watchdog.check())
+        self.assertFalse(self.motor_off())
+
+        self.now += 0.102
+        self.assertTrue(watchdog.check())
+        self.assertTrue(self.motor_off())
+        self.assertEqual(tripped, ['control'])
+        self.assertEqual(self.board.trip_source(), 'control')
+
+        stats = watchdog.stats()
+        self.assertAlmostEqual(stats['trip_latency'], 0.002)
+        self.assertAlmostEqual(stats['worst_poll_gap'], 0.102)
+
+        # Latched: beating again does not rearm it
+        self.board.beat('control')
+        self.assertTrue(watchdog.check())
+        self.assertEqual(tripped, ['control'])
+
+    def test_sources_without_deadline_ignored(self):
+        """
+        Test only sources with a deadline are watched
+        """
+        watchdog = SafetyWatchdog(self.board, {'control': 0.1}, pins=PINS)
+        watchdog.arm()
+        for _ in range(10):
+            self.now += 0.05
+            self.board.beat('control')
+            self.assertFalse(watchdog.check())
+
+    def test_stop_path_survives_failed_write(self):
+        """
+        Test one failing pin write does not skip the remaining outputs
+        """
+        class BrokenPWM:
+            def ChangeDutyCycle(self, duty):
+                raise RuntimeError("PWM gone")
+
+        self.drive_motor()
+        path = EmergencyStopPath(PINS, [BrokenPWM(), self.pwm])
+        elapsed = path.trip()
+        self.assertGreaterEqual(elapsed, 0.0)
+        self.assertEqual(path.failures, 1)
+        self.assertTrue(self.motor_off())
+
+    def test_thread_stops_hung_loop(self):
+        """
+        Test the watchdog thread trips within its measured worst case
+        """
+        board = HeartbeatBoard(['control'])
+        watchdog = SafetyWatchdog(board, {'control': 0.05}, pins=PINS, pwms=[self.pwm],
+                                  poll_interval=0.001)
+        watchdog.start()
+        try:
+            self.drive_motor()
+            for _ in range(10):
+                board.beat('control')
+                time.sleep(0.005)
+            self.assertFalse(watchdog.tripped)
+
+            # The loop hangs: no more beats
+            deadline = time.monotonic() + 2.0
+            while not watchdog.tripped and time.monotonic() < deadline:
+                time.sleep(0.005)
+            self.assertTrue(watchdog.tripped)
+            self.assertTrue(self.motor_off())
+
+            stats = watchdog.stats()
+            self.assertGreater(stats['checks'], 10)
+            self.assertLess(stats['trip_latency'], 0.5)
+            self.assertGreater(stats['worst_case_trip_time'], 0.0)
+        finally:
+            watchdog.stop()
+
+    def test_process_armed_before_start_returns(self):
+        """
+        Test start() only returns once a watchdog process has armed
+        """
+        board = HeartbeatBoard(['control'])
+        watchdog = SafetyWatchdog(board, {'control': 5.0}, pins=PINS, separate_process=True)
+        try:
+            self.assertTrue(watchdog.start())
+            self.assertTrue(watchdog.armed)
+            self.assertFalse(watchdog.tripped)
+        finally:
+            watchdog.stop()
+
+    def test_process_reports_trip_through_status(self):
+        """
+        Test a trip in the watchdog process is visible to its owner
+        """
+        board = HeartbeatBoard(['control'])
+        watchdog = SafetyWatchdog(board, {'control': 0.05}, pins=PINS, poll_interval=0.001,
+                                  separate_process=True)
+        try:
+            self.assertTrue(watchdog.start())
+            deadline = time.monotonic() + 5.0
+            while not watchdog.tripped and time.monotonic() < deadline:
+                time.sleep(0.005)
+            stats = watchdog.stats()
+            self.assertTrue(stats['tripped'])
+            self.assertEqual(stats['source'], 'control')
+            self.assertEqual(stats['stop_failures'], 0)
+            self.assertGreater(stats['checks'], 0)
+        finally:
+            watchdog.stop()
+
+    def test_watchdog_config(self):
+        """
+        Test the watchdog section defaults and its poll/timeout check
+        """
+        config = {
+            'gpio': {'dc_motor_pins': {
+                'left': {'pwm': 18, 'dir1': 23, 'dir2': 24},
+                'right': {'pwm': 25, 'dir1': 8, 'dir2': 7}
+            }},
+            'communication': {'bluetooth': {'port': '/dev/ttyS0', 'baudrate': 9600}}
+        }
+        self.assertFalse(compile_config(config).watchdog.enabled)
+        config['watchdog'] = {'enabled': True, 'timeout': 0.01, 'poll_interval': 0.02}
+        with self.assertRaises(ConfigError):
+            compile_config(config)
+
+    def test_process_refused_with_struts(self):
+        """
+        Test a watchdog process is refused when struts it cannot stop exist
+        """
+        config = {
+            'gpio': {'dc_motor_pins': {
+                'left': {'pwm': 18, 'dir1': 23, 'dir2': 24},
+                'right': {'pwm': 25, 'dir1': 8, 'dir2': 7}
+            }},
+            'communication': {'bluetooth': {'port': '/dev/ttyS0', 'baudrate': 9600}},
+            'watchdog': {'enabled': True, 'separate_process': True}
+        }
+        self.assertTrue(compile_config(config).watchdog.separate_process)
+        config['suspension'] = {
+            'front_left': {'pump_pin': 5, 'valve_pin': 6},
+            'front_right': {'pump_pin': 12, 'valve_pin': 13},
+            'rear_left': {'pump_pin': 19, 'valve_pin': 26},
+            'rear_right': {'pump_pin': 20, 'valve_pin': 21}
+        }
+        with self.assertRaises(ConfigError):
+            compile_config(config)
+        config['watchdog']['separate_process'] = False
+        self.assertIsNotNone(compile_config(config).suspension)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.settings import (
+    load_settings, compile_config, read_hardware_map, ConfigWatcher,
+    ConfigError, DEFAULT_HARDWARE_MAP_PATH
+)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HARDWARE_MAP = os.path.join(PROJECT_ROOT, DEFAULT_HARDWARE_MAP_PATH)
+
+class TestSettings(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.config_path = os.path.join(self.tempdir.name, 'config.json')
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def _write(self, content):
+        with open(self.config_path, 'w') as config_file:
+            json.dump(content, config_file)
+
+    def _load(self, environ=None):
+        return load_settings(self.config_path, HARDWARE_MAP, environ=environ or {})
+
+    def test_layered_sources(self):
+        """
+        Test defaults < hardware map < config file < environment
+        """
+        self._write({
+            'gpio': {'dc_motor_pins': {'right': {'pwm': 13}}},
+            'control': {'loop_rate_hz': 100}
+        })
+        config = self._load({
+            'ROBOT_CONFIG__CONTROL__STABILITY_THRESHOLD': '0.8',
+            'ROBOT_CONFIG__COMMUNICATION__BLUETOOTH__PORT': '/dev/rfcomm0'
+        })
+
+        self.assertEqual(config.gpio.dc_motor_pins.left.pins, (18, 23, 24))
+        self.assertEqual(config.gpio.dc_motor_pins.right.pins, (13, 8, 7))
+        self.assertEqual(config.control.loop_rate_hz, 100.0)
+        self.assertEqual(config.control.stability_threshold, 0.8)
+        self.assertEqual(config.communication.bluetooth.port, '/dev/rfcomm0')
+        self.assertEqual(config.communication.bluetooth.baudrate, 9600)
+        self.assertIsNone(config.speed_control)
+
+    def test_hardware_map_pins(self):
+        """
+        Test the pin map feeds the motor pins and Bluetooth port
+        """
+        layer = read_hardware_map(HARDWARE_MAP)
+        self.assertEqual(layer['gpio']['dc_motor_pins']['right'], {'pwm': 25, 'dir1': 8, 'dir2': 7})
+        self.assertEqual(layer['communication']['bluetooth']['port'], '/dev/ttyS0')
+
+    def test_compiled_config_is_frozen(self):
+        """
+        Test compiled sections are read-only, slotted and comparable
+        """
+        config = self._load()
+        with self.assertRaises(AttributeError):
+            config.control.loop_rate_hz = 10
+        with self.assertRaises(AttributeError):
+            config.extra = 1
+        self.assertFalse(hasattr(config.control, '__dict__'))
+        self.assertEqual(config, self._load())
+        self.assertEqual(compile_config(config.to_dict()), config)
+
+    def test_schema_errors(self):
+        """
+        Test bad types, ranges, unknown keys and pin clashes are rejected
+        """
+        base = self._load().to_dict()
+        broken = [
+            {'control': {'loop_rate_hz': 'fast'}},
+            {'control': {'loop_rate_hz': 0}},
+            {'control': {'loop_ratehz': 50}},
+            {'gpio': {'dc_motor_pins': {'left': {'pwm': True}}}},
+            {'speed_control': {'left_sensor_pin': 18, 'right_sensor_pin': 5}},
+            {'communication': {'arduino': {'port': '/dev/ttyACM0'}}}
+        ]
+        for override in broken:
+            self._write(override)
+            with self.subTest(override=override), self.assertRaises(ConfigError):
+                self._load()
+
+        with open(self.config_path, 'w') as config_file:
+            config_file.write('{')
+        with self.assertRaises(ConfigError):
+            self._load()
+
+        self.assertEqual(compile_config(base).to_dict(), base)
+
+    def test_hot_reload_applies_safe_changes_only(self):
+        """
+        Test hot settings are applied and pin changes wait for a restart
+        """
+        self._write({'control': {'loop_rate_hz': 50}})
+        watcher = ConfigWatcher(self._load(), load=self._load, paths=[self.config_path])
+        updates = []
+        watcher.subscribe(lambda config, changed: updates.append(changed))
+
+        self.assertEqual(watcher.check(), [])
+
+        self._write({
+            'control': {'loop_rate_hz': 200, 'stability_threshold': 0.7},
+            'gpio': {'dc_motor_pins': {'left': {'pwm': 12}}}
+        })
+        os.utime(self.config_path, ns=(0, 1))
+        applied = watcher.check()
+
+        self.assertEqual(applied, ['control.loop_rate_hz', 'control.stability_threshold'])
+        self.assertEqual(updates, [applied])
+        self.assertEqual(watcher.config.control.loop_period, 1 / 200)
+        self.assertEqual(watcher.config.gpio.dc_motor_pins.left.pwm, 18)
+
+        # An invalid edit keeps the running configuration
+        self._write({'control': {'loop_rate_hz': -1}})
+        os.utime(self.config_path, ns=(0, 2))
+        self.assertEqual(watcher.check(), [])
+        self.assertEqual(watcher.config.control.loop_rate_hz, 200)
+
+    def test_hot_reload_revalidates_merged_config(self):
+        """
+        Test a hot value checked only against new cold values is rejected
+        """
+        suspension = {
+            'front_left': {'pump_pin': 5, 'valve_pin': 6},
+            'front_right': {'pump_pin': 12, 'valve_pin': 13},
+            'rear_left': {'pump_pin': 19, 'valve_pin': 26},
+            'rear_right': {'pump_pin': 20, 'valve_pin': 21}
+        }
+        self._write({'suspension': suspension})
+        watcher = ConfigWatcher(self._load(), load=self._load, paths=[self.config_path])
+        updates = []
+        watcher.subscribe(lambda config, changed: updates.append(changed))
+
+        # Valid with the new (cold) max_height, not with the running one
+        self._write({'suspension': dict(suspension, target_height=250.0, max_height=300.0)})
+        os.utime(self.config_path, ns=(0, 1))
+        self.assertEqual(watcher.check(), [])
+        self.assertEqual(updates, [])
+        self.assertEqual(watcher.config.suspension.target_height, 120.0)
+
+if __name__ == '__main__':
+    unittest.main()
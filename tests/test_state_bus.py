@@ -0,0 +1,185 @@
+import unittest
+import sys
+import os
+import time
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.state_bus import (
+    StateBus, StateBusError, BusIMUReader, ProcessLauncher, pin_to_cores, SEQUENCE, RECORD_ALIGN
+)
+
+SCHEMA = {
+    'pair': [('a', 'f8'), ('b', 'f8')],
+    'flags': [('value', 'u4')]
+}
+
+def bus_name(test):
+    return f"test_bus_{os.getpid()}_{test.id().rsplit('.', 1)[-1]}"
+
+def write_pairs(name, stop_event, count):
+    """
+    Worker: write pairs whose halves always match
+    """
+    bus = StateBus.attach(name, SCHEMA)
+    try:
+        for index in range(1, count + 1):
+            bus.write('pair', (float(index), float(index)))
+        bus.write('flags', (count,))
+    finally:
+        bus.close()
+
+def wait_for_stop(name, stop_event):
+    bus = StateBus.attach(name, SCHEMA)
+    try:
+        bus.write('flags', (os.getpid(),))
+        stop_event.wait(10)
+    finally:
+        bus.close()
+
+class TestStateBus(unittest.TestCase):
+    def setUp(self):
+        self.bus = StateBus.create(SCHEMA, bus_name(self))
+
+    def tearDown(self):
+        self.bus.close()
+        self.bus.unlink()
+
+    def test_write_read_roundtrip(self):
+        """
+        Test values, timestamps and versions of a record
+        """
+        self.assertIsNone(self.bus.read('pair'))
+        self.bus.write('pair', (1.5, -2.5), t=10.0)
+        self.assertEqual(self.bus.read('pair'), (10.0, 1.5, -2.5))
+        self.assertEqual(self.bus.read_dict('pair'), {'t': 10.0, 'a': 1.5, 'b': -2.5})
+        self.assertEqual(self.bus.sequence('pair'), 2)
+        self.bus.write('pair', (3.0, 4.0))
+        self.assertEqual(self.bus.sequence('pair'), 4)
+
+    def test_records_on_separate_cache_lines(self):
+        """
+        Test every record starts on its own cache line
+        """
+        offsets = [record.offset for record in self.bus.records.values()]
+        for offset in offsets:
+            self.assertEqual(offset % RECORD_ALIGN, 0)
+        self.assertEqual(len(set(offset // RECORD_ALIGN for offset in offsets)), len(offsets))
+
+    def test_attach_checks_layout(self):
+        """
+        Test attaching with a different schema is refused
+        """
+        other = StateBus.attach(self.bus.name, SCHEMA)
+        self.bus.write('flags', (7,))
+        self.assertEqual(other.read('flags')[1], 7)
+        other.close()
+
+        with self.assertRaises(StateBusError):
+            StateBus.attach(self.bus.name, {'pair': [('a', 'f4')]})
+
+    def test_stalled_writer_detected(self):
+        """
+        Test a record left mid-update raises instead of returning torn data
+        """
+        self.bus.write('pair', (1.0, 1.0))
+        record = self.bus.records['pair']
+        SEQUENCE.pack_into(self.bus.shm.buf, record.offset, 3)
+        with self.assertRaises(StateBusError):
+            record.read(timeout=0.01)
+        # The next write completes the version again
+        self.bus.write('pair', (2.0, 2.0))
+        self.assertEqual(self.bus.read('pair')[1:], (2.0, 2.0))
+
+    def test_view_is_zero_copy(self):
+        """
+        Test a view follows later writes without being re-read
+        """
+        view = self.bus.view('pair')
+        self.bus.write('pair', (5.0, 6.0), t=1.0)
+        try:
+            self.assertEqual(float(view['a']), 5.0)
+            self.assertEqual(float(view['b']), 6.0)
+        finally:
+            del view
+
+    def test_reads_consistent_across_processes(self):
+        """
+        Test a reader never sees a half-written record from another process
+        """
+        count = 20000
+        launcher = ProcessLauncher(self.bus.name)
+        launcher.add('writer', write_pairs, args=(count,))
+        launcher.start()
+        torn = 0
+        reads = 0
+        deadline = time.monotonic() + 20
+        while time.monotonic() < deadline:
+            values = self.bus.read('pair')
+            if values:
+                reads += 1
+                if values[1] != values[2]:
+                    torn += 1
+            flags = self.bus.read('flags')
+            if flags and flags[1] == count:
+                break
+        launcher.stop()
+        self.assertEqual(torn, 0)
+        self.assertGreater(reads, 0)
+        self.assertEqual(self.bus.read('pair')[1], float(count))
+
+    def test_launcher_pins_and_stops(self):
+        """
+        Test workers get their cores and stop on request
+        """
+        launcher = ProcessLauncher(self.bus.name)
+        launcher.add('idle', wait_for_stop, cores=[0])
+        launcher.start()
+        deadline = time.monotonic() + 10
+        while not self.bus.read('flags') and time.monotonic() < deadline:
+            time.sleep(0.01)
+        pid = int(self.bus.read('flags')[1])
+        status = launcher.status()['idle']
+        self.assertEqual(status['pid'], pid)
+        self.assertTrue(status['alive'])
+        if hasattr(os, 'sched_getaffinity'):
+            self.assertEqual(os.sched_getaffinity(pid), {0})
+        launcher.stop()
+        self.assertEqual(launcher.processes, {})
+
+    def test_imu_reader(self):
+        """
+        Test the bus IMU reader returns fresh samples only
+        """
+        bus = StateBus.create(name=bus_name(self) + '_imu')
+        try:
+            now = [100.0]
+            bus.clock = lambda: now[0]
+            reader = BusIMUReader(bus, max_age=0.1)
+            self.assertIsNone(reader.read())
+            bus.write('imu', (0.0, 0.1, 1.0, 2.0, 0.0, -1.0))
+            reading = reader.read()
+            self.assertAlmostEqual(reading['acceleration']['y'], 0.1, places=5)
+            self.assertEqual(reading['gyroscope']['z'], -1.0)
+            # The same sample read again keeps its timestamp
+            now[0] += 0.01
+            self.assertEqual(reader.read()['timestamp'], reading['timestamp'])
+            now[0] += 0.5
+            self.assertIsNone(reader.read())
+        finally:
+            bus.close()
+            bus.unlink()
+
+    def test_pin_to_invalid_core(self):
+        """
+        Test pinning to a core that does not exist fails softly
+        """
+        if not hasattr(os, 'sched_setaffinity'):
+            self.skipTest("CPU affinity not supported")
+        before = os.sched_getaffinity(0)
+        self.assertFalse(pin_to_cores([4096]))
+        self.assertEqual(os.sched_getaffinity(0), before)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,224 @@
+import unittest
+import sys
+import os
+import logging
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import hal
+from src.hal.simulator import SimulatorBackend
+from src.control.suspension import SuspensionController, RideHeightMonitor, SimulatedSuspensionPlant
+from src.actuators.hydraulic_corner import HydraulicCorner, SuspensionActuators
+from src.settings import compile_config, ConfigError
+
+def make_config(**overrides):
+    config = {
+        'gpio': {'dc_motor_pins': {
+            'left': {'pwm': 18, 'dir1': 23, 'dir2': 24},
+            'right': {'pwm': 25, 'dir1': 8, 'dir2': 7}
+        }},
+        'communication': {'bluetooth': {'port': '/dev/ttyS0', 'baudrate': 9600}},
+        'suspension': {
+            'front_left': {'pump_pin': 5, 'valve_pin': 6},
+            'front_right': {'pump_pin': 12, 'valve_pin': 13},
+            'rear_left': {'pump_pin': 19, 'valve_pin': 26},
+            'rear_right': {'pump_pin': 20, 'valve_pin': 21}
+        }
+    }
+    config['suspension'].update(overrides)
+    return config
+
+class StubLidar:
+    def __init__(self, distance):
+        self.distance = distance
+
+    def read(self):
+        if self.distance is None:
+            return None
+        return {'distance_mm': self.distance, 'valid_measurement': True}
+
+class TestSuspensionController(unittest.TestCase):
+    def run_plant(self, controller, plant, steps, dt=0.02, speed=0.0, heights=True):
+        now = 0.0
+        imu_data = plant.step([0.0] * 4, dt)
+        for _ in range(steps):
+            if heights:
+                controller.set_ride_heights(plant.heights, now)
+            commands = controller.update(imu_data, speed, dt, now)
+            imu_data = plant.step(commands, dt)
+            now += dt
+        return commands
+
+    def test_levels_tilted_vehicle(self):
+        """
+        Test roll and pitch converge to level and the height to target
+        """
+        controller = SuspensionController()
+        plant = SimulatedSuspensionPlant()
+        plant.heights = [140.0, 110.0, 135.0, 105.0]
+        self.run_plant(controller, plant, 400)
+
+        roll, pitch = plant.attitude()
+        self.assertLess(abs(roll), 0.5)
+        self.assertLess(abs(pitch), 0.5)
+        self.assertAlmostEqual(sum(plant.heights) / 4, 120.0, delta=2.0)
+
+    def test_lowers_at_speed(self):
+        """
+        Test the ride height target follows vehicle speed
+        """
+        controller = SuspensionController(height_per_speed=-10.0)
+        self.assertEqual(controller.target_ride_height(0.0), 120.0)
+        self.assertEqual(controller.target_ride_height(2.0), 100.0)
+        self.assertEqual(controller.target_ride_height(10.0), 80.0)
+
+    def test_commands_bounded_and_travel_limited(self):
+        """
+        Test commands stay within -1..1 and never push past strut travel
+        """
+        controller = SuspensionController()
+        controller.set_ride_heights([160.0, 80.0, 120.0, 120.0], 0.0)
+        imu_data = {
+            'acceleration': {'x': 0.0, 'y': 0.5, 'z': 0.85},
+            'gyroscope': {'x': 200.0, 'y': 0.0, 'z': 0.0}
+        }
+        for _ in range(50):
+            commands = controller.update(imu_data, 0.0, 0.02, 0.0)
+            for command in commands:
+                self.assertTrue(-1.0 <= command <= 1.0)
+            self.assertLessEqual(commands[0], 0.0)
+            self.assertGreaterEqual(commands[1], 0.0)
+
+    def test_stale_heights_ignored(self):
+        """
+        Test old ride heights no longer drive the heave loop
+        """
+        controller = SuspensionController(height_timeout=0.5)
+        level = {'acceleration': {'x': 0.0, 'y': 0.0, 'z': 1.0},
+                 'gyroscope': {'x': 0.0, 'y': 0.0, 'z': 0.0}}
+        controller.set_ride_heights([100.0] * 4, 0.0)
+        commands = controller.update(level, 0.0, 0.02, 0.1)
+        self.assertTrue(all(command > 0 for command in commands))
+
+        controller.reset()
+        commands = controller.update(level, 0.0, 0.02, 1.0)
+        self.assertEqual(list(commands), [0.0] * 4)
+
+    def test_repeated_sample_not_refused(self):
+        """
+        Test a sample already fused does not keep integrating its gyro rate
+        """
+        controller = SuspensionController()
+        stale = {'acceleration': {'x': 0.0, 'y': 0.0, 'z': 1.0},
+                 'gyroscope': {'x': 3.0, 'y': 0.0, 'z': 0.0},
+                 'timestamp': 100.0}
+        for step in range(200):
+            commands = controller.update(stale, 0.0, 0.02, step * 0.02)
+        self.assertEqual(controller.attitude.roll, 0.0)
+
+        # The next sample integrates over the whole time since the last one
+        fresh = dict(stale, timestamp=104.0)
+        controller.update(fresh, 0.0, 0.02, 4.0)
+        self.assertAlmostEqual(controller.attitude.roll, 0.98 * 3.0 * 4.0)
+
+    def test_ride_height_monitor(self):
+        """
+        Test the monitor hands valid heights to the controller
+        """
+        controller = SuspensionController()
+        monitor = RideHeightMonitor(
+            [StubLidar(118), StubLidar(None), None, StubLidar(121)], controller, clock=lambda: 3.0
+        )
+        self.assertEqual(monitor.poll(), [118.0, None, None, 121.0])
+        self.assertEqual(monitor.failed_reads, 1)
+        self.assertEqual(controller.heights_updated, 3.0)
+
+class TestSuspensionActuators(unittest.TestCase):
+    def setUp(self):
+        self.previous = hal.set_backend(SimulatorBackend())
+        self.corners = [HydraulicCorner(pump, valve) for pump, valve in ((5, 6), (12, 13), (19, 26), (20, 21))]
+
+    def tearDown(self):
+        hal.set_backend(self.previous)
+
+    def test_duty_written_only_on_change(self):
+        """
+        Test repeated commands cause no further PWM writes
+        """
+        corner = self.corners[0]
+        corner.apply(0.5)
+        self.assertEqual((corner.pump_duty, corner.valve_duty), (60, 0))
+        writes = corner.writes
+        corner.apply(0.501)
+        corner.apply(0.5)
+        self.assertEqual(corner.writes, writes)
+
+        corner.apply(-1.0)
+        self.assertEqual((corner.pump_duty, corner.valve_duty), (0, 100))
+        corner.apply(0.01)
+        self.assertEqual((corner.pump_duty, corner.valve_duty), (0, 0))
+
+    def test_pump_budget(self):
+        """
+        Test only the largest raise demands get a pump
+        """
+        actuators = SuspensionActuators(self.corners, max_active_pumps=2)
+        running = actuators.apply([0.3, 0.9, 0.6, -0.4])
+        self.assertEqual(running, 2)
+        self.assertEqual([corner.pump_duty > 0 for corner in self.corners], [False, True, True, False])
+        self.assertGreater(self.corners[3].valve_duty, 0)
+
+        actuators.hold()
+        self.assertEqual([(c.pump_duty, c.valve_duty) for c in self.corners], [(0, 0)] * 4)
+
+class TestSuspensionConfig(unittest.TestCase):
+    def test_compiles_and_checks_pins(self):
+        """
+        Test the suspension section and its GPIO conflict check
+        """
+        config = compile_config(make_config())
+        self.assertEqual(config.suspension.rear_right.valve_pin, 21)
+        self.assertIsNone(config.suspension.front_left.lidar_address)
+
+        bad = make_config(rear_right={'pump_pin': 18, 'valve_pin': 21})
+        with self.assertRaises(ConfigError):
+            compile_config(bad)
+        with self.assertRaises(ConfigError):
+            compile_config(make_config(target_height=200.0))
+
+    def test_vehicle_drives_struts(self):
+        """
+        Test the control tick levels through the strut actuators
+        """
+        from unittest.mock import MagicMock
+        from src.vehicle_control import VehicleController
+
+        previous = hal.set_backend(SimulatorBackend())
+        logging.disable(logging.CRITICAL)
+        try:
+            imu_sensor = MagicMock()
+            controller = VehicleController(make_config(), imu_sensor=imu_sensor, drive_train=MagicMock(),
+                                           bluetooth_controller=MagicMock(), calibrate=False)
+            for step in range(5):
+                imu_sensor.read.return_value = {
+                    'acceleration': {'x': 0.0, 'y': 0.2, 'z': 0.98},
+                    'gyroscope': {'x': 0.0, 'y': 0.0, 'z': 0.0},
+                    'timestamp': step * 0.02
+                }
+                controller.control_tick(step * 0.02)
+            self.assertEqual(imu_sensor.read.call_count, 5)
+            self.assertEqual(controller.last_imu['timestamp'], 0.08)
+            corners = controller.suspension_actuators.corners
+            # Rolled right side down: raise the right, release the left
+            self.assertGreater(corners[1].pump_duty, 0)
+            self.assertGreater(corners[0].valve_duty, 0)
+
+            controller.stop()
+            self.assertEqual([(c.pump_duty, c.valve_duty) for c in corners], [(0, 0)] * 4)
+        finally:
+            logging.disable(logging.NOTSET)
+            hal.set_backend(previous)
+
+if __name__ == '__main__':
+    unittest.main()
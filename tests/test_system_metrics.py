@@ -0,0 +1,142 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+import urllib.request
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.system_metrics import RingBuffer, ProcfsReader, SystemMetricsSampler, MetricsServer
+
+class FakeSystem:
+    """
+    Minimal /proc and /sys tree with adjustable counters.
+    """
+
+    def __init__(self, root):
+        self.proc = os.path.join(root, 'proc')
+        self.sys = os.path.join(root, 'sys')
+        os.makedirs(os.path.join(self.proc, 'net'))
+        os.makedirs(os.path.join(self.proc, 'self'))
+        self.set(cpu=[(100, 900), (300, 700)], rx=0, tx=0, sectors=(0, 0), process_ticks=0)
+
+    def _write(self, content, *parts):
+        path = os.path.join(*parts)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as counter_file:
+            counter_file.write(content)
+
+    def set(self, cpu, rx, tx, sectors, process_ticks, temperature=None, throttled=None):
+        lines = ["cpu  0 0 0 0 0 0 0 0"]
+        for index, (busy, idle) in enumerate(cpu):
+            lines.append(f"cpu{index} {busy} 0 0 {idle} 0 0 0 0 0 0")
+        self._write('\n'.join(lines) + '\nintr 1\n', self.proc, 'stat')
+        self._write("MemTotal: 1000 kB\nMemFree: 100 kB\nMemAvailable: 250 kB\n", self.proc, 'meminfo')
+        self._write(
+            "Inter-| header\n face | header\n"
+            "    lo: 999 0 0 0 0 0 0 0 999 0 0 0 0 0 0 0\n"
+            f"  wlan0: {rx} 0 0 0 0 0 0 0 {tx} 0 0 0 0 0 0 0\n",
+            self.proc, 'net', 'dev'
+        )
+        self._write(
+            f" 179 0 mmcblk0 1 0 {sectors[0]} 0 1 0 {sectors[1]} 0 0 0 0\n"
+            f" 179 1 mmcblk0p1 1 0 {sectors[0]} 0 1 0 {sectors[1]} 0 0 0 0\n"
+            " 7 0 loop0 1 0 5000 0 1 0 5000 0 0 0 0\n",
+            self.proc, 'diskstats'
+        )
+        fields = ['S'] + ['0'] * 50
+        fields[11] = str(process_ticks)   # utime
+        fields[17] = '7'                  # num_threads
+        fields[21] = '10'                 # rss pages
+        self._write("42 (python3 main) " + ' '.join(fields) + '\n', self.proc, 'self', 'stat')
+        if temperature is not None:
+            self._write(f"{int(temperature * 1000)}\n", self.sys, 'class', 'thermal', 'thermal_zone0', 'temp')
+        if throttled is not None:
+            self._write(f"{throttled:#x}\n", self.sys, 'devices', 'platform', 'soc', 'soc:firmware', 'get_throttled')
+
+class TestSystemMetrics(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.system = FakeSystem(self.tempdir.name)
+        self.now = [0.0]
+        reader = ProcfsReader(self.system.proc, self.system.sys)
+        reader.clock_ticks = 100
+        reader.page_size = 4096
+        self.sampler = SystemMetricsSampler(
+            capacity=3, reader=reader, clock=lambda: self.now[0], wall_clock=lambda: 1000 + self.now[0]
+        )
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_ring_buffer(self):
+        """
+        Test the history keeps the newest entries in order
+        """
+        ring = RingBuffer(3)
+        self.assertIsNone(ring.latest())
+        for value in range(5):
+            ring.append(value)
+        self.assertEqual(ring.snapshot(), [2, 3, 4])
+        self.assertEqual(ring.latest(), 4)
+        self.assertEqual(len(ring), 3)
+
+    def test_rates_from_counter_deltas(self):
+        """
+        Test CPU, network, disk and process rates between two samples
+        """
+        self.sampler.sample()
+        self.now[0] = 2.0
+        self.system.set(
+            cpu=[(150, 950), (400, 700)], rx=2000, tx=500, sectors=(8, 16),
+            process_ticks=50, temperature=71.5, throttled=0x50004
+        )
+        sample = self.sampler.sample()
+
+        self.assertEqual(sample['cpu_core_percent'], [50.0, 100.0])
+        self.assertEqual(sample['cpu_percent'], 75.0)
+        self.assertEqual(sample['net_rx_bps'], 1000.0)
+        self.assertEqual(sample['net_tx_bps'], 250.0)
+        self.assertEqual(sample['disk_read_bps'], 8 * 512 / 2)
+        self.assertEqual(sample['disk_write_bps'], 16 * 512 / 2)
+        self.assertEqual(sample['process_cpu_percent'], 25.0)
+        self.assertEqual(sample['process_threads'], 7)
+        self.assertEqual(sample['process_rss_bytes'], 40960)
+        self.assertEqual(sample['memory_percent'], 75.0)
+        self.assertEqual(sample['cpu_temperature_c'], 71.5)
+        self.assertTrue(sample['throttled'])
+
+        for second in (3.0, 4.0, 5.0):
+            self.now[0] = second
+            self.sampler.sample()
+        self.assertEqual([s['monotonic'] for s in self.sampler.samples()], [3.0, 4.0, 5.0])
+        self.assertEqual(len(self.sampler.samples(since=4.0)), 2)
+
+    def test_prometheus_and_http_export(self):
+        """
+        Test the exposition text and the HTTP endpoint
+        """
+        self.system.set(cpu=[(100, 900)], rx=0, tx=0, sectors=(0, 0), process_ticks=0,
+                        temperature=55.0, throttled=0x4)
+        self.sampler.sample()
+        text = self.sampler.to_prometheus()
+        self.assertIn('# TYPE vehicle_cpu_temperature_celsius gauge', text)
+        self.assertIn('vehicle_cpu_temperature_celsius 55.0', text)
+        self.assertIn('vehicle_throttled{reason="throttled"} 1.0', text)
+        self.assertIn('vehicle_throttled{reason="under_voltage"} 0.0', text)
+
+        server = MetricsServer(self.sampler, port=0)
+        server.start()
+        try:
+            host, port = server.address[:2]
+            with urllib.request.urlopen(f"http://{host}:{port}/metrics", timeout=5) as response:
+                self.assertEqual(response.read().decode(), text)
+            with urllib.request.urlopen(f"http://{host}:{port}/metrics.json", timeout=5) as response:
+                self.assertEqual(len(json.loads(response.read())), 1)
+        finally:
+            server.stop()
+
+if __name__ == '__main__':
+    unittest.main()
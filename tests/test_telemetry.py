@@ -0,0 +1,157 @@
+import unittest
+import sys
+import os
+import json
+import tempfile
+import numpy
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import hal
+from src.hal.simulator import SimulatorBackend
+from src.telemetry import TelemetryRecorder, TelemetryReader
+
+class TestTelemetry(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.now = [0.0]
+        self.recorder = TelemetryRecorder(
+            self.tempdir.name, run_name='run', chunk_records=100, flush_records=64,
+            clock=lambda: self.now[0], wall_clock=lambda: 1700000000.0
+        )
+        self.recorder.add_channel('imu', [('ax', 'f4'), ('az', 'f4'), ('ok', 'bool')])
+
+    def tearDown(self):
+        self.recorder.close()
+        self.tempdir.cleanup()
+
+    def _record(self, count, step=0.01):
+        for i in range(count):
+            self.now[0] = round(self.now[0] + step, 6)
+            self.recorder.record('imu', (i * 0.5, 1.0, i % 2 == 0))
+
+    def test_chunked_append_and_index(self):
+        """
+        Test batched flushes roll over into chunks with time ranges
+        """
+        self._record(63)
+        self.assertEqual(self.recorder.stats['flushes'], 0)
+        self._record(187)
+        self.recorder.flush()
+
+        index_path = os.path.join(self.recorder.directory, 'imu', 'index.json')
+        with open(index_path) as index_file:
+            chunks = json.load(index_file)['chunks']
+        self.assertEqual([chunk['count'] for chunk in chunks], [100, 100, 50])
+        self.assertEqual(chunks[0]['t_start'], 0.01)
+        self.assertEqual(chunks[2]['t_end'], 2.5)
+        # 8-byte timestamp + two float32 + bool, unpadded
+        self.assertEqual(os.path.getsize(os.path.join(self.recorder.directory, 'imu', 'chunk-000001.bin')), 100 * 17)
+
+        # Timestamps may not go backwards
+        self.recorder.record('imu', (0.0, 0.0, False), timestamp=1.0)
+        self.assertEqual(self.recorder.stats['out_of_order'], 1)
+
+    def test_reader_slices_by_time(self):
+        """
+        Test time slices across chunk boundaries, half-open at the end
+        """
+        self._record(250)
+        self.recorder.close()
+
+        reader = TelemetryReader(self.recorder.directory)
+        try:
+            self.assertEqual(reader.channels, ['imu'])
+            self.assertEqual(reader.columns('imu'), ['t', 'ax', 'az', 'ok'])
+            self.assertEqual(reader.time_range('imu'), (0.01, 2.5))
+
+            window = reader.read('imu', start=0.95, end=1.05)
+            self.assertEqual(len(window), 10)
+            first = tuple(window[0])
+            self.assertAlmostEqual(first[0], 0.95)
+            self.assertEqual(first[1], 47.0)
+            self.assertTrue(first[3])
+            self.assertAlmostEqual(float(tuple(window[-1])[0]), 1.04)
+
+            self.assertEqual(len(reader.read('imu')), 250)
+            self.assertEqual(len(reader.read('imu', start=3.0)), 0)
+        finally:
+            reader.close()
+
+    def test_unindexed_records_are_found(self):
+        """
+        Test records flushed without an index update (crash) are still read
+        """
+        self._record(80)
+        self.recorder.flush()
+        channel = self.recorder.channels['imu']
+        data, timestamps = channel.take()
+        self._record(30)
+        data, timestamps = channel.take()
+        # Write the data but leave index.json as it was
+        channel._file.write(data)
+        channel._file.flush()
+
+        reader = TelemetryReader(self.recorder.directory)
+        try:
+            self.assertEqual(len(reader.read('imu')), 110)
+            self.assertAlmostEqual(reader.time_range('imu')[1], 1.1)
+        finally:
+            reader.close()
+
+    def test_numpy_memmap_view(self):
+        """
+        Test reads inside one chunk are zero-copy memmap views
+        """
+        self._record(250)
+        self.recorder.close()
+
+        reader = TelemetryReader(self.recorder.directory)
+        window = reader.read('imu', start=1.2, end=1.5)
+        self.assertIsInstance(window, numpy.memmap)
+        self.assertEqual(window.dtype.names, ('t', 'ax', 'az', 'ok'))
+        self.assertAlmostEqual(float(window['ax'].sum()), sum(i * 0.5 for i in range(119, 149)))
+        del window
+        reader.close()
+
+class TestVehicleTelemetry(unittest.TestCase):
+    def test_controller_records_imu_and_wheels(self):
+        """
+        Test drive() and every control_tick() feed the attached recorder
+        """
+        from src.vehicle_control import VehicleController
+
+        sim = SimulatorBackend()
+        previous = hal.set_backend(sim)
+        tempdir = tempfile.TemporaryDirectory()
+        try:
+            config = {
+                'gpio': {'dc_motor_pins': {
+                    'left': {'pwm': 18, 'dir1': 23, 'dir2': 24},
+                    'right': {'pwm': 25, 'dir1': 8, 'dir2': 7}
+                }}
+            }
+            controller = VehicleController(config, calibrate=False)
+            recorder = TelemetryRecorder(tempdir.name, run_name='vehicle')
+            controller.attach_telemetry(recorder)
+
+            controller.drive(0.5, 'forward')
+            for _ in range(5):
+                sim.clock.advance(0.02)
+                controller.control_tick()
+            recorder.close()
+
+            reader = TelemetryReader(recorder.directory)
+            # One IMU record from drive() and one per tick
+            self.assertEqual(len(reader.read('imu')), 6)
+            wheels = reader.read('wheels')
+            self.assertEqual(len(wheels), 5)
+            self.assertEqual(tuple(wheels[-1])[1:3], (50.0, 50.0))
+            reader.close()
+        finally:
+            hal.set_backend(previous)
+            tempdir.cleanup()
+
+if __name__ == '__main__':
+    unittest.main()
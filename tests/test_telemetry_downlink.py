@@ -0,0 +1,180 @@
+import unittest
+import sys
+import os
+import time
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import hal
+from src.hal.simulator import SimulatorBackend
+from src.communication.telemetry_downlink import (
+    TelemetryDownlink, DownlinkEncoder, DownlinkDecoder, FRAME_OVERHEAD, FLAG_ESTOP
+)
+from src.settings import compile_config, ConfigError
+
+STATUS = {
+    'flags': 0, 'teleop_seq': 7, 'left_command': 50.0, 'right_command': -25.0,
+    'left_speed': 0.412, 'right_speed': 0.398,
+    'ax': 0.01, 'ay': -0.02, 'az': 0.99, 'gx': 1.5, 'gy': 0.0, 'gz': -3.2
+}
+
+class BackloggedPort:
+    """
+    Serial stand-in whose transmit buffer drains only when told to
+    """
+    baudrate = 9600
+
+    def __init__(self):
+        self.out_waiting = 0
+        self.draining = False
+        self.written = bytearray()
+
+    def write(self, data):
+        self.written += data
+        if not self.draining:
+            self.out_waiting += len(data)
+        return len(data)
+
+class TestDownlinkFraming(unittest.TestCase):
+    def test_keyframe_then_deltas(self):
+        """
+        Test deltas carry only changed fields and the receiver keeps the rest
+        """
+        encoder = DownlinkEncoder()
+        decoder = DownlinkDecoder()
+
+        keyframe, trimmed = encoder.encode(STATUS, keyframe=True)
+        self.assertEqual(trimmed, 0)
+        decoder.feed(keyframe)
+        self.assertEqual(decoder.state['teleop_seq'], 7)
+        self.assertAlmostEqual(decoder.state['left_speed'], 0.412)
+        self.assertAlmostEqual(decoder.state['gz'], -3.2)
+
+        # Unchanged values produce no frame at all
+        self.assertEqual(encoder.encode(STATUS), (None, 0))
+
+        changed = dict(STATUS, left_command=60.0)
+        delta, _ = encoder.encode(changed)
+        self.assertEqual(len(delta), FRAME_OVERHEAD + 3)
+        self.assertLess(len(delta), len(keyframe) / 4)
+        self.assertEqual(decoder.feed(delta), [{'left_command': 60.0}])
+        self.assertAlmostEqual(decoder.state['right_command'], -25.0)
+
+    def test_budget_keeps_safety_fields(self):
+        """
+        Test a tight budget trims diagnostics first and defers them
+        """
+        encoder = DownlinkEncoder()
+        decoder = DownlinkDecoder()
+        frame, trimmed = encoder.encode(STATUS, budget=FRAME_OVERHEAD + 5)
+
+        update = decoder.feed(frame)[0]
+        self.assertEqual(set(update), {'flags', 'teleop_seq'})
+        self.assertEqual(trimmed, 10)
+
+        # Deferred fields follow in the next frames
+        while trimmed:
+            frame, trimmed = encoder.encode(STATUS, budget=FRAME_OVERHEAD + 12)
+            decoder.feed(frame)
+        self.assertEqual(set(decoder.state), set(STATUS))
+
+    def test_resync_after_corruption(self):
+        """
+        Test noise and a corrupted frame are skipped
+        """
+        encoder = DownlinkEncoder()
+        decoder = DownlinkDecoder()
+        first, _ = encoder.encode(STATUS, keyframe=True)
+        corrupt = bytearray(first)
+        corrupt[8] ^= 0xFF
+        second, _ = encoder.encode(dict(STATUS, flags=FLAG_ESTOP))
+
+        updates = decoder.feed(b'\x00\x5a' + bytes(corrupt) + second[:5])
+        updates += decoder.feed(second[5:])
+        self.assertEqual(updates, [{'flags': FLAG_ESTOP}])
+        self.assertEqual(decoder.crc_errors, 1)
+
+class TestTelemetryDownlink(unittest.TestCase):
+    def setUp(self):
+        self.sim = SimulatorBackend()
+        self.previous = hal.set_backend(self.sim)
+
+    def tearDown(self):
+        hal.set_backend(self.previous)
+
+    def test_sender_thread_streams_status(self):
+        """
+        Test published values reach the ground side and safety changes go out at once
+        """
+        ground = self.sim.serial_device('/dev/ttyS0')
+        downlink = TelemetryDownlink(hal.open_serial('/dev/ttyS0', 9600, 0.05), rate=1.0, max_rate=1.0)
+        decoder = DownlinkDecoder()
+        downlink.publish(STATUS)
+        downlink.start()
+        try:
+            deadline = time.monotonic() + 2.0
+            while 'gz' not in decoder.state and time.monotonic() < deadline:
+                decoder.feed(ground.read(max(ground.in_waiting, 1)))
+            self.assertAlmostEqual(decoder.state['az'], 0.99)
+
+            # At 1 Hz only the safety wakeup gets this out within 0.5 s
+            sent = time.monotonic()
+            downlink.publish(dict(STATUS, flags=FLAG_ESTOP))
+            while decoder.state['flags'] != FLAG_ESTOP and time.monotonic() - sent < 0.5:
+                decoder.feed(ground.read(max(ground.in_waiting, 1)))
+            self.assertEqual(decoder.state['flags'], FLAG_ESTOP)
+        finally:
+            downlink.stop()
+
+    def test_rate_adapts_to_link(self):
+        """
+        Test the rate backs off on a backlog and recovers on a fast link
+        """
+        port = BackloggedPort()
+        port.out_waiting = 4096
+        downlink = TelemetryDownlink(port, rate=10.0, min_rate=1.0, max_rate=20.0)
+        for step in range(20):
+            downlink.publish(dict(STATUS, left_command=step))
+            downlink.send_once()
+        self.assertEqual(downlink.rate, 1.0)
+
+        port.out_waiting = 0
+        port.draining = True
+        for step in range(40):
+            downlink.publish(dict(STATUS, left_command=step))
+            downlink.send_once()
+        self.assertGreater(downlink.rate, 10.0)
+        self.assertLessEqual(downlink.rate, 20.0)
+
+    def test_publish_does_not_touch_port(self):
+        """
+        Test publish() only stores values
+        """
+        port = BackloggedPort()
+        downlink = TelemetryDownlink(port)
+        for step in range(1000):
+            downlink.publish(dict(STATUS, left_command=step % 100))
+        self.assertEqual(port.written, b'')
+        self.assertEqual(len(downlink.outbox), len(STATUS))
+
+class TestDownlinkConfig(unittest.TestCase):
+    def test_rate_within_limits(self):
+        """
+        Test the start rate must lie between the adaptive rate limits
+        """
+        config = {
+            'gpio': {'dc_motor_pins': {
+                'left': {'pwm': 18, 'dir1': 23, 'dir2': 24},
+                'right': {'pwm': 25, 'dir1': 8, 'dir2': 7}
+            }},
+            'communication': {'bluetooth': {'port': '/dev/ttyS0', 'baudrate': 9600}},
+            'downlink': {'rate': 10.0, 'min_rate': 5.0, 'max_rate': 10.0}
+        }
+        self.assertEqual(compile_config(config).downlink.max_rate, 10.0)
+        config['downlink']['max_rate'] = 8.0
+        with self.assertRaises(ConfigError):
+            compile_config(config)
+
+if __name__ == '__main__':
+    unittest.main()
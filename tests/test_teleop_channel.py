@@ -0,0 +1,119 @@
+import unittest
+import sys
+import os
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import hal
+from src.hal.simulator import SimulatorBackend
+from src.communication.teleop_channel import (
+    TeleopChannel, TeleopFrameParser, TeleopCommand, encode_command, FRAME_SIZE,
+    MODE_DRIVE, MODE_STOP
+)
+
+class TestTeleopFrameParser(unittest.TestCase):
+    def test_split_and_merged_frames(self):
+        """
+        Test frames split across reads and several per read all decode
+        """
+        parser = TeleopFrameParser()
+        stream = b''.join(encode_command(seq, 0.5, -0.25) for seq in range(3))
+
+        self.assertEqual(parser.feed(stream[:4]), [])
+        commands = parser.feed(stream[4:FRAME_SIZE + 3])
+        commands += parser.feed(stream[FRAME_SIZE + 3:])
+
+        self.assertEqual([command.seq for command in commands], [0, 1, 2])
+        self.assertEqual(commands[0].throttle, 0.5)
+        self.assertEqual(commands[0].steer, -0.25)
+        self.assertEqual(commands[0].mode, MODE_DRIVE)
+
+    def test_resync_after_noise_and_bad_crc(self):
+        """
+        Test line noise and corrupted frames are skipped
+        """
+        parser = TeleopFrameParser()
+        corrupt = bytearray(encode_command(1, 1.0, 0.0))
+        corrupt[4] ^= 0xFF
+        stream = b'\x00\x13\xaa' + bytes(corrupt) + encode_command(2, -1.0, 0.5)
+
+        commands = parser.feed(stream)
+        self.assertEqual([command.seq for command in commands], [2])
+        self.assertEqual(commands[0].throttle, -1.0)
+        self.assertEqual(parser.crc_errors, 1)
+
+class TestTeleopChannel(unittest.TestCase):
+    def setUp(self):
+        self.sim = SimulatorBackend()
+        self.previous = hal.set_backend(self.sim)
+        self.joystick = self.sim.serial_device('/dev/rfcomm0')
+        self.port = hal.open_serial('/dev/rfcomm0', 115200, 0.05)
+        self.channel = TeleopChannel(self.port, timeout=0.25)
+
+    def tearDown(self):
+        self.channel.stop()
+        hal.set_backend(self.previous)
+
+    def test_reader_thread_publishes_latest(self):
+        """
+        Test the reader decodes frames as they arrive and wakes the loop
+        """
+        self.channel.start()
+        self.assertIsNone(self.channel.setpoint())
+
+        self.joystick.write(encode_command(7, 0.3, 0.1))
+        self.assertTrue(self.channel.wait(2.0))
+        setpoint = self.channel.setpoint()
+        self.assertEqual((setpoint.seq, setpoint.throttle), (7, 0.3))
+        self.assertEqual(self.channel.age(), 0.0)
+
+    def test_out_of_order_and_timeout(self):
+        """
+        Test older sequence numbers are dropped and stale setpoints expire
+        """
+        self.channel.handle_bytes(encode_command(0xFFFF, 0.1, 0.0))
+        self.channel.handle_bytes(encode_command(2, 0.2, 0.0))    # wrapped, newer
+        self.channel.handle_bytes(encode_command(1, 0.9, 0.0))    # late duplicate
+        self.assertEqual(self.channel.setpoint().seq, 2)
+        self.assertEqual(self.channel.stats['out_of_order'], 1)
+
+        self.sim.clock.advance(0.3)
+        self.assertIsNone(self.channel.setpoint())
+        # After a timeout a restarted sender may begin again from zero
+        self.channel.handle_bytes(encode_command(0, 0.4, 0.0))
+        self.assertEqual(self.channel.setpoint().throttle, 0.4)
+
+class TestTeleopControl(unittest.TestCase):
+    def test_arcade_mix_and_link_loss(self):
+        """
+        Test setpoints reach the wheels and a lost link stops the vehicle
+        """
+        from src.vehicle_control import VehicleController
+
+        sim = SimulatorBackend()
+        previous = hal.set_backend(sim)
+        try:
+            config = {
+                'gpio': {'dc_motor_pins': {
+                    'left': {'pwm': 18, 'dir1': 23, 'dir2': 24},
+                    'right': {'pwm': 25, 'dir1': 8, 'dir2': 7}
+                }}
+            }
+            controller = VehicleController(config, calibrate=False)
+            controller.apply_teleop(TeleopCommand(1, 0.5, 0.25, MODE_DRIVE))
+            self.assertEqual(controller.drive_train.targets(), (75.0, 25.0))
+            self.assertEqual(sim.gpio.pwm_duty(18), 75.0)
+
+            controller.apply_teleop(TeleopCommand(2, 0.5, 0.25, MODE_STOP))
+            self.assertEqual(controller.drive_train.targets(), (0.0, 0.0))
+
+            controller.apply_teleop(TeleopCommand(3, -0.4, 0.0, MODE_DRIVE))
+            self.assertEqual(controller.drive_train.targets(), (-40.0, -40.0))
+            controller.apply_teleop(None)
+            self.assertEqual(controller.drive_train.targets(), (0.0, 0.0))
+        finally:
+            hal.set_backend(previous)
+
+if __name__ == '__main__':
+    unittest.main()
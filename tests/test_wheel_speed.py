@@ -0,0 +1,91 @@
+import unittest
+import sys
+import os
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.control.wheel_speed import (
+    PIDController,
+    FeedforwardTable,
+    GainSchedule,
+    WheelSpeedController,
+    SimulatedWheelPlant
+)
+
+class TestWheelSpeedControl(unittest.TestCase):
+    DT = 0.01
+
+    def run_loop(self, controller, plant, target, seconds):
+        """
+        Run the controller against the simulated plant
+        """
+        for _ in range(int(seconds / self.DT)):
+            duty = controller.update(target, plant.measure(), self.DT)
+            plant.step(duty, self.DT)
+        return duty
+
+    def test_tracks_target_speed(self):
+        """
+        Test the closed loop settles on the target despite a load
+        """
+        plant = SimulatedWheelPlant(noise=0.005, load=0.05)
+        controller = WheelSpeedController()
+
+        self.run_loop(controller, plant, 0.5, 3.0)
+        self.assertAlmostEqual(plant.speed, 0.5, delta=0.02)
+
+        duty = self.run_loop(controller, plant, -0.3, 3.0)
+        self.assertLess(duty, 0)
+        self.assertAlmostEqual(plant.speed, -0.3, delta=0.02)
+
+    def test_feedforward_learns_plant_curve(self):
+        """
+        Test steady-state running moves the feedforward toward the real duty
+        """
+        plant = SimulatedWheelPlant()
+        controller = WheelSpeedController()
+        initial_error = abs(controller.feedforward.duty_for(0.5) - 61.95)
+
+        self.run_loop(controller, plant, 0.5, 20.0)
+        learned_error = abs(controller.feedforward.duty_for(0.5) - 61.95)
+        self.assertLess(learned_error, initial_error / 5)
+
+    def test_anti_windup(self):
+        """
+        Test the integral stops growing while the output is saturated
+        """
+        pid = PIDController(kp=1.0, ki=10.0, output_max=100.0)
+        for _ in range(1000):
+            self.assertEqual(pid.update(1000.0, 0.0, self.DT), 100.0)
+        self.assertEqual(pid.integral, 0.0)
+
+        # Recovers immediately once the error reverses
+        self.assertLess(pid.update(0.0, 10.0, self.DT), 100.0)
+
+    def test_gain_schedule_interpolation(self):
+        """
+        Test gains are interpolated between schedule points
+        """
+        schedule = GainSchedule([(0.0, 10.0, 100.0, 0.0), (1.0, 30.0, 50.0, 0.1)])
+        pid = PIDController(kp=0.0)
+
+        schedule.apply(pid, 0.5)
+        self.assertAlmostEqual(pid.kp, 20.0)
+        self.assertAlmostEqual(pid.ki, 75.0)
+        self.assertAlmostEqual(pid.kd, 0.05)
+
+        schedule.apply(pid, 2.0)
+        self.assertEqual(pid.kp, 30.0)
+
+    def test_feedforward_table_stays_monotonic(self):
+        """
+        Test learning never makes the duty map non-monotonic
+        """
+        table = FeedforwardTable(learning_rate=0.5)
+        table.learn(55.0, 0.1)
+        self.assertEqual(table.speeds, sorted(table.speeds))
+        self.assertLessEqual(table.duty_for(0.3), table.duty_for(0.6))
+
+if __name__ == '__main__':
+    unittest.main()